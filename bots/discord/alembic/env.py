@@ -15,6 +15,7 @@ from alembic import context
 from discord_bot.models.base import Base
 from discord_bot.models.discord_models import *  # noqa
 from discord_bot.models.newsletter_models import *  # noqa
+from discord_bot.models.workflow_models import *  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
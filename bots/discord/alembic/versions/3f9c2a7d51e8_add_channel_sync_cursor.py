@@ -0,0 +1,28 @@
+"""Add historical sync cursor to discord channels
+
+Revision ID: 3f9c2a7d51e8
+Revises: 924530e008e4
+Create Date: 2026-10-17 09:12:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7d51e8'
+down_revision = '924530e008e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('discord_channels', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_synced_message_id', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('discord_channels', schema=None) as batch_op:
+        batch_op.drop_column('last_synced_at')
+        batch_op.drop_column('last_synced_message_id')
@@ -0,0 +1,57 @@
+"""Add workflow checkpoints
+
+Revision ID: 5d8a1f3c7e24
+Revises: c41d8e2f6a90
+Create Date: 2026-10-17 16:20:11.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8a1f3c7e24'
+down_revision = 'c41d8e2f6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('workflow_checkpoints',
+    sa.Column('thread_id', sa.String(length=200), nullable=False),
+    sa.Column('checkpoint_ns', sa.String(length=200), nullable=False),
+    sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+    sa.Column('parent_checkpoint_id', sa.String(length=64), nullable=True),
+    sa.Column('checkpoint_type', sa.String(length=50), nullable=False),
+    sa.Column('checkpoint', sa.LargeBinary(), nullable=False),
+    sa.Column('metadata_type', sa.String(length=50), nullable=False),
+    sa.Column('metadata', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id')
+    )
+    with op.batch_alter_table('workflow_checkpoints', schema=None) as batch_op:
+        batch_op.create_index('ix_workflow_checkpoints_thread_created', ['thread_id', 'created_at'], unique=False)
+
+    op.create_table('workflow_checkpoint_writes',
+    sa.Column('thread_id', sa.String(length=200), nullable=False),
+    sa.Column('checkpoint_ns', sa.String(length=200), nullable=False),
+    sa.Column('checkpoint_id', sa.String(length=64), nullable=False),
+    sa.Column('task_id', sa.String(length=64), nullable=False),
+    sa.Column('idx', sa.Integer(), nullable=False),
+    sa.Column('channel', sa.String(length=200), nullable=False),
+    sa.Column('value_type', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.LargeBinary(), nullable=False),
+    sa.Column('task_path', sa.String(length=200), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('workflow_checkpoint_writes')
+    with op.batch_alter_table('workflow_checkpoints', schema=None) as batch_op:
+        batch_op.drop_index('ix_workflow_checkpoints_thread_created')
+
+    op.drop_table('workflow_checkpoints')
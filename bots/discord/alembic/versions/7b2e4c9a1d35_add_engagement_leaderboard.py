@@ -0,0 +1,75 @@
+"""Add engagement leaderboard and composite ranking indexes
+
+Revision ID: 7b2e4c9a1d35
+Revises: 3f9c2a7d51e8
+Create Date: 2026-10-17 13:40:22.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4c9a1d35'
+down_revision = '3f9c2a7d51e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('engagement_leaderboard',
+    sa.Column('message_id', sa.UUID(), nullable=False),
+    sa.Column('discord_message_id', sa.String(length=20), nullable=False),
+    sa.Column('channel_id', sa.String(length=20), nullable=False),
+    sa.Column('channel_name', sa.String(length=100), nullable=False),
+    sa.Column('author_name', sa.String(length=32), nullable=False),
+    sa.Column('content_preview', sa.String(length=200), nullable=False),
+    sa.Column('message_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_activity', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('reply_count', sa.Integer(), nullable=False),
+    sa.Column('reaction_count', sa.Integer(), nullable=False),
+    sa.Column('discussion_participants', sa.Integer(), nullable=False),
+    sa.Column('engagement_score', sa.Float(), nullable=False),
+    sa.Column('trending_score', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['message_id'], ['discord_messages.id'], ),
+    sa.PrimaryKeyConstraint('message_id')
+    )
+    with op.batch_alter_table('engagement_leaderboard', schema=None) as batch_op:
+        batch_op.create_index('ix_engagement_leaderboard_activity_trending', ['last_activity', 'trending_score'], unique=False)
+        batch_op.create_index('ix_engagement_leaderboard_channel_id', ['channel_id'], unique=False)
+        batch_op.create_index('ix_engagement_leaderboard_created_score', ['message_created_at', 'engagement_score'], unique=False)
+
+    with op.batch_alter_table('engagement_metrics', schema=None) as batch_op:
+        batch_op.create_index('ix_engagement_metrics_activity_trending', ['last_activity', 'trending_score'], unique=False)
+
+    # Backfill from existing metrics
+    op.execute("""
+        INSERT INTO engagement_leaderboard (
+            message_id, discord_message_id, channel_id, channel_name, author_name,
+            content_preview, message_created_at, last_activity, reply_count,
+            reaction_count, discussion_participants, engagement_score, trending_score
+        )
+        SELECT
+            em.message_id, dm.message_id, dc.channel_id, dc.name,
+            COALESCE(du.display_name, du.username), SUBSTR(dm.content, 1, 200),
+            dm.created_at, em.last_activity, em.reply_count, em.reaction_count,
+            em.discussion_participants, em.engagement_score, em.trending_score
+        FROM engagement_metrics em
+        JOIN discord_messages dm ON em.message_id = dm.id
+        JOIN discord_channels dc ON dm.channel_id = dc.id
+        JOIN discord_users du ON dm.author_id = du.id
+    """)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('engagement_metrics', schema=None) as batch_op:
+        batch_op.drop_index('ix_engagement_metrics_activity_trending')
+
+    with op.batch_alter_table('engagement_leaderboard', schema=None) as batch_op:
+        batch_op.drop_index('ix_engagement_leaderboard_created_score')
+        batch_op.drop_index('ix_engagement_leaderboard_channel_id')
+        batch_op.drop_index('ix_engagement_leaderboard_activity_trending')
+
+    op.drop_table('engagement_leaderboard')
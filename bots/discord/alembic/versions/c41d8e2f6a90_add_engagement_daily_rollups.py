@@ -0,0 +1,38 @@
+"""Add engagement daily rollups
+
+Rollups are populated as messages are scored; run
+scripts/calculate_engagement.py once to backfill history.
+
+Revision ID: c41d8e2f6a90
+Revises: 7b2e4c9a1d35
+Create Date: 2026-10-17 15:02:57.316480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8e2f6a90'
+down_revision = '7b2e4c9a1d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('engagement_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('scored_count', sa.Integer(), nullable=False),
+    sa.Column('high_engagement_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_histogram', sa.JSON(), nullable=False),
+    sa.Column('keyword_counts', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('engagement_daily_rollups')
@@ -0,0 +1,39 @@
+"""Add research cache
+
+Revision ID: e6b3f8a2c417
+Revises: 5d8a1f3c7e24
+Create Date: 2026-10-17 18:05:42.119374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b3f8a2c417'
+down_revision = '5d8a1f3c7e24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('research_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    with op.batch_alter_table('research_cache', schema=None) as batch_op:
+        batch_op.create_index('ix_research_cache_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('research_cache', schema=None) as batch_op:
+        batch_op.drop_index('ix_research_cache_expires_at')
+
+    op.drop_table('research_cache')
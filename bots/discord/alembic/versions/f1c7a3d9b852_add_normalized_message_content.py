@@ -0,0 +1,30 @@
+"""Add normalized message content
+
+Existing messages are normalized on demand until they are next synced.
+
+Revision ID: f1c7a3d9b852
+Revises: e6b3f8a2c417
+Create Date: 2026-10-17 18:20:41.508213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7a3d9b852'
+down_revision = 'e6b3f8a2c417'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('discord_messages', sa.Column('normalized_content', sa.Text(), nullable=True))
+    op.add_column('discord_messages', sa.Column('content_urls', sa.JSON(), nullable=True))
+    op.add_column('discord_messages', sa.Column('code_languages', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('discord_messages', 'code_languages')
+    op.drop_column('discord_messages', 'content_urls')
+    op.drop_column('discord_messages', 'normalized_content')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for live message de-duplication.
+
+Compares the previous approach (rebuilding a dict of message timestamps on
+every message) with ``ExpiringSet``.
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+
+from discord_bot.utils.caching import ExpiringSet
+
+
+def dict_rebuild_dedupe() -> Callable[[str], bool]:
+    """The pre-ExpiringSet implementation of ``_should_rate_limit``."""
+    cache: Dict[str, datetime] = {}
+
+    def should_skip(message_id: str) -> bool:
+        nonlocal cache
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(minutes=5)
+        cache = {k: v for k, v in cache.items() if v > cutoff}
+        if message_id in cache:
+            return True
+        cache[message_id] = now
+        return False
+
+    return should_skip
+
+
+def expiring_set_dedupe() -> Callable[[str], bool]:
+    seen = ExpiringSet(ttl=300, max_size=50000)
+    return lambda message_id: not seen.add(message_id)
+
+
+def run(name: str, should_skip: Callable[[str], bool], messages: int) -> None:
+    started = time.perf_counter()
+    for i in range(messages):
+        should_skip(str(i))
+        # Every tenth message is a duplicate delivery
+        if i % 10 == 0:
+            should_skip(str(i))
+    elapsed = time.perf_counter() - started
+    print(f"{name:<16} {messages:>8} messages  {elapsed:8.3f}s  {elapsed / messages * 1e6:8.2f} us/message")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000, help="Messages to process per run")
+    args = parser.parse_args()
+
+    run("dict rebuild", dict_rebuild_dedupe(), args.messages)
+    run("ExpiringSet", expiring_set_dedupe(), args.messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark technical keyword extraction over a synthetic Discord corpus.
+
+Compares the previous per-term substring scan with the precompiled
+``KeywordMatcher`` used by ``EngagementAnalyzer``. The substring scan costs
+O(terms x length) per message, so ``--extra-terms`` pads the vocabulary to
+show how each approach scales with a larger configured vocabulary.
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from discord_bot.services.engagement_service import TECHNICAL_KEYWORDS
+from discord_bot.utils.text_processing import KeywordMatcher
+
+FILLER = (
+    "hey", "folks", "anyone", "tried", "this", "yesterday", "works", "great", "but",
+    "storage", "paragraph", "thanks", "the", "with", "for", "issue", "link", "docs",
+    "question", "about", "setup", "latest", "release", "meeting", "slides", "lol",
+)
+
+
+def synthetic_corpus(messages: int, seed: int = 42) -> List[str]:
+    """Build chat-like messages mixing filler words with technical terms."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(messages):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(5, 60))]
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(TECHNICAL_KEYWORDS))
+        corpus.append(" ".join(words).capitalize() + "?")
+    return corpus
+
+
+def substring_scan(vocabulary: List[str]) -> Callable[[str], List[str]]:
+    """The pre-KeywordMatcher implementation of ``_extract_keywords``."""
+    def extract(content: str) -> List[str]:
+        content_lower = content.lower()
+        return [term for term in list(vocabulary) if term.lower() in content_lower][:10]
+
+    return extract
+
+
+def run(name: str, extract: Callable[[str], List], corpus: List[str]) -> None:
+    started = time.perf_counter()
+    hits = sum(len(extract(content)) for content in corpus)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<16} {len(corpus):>8} messages  {elapsed:8.3f}s  "
+        f"{len(corpus) / elapsed:>10,.0f} messages/s  {hits:>8} hits"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000, help="Synthetic messages to scan")
+    parser.add_argument("--extra-terms", type=int, default=0, help="Synthetic terms added to the vocabulary")
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.messages)
+    vocabulary = list(TECHNICAL_KEYWORDS) + [f"term{i}" for i in range(args.extra_terms)]
+    matcher = KeywordMatcher(vocabulary)
+
+    print(f"Vocabulary: {len(vocabulary)} terms")
+    run("substring scan", substring_scan(vocabulary), corpus)
+    run("KeywordMatcher", lambda content: matcher.find(content, limit=10), corpus)
+
+
+if __name__ == "__main__":
+    main()
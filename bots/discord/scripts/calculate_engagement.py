@@ -47,39 +47,18 @@ async def calculate_all_engagement():
             bot_task.cancel()
             return
 
-        # Get all messages that need engagement updates
+        # Recompute engagement for every stored message with the bulk engine
         from discord_bot.models.discord_models import DiscordMessage, EngagementMetrics
-        from sqlalchemy import select
+        from sqlalchemy import select, func
 
         async with db_service.get_session() as session:
-            result = await session.execute(
-                select(DiscordMessage)
-                .order_by(DiscordMessage.created_at.desc())
-            )
-            messages = result.scalars().all()
+            total = (await session.execute(select(func.count(DiscordMessage.id)))).scalar() or 0
 
-        total = len(messages)
         logger.info(f"Found {total} messages to process")
         print(f"\nProcessing {total} messages...")
 
-        updated = 0
-        errors = 0
-
-        for i, message in enumerate(messages, 1):
-            try:
-                # Update engagement metrics for this message
-                score = await engagement_service.update_message_engagement(message.message_id)
-
-                if score is not None:
-                    updated += 1
-
-                if i % 50 == 0:
-                    print(f"Processed {i}/{total} messages ({updated} updated, {errors} errors)")
-                    logger.info(f"Progress: {i}/{total} messages processed")
-
-            except Exception as e:
-                errors += 1
-                logger.error(f"Error processing message {message.message_id}: {e}")
+        updated = await engagement_service.bulk_update_engagement(days=None)
+        errors = total - updated
 
         print(f"\n✅ Engagement calculation completed!")
         print(f"   Total messages: {total}")
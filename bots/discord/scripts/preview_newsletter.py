@@ -3,26 +3,37 @@
 
 Usage:
     python scripts/preview_newsletter.py [newsletter_file.md]
+    python scripts/preview_newsletter.py --follow [--id NEWSLETTER_ID]
 
-If no file specified, opens the most recent newsletter.
+If no file specified, opens the most recent newsletter. With --follow, tails a
+generation from the database, refreshing the preview as sections are saved.
 """
 
 import sys
+import uuid
+import asyncio
 import argparse
 from pathlib import Path
 import webbrowser
 import tempfile
 import markdown
 from datetime import datetime
+from typing import Optional
 
+# Building a Markdown instance loads every extension; reuse one and reset it
+_converter = markdown.Markdown(extensions=['extra', 'codehilite', 'toc'])
 
-def markdown_to_html(markdown_content: str, title: str = "AIMUG Newsletter") -> str:
-    """Convert markdown to styled HTML."""
+
+def markdown_to_html(
+    markdown_content: str,
+    title: str = "AIMUG Newsletter",
+    refresh_seconds: Optional[int] = None
+) -> str:
+    """Convert markdown to styled HTML, optionally auto-refreshing."""
     # Convert markdown to HTML
-    html_body = markdown.markdown(
-        markdown_content,
-        extensions=['extra', 'codehilite', 'toc']
-    )
+    html_body = _converter.reset().convert(markdown_content)
+
+    refresh_tag = f'<meta http-equiv="refresh" content="{refresh_seconds}">' if refresh_seconds else ""
 
     # Create full HTML with styling
     html = f"""<!DOCTYPE html>
@@ -30,6 +41,7 @@ def markdown_to_html(markdown_content: str, title: str = "AIMUG Newsletter") ->
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    {refresh_tag}
     <title>{title}</title>
     <style>
         body {{
@@ -172,6 +184,97 @@ def preview_newsletter(newsletter_path: Path):
     print(f"💾 HTML preview: {temp_html}")
 
 
+def sections_to_markdown(title: str, subtitle: Optional[str], sections) -> str:
+    """Assemble a partial newsletter from its saved sections."""
+    parts = [f"# {title}"]
+    if subtitle:
+        parts.append(f"*{subtitle}*")
+    for section in sections:
+        parts.append(f"## {section.title}\n\n{section.content_markdown or ''}")
+    if not sections:
+        parts.append("*Waiting for the first sections...*")
+    return "\n\n".join(parts)
+
+
+async def follow_generation(newsletter_id: Optional[str], interval: int):
+    """Tail a newsletter generation, re-rendering the preview as sections land."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from sqlalchemy import select
+    from discord_bot.services.database import db_service
+    from discord_bot.models.newsletter_models import (
+        Newsletter, NewsletterStatus, NewsletterSection, NewsletterGenerationLog
+    )
+
+    await db_service.initialize()
+    try:
+        async with db_service.get_session() as session:
+            query = select(Newsletter)
+            if newsletter_id:
+                query = query.where(Newsletter.id == uuid.UUID(newsletter_id))
+            else:
+                query = query.order_by(Newsletter.created_at.desc()).limit(1)
+            newsletter = (await session.execute(query)).scalar_one_or_none()
+
+        if not newsletter:
+            raise FileNotFoundError("No newsletter found in database")
+
+        print(f"📰 Following newsletter: {newsletter.title} ({newsletter.id})")
+        preview_path = Path(tempfile.gettempdir()) / f"newsletter_preview_{newsletter.id}.html"
+        seen_logs = set()
+        last_markdown = None
+
+        while True:
+            async with db_service.get_session() as session:
+                newsletter = (await session.execute(
+                    select(Newsletter).where(Newsletter.id == newsletter.id)
+                )).scalar_one()
+                sections = (await session.execute(
+                    select(NewsletterSection)
+                    .where(NewsletterSection.newsletter_id == newsletter.id)
+                    .order_by(NewsletterSection.order_index)
+                )).scalars().all()
+                logs = (await session.execute(
+                    select(NewsletterGenerationLog)
+                    .where(NewsletterGenerationLog.newsletter_id == newsletter.id)
+                    .order_by(NewsletterGenerationLog.started_at)
+                )).scalars().all()
+
+            for log in logs:
+                if log.id in seen_logs:
+                    continue
+                seen_logs.add(log.id)
+                duration = f" in {log.duration:.1f}s" if log.duration is not None else ""
+                print(f"  ⏱️  {log.step_name} {log.status}{duration}")
+
+            finished = newsletter.status not in (NewsletterStatus.PENDING, NewsletterStatus.GENERATING)
+            if finished and newsletter.content_markdown:
+                markdown_content = newsletter.content_markdown
+            else:
+                markdown_content = sections_to_markdown(newsletter.title, newsletter.subtitle, sections)
+
+            if markdown_content != last_markdown:
+                html = markdown_to_html(
+                    markdown_content, newsletter.title, refresh_seconds=None if finished else interval
+                )
+                preview_path.write_text(html, encoding="utf-8")
+                if last_markdown is None:
+                    print(f"🌐 Opening in browser: {preview_path}")
+                    webbrowser.open(f"file://{preview_path}")
+                else:
+                    print(f"🔄 Preview updated ({len(sections)} sections)")
+                last_markdown = markdown_content
+
+            if finished:
+                print(f"✅ Generation finished with status: {newsletter.status.value}")
+                if newsletter.error_message:
+                    print(f"⚠️  {newsletter.error_message}")
+                return
+
+            await asyncio.sleep(interval)
+    finally:
+        await db_service.close()
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -181,6 +284,7 @@ def main():
 Examples:
   %(prog)s                                          # Preview latest newsletter
   %(prog)s output/newsletter_monthly_202509.md     # Preview specific newsletter
+  %(prog)s --follow                                 # Tail the latest generation
         """
     )
 
@@ -190,8 +294,35 @@ Examples:
         help="Path to newsletter markdown file (default: latest)"
     )
 
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Tail a generation from the database, refreshing as sections are saved"
+    )
+    parser.add_argument(
+        "--id",
+        dest="newsletter_id",
+        help="Newsletter ID to follow (default: most recent)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=3,
+        help="Seconds between polls when following (default: 3)"
+    )
+
     args = parser.parse_args()
 
+    if args.follow:
+        try:
+            asyncio.run(follow_generation(args.newsletter_id, args.interval))
+        except KeyboardInterrupt:
+            print("👋 Stopped following")
+        except Exception as e:
+            print(f"❌ Failed to follow newsletter: {e}")
+            sys.exit(1)
+        return
+
     # Determine newsletter path
     if args.newsletter:
         newsletter_path = Path(args.newsletter)
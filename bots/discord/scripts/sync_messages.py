@@ -2,11 +2,13 @@
 """
 Script to sync historical messages from Discord.
 Runs the bot, syncs messages from the past 2 weeks, then exits.
+
+Reruns resume from each channel's last synced message; pass --restart
+to re-walk the whole window.
 """
 
 import asyncio
 import sys
-from datetime import datetime, timezone, timedelta
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import setup_logging, get_logger
@@ -18,8 +20,13 @@ setup_logging()
 logger = get_logger(__name__)
 
 
-async def sync_historical_messages(days: int = 14):
-    """Sync historical messages and exit."""
+async def sync_historical_messages(days: int = 14, resume: bool = True):
+    """Sync historical messages and exit.
+
+    Args:
+        days: Days of history to cover for channels without a sync cursor.
+        resume: Continue from each channel's persisted cursor.
+    """
     logger.info(f"Starting historical message sync for last {days} days")
 
     try:
@@ -55,49 +62,15 @@ async def sync_historical_messages(days: int = 14):
             bot_task.cancel()
             raise RuntimeError("Bot failed to connect within 60 seconds")
 
-        # Guild sync already happens in on_ready, so we can proceed directly to message sync
-
-        # Sync messages from the past N days
-        hours = days * 24
-        cutoff_time = datetime.now(timezone.utc) - timedelta(days=days)
-
-        logger.info(f"Syncing messages since {cutoff_time}")
-
-        message_count = 0
-        channel_count = 0
-
-        for guild in discord_service.bot.guilds:
-            logger.info(f"Processing guild: {guild.name}")
+        # Guild sync and a resumable sync already run in on_ready; this pass
+        # picks up from each channel's cursor, so it only fetches what's new
+        logger.info(f"Syncing messages from the last {days} days")
 
-            for channel in guild.text_channels:
-                # Skip if not monitored
-                if not discord_service._monitor_all_channels and str(channel.id) not in discord_service._monitored_channels:
-                    continue
-
-                try:
-                    channel_messages = 0
-                    logger.info(f"  Syncing #{channel.name}...")
-
-                    async for message in channel.history(after=cutoff_time, limit=None):
-                        await discord_service.process_message(message, is_historical=True)
-                        message_count += 1
-                        channel_messages += 1
-
-                        # Rate limiting
-                        if message_count % 100 == 0:
-                            logger.info(f"    Processed {message_count} total messages so far...")
-                            await asyncio.sleep(1)
-
-                    if channel_messages > 0:
-                        logger.info(f"    ✅ Synced {channel_messages} messages from #{channel.name}")
-                        channel_count += 1
-
-                except Exception as e:
-                    logger.error(f"    ❌ Error syncing #{channel.name}: {e}")
+        stats = await discord_service.sync_recent_messages(hours=days * 24, resume=resume)
 
         logger.info(f"\n📊 Sync Summary:")
-        logger.info(f"   Channels processed: {channel_count}")
-        logger.info(f"   Total messages synced: {message_count}")
+        logger.info(f"   Channels processed: {stats['channels']}")
+        logger.info(f"   Total messages synced: {stats['messages']}")
         logger.info(f"   Time period: Last {days} days")
 
     except Exception as e:
@@ -133,16 +106,19 @@ async def main():
         logger.error("DATABASE_URL not set in environment")
         sys.exit(1)
 
-    # Default to 14 days (2 weeks)
+    # Default to 14 days (2 weeks); --restart ignores saved channel cursors
+    args = [arg for arg in sys.argv[1:] if arg != "--restart"]
+    resume = "--restart" not in sys.argv[1:]
+
     days = 14
-    if len(sys.argv) > 1:
+    if args:
         try:
-            days = int(sys.argv[1])
+            days = int(args[0])
         except ValueError:
-            logger.error(f"Invalid days argument: {sys.argv[1]}")
+            logger.error(f"Invalid days argument: {args[0]}")
             sys.exit(1)
 
-    await sync_historical_messages(days=days)
+    await sync_historical_messages(days=days, resume=resume)
 
 
 if __name__ == "__main__":
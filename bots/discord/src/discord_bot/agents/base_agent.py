@@ -1,7 +1,7 @@
 """Base agent class for all newsletter generation agents."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
 from datetime import datetime
 
 from langchain.schema import BaseMessage, HumanMessage, SystemMessage
@@ -11,9 +11,16 @@ from langsmith import traceable
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
 from discord_bot.agents.state import NewsletterState, AgentResponse
+from discord_bot.services.llm_cache import get_llm_cache, llm_cache_key
+from discord_bot.services.model_router import ModelProvider, model_router
+from discord_bot.utils.concurrency import bounded_gather
+from discord_bot.utils.instrumentation import LLMUsage, record_llm_call, track_llm_usage
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class BaseNewsletterAgent(ABC):
     """Base class for all newsletter generation agents."""
@@ -24,13 +31,15 @@ class BaseNewsletterAgent(ABC):
         role: str,
         model: Optional[BaseChatModel] = None,
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        cache_responses: bool = True
     ):
         self.name = name
         self.role = role
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.cache_responses = cache_responses
         self._system_prompt = self._create_system_prompt()
         
     @abstractmethod
@@ -46,6 +55,10 @@ class BaseNewsletterAgent(ABC):
     @traceable(name="agent_invoke")
     async def invoke(self, state: NewsletterState) -> AgentResponse:
         """Invoke the agent with error handling and tracing."""
+        with track_llm_usage() as usage:
+            return await self._invoke(state, usage)
+    
+    async def _invoke(self, state: NewsletterState, usage: LLMUsage) -> AgentResponse:
         start_time = datetime.now()
         
         try:
@@ -59,11 +72,14 @@ class BaseNewsletterAgent(ABC):
             # Add metadata
             response.metadata["processing_time"] = (datetime.now() - start_time).total_seconds()
             response.metadata["model_used"] = self.model.__class__.__name__ if self.model else "None"
+            response.metadata["llm_usage"] = usage.as_dict()
             
             logger.info(f"Agent {self.name} completed processing", extra={
                 "agent": self.name,
                 "confidence": response.confidence,
-                "processing_time": response.metadata["processing_time"]
+                "processing_time": response.metadata["processing_time"],
+                "llm_calls": usage.calls,
+                "cache_hits": usage.cache_hits
             })
             
             return response
@@ -81,7 +97,11 @@ class BaseNewsletterAgent(ABC):
                 output=None,
                 confidence=0.0,
                 reasoning=f"Agent failed with error: {str(e)}",
-                metadata={"error": str(e), "error_type": type(e).__name__}
+                metadata={
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "llm_usage": usage.as_dict()
+                }
             )
     
     def _create_messages(self, user_prompt: str, context: Dict[str, Any] = None) -> List[BaseMessage]:
@@ -96,24 +116,125 @@ class BaseNewsletterAgent(ABC):
         
         return messages
     
+    @property
+    def model_key(self) -> str:
+        """``provider/model`` key shared by agents on the same model.
+        
+        Concurrency limits fall back from the model to its provider, so the
+        provider prefix is what lets overrides like ``openai=8`` apply. Names
+        that are already qualified (router ids) are used as they are.
+        """
+        if not self.model:
+            return "none"
+        name = next(
+            (
+                value for value in (
+                    getattr(self.model, attribute, None) for attribute in ("model_name", "model")
+                )
+                if isinstance(value, str) and value
+            ),
+            self.model.__class__.__name__
+        )
+        if "/" in name:
+            return name
+        provider = self._model_provider()
+        return f"{provider}/{name}" if provider else name
+    
+    def _model_provider(self) -> Optional[str]:
+        """Provider of this agent's chat model, from its LangChain type or package."""
+        llm_type = getattr(self.model, "_llm_type", None)
+        hints = [llm_type if isinstance(llm_type, str) else "", type(self.model).__module__]
+        for provider in ModelProvider:
+            if any(provider.value in hint.lower() for hint in hints):
+                return provider.value
+        return None
+    
+    async def _fan_out(
+        self,
+        items: Iterable[T],
+        fn: Callable[[T], Awaitable[R]],
+        fallback: Optional[Callable[[T], R]] = None
+    ) -> List[R]:
+        """Run ``fn`` over ``items`` concurrently within this model's limit, keeping order."""
+        return await bounded_gather(items, fn, key=self.model_key, fallback=fallback)
+    
+    @property
+    def uses_response_cache(self) -> bool:
+        """Whether this agent reads and writes the shared LLM response cache."""
+        return self.cache_responses and self.name not in settings.llm_cache_excluded_agents
+    
     async def _call_llm(self, messages: List[BaseMessage]) -> str:
-        """Call the LLM with the given messages."""
+        """Call the LLM with the given messages, serving repeats from the response cache."""
         if not self.model:
             raise ValueError(f"No model configured for agent {self.name}")
         
+        cache = get_llm_cache() if self.uses_response_cache else None
+        key = None
+        if cache is not None:
+            key = llm_cache_key(self.model_key, messages, self.temperature, self.max_tokens)
+            entry = await cache.get(key)
+            if entry is not None:
+                self._record_llm_usage(entry.get("usage", {}), cached=True)
+                return entry["content"]
+        
         try:
             response = await self.model.ainvoke(
                 messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens
             )
-            return response.content
         except Exception as e:
             logger.error(f"LLM call failed for agent {self.name}", extra={
                 "error": str(e),
                 "agent": self.name
             })
             raise
+        
+        usage = self._response_usage(response)
+        self._record_llm_usage(usage, cached=False)
+        if cache is not None and isinstance(response.content, str):
+            await cache.set(key, {"content": response.content, "usage": usage})
+        return response.content
+    
+    @staticmethod
+    def _response_usage(response: Any) -> Dict[str, int]:
+        """Extract token counts from a LangChain chat response, if reported."""
+        usage = getattr(response, "usage_metadata", None)
+        if not isinstance(usage, dict):
+            return {"input_tokens": 0, "output_tokens": 0}
+        return {
+            "input_tokens": int(usage.get("input_tokens", 0) or 0),
+            "output_tokens": int(usage.get("output_tokens", 0) or 0)
+        }
+    
+    def _record_llm_usage(self, usage: Dict[str, int], cached: bool) -> None:
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        record_llm_call(
+            input_tokens,
+            output_tokens,
+            self._estimate_cost(input_tokens, output_tokens),
+            cached=cached,
+            model=self.model_key
+        )
+    
+    def _estimate_cost(self, input_tokens: int, output_tokens: int) -> float:
+        """Price tokens using the model router's catalogue for this agent's model."""
+        if not input_tokens and not output_tokens:
+            return 0.0
+        models = model_router.get_available_models()
+        key = self.model_key
+        name = key.split("/", 1)[-1]
+        model_info = models.get(key) or models.get(name) or next(
+            (info for model_id, info in models.items() if model_id.endswith(f"/{name}")),
+            None
+        )
+        if not model_info:
+            return 0.0
+        return (
+            input_tokens * model_info.input_cost_per_token +
+            output_tokens * model_info.output_cost_per_token
+        )
     
     def _extract_json_from_response(self, response: str) -> Dict[str, Any]:
         """Extract JSON from LLM response."""
@@ -6,6 +6,7 @@ from collections import defaultdict
 from discord_bot.agents.base_agent import BaseNewsletterAgent
 from discord_bot.agents.state import NewsletterState, AgentResponse, DiscussionData
 from discord_bot.core.logging import get_logger
+from discord_bot.utils.text_processing import discussion_text
 
 logger = get_logger(__name__)
 
@@ -56,14 +57,12 @@ Maintain a professional but approachable tone that reflects the collaborative sp
         categorized_discussions = self._categorize_discussions(discussions)
         
         # Analyze each category
-        content_analysis = {}
-        for category, category_discussions in categorized_discussions.items():
-            analysis = await self._analyze_category(
-                category, 
-                category_discussions,
-                research_results
-            )
-            content_analysis[category] = analysis
+        analyses = await self._fan_out(
+            list(categorized_discussions.items()),
+            lambda item: self._analyze_category(item[0], item[1], research_results),
+            fallback=lambda item: self._create_fallback_analysis(item[0], item[1])
+        )
+        content_analysis = dict(zip(categorized_discussions, analyses))
         
         # Create content outline
         content_outline = await self._create_content_outline(
@@ -129,10 +128,11 @@ Maintain a professional but approachable tone that reflects the collaborative sp
         discussion_texts = []
         for d in discussions[:5]:  # Limit to top 5 discussions
             text = f"""
-            Content: {d.get('content', '')}
+            Content: {discussion_text(d)}
             Engagement Score: {d.get('engagement_score', 0)}
             Replies: {d.get('reply_count', 0)}
             Keywords: {', '.join(d.get('keywords', []))}
+            Code: {', '.join(d.get('code_languages', [])) or 'none'}
             """
             discussion_texts.append(text)
         
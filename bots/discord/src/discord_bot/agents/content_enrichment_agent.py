@@ -1,13 +1,13 @@
 """Content enrichment agent for adding news, events, memes, and community content."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime, timedelta
-import re
 
 from discord_bot.agents.base_agent import BaseNewsletterAgent
 from discord_bot.agents.state import NewsletterState, AgentResponse
 from discord_bot.core.logging import get_logger
 from discord_bot.core.config import settings
+from discord_bot.utils.text_processing import discussion_text, parse_discord_content
 
 logger = get_logger(__name__)
 
@@ -95,9 +95,9 @@ Guidelines:
         news_discussions.sort(key=lambda x: x.get("engagement_score", 0), reverse=True)
         top_news = news_discussions[0]
 
-        # Extract URL from content if present
+        # Extract URL from content if present; ingest stores them for new messages
         content = top_news.get("content", "")
-        urls = re.findall(r'https?://[^\s]+', content)
+        urls = top_news.get("urls") or parse_discord_content(content, top_news.get("message_id")).urls
         news_url = urls[0] if urls else None
 
         # Generate Discord link
@@ -111,7 +111,7 @@ Guidelines:
         summary = await self._summarize_news_article(top_news)
 
         return {
-            "title": self._extract_title(content),
+            "title": self._extract_title(content, urls),
             "summary": summary,
             "url": news_url,
             "discord_link": discord_link,
@@ -126,10 +126,10 @@ Guidelines:
         """Generate a brief summary of the news article."""
         if not self.model:
             # Fallback: use first 150 characters
-            content = news_discussion.get("content", "")
+            content = discussion_text(news_discussion)
             return content[:150] + "..." if len(content) > 150 else content
 
-        content = news_discussion.get("content", "")
+        content = discussion_text(news_discussion)
         prompt = f"""Summarize this news article in 1-2 sentences (max 50 words):
 
 {content[:500]}
@@ -144,14 +144,16 @@ Focus on the key point and why it matters to the AI/ML community."""
             logger.warning(f"Failed to generate news summary: {e}")
             return content[:150] + "..." if len(content) > 150 else content
 
-    def _extract_title(self, content: str) -> str:
-        """Extract title from content."""
+    def _extract_title(self, content: str, urls: Sequence[str] = ()) -> str:
+        """Extract title from content, dropping the message's ``urls``."""
         # Try to find first line or sentence
         lines = content.split('\n')
         first_line = lines[0].strip() if lines else content[:100]
 
         # Remove URLs
-        first_line = re.sub(r'https?://[^\s]+', '', first_line).strip()
+        for url in urls:
+            first_line = first_line.replace(url, '')
+        first_line = first_line.strip()
 
         # Truncate if too long
         if len(first_line) > 100:
@@ -220,7 +222,7 @@ Focus on the key point and why it matters to the AI/ML community."""
         return {
             "image_url": image_url,
             "discord_link": discord_link,
-            "caption": top_meme.get("content", "")[:200],
+            "caption": discussion_text(top_meme)[:200],
             "engagement": {
                 "score": top_meme.get("engagement_score", 0),
                 "reactions": top_meme.get("reaction_count", 0)
@@ -256,7 +258,7 @@ Focus on the key point and why it matters to the AI/ML community."""
                 tshirt_ideas.append({
                     "image_url": attachment_urls[0],
                     "discord_link": discord_link,
-                    "description": discussion.get("content", "")[:100],
+                    "description": discussion_text(discussion)[:100],
                     "channel": channel
                 })
 
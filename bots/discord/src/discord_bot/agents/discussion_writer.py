@@ -1,5 +1,6 @@
 """Discussion writer agent for creating detailed discussion summaries."""
 
+import asyncio
 from typing import Dict, Any, List
 from collections import defaultdict
 
@@ -7,6 +8,8 @@ from discord_bot.agents.base_agent import BaseNewsletterAgent
 from discord_bot.agents.state import NewsletterState, AgentResponse
 from discord_bot.core.logging import get_logger
 from discord_bot.core.config import settings
+from discord_bot.utils.offload import run_cpu
+from discord_bot.utils.text_processing import discussion_text
 
 logger = get_logger(__name__)
 
@@ -61,16 +64,17 @@ Format:
             )
 
         # Group discussions by topic/category
-        grouped_discussions = self._group_discussions_by_topic(discussions)
-
-        # Generate detailed summaries for each discussion
-        discussion_summaries = {}
-        for group_name, group_discussions in grouped_discussions.items():
-            summaries = await self._generate_discussion_summaries(
-                group_name,
-                group_discussions
-            )
-            discussion_summaries[group_name] = summaries
+        grouped_discussions = await run_cpu(
+            "discussion_writer.group_by_topic", self._group_discussions_by_topic, discussions
+        )
+
+        # Generate detailed summaries for each discussion; groups run
+        # concurrently and share the model's concurrency limit
+        group_summaries = await asyncio.gather(*(
+            self._generate_discussion_summaries(group_name, group_discussions)
+            for group_name, group_discussions in grouped_discussions.items()
+        ))
+        discussion_summaries = dict(zip(grouped_discussions, group_summaries))
 
         return AgentResponse(
             agent_name=self.name,
@@ -85,7 +89,8 @@ Format:
             next_steps=["editing", "formatting"]
         )
 
-    def _group_discussions_by_topic(self, discussions: List[Dict]) -> Dict[str, List[Dict]]:
+    @staticmethod
+    def _group_discussions_by_topic(discussions: List[Dict]) -> Dict[str, List[Dict]]:
         """Group discussions by topic/category and detect cross-channel topics."""
         # First, group by keywords to find cross-channel topics
         keyword_discussions = defaultdict(list)
@@ -161,17 +166,11 @@ Format:
         if not self.model:
             return self._create_fallback_summaries(discussions)
 
-        summaries = []
-
-        for disc in discussions:
-            try:
-                summary = await self._generate_single_discussion_summary(disc, group_name)
-                summaries.append(summary)
-            except Exception as e:
-                logger.warning(f"Failed to generate summary for discussion {disc.get('message_id')}: {e}")
-                summaries.append(self._create_fallback_summary(disc))
-
-        return summaries
+        return await self._fan_out(
+            discussions,
+            lambda disc: self._generate_single_discussion_summary(disc, group_name),
+            fallback=self._create_fallback_summary
+        )
 
     async def _generate_single_discussion_summary(
         self,
@@ -179,7 +178,7 @@ Format:
         group_name: str
     ) -> Dict[str, str]:
         """Generate a detailed summary for a single discussion."""
-        content = discussion.get("content", "")
+        content = discussion_text(discussion)
         keywords = discussion.get("keywords", [])
         channel = discussion.get("channel", "unknown")
         author = discussion.get("author", "Unknown")
@@ -201,6 +200,7 @@ Discussion Content:
 {content[:1000]}
 
 Keywords: {', '.join(keywords)}
+Code: {', '.join(discussion.get("code_languages", [])) or "none"}
 Channel: #{channel}
 Author: @{author}
 Engagement: {engagement:.1f} score, {replies} replies, {reactions} reactions
@@ -253,7 +253,7 @@ Return ONLY the formatted summary, nothing else.
         keywords = discussion.get("keywords", [])
         channel = discussion.get("channel", "unknown")
         author = discussion.get("author", "Unknown")
-        content = discussion.get("content", "")[:150]
+        content = discussion_text(discussion)[:150]
         message_id = discussion.get("message_id", "")
         engagement = discussion.get("engagement_score", 0)
         replies = discussion.get("reply_count", 0)
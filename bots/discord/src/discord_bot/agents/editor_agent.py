@@ -6,6 +6,7 @@ import re
 from discord_bot.agents.base_agent import BaseNewsletterAgent
 from discord_bot.agents.state import NewsletterState, AgentResponse, WriterFeedback
 from discord_bot.core.logging import get_logger
+from discord_bot.utils.offload import run_cpu
 
 logger = get_logger(__name__)
 
@@ -60,14 +61,13 @@ Quality criteria:
             )
         
         # Review each section
-        edited_sections = []
-        feedback_items = []
-        
-        for section in draft_sections:
-            edited_section, feedback = await self._edit_section(section)
-            edited_sections.append(edited_section)
-            if feedback:
-                feedback_items.append(feedback)
+        edits = await self._fan_out(
+            draft_sections,
+            self._edit_section,
+            fallback=self._basic_edit_section
+        )
+        edited_sections = [edited_section for edited_section, _ in edits]
+        feedback_items = [feedback for _, feedback in edits if feedback]
         
         # Perform quality checks
         quality_metrics = self._perform_quality_checks(edited_sections)
@@ -99,12 +99,31 @@ Quality criteria:
         
         if not self.model:
             # Basic editing without LLM
-            edited_content = self._basic_edit(original_content)
+            edited_content = await run_cpu("editor.basic_edit", self._basic_edit, original_content)
         else:
             edited_content = await self._llm_edit(section)
         
+        changes_made = await run_cpu(
+            "editor.edit_distance", self._calculate_edit_distance, original_content, edited_content
+        )
+        return self._apply_edit(section, edited_content, changes_made)
+    
+    def _basic_edit_section(self, section: Dict) -> tuple[Dict, Optional[WriterFeedback]]:
+        """Edit a section without the LLM (fallback when the LLM edit fails)."""
+        return self._apply_edit(section, self._basic_edit(section.get("content", "")))
+    
+    def _apply_edit(
+        self,
+        section: Dict,
+        edited_content: str,
+        changes_made: Optional[float] = None
+    ) -> tuple[Dict, Optional[WriterFeedback]]:
+        """Build the edited section and editor feedback for new content."""
+        original_content = section.get("content", "")
+        
         # Check if significant changes were made
-        changes_made = self._calculate_edit_distance(original_content, edited_content)
+        if changes_made is None:
+            changes_made = self._calculate_edit_distance(original_content, edited_content)
         
         feedback = None
         if changes_made > 0.1:  # More than 10% change
@@ -126,7 +145,8 @@ Quality criteria:
         
         return edited_section, feedback
     
-    def _basic_edit(self, content: str) -> str:
+    @staticmethod
+    def _basic_edit(content: str) -> str:
         """Perform basic editing without LLM."""
         # Remove extra whitespace
         content = re.sub(r'\s+', ' ', content).strip()
@@ -187,7 +207,8 @@ Quality criteria:
 
         return cleaned.strip()
     
-    def _calculate_edit_distance(self, original: str, edited: str) -> float:
+    @staticmethod
+    def _calculate_edit_distance(original: str, edited: str) -> float:
         """Calculate the percentage of content changed."""
         if not original:
             return 1.0
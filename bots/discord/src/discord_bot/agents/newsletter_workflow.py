@@ -1,10 +1,11 @@
 """LangGraph workflow for newsletter generation."""
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
 import asyncio
+import time
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langchain_core.runnables import RunnableConfig
 
 from discord_bot.agents.state import NewsletterState, DiscussionData
@@ -18,9 +19,15 @@ from discord_bot.agents.formatter_agent import FormatterAgent
 from discord_bot.core.logging import get_logger
 from discord_bot.core.config import settings
 from discord_bot.services.model_router import model_router, ModelCapability
+from discord_bot.services.workflow_checkpointer import SQLAlchemyCheckpointSaver
+from discord_bot.utils.instrumentation import track_llm_usage
 
 logger = get_logger(__name__)
 
+# Nodes that only depend on the input discussions (content analysis stands in
+# for research, whose results it consumes) and are joined before opinion writing
+REVISION_NODES = ("content_analysis", "discussion_writing", "content_enrichment")
+
 
 class NewsletterWorkflow:
     """LangGraph workflow for newsletter generation."""
@@ -28,6 +35,8 @@ class NewsletterWorkflow:
     def __init__(self):
         self.graph: Optional[StateGraph] = None
         self.compiled_graph = None
+        self.checkpointer = SQLAlchemyCheckpointSaver()
+        self.checkpointed_graph = None
         self.agents = {}
         self._initialize_agents()
         self._build_graph()
@@ -80,55 +89,110 @@ class NewsletterWorkflow:
         })
     
     def _build_graph(self):
-        """Build the LangGraph workflow."""
+        """Build the LangGraph workflow.
+        
+        Research, discussion writing and content enrichment only read the
+        input discussions, so they fan out from the start and join at
+        ``assemble_sections`` (research via content analysis, which needs
+        its results). Nodes return partial updates; the reducers on
+        ``NewsletterState`` merge the keys parallel branches share.
+        """
         workflow = StateGraph(NewsletterState)
 
         # Add nodes for each agent
-        workflow.add_node("research", self._research_node)
-        workflow.add_node("content_analysis", self._content_analysis_node)
-        workflow.add_node("discussion_writing", self._discussion_writing_node)  # NEW: Generate detailed summaries
-        workflow.add_node("opinion_writing", self._opinion_writing_node)
-        workflow.add_node("content_enrichment", self._content_enrichment_node)  # NEW: Add news, events, memes
-        workflow.add_node("editing", self._editing_node)
-        workflow.add_node("formatting", self._formatting_node)
-        workflow.add_node("quality_check", self._quality_check_node)
-
-        # Define the workflow edges
-        workflow.set_entry_point("research")
+        nodes = {
+            "research": self._research_node,
+            "content_analysis": self._content_analysis_node,
+            "discussion_writing": self._discussion_writing_node,  # NEW: Generate detailed summaries
+            "content_enrichment": self._content_enrichment_node,  # NEW: Add news, events, memes
+            "assemble_sections": self._assemble_sections_node,
+            "opinion_writing": self._opinion_writing_node,
+            "editing": self._editing_node,
+            "formatting": self._formatting_node,
+            "quality_check": self._quality_check_node,
+        }
+        for name, node in nodes.items():
+            workflow.add_node(name, self._instrumented(name, node))
 
+        # Define the workflow edges: independent branches fan out from the start
+        workflow.add_edge(START, "research")
+        workflow.add_edge(START, "discussion_writing")
+        workflow.add_edge(START, "content_enrichment")
         workflow.add_edge("research", "content_analysis")
-        workflow.add_edge("content_analysis", "discussion_writing")  # NEW: Write detailed summaries
-        workflow.add_edge("discussion_writing", "content_enrichment")  # NEW: Enrich with news, events, memes
-        workflow.add_edge("content_enrichment", "opinion_writing")
+
+        # ...and join once all of them have finished
+        workflow.add_edge(list(REVISION_NODES), "assemble_sections")
+        workflow.add_edge("assemble_sections", "opinion_writing")
         workflow.add_edge("opinion_writing", "editing")
         workflow.add_edge("editing", "formatting")
         workflow.add_edge("formatting", "quality_check")
         
-        # Conditional edge for quality check
+        # Conditional edge for quality check: revisions re-run every branch
+        # that feeds the join (research results are reused)
         workflow.add_conditional_edges(
             "quality_check",
-            self._should_iterate,
-            {
-                "iterate": "content_analysis",  # Go back to content analysis for iteration
-                "complete": END
-            }
+            self._next_after_quality_check,
+            [*REVISION_NODES, END]
         )
         
         self.graph = workflow
         self.compiled_graph = workflow.compile()
+        self.checkpointed_graph = workflow.compile(checkpointer=self.checkpointer)
         
         logger.info("Built newsletter generation workflow")
     
+    @property
+    def node_names(self) -> List[str]:
+        """Names of the workflow nodes, in graph order."""
+        return list(self.graph.nodes) if self.graph else []
+    
     async def generate_newsletter(
         self,
         discussions: List[DiscussionData],
         newsletter_type: str = "daily",
-        target_date: Optional[str] = None
+        target_date: Optional[str] = None,
+        resume: bool = True,
+        restart_from: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate a newsletter from discussions."""
+        """Generate a newsletter from discussions.
+        
+        With checkpointing enabled, runs are keyed by newsletter type and
+        date. An interrupted run for the same newsletter resumes from its
+        last completed node unless ``resume`` is False, and ``restart_from``
+        replays the most recent run from the named node onwards, reusing the
+        state produced by the nodes before it.
+        """
+        result: Dict[str, Any] = {}
+        async for event in self.stream_newsletter(
+            discussions, newsletter_type, target_date, resume, restart_from
+        ):
+            if event["type"] == "completed":
+                result = event["state"]
+        return result
+    
+    async def stream_newsletter(
+        self,
+        discussions: List[DiscussionData],
+        newsletter_type: str = "daily",
+        target_date: Optional[str] = None,
+        resume: bool = True,
+        restart_from: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Generate a newsletter, yielding progress as each node completes.
+        
+        Yields ``{"type": "node", "node": ..., "update": ...}`` with the
+        partial state update of every node run, in completion order, then a
+        final ``{"type": "completed", "state": ...}`` with the merged state.
+        Arguments are those of ``generate_newsletter``.
+        """
         if target_date is None:
             target_date = datetime.now().strftime("%Y-%m-%d")
         
+        if restart_from and restart_from not in self.node_names:
+            raise ValueError(
+                f"Unknown workflow node '{restart_from}', expected one of: {', '.join(self.node_names)}"
+            )
+        
         # Prepare initial state
         initial_state: NewsletterState = {
             "newsletter_type": newsletter_type,
@@ -141,6 +205,7 @@ class NewsletterWorkflow:
             "draft_sections": [],
             "discussion_summaries": {},
             "grouped_discussions": {},
+            "discussion_sections": [],
             "enriched_content": {},  # NEW: news, events, memes
             "technical_analysis": {},
             "writer_feedback": [],
@@ -151,6 +216,7 @@ class NewsletterWorkflow:
             "iteration_count": 0,
             "errors": [],
             "warnings": [],
+            "node_metrics": [],
             "selected_models": {},
             "model_costs": {}
         }
@@ -158,19 +224,41 @@ class NewsletterWorkflow:
         logger.info("Starting newsletter generation", extra={
             "newsletter_type": newsletter_type,
             "discussion_count": len(discussions),
-            "target_date": target_date
+            "target_date": target_date,
+            "resume": resume,
+            "restart_from": restart_from
         })
         
         try:
             # Run the workflow
             config = RunnableConfig(
                 configurable={
-                    "thread_id": f"newsletter_{newsletter_type}_{target_date}",
-                    "checkpoint_ns": "newsletter_generation"
+                    "thread_id": f"newsletter_{newsletter_type}_{target_date}"
                 }
             )
             
-            result = await self.compiled_graph.ainvoke(initial_state, config)
+            if settings.newsletter_checkpointing:
+                graph = self.checkpointed_graph
+                graph_input, config = await self._resolve_run_start(
+                    graph, config, initial_state, resume, restart_from
+                )
+            elif restart_from:
+                raise ValueError("Restarting from a node requires newsletter checkpointing")
+            else:
+                graph = self.compiled_graph
+                graph_input = initial_state
+            
+            result: Dict[str, Any] = {}
+            async for mode, chunk in graph.astream(
+                graph_input, config, stream_mode=["updates", "values"]
+            ):
+                if mode == "values":
+                    # Only the latest merged state is kept
+                    result = chunk
+                    continue
+                for node, update in chunk.items():
+                    if node in self.node_names:
+                        yield {"type": "node", "node": node, "update": update or {}}
             
             logger.info("Newsletter generation completed", extra={
                 "final_step": result.get("current_step"),
@@ -178,7 +266,7 @@ class NewsletterWorkflow:
                 "total_word_count": result.get("quality_metrics", {}).get("total_word_count", 0)
             })
             
-            return result
+            yield {"type": "completed", "state": result}
             
         except Exception as e:
             logger.error("Newsletter generation failed", extra={
@@ -187,83 +275,136 @@ class NewsletterWorkflow:
             })
             raise
     
-    async def _research_node(self, state: NewsletterState) -> NewsletterState:
+    async def _resolve_run_start(
+        self,
+        graph,
+        config: RunnableConfig,
+        initial_state: NewsletterState,
+        resume: bool,
+        restart_from: Optional[str]
+    ) -> Tuple[Optional[NewsletterState], RunnableConfig]:
+        """Pick the graph input and checkpoint a run should start from.
+        
+        Returning ``None`` as input makes LangGraph continue from the
+        checkpoint in ``config`` instead of starting a fresh run.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        
+        if restart_from:
+            async for snapshot in graph.aget_state_history(config):
+                if restart_from in snapshot.next:
+                    logger.info("Restarting newsletter workflow from node", extra={
+                        "thread_id": thread_id,
+                        "node": restart_from,
+                        "checkpoint_id": snapshot.config["configurable"]["checkpoint_id"]
+                    })
+                    return None, snapshot.config
+            raise ValueError(f"No checkpoint for thread {thread_id} reaches node '{restart_from}'")
+        
+        if resume:
+            snapshot = await graph.aget_state(config)
+            if snapshot.next:
+                logger.info("Resuming interrupted newsletter workflow", extra={
+                    "thread_id": thread_id,
+                    "next_nodes": list(snapshot.next)
+                })
+                return None, config
+        
+        # Start over: drop the previous run so its pending tasks cannot leak
+        # into the new one.
+        await self.checkpointer.adelete_thread(thread_id)
+        return initial_state, config
+    
+    def _instrumented(self, name: str, node: Callable[[NewsletterState], Awaitable[Dict[str, Any]]]):
+        """Wrap a node to record its wall time and LLM usage.
+        
+        Each run appends an entry to ``node_metrics`` and adds its spend and
+        response-cache savings to ``model_costs``.
+        """
+        async def run(state: NewsletterState) -> Dict[str, Any]:
+            started_at = datetime.now(timezone.utc)
+            started = time.perf_counter()
+            with track_llm_usage() as usage:
+                update = await node(state)
+            
+            update["node_metrics"] = [{
+                "node": name,
+                "iteration": state.get("iteration_count", 0),
+                "started_at": started_at.isoformat(),
+                "duration": round(time.perf_counter() - started, 3),
+                **usage.as_dict()
+            }]
+            if usage.calls:
+                update["model_costs"] = {name: usage.cost}
+                if usage.cache_hits:
+                    update["model_costs"][f"{name}_cache_savings"] = usage.cost_saved
+            return update
+        return run
+    
+    async def _research_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Research node in the workflow."""
-        state["current_step"] = "research"
+        update: Dict[str, Any] = {"current_step": "research"}
         
         try:
             # Get model for research capability
             model_info = await model_router.get_model_for_capability(ModelCapability.RESEARCH)
             if model_info:
-                state["selected_models"]["research"] = model_info.id
+                update["selected_models"] = {"research": model_info.id}
             
             response = await self.agents["research"].invoke(state)
             
             if response.output:
-                state["research_topics"] = response.output.get("research_topics", [])
-                state["research_results"] = response.output.get("research_results", [])
+                update["research_topics"] = response.output.get("research_topics", [])
+                update["research_results"] = response.output.get("research_results", [])
             
         except Exception as e:
-            state["errors"].append(f"Research step failed: {str(e)}")
+            update["errors"] = [f"Research step failed: {str(e)}"]
             logger.error("Research step failed", extra={"error": str(e)})
         
-        return state
+        return update
     
-    async def _content_analysis_node(self, state: NewsletterState) -> NewsletterState:
+    async def _content_analysis_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Content analysis node in the workflow."""
-        state["current_step"] = "content_analysis"
+        update: Dict[str, Any] = {"current_step": "content_analysis"}
         
         try:
             # Get model for content analysis
             model_info = await model_router.get_model_for_capability(ModelCapability.TECHNICAL_ANALYSIS)
             if model_info:
-                state["selected_models"]["content_analysis"] = model_info.id
+                update["selected_models"] = {"content_analysis": model_info.id}
             
             response = await self.agents["content_analyst"].invoke(state)
             
             if response.output:
-                state["content_outline"] = response.output.get("content_outline", {})
-                # Initialize draft sections based on content outline
-                outline = state["content_outline"]
-                draft_sections = []
-                
-                for section in outline.get("sections", []):
-                    draft_sections.append({
-                        "section_type": section.get("type", "general"),
-                        "title": section.get("title", "Untitled"),
-                        "content": f"Content for {section.get('title')} section will be generated...",
-                        "discussion_ids": section.get("discussion_ids", []),
-                        "word_count": 0
-                    })
-                
-                state["draft_sections"] = draft_sections
+                update["content_outline"] = response.output.get("content_outline", {})
         
         except Exception as e:
-            state["errors"].append(f"Content analysis step failed: {str(e)}")
+            update["errors"] = [f"Content analysis step failed: {str(e)}"]
             logger.error("Content analysis step failed", extra={"error": str(e)})
         
-        return state
+        return update
 
-    async def _discussion_writing_node(self, state: NewsletterState) -> NewsletterState:
+    async def _discussion_writing_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Discussion writing node - generates detailed discussion summaries."""
-        state["current_step"] = "discussion_writing"
+        update: Dict[str, Any] = {"current_step": "discussion_writing"}
 
         try:
             # Get model for discussion writing
             model_info = await model_router.get_model_for_capability(ModelCapability.CONTENT_WRITING)
             if model_info:
-                state["selected_models"]["discussion_writing"] = model_info.id
+                update["selected_models"] = {"discussion_writing": model_info.id}
 
             response = await self.agents["discussion_writer"].invoke(state)
 
             if response.output:
                 # Store discussion summaries and grouped discussions
-                state["discussion_summaries"] = response.output.get("discussion_summaries", {})
-                state["grouped_discussions"] = response.output.get("grouped_discussions", {})
+                discussion_summaries = response.output.get("discussion_summaries", {})
+                update["discussion_summaries"] = discussion_summaries
+                update["grouped_discussions"] = response.output.get("grouped_discussions", {})
 
                 # Collect ALL discussions across all sections
                 all_summaries = []
-                for section_name, summaries in state["discussion_summaries"].items():
+                for section_name, summaries in discussion_summaries.items():
                     for summary_data in summaries:
                         all_summaries.append({
                             **summary_data,
@@ -277,8 +418,8 @@ class NewsletterWorkflow:
                 featured_summaries = all_summaries[:3]
                 remaining_summaries = all_summaries[3:]
 
-                # Build draft sections with new layout
-                draft_sections = []
+                # Build discussion sections with new layout
+                discussion_sections = []
 
                 # 1. Top 3 Featured Discussions
                 if featured_summaries:
@@ -303,7 +444,7 @@ class NewsletterWorkflow:
 
                         featured_content.append(item)
 
-                    draft_sections.append({
+                    discussion_sections.append({
                         "section_type": "featured",
                         "title": "🔥 Top Discussions This Week",
                         "content": "\n".join(featured_content),
@@ -341,7 +482,7 @@ class NewsletterWorkflow:
 
                             section_content.append(item)
 
-                        draft_sections.append({
+                        discussion_sections.append({
                             "section_type": "category",
                             "title": section_name,
                             "content": "\n".join(section_content),
@@ -349,199 +490,219 @@ class NewsletterWorkflow:
                             "word_count": sum(len(item.split()) for item in section_content)
                         })
 
-                state["draft_sections"] = draft_sections
+                update["discussion_sections"] = discussion_sections
 
         except Exception as e:
-            state["errors"].append(f"Discussion writing step failed: {str(e)}")
+            update["errors"] = [f"Discussion writing step failed: {str(e)}"]
             logger.error("Discussion writing step failed", extra={"error": str(e)})
 
-        return state
+        return update
 
-    async def _content_enrichment_node(self, state: NewsletterState) -> NewsletterState:
-        """Content enrichment node - adds news, events, memes, and t-shirt ideas."""
-        state["current_step"] = "content_enrichment"
+    async def _content_enrichment_node(self, state: NewsletterState) -> Dict[str, Any]:
+        """Content enrichment node - finds news, events, memes, and t-shirt ideas."""
+        update: Dict[str, Any] = {"current_step": "content_enrichment"}
 
         try:
             response = await self.agents["content_enrichment"].invoke(state)
 
             if response.output:
-                # Store enriched content
-                state["enriched_content"] = response.output
-
-                # Add enriched content to draft sections
-                newsletter_type = state.get("newsletter_type", "weekly")
-                draft_sections = state.get("draft_sections", [])
-
-                # Insert news section after featured discussions
-                news_article = response.output.get("news_article")
-                if news_article:
-                    news_content = f"**{news_article['title']}**\n\n"
-                    news_content += f"{news_article['summary']}\n\n"
-                    if news_article.get('url'):
-                        news_content += f"[Read Full Article]({news_article['url']})"
-                    if news_article.get('discord_link'):
-                        news_content += f" | [Discussion]({news_article['discord_link']})"
-
-                    # Insert after featured (index 1)
-                    draft_sections.insert(1, {
-                        "section_type": "news",
-                        "title": "📰 Community News",
-                        "content": news_content,
-                        "discussion_ids": [],
-                        "word_count": len(news_content.split())
-                    })
+                # Store enriched content; sections are built once branches join
+                update["enriched_content"] = response.output
 
-                # Add events section for monthly newsletters
-                if newsletter_type == "monthly":
-                    events = response.output.get("events", [])
-                    if events:
-                        events_content = []
-                        for event in events:
-                            event_item = f"**{event['title']}**  \n"
-                            event_item += f"{event['description']}  \n"
-                            event_item += f"📅 {event['date']}  \n"
-                            if event.get('location'):
-                                event_item += f"📍 {event['location']}  \n"
-                            if event.get('url'):
-                                event_item += f"[Learn More]({event['url']})\n"
-                            events_content.append(event_item)
-
-                        draft_sections.append({
-                            "section_type": "events",
-                            "title": "📅 Upcoming Events",
-                            "content": "\n".join(events_content),
-                            "discussion_ids": [],
-                            "word_count": sum(len(e.split()) for e in events_content)
-                        })
+        except Exception as e:
+            update["errors"] = [f"Content enrichment step failed: {str(e)}"]
+            logger.error("Content enrichment step failed", extra={"error": str(e)})
 
-                # Add meme section
-                meme = response.output.get("meme_image")
-                if meme:
-                    meme_content = f"![Top Community Meme]({meme['image_url']})\n\n"
-                    if meme.get('caption'):
-                        meme_content += f"*{meme['caption']}*\n\n"
-                    if meme.get('discord_link'):
-                        meme_content += f"[View in Discord]({meme['discord_link']})"
-
-                    draft_sections.append({
-                        "section_type": "meme",
-                        "title": "😂 Top Community Meme",
-                        "content": meme_content,
-                        "discussion_ids": [],
-                        "word_count": len(meme_content.split())
-                    })
+        return update
+
+    async def _assemble_sections_node(self, state: NewsletterState) -> Dict[str, Any]:
+        """Join node - lay out discussion and enrichment sections into the draft."""
+        draft_sections = [dict(section) for section in state.get("discussion_sections", [])]
+
+        if not draft_sections:
+            # No written discussions; start from the content outline placeholders
+            for section in state.get("content_outline", {}).get("sections", []):
+                draft_sections.append({
+                    "section_type": section.get("type", "general"),
+                    "title": section.get("title", "Untitled"),
+                    "content": f"Content for {section.get('title')} section will be generated...",
+                    "discussion_ids": section.get("discussion_ids", []),
+                    "word_count": 0
+                })
 
-                # Add t-shirt ideas section
-                tshirt_ideas = response.output.get("tshirt_ideas", [])
-                if tshirt_ideas:
-                    tshirt_content = "Community members have shared these creative design ideas! Images tagged with 👕 are considered for future AIMUG merchandise.\n\n"
-                    for idx, idea in enumerate(tshirt_ideas, 1):
-                        tshirt_content += f"**Idea {idx}**  \n"
-                        tshirt_content += f"![T-Shirt Idea {idx}]({idea['image_url']})  \n"
-                        if idea.get('description'):
-                            tshirt_content += f"*{idea['description']}*  \n"
-                        if idea.get('discord_link'):
-                            tshirt_content += f"[View in Discord]({idea['discord_link']})  \n"
-                        tshirt_content += "\n"
-
-                    draft_sections.append({
-                        "section_type": "tshirt",
-                        "title": "👕 T-Shirt Design Ideas",
-                        "content": tshirt_content,
-                        "discussion_ids": [],
-                        "word_count": len(tshirt_content.split())
-                    })
+        enriched = state.get("enriched_content") or {}
+        newsletter_type = state.get("newsletter_type", "weekly")
+
+        # Insert news section after featured discussions
+        news_article = enriched.get("news_article")
+        if news_article:
+            news_content = f"**{news_article['title']}**\n\n"
+            news_content += f"{news_article['summary']}\n\n"
+            if news_article.get('url'):
+                news_content += f"[Read Full Article]({news_article['url']})"
+            if news_article.get('discord_link'):
+                news_content += f" | [Discussion]({news_article['discord_link']})"
+
+            # Insert after featured (index 1)
+            draft_sections.insert(1, {
+                "section_type": "news",
+                "title": "📰 Community News",
+                "content": news_content,
+                "discussion_ids": [],
+                "word_count": len(news_content.split())
+            })
 
-                state["draft_sections"] = draft_sections
+        # Add events section for monthly newsletters
+        if newsletter_type == "monthly":
+            events = enriched.get("events", [])
+            if events:
+                events_content = []
+                for event in events:
+                    event_item = f"**{event['title']}**  \n"
+                    event_item += f"{event['description']}  \n"
+                    event_item += f"📅 {event['date']}  \n"
+                    if event.get('location'):
+                        event_item += f"📍 {event['location']}  \n"
+                    if event.get('url'):
+                        event_item += f"[Learn More]({event['url']})\n"
+                    events_content.append(event_item)
+
+                draft_sections.append({
+                    "section_type": "events",
+                    "title": "📅 Upcoming Events",
+                    "content": "\n".join(events_content),
+                    "discussion_ids": [],
+                    "word_count": sum(len(e.split()) for e in events_content)
+                })
 
-        except Exception as e:
-            state["errors"].append(f"Content enrichment step failed: {str(e)}")
-            logger.error("Content enrichment step failed", extra={"error": str(e)})
+        # Add meme section
+        meme = enriched.get("meme_image")
+        if meme:
+            meme_content = f"![Top Community Meme]({meme['image_url']})\n\n"
+            if meme.get('caption'):
+                meme_content += f"*{meme['caption']}*\n\n"
+            if meme.get('discord_link'):
+                meme_content += f"[View in Discord]({meme['discord_link']})"
+
+            draft_sections.append({
+                "section_type": "meme",
+                "title": "😂 Top Community Meme",
+                "content": meme_content,
+                "discussion_ids": [],
+                "word_count": len(meme_content.split())
+            })
+
+        # Add t-shirt ideas section
+        tshirt_ideas = enriched.get("tshirt_ideas", [])
+        if tshirt_ideas:
+            tshirt_content = "Community members have shared these creative design ideas! Images tagged with 👕 are considered for future AIMUG merchandise.\n\n"
+            for idx, idea in enumerate(tshirt_ideas, 1):
+                tshirt_content += f"**Idea {idx}**  \n"
+                tshirt_content += f"![T-Shirt Idea {idx}]({idea['image_url']})  \n"
+                if idea.get('description'):
+                    tshirt_content += f"*{idea['description']}*  \n"
+                if idea.get('discord_link'):
+                    tshirt_content += f"[View in Discord]({idea['discord_link']})  \n"
+                tshirt_content += "\n"
+
+            draft_sections.append({
+                "section_type": "tshirt",
+                "title": "👕 T-Shirt Design Ideas",
+                "content": tshirt_content,
+                "discussion_ids": [],
+                "word_count": len(tshirt_content.split())
+            })
 
-        return state
+        return {"current_step": "assemble_sections", "draft_sections": draft_sections}
 
-    async def _opinion_writing_node(self, state: NewsletterState) -> NewsletterState:
+    async def _opinion_writing_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Opinion writing node in the workflow."""
-        state["current_step"] = "opinion_writing"
+        update: Dict[str, Any] = {"current_step": "opinion_writing"}
         
         try:
             # Get model for opinion writing
             model_info = await model_router.get_model_for_capability(ModelCapability.CONTENT_WRITING)
             if model_info:
-                state["selected_models"]["opinion_writing"] = model_info.id
+                update["selected_models"] = {"opinion_writing": model_info.id}
             
             response = await self.agents["opinion_writer"].invoke(state)
             
             if response.output:
-                state["technical_analysis"] = response.output.get("technical_analysis", {})
+                update["technical_analysis"] = response.output.get("technical_analysis", {})
                 
                 # Update draft sections with generated content
                 section_intros = response.output.get("section_intros", {})
+                draft_sections = []
                 for section in state["draft_sections"]:
                     title = section["title"]
                     if title in section_intros:
-                        section["content"] = section_intros[title]
-                        section["word_count"] = len(section["content"].split())
+                        section = {
+                            **section,
+                            "content": section_intros[title],
+                            "word_count": len(section_intros[title].split())
+                        }
+                    draft_sections.append(section)
+                update["draft_sections"] = draft_sections
         
         except Exception as e:
-            state["errors"].append(f"Opinion writing step failed: {str(e)}")
+            update["errors"] = [f"Opinion writing step failed: {str(e)}"]
             logger.error("Opinion writing step failed", extra={"error": str(e)})
         
-        return state
+        return update
     
-    async def _editing_node(self, state: NewsletterState) -> NewsletterState:
+    async def _editing_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Editing node in the workflow."""
-        state["current_step"] = "editing"
+        update: Dict[str, Any] = {"current_step": "editing"}
         
         try:
             # Get model for editing
             model_info = await model_router.get_model_for_capability(ModelCapability.EDITING)
             if model_info:
-                state["selected_models"]["editing"] = model_info.id
+                update["selected_models"] = {"editing": model_info.id}
             
             response = await self.agents["editor"].invoke(state)
             
             if response.output:
-                state["draft_sections"] = response.output.get("edited_sections", state["draft_sections"])
-                state["writer_feedback"] = response.output.get("writer_feedback", [])
-                state["quality_metrics"] = response.output.get("quality_metrics", {})
+                update["draft_sections"] = response.output.get("edited_sections", state["draft_sections"])
+                update["writer_feedback"] = response.output.get("writer_feedback", [])
+                update["quality_metrics"] = response.output.get("quality_metrics", {})
         
         except Exception as e:
-            state["errors"].append(f"Editing step failed: {str(e)}")
+            update["errors"] = [f"Editing step failed: {str(e)}"]
             logger.error("Editing step failed", extra={"error": str(e)})
         
-        return state
+        return update
     
-    async def _formatting_node(self, state: NewsletterState) -> NewsletterState:
+    async def _formatting_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Formatting node in the workflow."""
-        state["current_step"] = "formatting"
+        update: Dict[str, Any] = {"current_step": "formatting"}
         
         try:
             # Get model for formatting (usually simpler model is fine)
             model_info = await model_router.get_model_for_capability(ModelCapability.FORMATTING)
             if model_info:
-                state["selected_models"]["formatting"] = model_info.id
+                update["selected_models"] = {"formatting": model_info.id}
             
             response = await self.agents["formatter"].invoke(state)
             
             if response.output:
-                state["newsletter_draft"] = response.output.get("newsletter_draft")
+                update["newsletter_draft"] = response.output.get("newsletter_draft")
                 # Store formatted content for later use
-                state["formatted_content"] = {
+                update["formatted_content"] = {
                     "html": response.output.get("html_content"),
                     "markdown": response.output.get("markdown_content"),
                     "text": response.output.get("text_content")
                 }
         
         except Exception as e:
-            state["errors"].append(f"Formatting step failed: {str(e)}")
+            update["errors"] = [f"Formatting step failed: {str(e)}"]
             logger.error("Formatting step failed", extra={"error": str(e)})
         
-        return state
+        return update
     
-    async def _quality_check_node(self, state: NewsletterState) -> NewsletterState:
+    async def _quality_check_node(self, state: NewsletterState) -> Dict[str, Any]:
         """Quality check node in the workflow."""
-        state["current_step"] = "quality_check"
+        update: Dict[str, Any] = {"current_step": "quality_check"}
         
         quality_score = state.get("quality_metrics", {}).get("overall_score", 0.8)
         error_count = len(state.get("errors", []))
@@ -549,17 +710,17 @@ class NewsletterWorkflow:
         # Check if quality meets standards
         if quality_score < 0.7 or error_count > 2:
             if state.get("iteration_count", 0) < 2:  # Max 2 iterations
-                state["warnings"].append("Quality below threshold, initiating revision")
-                state["iteration_count"] = state.get("iteration_count", 0) + 1
+                update["warnings"] = ["Quality below threshold, initiating revision"]
+                update["iteration_count"] = state.get("iteration_count", 0) + 1
                 logger.warning("Quality check failed, initiating revision", extra={
                     "quality_score": quality_score,
                     "error_count": error_count,
-                    "iteration": state["iteration_count"]
+                    "iteration": update["iteration_count"]
                 })
             else:
-                state["warnings"].append("Max iterations reached, proceeding with current quality")
+                update["warnings"] = ["Max iterations reached, proceeding with current quality"]
         
-        return state
+        return update
     
     def _should_iterate(self, state: NewsletterState) -> str:
         """Determine if workflow should iterate or complete."""
@@ -573,6 +734,12 @@ class NewsletterWorkflow:
         else:
             return "complete"
     
+    def _next_after_quality_check(self, state: NewsletterState) -> Union[List[str], str]:
+        """Route to the revision branches or finish."""
+        if self._should_iterate(state) == "iterate":
+            return list(REVISION_NODES)
+        return END
+    
     def get_workflow_status(self) -> Dict[str, Any]:
         """Get current workflow status."""
         return {
@@ -6,6 +6,7 @@ import random
 from discord_bot.agents.base_agent import BaseNewsletterAgent
 from discord_bot.agents.state import NewsletterState, AgentResponse
 from discord_bot.core.logging import get_logger
+from discord_bot.utils.text_processing import discussion_text
 
 logger = get_logger(__name__)
 
@@ -66,13 +67,15 @@ Your commentary should be:
         )
         
         # Generate commentary for each featured discussion
-        technical_analysis = {}
-        for discussion in featured_discussions:
-            commentary = await self._generate_commentary(
-                discussion,
-                research_results
-            )
-            technical_analysis[discussion["message_id"]] = commentary
+        commentaries = await self._fan_out(
+            featured_discussions,
+            lambda discussion: self._generate_commentary(discussion, research_results),
+            fallback=self._create_fallback_commentary
+        )
+        technical_analysis = {
+            discussion["message_id"]: commentary
+            for discussion, commentary in zip(featured_discussions, commentaries)
+        }
         
         # Generate section introductions
         section_intros = await self._generate_section_intros(content_analysis)
@@ -139,8 +142,9 @@ Your commentary should be:
         prompt = f"""
         Provide technical commentary on this community discussion:
         
-        Content: {discussion.get('content', '')}
+        Content: {discussion_text(discussion)}
         Keywords: {', '.join(keywords)}
+        Code: {', '.join(discussion.get('code_languages', [])) or 'none'}
         Category: {', '.join(discussion.get('category', ['general']))}
         Engagement: {discussion.get('engagement_score', 0)} score with {discussion.get('reply_count', 0)} replies
         
@@ -7,6 +7,8 @@ from discord_bot.agents.base_agent import BaseNewsletterAgent
 from discord_bot.agents.state import NewsletterState, AgentResponse, ResearchResult
 from discord_bot.core.logging import get_logger
 from discord_bot.services.perplexity_service import perplexity_service
+from discord_bot.services.research_cache import research_max_age
+from discord_bot.utils.text_processing import discussion_text
 
 logger = get_logger(__name__)
 
@@ -51,10 +53,12 @@ Always prioritize accuracy and cite sources when possible."""
         # Extract research topics from discussions
         research_topics = await self._identify_research_topics(discussions)
         
-        # Perform research for each topic
+        # Perform research for each topic, reusing results still fresh for
+        # this newsletter type
+        newsletter_type = state.get("newsletter_type")
         research_results = []
         for topic in research_topics[:5]:  # Limit to top 5 topics
-            result = await self._research_topic(topic, discussions)
+            result = await self._research_topic(topic, discussions, newsletter_type)
             if result:
                 research_results.append(result)
         
@@ -77,7 +81,7 @@ Always prioritize accuracy and cite sources when possible."""
         
         for discussion in discussions:
             keywords = discussion.get("keywords", [])
-            content = discussion.get("content", "")
+            content = discussion_text(discussion)
             
             # Look for technical terms that might need clarification
             if any(keyword in ["langchain", "langgraph", "agent", "rag"] for keyword in keywords):
@@ -103,7 +107,12 @@ Always prioritize accuracy and cite sources when possible."""
         # Remove duplicates and return
         return list(set(topics_to_research))
     
-    async def _research_topic(self, topic: str, discussions: List[Dict]) -> Optional[ResearchResult]:
+    async def _research_topic(
+        self,
+        topic: str,
+        discussions: List[Dict],
+        newsletter_type: Optional[str] = None
+    ) -> Optional[ResearchResult]:
         """Research a specific topic."""
         # Create research query
         query = self._create_research_query(topic, discussions)
@@ -111,7 +120,8 @@ Always prioritize accuracy and cite sources when possible."""
         # Use Perplexity service for research
         research_result = await perplexity_service.research_topic(
             query=query,
-            topic_context=topic
+            topic_context=topic,
+            max_age=research_max_age(newsletter_type)
         )
         
         if research_result:
@@ -128,7 +138,7 @@ Always prioritize accuracy and cite sources when possible."""
         discussion_context = []
         for d in discussions[:3]:  # Use top 3 discussions for context
             if any(keyword in topic.lower() for keyword in d.get("keywords", [])):
-                discussion_context.append(d.get("content", "")[:100])
+                discussion_context.append(discussion_text(d)[:100])
         
         # Build query
         query_parts = [topic]
@@ -147,7 +157,14 @@ Always prioritize accuracy and cite sources when possible."""
         
         return " ".join(query_parts)
     
-    async def fact_check(self, claim: str, context: str = "") -> Dict[str, Any]:
+    async def fact_check(
+        self,
+        claim: str,
+        context: str = "",
+        newsletter_type: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Fact-check a specific claim."""
         # Use Perplexity service for fact-checking
-        return await perplexity_service.fact_check(claim, context)
\ No newline at end of file
+        return await perplexity_service.fact_check(
+            claim, context, max_age=research_max_age(newsletter_type)
+        )
\ No newline at end of file
@@ -1,6 +1,7 @@
 """State definitions for the newsletter generation workflow."""
 
-from typing import List, Dict, Optional, Any, TypedDict
+import operator
+from typing import Annotated, List, Dict, Optional, Any, TypedDict
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -20,6 +21,10 @@ class DiscussionData(BaseModel):
     category: List[str]
     thread_summary: Optional[str] = None
     created_at: datetime
+    # Normalized at ingest (see parse_discord_content); empty for old rows
+    clean_content: Optional[str] = None
+    urls: List[str] = []
+    code_languages: List[str] = []
 
 
 class ResearchResult(BaseModel):
@@ -61,6 +66,24 @@ class NewsletterDraft(BaseModel):
     generation_metadata: Dict[str, Any]
 
 
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer merging dict updates from parallel nodes; later keys win."""
+    return {**(left or {}), **(right or {})}
+
+
+def sum_costs(left: Dict[str, float], right: Dict[str, float]) -> Dict[str, float]:
+    """Reducer accumulating per-step costs across nodes and iterations."""
+    merged = dict(left or {})
+    for key, value in (right or {}).items():
+        merged[key] = merged.get(key, 0.0) + value
+    return merged
+
+
+def last_value(left: Any, right: Any) -> Any:
+    """Reducer keeping the most recent write, allowing parallel writers."""
+    return right
+
+
 class NewsletterState(TypedDict):
     """State for the newsletter generation workflow."""
     # Input data
@@ -78,6 +101,7 @@ class NewsletterState(TypedDict):
     draft_sections: List[NewsletterSection]
     discussion_summaries: Dict[str, List[Dict[str, Any]]]  # section_name -> [summary_data]
     grouped_discussions: Dict[str, List[Dict[str, Any]]]  # section_name -> [discussion_data]
+    discussion_sections: List[Dict[str, Any]]  # featured + per-category sections from discussion writing
     enriched_content: Dict[str, Any]  # NEW: news, events, memes, t-shirt ideas
     technical_analysis: Dict[str, str]
     writer_feedback: List[WriterFeedback]
@@ -87,15 +111,16 @@ class NewsletterState(TypedDict):
     formatted_content: Dict[str, str]  # html, markdown, text
     quality_metrics: Dict[str, float]
 
-    # Workflow control
-    current_step: str
+    # Workflow control (reducers let parallel branches update these together)
+    current_step: Annotated[str, last_value]
     iteration_count: int
-    errors: List[str]
-    warnings: List[str]
+    errors: Annotated[List[str], operator.add]
+    warnings: Annotated[List[str], operator.add]
+    node_metrics: Annotated[List[Dict[str, Any]], operator.add]  # wall time and LLM usage per node run
 
     # Model selection
-    selected_models: Dict[str, str]  # agent_name -> model_id
-    model_costs: Dict[str, float]  # agent_name -> cost
+    selected_models: Annotated[Dict[str, str], merge_dicts]  # agent_name -> model_id
+    model_costs: Annotated[Dict[str, float], sum_costs]  # agent_name -> cost
 
 
 class AgentResponse(BaseModel):
@@ -5,7 +5,7 @@ import subprocess
 import sys
 import time
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 from pathlib import Path
 
@@ -28,7 +28,7 @@ try:
     from discord_bot.services.buttondown_service import buttondown_service
     from discord_bot.services.scheduler_service import scheduler_service
     from discord_bot.services.newsletter_service import newsletter_service
-    from discord_bot.models.discord_models import DiscordMessage, EngagementMetrics
+    from discord_bot.services.engagement_service import engagement_service
     from discord_bot.models.newsletter_models import Newsletter, NewsletterType
     
     DEPENDENCIES_AVAILABLE = True
@@ -533,21 +533,40 @@ def env_status():
 @async_command
 async def sync_messages(
     hours: int = typer.Option(24, help="Hours of message history to sync"),
-    force: bool = typer.Option(False, help="Force sync even if already done")
+    force: bool = typer.Option(False, help="Ignore saved channel cursors and re-sync the full window")
 ):
     """Sync recent messages from Discord channels."""
     console.print(f"📥 Syncing messages from last {hours} hours...", style="blue")
     
+    bot_task = None
     try:
         await db_service.initialize()
         await discord_service.initialize()
         
-        console.print("⚠️  Message sync requires Discord bot to be running", style="yellow")
-        console.print("Use 'discord-bot run' to start the bot and sync messages automatically", style="blue")
+        # Connect the bot and wait until guilds are available
+        discord_service._ready_event = asyncio.Event()
+        bot_task = asyncio.create_task(discord_service.bot.start(settings.discord_token))
+        await asyncio.wait_for(discord_service._ready_event.wait(), timeout=60.0)
         
+        stats = await discord_service.sync_recent_messages(hours=hours, resume=not force)
+        
+        console.print(
+            f"✅ Synced {stats['messages']} messages from {stats['channels']} channels",
+            style="green"
+        )
+        
+    except asyncio.TimeoutError:
+        console.print("❌ Discord bot failed to connect within 60 seconds", style="red")
+        raise typer.Exit(1)
     except Exception as e:
         console.print(f"❌ Message sync failed: {e}", style="red")
         raise typer.Exit(1)
+    finally:
+        if discord_service.bot and not discord_service.bot.is_closed():
+            await discord_service.bot.close()
+        if bot_task and not bot_task.done():
+            bot_task.cancel()
+        await db_service.close()
 
 
 @app.command()
@@ -563,61 +582,55 @@ async def analyze_engagement(
     try:
         await db_service.initialize()
         
-        cutoff_date = datetime.now() - timedelta(days=days)
+        # Get top engaged messages from the leaderboard
+        leaderboard = await engagement_service.get_leaderboard(
+            days=days,
+            min_score=min_score,
+            limit=limit
+        )
         
-        async with db_service.get_session() as session:
-            # Get top engaged messages
-            result = await session.execute(
-                select(DiscordMessage, EngagementMetrics)
-                .join(EngagementMetrics)
-                .where(DiscordMessage.created_at >= cutoff_date)
-                .where(EngagementMetrics.engagement_score >= min_score)
-                .order_by(EngagementMetrics.engagement_score.desc())
-                .limit(limit)
-            )
-            
-            messages_with_metrics = result.all()
-            
-            if not messages_with_metrics:
-                console.print("No messages found matching criteria", style="yellow")
-                return
-            
-            # Create table
-            table = Table(title="Top Engaged Discussions")
-            table.add_column("Score", style="cyan", width=8)
-            table.add_column("Replies", style="green", width=8)
-            table.add_column("Reactions", style="yellow", width=10)
-            table.add_column("Participants", style="blue", width=12)
-            table.add_column("Content", style="white", width=50)
-            table.add_column("Date", style="dim", width=12)
-            
-            for message, metrics in messages_with_metrics:
-                content = message.content[:47] + "..." if len(message.content) > 50 else message.content
-                content = content.replace('\n', ' ')
-                
-                table.add_row(
-                    f"{metrics.engagement_score:.1f}",
-                    str(metrics.reply_count),
-                    str(metrics.reaction_count),
-                    str(metrics.discussion_participants),
-                    content,
-                    message.created_at.strftime("%m/%d/%Y")
-                )
-            
-            console.print(table)
-            
-            # Summary stats
-            total_messages = len(messages_with_metrics)
-            avg_score = sum(m.engagement_score for _, m in messages_with_metrics) / total_messages
+        if not leaderboard:
+            console.print("No messages found matching criteria", style="yellow")
+            return
+        
+        # Create table
+        table = Table(title="Top Engaged Discussions")
+        table.add_column("Score", style="cyan", width=8)
+        table.add_column("Replies", style="green", width=8)
+        table.add_column("Reactions", style="yellow", width=10)
+        table.add_column("Participants", style="blue", width=12)
+        table.add_column("Content", style="white", width=50)
+        table.add_column("Date", style="dim", width=12)
+        
+        for entry in leaderboard:
+            content = entry.content_preview[:47] + "..." if len(entry.content_preview) > 50 else entry.content_preview
+            content = content.replace('\n', ' ')
             
-            console.print(Panel(
-                f"📈 Analysis Summary\n"
-                f"• {total_messages} high-engagement messages\n"
-                f"• Average engagement score: {avg_score:.1f}\n"
-                f"• Time period: {days} days",
-                title="Summary",
-                style="bold"
-            ))
+            table.add_row(
+                f"{entry.engagement_score:.1f}",
+                str(entry.reply_count),
+                str(entry.reaction_count),
+                str(entry.discussion_participants),
+                content,
+                entry.message_created_at.strftime("%m/%d/%Y")
+            )
+        
+        console.print(table)
+        
+        # Summary stats from the daily rollups
+        summary = await engagement_service.get_engagement_summary(days=days)
+        keywords = ", ".join(keyword for keyword, _ in summary["top_keywords"][:5]) or "none"
+        
+        console.print(Panel(
+            f"📈 Analysis Summary\n"
+            f"• {summary['total_messages']} messages, {summary['high_engagement_count']} "
+            f"high-engagement ({summary['high_engagement_rate']:.0%})\n"
+            f"• Average engagement score: {summary['average_engagement_score']:.1f}\n"
+            f"• Top keywords: {keywords}\n"
+            f"• Time period: {days} days",
+            title="Summary",
+            style="bold"
+        ))
     
     except Exception as e:
         console.print(f"❌ Engagement analysis failed: {e}", style="red")
@@ -631,7 +644,9 @@ async def generate_newsletter(
     force: bool = typer.Option(False, help="Force generation even if one exists"),
     dry_run: bool = typer.Option(False, help="Simulate generation without creating"),
     auto_publish: bool = typer.Option(False, help="Automatically publish to Buttondown"),
-    setup: bool = typer.Option(False, help="Run complete environment setup (Poetry, dependencies, Docker)")
+    setup: bool = typer.Option(False, help="Run complete environment setup (Poetry, dependencies, Docker)"),
+    resume: bool = typer.Option(True, help="Resume an interrupted run for the same newsletter from its last completed node"),
+    from_node: Optional[str] = typer.Option(None, help="Re-run the last workflow run from this node (e.g. formatting); implies --force")
 ):
     """Generate a newsletter."""
     console.print(f"📰 Generating {newsletter_type} newsletter...", style="blue")
@@ -671,6 +686,13 @@ async def generate_newsletter(
             console.print("❌ Newsletter type must be 'daily' or 'weekly'", style="red")
             raise typer.Exit(1)
         
+        if from_node:
+            from discord_bot.agents.newsletter_workflow import newsletter_workflow
+            if from_node not in newsletter_workflow.node_names:
+                console.print(f"❌ Unknown workflow node '{from_node}'. Choose one of: {', '.join(newsletter_workflow.node_names)}", style="red")
+                raise typer.Exit(1)
+            force = True
+        
         # Give containers a moment to fully start before connecting
         console.print("⏳ Allowing services to fully initialize...", style="blue")
         time.sleep(3)
@@ -705,11 +727,20 @@ async def generate_newsletter(
                 return
             
             # Generate newsletter
-            with console.status(f"Generating {newsletter_type} newsletter..."):
+            with console.status(f"Generating {newsletter_type} newsletter...") as status:
+                async def show_progress(event):
+                    duration = f" in {event['duration']:.1f}s" if event["duration"] is not None else ""
+                    saved = f", {event['sections_saved']} sections saved" if event["sections_saved"] else ""
+                    console.print(f"  ✓ {event['node']}{duration}{saved}", style="dim")
+                    status.update(f"Generating {newsletter_type} newsletter... ({event['node']} done)")
+                
                 newsletter_type_enum = NewsletterType.DAILY if newsletter_type == "daily" else NewsletterType.WEEKLY
                 newsletter = await newsletter_service.generate_newsletter(
                     newsletter_type=newsletter_type_enum,
-                    force=force
+                    force=force,
+                    resume=resume,
+                    restart_from=from_node,
+                    on_progress=show_progress
                 )
             
             if newsletter:
@@ -747,6 +778,65 @@ async def generate_newsletter(
         raise typer.Exit(1)
 
 
+@app.command()
+@async_command
+async def newsletter_profile(
+    newsletter_id: str = typer.Argument(..., help="Newsletter ID to profile")
+):
+    """Show per-node latency, token and cost breakdown of a newsletter run."""
+    try:
+        await db_service.initialize()
+        
+        profile = await newsletter_service.get_generation_profile(newsletter_id)
+        if not profile:
+            console.print(f"No node metrics recorded for newsletter {newsletter_id}", style="yellow")
+            return
+        
+        table = Table(title=f"Newsletter Generation Profile: {newsletter_id}")
+        table.add_column("Node", style="cyan")
+        table.add_column("Runs", style="dim", justify="right")
+        table.add_column("Time", style="green", justify="right")
+        table.add_column("% Time", style="green", justify="right")
+        table.add_column("LLM Calls", style="yellow", justify="right")
+        table.add_column("Tokens (in/out)", style="blue", justify="right")
+        table.add_column("Cache Hits", style="magenta", justify="right")
+        table.add_column("Cost", style="red", justify="right")
+        table.add_column("% Cost", style="red", justify="right")
+        
+        for node in profile["nodes"]:
+            table.add_row(
+                node["node"],
+                str(node["runs"]),
+                f"{node['duration']:.2f}s",
+                f"{node['duration_share']:.0%}",
+                str(node["llm_calls"]),
+                f"{node['input_tokens']:,}/{node['output_tokens']:,}",
+                str(node["cache_hits"]),
+                f"${node['cost']:.4f}",
+                f"{node['cost_share']:.0%}"
+            )
+        
+        console.print(table)
+        
+        slowest = max(profile["nodes"], key=lambda node: node["duration"])
+        costliest = max(profile["nodes"], key=lambda node: node["cost"])
+        console.print(Panel(
+            f"⏱️  Wall time: {profile['wall_time']:.2f}s "
+            f"(node time {profile['node_time_total']:.2f}s)\n"
+            f"🤖 LLM calls: {profile['llm_calls']} ({profile['cache_hits']} from cache), "
+            f"{profile['tokens']:,} tokens\n"
+            f"💰 Cost: ${profile['total_cost']:.4f} (saved ${profile['cost_saved']:.4f} via cache)\n"
+            f"🐢 Slowest node: {slowest['node']} ({slowest['duration_share']:.0%} of node time)\n"
+            f"💸 Costliest node: {costliest['node']} ({costliest['cost_share']:.0%} of spend)",
+            title="Summary",
+            style="bold"
+        ))
+    
+    except Exception as e:
+        console.print(f"❌ Failed to load newsletter profile: {e}", style="red")
+        raise typer.Exit(1)
+
+
 @app.command()
 @async_command
 async def list_newsletters(
@@ -1,7 +1,7 @@
 """Configuration management for the Discord bot."""
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -26,6 +26,7 @@ class Settings(BaseSettings):
     discord_channel_ids: str = Field(default="", description="Comma-separated channel IDs to monitor")
     discord_rate_limit_requests: int = Field(default=50, description="Discord API rate limit requests")
     discord_rate_limit_period: int = Field(default=60, description="Discord API rate limit period")
+    discord_sync_concurrency: int = Field(default=4, description="Channels fetched concurrently during historical sync")
     
     # Database Configuration
     database_url: str = Field(description="Database connection URL")
@@ -49,6 +50,41 @@ class Settings(BaseSettings):
     default_writing_model: str = Field(default="claude-3-sonnet-20240229", description="Default model for writing tasks")
     default_editing_model: str = Field(default="claude-3-haiku-20240307", description="Default model for editing tasks")
     
+    # Model Routing
+    model_routing_policy: str = Field(default="cheapest_under_sla", description="Default model routing policy (cheapest_under_sla, fastest or hedged)")
+    model_routing_policies: str = Field(default="", description="Comma-separated capability=policy overrides, e.g. 'editing=fastest,research=hedged'")
+    model_routing_latency_sla: float = Field(default=20.0, description="p95 latency in seconds a model must stay under for cheapest_under_sla routing")
+    model_routing_max_error_rate: float = Field(default=0.25, description="Recent error rate above which a model is skipped while others are healthy")
+    model_stats_window: int = Field(default=100, description="Recent invocations per model kept for latency and error statistics")
+    model_stats_min_samples: int = Field(default=5, description="Invocations needed before a model's statistics influence routing")
+    model_stats_max_age: float = Field(default=900.0, description="Seconds an invocation counts towards a model's statistics; 0 keeps them until pushed out of the window")
+    model_hedge_quantile: float = Field(default=0.9, description="Latency quantile of the primary model after which a hedged request is sent")
+    model_hedge_delay: float = Field(default=10.0, description="Seconds before hedging while the primary model has too few samples for a latency quantile")
+    model_hedge_budget: float = Field(default=0.1, description="Fraction of hedge-eligible requests per capability that may send a hedge (0 disables hedging)")
+    
+    # LLM Fan-out
+    llm_max_concurrency: int = Field(default=4, description="Concurrent LLM calls per model when fanning out")
+    llm_concurrency_overrides: str = Field(default="", description="Comma-separated model=limit or provider=limit overrides, e.g. 'openai=8,anthropic/claude-3-opus=2'")
+    llm_task_timeout: float = Field(default=120.0, description="Seconds before a fanned-out LLM call falls back")
+    
+    # LLM Response Cache
+    llm_cache_backend: str = Field(default="sqlite", description="LLM response cache backend (sqlite, redis or none)")
+    llm_cache_path: str = Field(default=".cache/llm_responses.sqlite3", description="SQLite file used by the sqlite LLM cache backend")
+    llm_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, description="Seconds a cached LLM response stays valid")
+    llm_cache_max_entries: int = Field(default=20000, description="Maximum cached LLM responses before least recently used ones are evicted")
+    llm_cache_exclude_agents: str = Field(default="", description="Comma-separated agent names that never use the LLM response cache")
+    
+    # External HTTP Transport
+    http_transport_max_connections: int = Field(default=20, description="Maximum open connections per external API host")
+    http_transport_max_keepalive: int = Field(default=10, description="Idle keep-alive connections kept per external API host")
+    http_transport_keepalive_expiry: float = Field(default=60.0, description="Seconds an idle keep-alive connection is kept open")
+    http_transport_http2: bool = Field(default=True, description="Use HTTP/2 for external APIs when the h2 package is installed")
+    http_transport_max_retries: int = Field(default=3, description="Retries of a failed external API request")
+    http_transport_backoff_base: float = Field(default=0.5, description="Base seconds of the jittered exponential retry backoff")
+    http_transport_max_retry_delay: float = Field(default=30.0, description="Longest wait between retries; longer Retry-After values are not retried")
+    http_transport_breaker_threshold: int = Field(default=5, description="Consecutive failures that open an external API's circuit breaker")
+    http_transport_breaker_reset_seconds: float = Field(default=30.0, description="Seconds an open circuit rejects requests before a trial request")
+    
     # OpenAI Configuration
     openai_api_key: Optional[str] = Field(default=None, description="OpenAI API key")
 
@@ -56,6 +92,12 @@ class Settings(BaseSettings):
     perplexity_api_key: Optional[str] = Field(default=None, description="Perplexity API key")
     perplexity_base_url: str = Field(default="https://api.perplexity.ai", description="Perplexity base URL")
     
+    # Research Cache
+    research_cache_backend: str = Field(default="database", description="Perplexity research cache backend (database, redis or none)")
+    research_cache_max_age_daily: int = Field(default=24 * 3600, description="Seconds cached research stays fresh for daily newsletters")
+    research_cache_max_age_weekly: int = Field(default=3 * 24 * 3600, description="Seconds cached research stays fresh for weekly newsletters")
+    research_cache_max_age_monthly: int = Field(default=7 * 24 * 3600, description="Seconds cached research stays fresh for monthly newsletters")
+    
     # Buttondown Configuration
     buttondown_api_key: Optional[str] = Field(default=None, description="Buttondown API key")
     buttondown_base_url: str = Field(default="https://api.buttondown.email/v1", description="Buttondown base URL")
@@ -65,7 +107,14 @@ class Settings(BaseSettings):
     newsletter_schedule_weekly: str = Field(default="0 20 * * 6", description="Weekly newsletter cron schedule - Saturday 8pm")
     newsletter_schedule_monthly: str = Field(default="0 20 1 * *", description="Monthly newsletter cron schedule - 1st day 8pm")
     timezone: str = Field(default="America/Chicago", description="Timezone for scheduling")
-    
+    newsletter_checkpointing: bool = Field(default=True, description="Persist workflow checkpoints so a rerun resumes from the last completed node")
+
+    # Scheduler
+    scheduler_jobstore: str = Field(default="database", description="Scheduler job store (database or memory)")
+    scheduler_jobstore_url: Optional[str] = Field(default=None, description="Synchronous SQLAlchemy URL for the job store; defaults to database_url on the psycopg driver")
+    cluster_lock_backend: str = Field(default="database", description="Cluster lease lock backend (database, redis or local)")
+    cluster_lock_ttl: int = Field(default=60, description="Seconds a Redis lease survives without renewal")
+
     # Rate Limiting
     api_rate_limit_requests: int = Field(default=100, description="General API rate limit requests")
     api_rate_limit_period: int = Field(default=60, description="General API rate limit period")
@@ -75,6 +124,43 @@ class Settings(BaseSettings):
     min_engagement_score: float = Field(default=1.0, description="Minimum engagement score for inclusion")
     max_newsletter_length: int = Field(default=5000, description="Maximum newsletter length in words")
     
+    # Message Ingestion
+    ingest_write_behind: bool = Field(default=True, description="Batch live message writes through a write-behind queue")
+    ingest_batch_size: int = Field(default=100, description="Maximum messages flushed per write-behind batch")
+    ingest_flush_interval: float = Field(default=0.5, description="Seconds to buffer live messages before flushing")
+    ingest_queue_max_size: int = Field(default=5000, description="Write-behind queue capacity before producers block")
+    
+    # Message Deduplication
+    message_dedupe_ttl_seconds: int = Field(default=300, description="Seconds a live message ID is remembered for duplicate suppression")
+    message_dedupe_max_size: int = Field(default=50000, description="Maximum message IDs remembered for duplicate suppression")
+    
+    # Identity Cache
+    identity_cache_max_size: int = Field(default=10000, description="Maximum cached guild/channel/user identities per kind")
+    identity_cache_ttl_seconds: int = Field(default=3600, description="Seconds before a cached identity is re-validated against the database")
+    
+    # Engagement Tracking
+    engagement_incremental_counters: bool = Field(default=True, description="Apply reaction/reply events as counter deltas instead of full recounts")
+    engagement_counter_cache_size: int = Field(default=10000, description="Maximum messages tracked by in-memory reactor/participant structures")
+    engagement_reconcile_interval_minutes: int = Field(default=60, description="Interval for reconciling incremental engagement counters")
+    engagement_reconcile_days: int = Field(default=7, description="Window of messages recomputed by the reconciliation job")
+    engagement_leaderboard_enabled: bool = Field(default=True, description="Rank top/trending discussions from the denormalized engagement leaderboard")
+    
+    # Engagement Scoring
+    engagement_reply_weight: float = Field(default=0.35, description="Score weight per reply")
+    engagement_reaction_weight: float = Field(default=0.20, description="Score weight per reaction")
+    engagement_reactor_weight: float = Field(default=0.25, description="Score weight per unique reactor")
+    engagement_thread_weight: float = Field(default=0.10, description="Score weight per thread depth level (capped at 10)")
+    engagement_recency_weight: float = Field(default=0.10, description="Score weight of the recency factor")
+    engagement_keyword_weight: float = Field(default=0.05, description="Score bonus per matched technical keyword")
+    engagement_decay_hours: float = Field(default=168, description="Hours over which the recency factor decays")
+    engagement_keywords: str = Field(default="", description="Comma-separated technical keyword vocabulary (empty uses the built-in list)")
+    
+    # CPU Offload
+    cpu_executor: str = Field(default="thread", description="Executor for CPU-bound helpers (thread, process or inline)")
+    cpu_executor_workers: int = Field(default=2, description="Worker threads or processes for CPU-bound helpers")
+    loop_lag_interval: float = Field(default=0.5, description="Seconds between event loop lag probes")
+    loop_lag_warn_threshold: float = Field(default=0.25, description="Event loop lag in seconds logged as a stall")
+
     # Logging Configuration
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(default="json", description="Log format (json or text)")
@@ -99,6 +185,36 @@ class Settings(BaseSettings):
             
         return [cid.strip() for cid in self.discord_channel_ids.split(",") if cid.strip()]
     
+    @property
+    def llm_concurrency_limits(self) -> Dict[str, int]:
+        """Get per-model/provider LLM concurrency overrides."""
+        limits = {}
+        for entry in self.llm_concurrency_overrides.split(","):
+            key, _, limit = entry.partition("=")
+            if key.strip() and limit.strip():
+                limits[key.strip()] = int(limit)
+        return limits
+    
+    @property
+    def model_routing_policy_overrides(self) -> Dict[str, str]:
+        """Get per-capability model routing policy overrides."""
+        policies = {}
+        for entry in self.model_routing_policies.split(","):
+            capability, _, policy = entry.partition("=")
+            if capability.strip() and policy.strip():
+                policies[capability.strip()] = policy.strip().lower()
+        return policies
+    
+    @property
+    def llm_cache_excluded_agents(self) -> List[str]:
+        """Get agent names opted out of LLM response caching."""
+        return [name.strip() for name in self.llm_cache_exclude_agents.split(",") if name.strip()]
+    
+    @property
+    def engagement_keyword_list(self) -> List[str]:
+        """Get the configured technical keyword vocabulary, if any."""
+        return [term.strip() for term in self.engagement_keywords.split(",") if term.strip()]
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
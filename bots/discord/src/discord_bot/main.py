@@ -13,7 +13,9 @@ from discord_bot.services.discord_service import discord_service
 from discord_bot.services.perplexity_service import perplexity_service
 from discord_bot.services.model_router import model_router
 from discord_bot.services.buttondown_service import buttondown_service
+from discord_bot.services.http_transport import http_transport
 from discord_bot.services.scheduler_service import scheduler_service
+from discord_bot.utils.offload import cpu_offloader, get_offload_stats, loop_lag_monitor
 
 # Setup logging first
 setup_logging()
@@ -63,6 +65,9 @@ class Application:
             await scheduler_service.initialize()
             await scheduler_service.start()
             
+            # Watch for CPU work blocking the loop that serves the gateway
+            loop_lag_monitor.start()
+            
             self._services_started = True
             logger.info("All services initialized successfully")
             
@@ -120,6 +125,11 @@ class Application:
             await buttondown_service.close()
             await model_router.close()
             await perplexity_service.close()
+            await http_transport.aclose()
+            
+            # Stop CPU offload workers and the loop lag monitor
+            await loop_lag_monitor.stop()
+            cpu_offloader.shutdown()
             
             # Close database connections
             logger.info("Closing database connections")
@@ -165,7 +175,9 @@ class Application:
             
             # Check Discord service
             health_status["services"]["discord"] = {
-                "status": "healthy" if discord_service.is_running else "stopped"
+                "status": "healthy" if discord_service.is_running else "stopped",
+                "ingest_queue": discord_service.get_ingest_stats(),
+                "identity_cache": discord_service.get_identity_cache_stats()
             }
             
             # Check scheduler
@@ -174,6 +186,12 @@ class Application:
                 **scheduler_service.get_scheduler_status()
             }
             
+            # Check event loop lag and CPU offload
+            health_status["services"]["event_loop"] = {
+                "status": "healthy" if loop_lag_monitor.is_running else "stopped",
+                **get_offload_stats()
+            }
+            
             # Overall status
             unhealthy_services = [
                 name for name, status in health_status["services"].items()
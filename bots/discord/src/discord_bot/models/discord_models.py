@@ -1,14 +1,14 @@
 """Database models for Discord-related data."""
 
 import uuid
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Dict, Optional, List
 from sqlalchemy import (
     String, Text, BigInteger, Integer, Float, Boolean,
-    JSON, ForeignKey, Index, UniqueConstraint, DateTime
+    JSON, ForeignKey, Index, UniqueConstraint, Date, DateTime
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from discord_bot.models.base import BaseModel
+from discord_bot.models.base import Base, BaseModel, TimestampMixin
 
 
 class DiscordGuild(BaseModel):
@@ -88,6 +88,16 @@ class DiscordChannel(BaseModel):
         doc="Whether this channel is monitored for messages"
     )
     
+    # Historical sync cursor
+    last_synced_message_id: Mapped[Optional[str]] = mapped_column(
+        String(20),
+        doc="ID of the newest message persisted by historical sync"
+    )
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        doc="When historical sync last advanced the cursor"
+    )
+    
     # Relationships
     guild: Mapped["DiscordGuild"] = relationship(back_populates="channels")
     messages: Mapped[List["DiscordMessage"]] = relationship(
@@ -180,6 +190,18 @@ class DiscordMessage(BaseModel):
         Text,
         doc="Message content with mentions resolved"
     )
+    normalized_content: Mapped[Optional[str]] = mapped_column(
+        Text,
+        doc="Content with Discord markup normalized for newsletter use"
+    )
+    content_urls: Mapped[Optional[List[str]]] = mapped_column(
+        JSON,
+        doc="URLs linked in the message text"
+    )
+    code_languages: Mapped[Optional[List[str]]] = mapped_column(
+        JSON,
+        doc="Languages of the message's code blocks"
+    )
     message_type: Mapped[str] = mapped_column(
         String(20),
         default="default",
@@ -383,4 +405,135 @@ class EngagementMetrics(BaseModel):
         Index("ix_engagement_metrics_score", "engagement_score"),
         Index("ix_engagement_metrics_trending", "trending_score"),
         Index("ix_engagement_metrics_last_activity", "last_activity"),
-    )
\ No newline at end of file
+        Index("ix_engagement_metrics_activity_trending", "last_activity", "trending_score"),
+    )
+
+
+class EngagementLeaderboard(Base, TimestampMixin):
+    """Denormalized ranking of messages by engagement.
+    
+    One row per message with the columns needed to rank and filter
+    discussions, kept in sync with ``EngagementMetrics`` so leaderboard
+    queries avoid joining messages, channels and users. Keyed by message so
+    rows can be refreshed with a single ``INSERT ... SELECT``.
+    """
+    
+    __tablename__ = "engagement_leaderboard"
+    
+    message_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("discord_messages.id"),
+        primary_key=True,
+        doc="Reference to the message"
+    )
+    discord_message_id: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        doc="Discord message ID"
+    )
+    channel_id: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        doc="Discord channel ID"
+    )
+    channel_name: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        doc="Channel name"
+    )
+    author_name: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        doc="Author display name, falling back to username"
+    )
+    content_preview: Mapped[str] = mapped_column(
+        String(200),
+        nullable=False,
+        doc="First 200 characters of the message content"
+    )
+    message_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="When the message was posted"
+    )
+    last_activity: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        doc="Timestamp of last activity on this message"
+    )
+    reply_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        doc="Number of direct replies"
+    )
+    reaction_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        doc="Total number of reactions"
+    )
+    discussion_participants: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        doc="Number of unique participants in discussion"
+    )
+    engagement_score: Mapped[float] = mapped_column(
+        Float,
+        default=0.0,
+        doc="Calculated engagement score"
+    )
+    trending_score: Mapped[float] = mapped_column(
+        Float,
+        default=0.0,
+        doc="Trending score based on recent activity"
+    )
+    
+    __table_args__ = (
+        Index("ix_engagement_leaderboard_created_score", "message_created_at", "engagement_score"),
+        Index("ix_engagement_leaderboard_activity_trending", "last_activity", "trending_score"),
+        Index("ix_engagement_leaderboard_channel_id", "channel_id"),
+    )
+
+
+class EngagementDailyRollup(Base, TimestampMixin):
+    """Per-day engagement aggregates for messages posted on that (UTC) day.
+    
+    Adjusted in the same transaction whenever messages are stored or
+    scored (and recomputed in full for bulk rescoring), so summaries over
+    a window read one row per day instead of every message.
+    """
+    
+    __tablename__ = "engagement_daily_rollups"
+    
+    day: Mapped[date] = mapped_column(
+        Date,
+        primary_key=True,
+        doc="UTC day the messages were posted"
+    )
+    message_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        doc="Messages posted on this day"
+    )
+    scored_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        doc="Messages with engagement metrics"
+    )
+    high_engagement_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        doc="Messages scoring at least the configured minimum engagement score"
+    )
+    score_sum: Mapped[float] = mapped_column(
+        Float,
+        default=0.0,
+        doc="Sum of engagement scores"
+    )
+    score_histogram: Mapped[Dict[str, int]] = mapped_column(
+        JSON,
+        default=dict,
+        doc="Message counts per engagement score bucket"
+    )
+    keyword_counts: Mapped[Dict[str, int]] = mapped_column(
+        JSON,
+        default=dict,
+        doc="Extracted keyword frequencies"
+    )
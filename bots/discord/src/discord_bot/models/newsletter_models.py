@@ -9,7 +9,7 @@ from sqlalchemy import (
     ForeignKey, Index, Enum as SQLEnum
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from discord_bot.models.base import BaseModel
+from discord_bot.models.base import Base, BaseModel, TimestampMixin
 
 
 class NewsletterType(str, Enum):
@@ -522,4 +522,49 @@ class NewsletterPublication(BaseModel):
         Index("ix_newsletter_publications_status", "status"),
         Index("ix_newsletter_publications_published_at", "published_at"),
         Index("ix_newsletter_publications_service", "service_name"),
-    )
\ No newline at end of file
+    )
+
+class ResearchCacheEntry(Base, TimestampMixin):
+    """Cached Perplexity research or fact-check result.
+    
+    Keyed by a hash of the normalized query and context, so the same
+    trending topic researched by daily, weekly and monthly runs is fetched
+    once per freshness window.
+    """
+    
+    __tablename__ = "research_cache"
+    
+    cache_key: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        doc="SHA-256 of the request kind, normalized query and context"
+    )
+    kind: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        doc="Request kind (research, fact_check)"
+    )
+    query: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        doc="Normalized query or claim"
+    )
+    result: Mapped[Dict[str, Any]] = mapped_column(
+        JSON,
+        nullable=False,
+        doc="Serialized result"
+    )
+    fetched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="When the result was fetched from the API"
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="When the entry is too old for any newsletter type"
+    )
+    
+    __table_args__ = (
+        Index("ix_research_cache_expires_at", "expires_at"),
+    )
@@ -0,0 +1,117 @@
+"""Database models for durable workflow checkpoints."""
+
+from typing import Optional
+from sqlalchemy import String, Integer, LargeBinary, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from discord_bot.models.base import Base, TimestampMixin
+
+
+class WorkflowCheckpoint(Base, TimestampMixin):
+    """LangGraph checkpoint taken after a workflow superstep.
+
+    Rows are keyed the way LangGraph addresses checkpoints (thread,
+    namespace, checkpoint ID) and hold the serializer's typed payloads, so a
+    failed run can be resumed from its last completed node.
+    """
+
+    __tablename__ = "workflow_checkpoints"
+
+    thread_id: Mapped[str] = mapped_column(
+        String(200),
+        primary_key=True,
+        doc="Workflow thread, e.g. newsletter_daily_2025-01-01"
+    )
+    checkpoint_ns: Mapped[str] = mapped_column(
+        String(200),
+        primary_key=True,
+        default="",
+        doc="Checkpoint namespace (empty for the root graph)"
+    )
+    checkpoint_id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        doc="Monotonic checkpoint ID"
+    )
+    parent_checkpoint_id: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        doc="Checkpoint this one was derived from"
+    )
+    checkpoint_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        doc="Serializer type tag of the checkpoint payload"
+    )
+    checkpoint: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        doc="Serialized checkpoint, including channel values"
+    )
+    metadata_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        doc="Serializer type tag of the metadata payload"
+    )
+    checkpoint_metadata: Mapped[bytes] = mapped_column(
+        "metadata",
+        LargeBinary,
+        nullable=False,
+        doc="Serialized checkpoint metadata (source, step, ...)"
+    )
+
+    __table_args__ = (
+        Index("ix_workflow_checkpoints_thread_created", "thread_id", "created_at"),
+    )
+
+
+class WorkflowCheckpointWrite(Base, TimestampMixin):
+    """Pending channel write recorded by a node before its checkpoint is taken."""
+
+    __tablename__ = "workflow_checkpoint_writes"
+
+    thread_id: Mapped[str] = mapped_column(
+        String(200),
+        primary_key=True,
+        doc="Workflow thread"
+    )
+    checkpoint_ns: Mapped[str] = mapped_column(
+        String(200),
+        primary_key=True,
+        default="",
+        doc="Checkpoint namespace"
+    )
+    checkpoint_id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        doc="Checkpoint the write belongs to"
+    )
+    task_id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        doc="Task that produced the write"
+    )
+    idx: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        doc="Position of the write within the task"
+    )
+    channel: Mapped[str] = mapped_column(
+        String(200),
+        nullable=False,
+        doc="Channel written to"
+    )
+    value_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        doc="Serializer type tag of the value"
+    )
+    value: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        doc="Serialized value"
+    )
+    task_path: Mapped[str] = mapped_column(
+        String(200),
+        nullable=False,
+        default="",
+        doc="Path of the task that produced the write"
+    )
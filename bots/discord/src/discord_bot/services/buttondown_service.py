@@ -3,11 +3,11 @@
 import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
-import httpx
 import json
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
+from discord_bot.services.http_transport import ServiceClient, http_transport
 from discord_bot.models.newsletter_models import Newsletter, PublishStatus
 
 logger = get_logger(__name__)
@@ -19,7 +19,7 @@ class ButtondownService:
     def __init__(self):
         self.base_url = settings.buttondown_base_url
         self.api_key = settings.buttondown_api_key
-        self.client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[ServiceClient] = None
     
     async def initialize(self):
         """Initialize the Buttondown service."""
@@ -27,8 +27,9 @@ class ButtondownService:
             logger.warning("Buttondown API key not configured")
             return
         
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
+        self.client = http_transport.client(
+            "buttondown",
+            self.base_url,
             headers={
                 "Authorization": f"Token {self.api_key}",
                 "Content-Type": "application/json"
@@ -41,7 +42,6 @@ class ButtondownService:
     async def close(self):
         """Close the Buttondown service."""
         if self.client:
-            await self.client.aclose()
             self.client = None
             logger.info("Buttondown service closed")
     
@@ -430,7 +430,8 @@ class ButtondownService:
             "service": "buttondown",
             "status": "unknown",
             "api_key_configured": bool(self.api_key),
-            "client_initialized": bool(self.client)
+            "client_initialized": bool(self.client),
+            "http": self.client.get_stats() if self.client else {}
         }
         
         if not self.api_key:
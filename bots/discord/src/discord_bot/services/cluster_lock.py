@@ -0,0 +1,268 @@
+"""Cluster-wide lease locks so only one bot replica runs a given job."""
+
+import asyncio
+import hashlib
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, FrozenSet, Optional
+
+from sqlalchemy import text
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+from discord_bot.services.database import db_service
+from discord_bot.utils.caching import SettingsBound
+
+logger = get_logger(__name__)
+
+# Leases held by the current task, so nested ``lease`` calls for the same
+# key (e.g. a scheduled job calling ``generate_newsletter``) re-enter.
+_held_leases: ContextVar[FrozenSet[str]] = ContextVar("cluster_leases", default=frozenset())
+
+# Release only if the lease is still ours; extend it only while it is.
+_REDIS_RELEASE = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+_REDIS_RENEW = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def advisory_lock_id(key: str) -> int:
+    """Map a lease key onto the signed 64-bit id Postgres advisory locks take."""
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class ClusterLock(ABC):
+    """Base class for lease lock backends.
+
+    ``lease`` never blocks: it yields False straight away when another
+    holder has the key, so callers skip work instead of queueing behind it.
+    Unlike the caches, a broken backend fails closed: the lease is reported
+    as not acquired rather than risking two replicas doing the same work.
+    """
+
+    backend = "none"
+
+    def __init__(self):
+        self.acquired = 0
+        self.contended = 0
+        self.errors = 0
+
+    @asynccontextmanager
+    async def lease(self, key: str) -> AsyncIterator[bool]:
+        """Hold ``key`` for the duration of the block; yields whether it was acquired."""
+        held = _held_leases.get()
+        if key in held:
+            yield True
+            return
+
+        try:
+            handle = await self._acquire(key)
+        except Exception as e:
+            self.errors += 1
+            logger.error("Cluster lock acquire failed", extra={
+                "backend": self.backend,
+                "key": key,
+                "error": str(e)
+            })
+            handle = None
+
+        if handle is None:
+            self.contended += 1
+            yield False
+            return
+
+        self.acquired += 1
+        token = _held_leases.set(held | {key})
+        try:
+            yield True
+        finally:
+            _held_leases.reset(token)
+            try:
+                await self._release(key, handle)
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Cluster lock release failed", extra={
+                    "backend": self.backend,
+                    "key": key,
+                    "error": str(e)
+                })
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lease counters for health reporting."""
+        return {
+            "backend": self.backend,
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "errors": self.errors,
+        }
+
+    @abstractmethod
+    async def _acquire(self, key: str) -> Optional[Any]:
+        """Try to take ``key``; return a release handle, or None if it is held elsewhere."""
+        pass
+
+    @abstractmethod
+    async def _release(self, key: str, handle: Any) -> None:
+        """Give up ``key`` using the handle ``_acquire`` returned."""
+        pass
+
+
+class LocalClusterLock(ClusterLock):
+    """Process-local leases, for single-replica deployments and tests."""
+
+    backend = "local"
+
+    def __init__(self):
+        super().__init__()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _acquire(self, key: str) -> Optional[asyncio.Lock]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        if lock.locked():
+            return None
+        await lock.acquire()
+        return lock
+
+    async def _release(self, key: str, handle: asyncio.Lock) -> None:
+        handle.release()
+
+
+class DatabaseClusterLock(ClusterLock):
+    """Leases as Postgres session-level advisory locks.
+
+    Each lease pins one pooled connection for as long as it is held, so a
+    crashed replica's leases are dropped with its connections. Databases
+    other than Postgres have no advisory locks and get process-local leases.
+    """
+
+    backend = "database"
+
+    def __init__(self):
+        super().__init__()
+        self._local = LocalClusterLock()
+
+    async def _acquire(self, key: str) -> Optional[Any]:
+        if not db_service.engine:
+            await db_service.initialize()
+
+        if db_service.engine.dialect.name != "postgresql":
+            lock = await self._local._acquire(key)
+            return ("local", lock) if lock is not None else None
+
+        conn = await db_service.engine.connect()
+        try:
+            locked = (await conn.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"),
+                {"lock_id": advisory_lock_id(key)}
+            )).scalar()
+            # Advisory locks outlive transactions; end the implicit one so
+            # the pinned connection does not sit idle in transaction.
+            await conn.commit()
+        except Exception:
+            await conn.close()
+            raise
+
+        if not locked:
+            await conn.close()
+            return None
+        return ("postgresql", conn)
+
+    async def _release(self, key: str, handle: Any) -> None:
+        kind, resource = handle
+        if kind == "local":
+            await self._local._release(key, resource)
+            return
+
+        try:
+            await resource.execute(
+                text("SELECT pg_advisory_unlock(:lock_id)"),
+                {"lock_id": advisory_lock_id(key)}
+            )
+            await resource.commit()
+        finally:
+            await resource.close()
+
+
+class RedisClusterLock(ClusterLock):
+    """Leases as Redis keys set with NX and a TTL.
+
+    The holder renews the TTL while it works, so a lease outlives a long
+    generation but expires soon after its replica dies.
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl: int, prefix: str = "cluster_lock:"):
+        super().__init__()
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url)
+        self._ttl_ms = ttl * 1000
+        self._prefix = prefix
+
+    async def _acquire(self, key: str) -> Optional[Any]:
+        owner = uuid.uuid4().hex
+        name = self._prefix + key
+        if not await self._client.set(name, owner, nx=True, px=self._ttl_ms):
+            return None
+        renewal = asyncio.create_task(self._renew(name, owner))
+        return owner, renewal
+
+    async def _release(self, key: str, handle: Any) -> None:
+        owner, renewal = handle
+        renewal.cancel()
+        await self._client.eval(_REDIS_RELEASE, 1, self._prefix + key, owner)
+
+    async def _renew(self, name: str, owner: str) -> None:
+        """Extend the lease every third of its TTL until released."""
+        while True:
+            await asyncio.sleep(self._ttl_ms / 3000)
+            try:
+                renewed = await self._client.eval(_REDIS_RENEW, 1, name, owner, self._ttl_ms)
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Cluster lock renewal failed", extra={
+                    "key": name,
+                    "error": str(e)
+                })
+                continue
+            if not renewed:
+                logger.error("Cluster lock lease lost before release", extra={"key": name})
+                return
+
+
+def _lock_settings() -> tuple:
+    return (settings.cluster_lock_backend.lower(), settings.redis_url, settings.cluster_lock_ttl)
+
+
+def _build_lock(backend: str, redis_url: str, ttl: int) -> ClusterLock:
+    if backend == "database":
+        return DatabaseClusterLock()
+    if backend == "redis":
+        try:
+            return RedisClusterLock(redis_url, ttl)
+        except ImportError:
+            logger.warning("redis package not installed, using database cluster locks")
+            return DatabaseClusterLock()
+    if backend != "local":
+        logger.warning(f"Unknown cluster lock backend '{backend}', using local locks")
+    return LocalClusterLock()
+
+
+_lock: SettingsBound[ClusterLock] = SettingsBound(_lock_settings, _build_lock)
+
+
+def get_cluster_lock() -> ClusterLock:
+    """Get the configured cluster lock backend."""
+    return _lock.get()
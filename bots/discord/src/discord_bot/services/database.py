@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker
 )
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.pool import NullPool
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
@@ -148,6 +149,18 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+def upsert_insert(session: AsyncSession, model):
+    """Build a dialect-specific INSERT supporting ``on_conflict_do_update``.
+
+    Postgres is the production backend; SQLite is used by the test suite.
+    Both expose the same ``on_conflict_do_*`` API on their insert constructs.
+    """
+    dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
 async def init_db() -> None:
     """Initialize database (convenience function)."""
     await db_service.initialize()
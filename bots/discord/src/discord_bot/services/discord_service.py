@@ -1,16 +1,25 @@
 """Discord service for bot integration and message processing."""
 
 import asyncio
+import uuid
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import discord
 from discord.ext import commands
-from sqlalchemy import select
+from sqlalchemy import event, func, select, update
 from sqlalchemy.exc import IntegrityError
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
-from discord_bot.services.database import db_service
+from discord_bot.services.database import db_service, upsert_insert
+from discord_bot.services.engagement_counters import EngagementCounters, participant_sources
+from discord_bot.services.engagement_rollups import RollupChanges
+from discord_bot.services.engagement_scoring import engagement_scorer
+from discord_bot.services.leaderboard import refresh_leaderboard, refresh_leaderboard_names
+from discord_bot.services.write_behind import WriteBehindQueue
+from discord_bot.utils.caching import ExpiringSet, TTLCache
+from discord_bot.utils.rate_limiting import TokenBucket
+from discord_bot.utils.text_processing import parse_discord_content
 from discord_bot.models.discord_models import (
     DiscordGuild, DiscordChannel, DiscordUser, DiscordMessage, 
     MessageReaction, EngagementMetrics
@@ -18,6 +27,31 @@ from discord_bot.models.discord_models import (
 
 logger = get_logger(__name__)
 
+# Discord returns at most 100 messages per history request
+HISTORY_PAGE_SIZE = 100
+
+# Mutable columns per identity kind; these are refreshed on upsert and
+# fingerprinted by the identity cache to skip unchanged writes
+IDENTITY_UPDATE_COLUMNS: Dict[str, List[str]] = {
+    "guild": ["name", "description", "member_count"],
+    "channel": ["name", "topic", "is_monitored"],
+    "user": ["username", "display_name", "avatar_url"],
+}
+
+# Session.info key for identity cache entries waiting on their transaction
+PENDING_IDENTITIES = "pending_identities"
+
+
+def _publish_identities(session) -> None:
+    """Cache the identities a transaction wrote, now that it has committed."""
+    for cache, snowflake, entry in session.info.pop(PENDING_IDENTITIES, []):
+        cache.set(snowflake, entry)
+
+
+def _discard_identities(session) -> None:
+    """Forget the identities a rolled-back transaction wrote."""
+    session.info.pop(PENDING_IDENTITIES, None)
+
 
 class DiscordBot(commands.Bot):
     """Custom Discord bot with message monitoring capabilities."""
@@ -74,6 +108,18 @@ class DiscordBot(commands.Bot):
     async def on_reaction_remove(self, reaction: discord.Reaction, user: discord.User):
         """Handle reaction removals."""
         await self.discord_service.process_reaction(reaction, user, is_add=False)
+    
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
+        """Handle guild updates."""
+        await self.discord_service.process_guild_update(after)
+    
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        """Handle channel updates."""
+        await self.discord_service.process_channel_update(after)
+    
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """Handle channel deletions."""
+        self.discord_service.invalidate_identity("channel", channel.id)
 
 
 class DiscordService:
@@ -83,9 +129,29 @@ class DiscordService:
         self.bot: Optional[DiscordBot] = None
         self._monitored_channels: Set[str] = set()
         self._monitor_all_channels: bool = False
-        self._message_cache: Dict[str, datetime] = {}  # Cache for rate limiting
+        self._seen_messages = ExpiringSet(
+            ttl=settings.message_dedupe_ttl_seconds,
+            max_size=settings.message_dedupe_max_size
+        )
         self._is_running = False
         self._ready_event: Optional[asyncio.Event] = None
+        self._counters = EngagementCounters(score_fn=engagement_scorer.score)
+        # Discord snowflake -> (database UUID, fingerprint of mutable columns)
+        self._identity_cache: Dict[str, TTLCache[Tuple[uuid.UUID, tuple]]] = {
+            kind: TTLCache(
+                max_size=settings.identity_cache_max_size,
+                ttl=settings.identity_cache_ttl_seconds
+            )
+            for kind in IDENTITY_UPDATE_COLUMNS
+        }
+        self._ingest_queue: WriteBehindQueue[discord.Message] = WriteBehindQueue(
+            name="messages",
+            flush_fn=self._store_message_batch,
+            batch_size=settings.ingest_batch_size,
+            flush_interval=settings.ingest_flush_interval,
+            max_size=settings.ingest_queue_max_size,
+            fallback_fn=self._process_message_direct
+        )
     
     async def initialize(self) -> None:
         """Initialize the Discord service."""
@@ -119,6 +185,9 @@ class DiscordService:
         logger.info("Starting Discord bot")
         self._is_running = True
         
+        if settings.ingest_write_behind:
+            self._ingest_queue.start()
+        
         try:
             await self.bot.start(settings.discord_token)
         except Exception as e:
@@ -127,15 +196,18 @@ class DiscordService:
                 "error_type": type(e).__name__
             })
             self._is_running = False
+            await self._ingest_queue.stop()
             raise
     
     async def stop(self) -> None:
-        """Stop the Discord bot."""
+        """Stop the Discord bot and flush any buffered messages."""
         if self.bot and self._is_running:
             logger.info("Stopping Discord bot")
             await self.bot.close()
             self._is_running = False
             logger.info("Discord bot stopped")
+        
+        await self._ingest_queue.stop()
     
     async def sync_guilds(self) -> None:
         """Sync guild information with database."""
@@ -156,32 +228,52 @@ class DiscordService:
             "guilds_synced": len(self.bot.guilds)
         })
     
-    async def sync_recent_messages(self, hours: int = 24) -> None:
-        """Sync recent messages from monitored channels."""
+    async def sync_recent_messages(self, hours: int = 24, resume: bool = True) -> Dict[str, int]:
+        """Sync recent messages from monitored channels.
+        
+        Channels are fetched concurrently (up to ``discord_sync_concurrency``)
+        under a shared token bucket sized by the Discord rate limit settings.
+        Each page of history is persisted as one batch, after which the
+        channel's sync cursor is advanced, so an interrupted sync resumes
+        from the last persisted page.
+        
+        Args:
+            hours: How far back to sync when a channel has no usable cursor.
+            resume: Continue from each channel's persisted cursor. Pass False
+                to re-walk the full window.
+        
+        Returns:
+            Counts of messages and channels synced.
+        """
         if not self.bot:
-            return
+            return {"messages": 0, "channels": 0}
         
-        logger.info(f"Syncing recent messages from last {hours} hours")
+        logger.info(f"Syncing recent messages from last {hours} hours", extra={
+            "resume": resume,
+            "concurrency": settings.discord_sync_concurrency
+        })
 
         cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        channels = [
+            channel
+            for guild in self.bot.guilds
+            for channel in guild.text_channels
+            if self._monitor_all_channels or str(channel.id) in self._monitored_channels
+        ]
+        cursors = await self._load_sync_cursors(channels) if resume else {}
         
-        message_count = 0
+        rate_limiter = TokenBucket(
+            requests=settings.discord_rate_limit_requests,
+            period=settings.discord_rate_limit_period
+        )
+        semaphore = asyncio.Semaphore(settings.discord_sync_concurrency)
         
-        for guild in self.bot.guilds:
-            for channel in guild.text_channels:
-                if not self._monitor_all_channels and str(channel.id) not in self._monitored_channels:
-                    continue
-                
+        async def sync_channel(channel: discord.TextChannel) -> int:
+            async with semaphore:
                 try:
-                    async for message in channel.history(after=cutoff_time, limit=None):
-                        await self.process_message(message, is_historical=True)
-                        message_count += 1
-                        
-                        # Rate limiting for bulk processing
-                        if message_count % 100 == 0:
-                            await asyncio.sleep(1)
-                            logger.debug(f"Processed {message_count} historical messages")
-                
+                    return await self._sync_channel_history(
+                        channel, cutoff_time, cursors.get(str(channel.id)), rate_limiter
+                    )
                 except discord.Forbidden:
                     logger.warning(f"No access to channel {channel.name}")
                 except Exception as e:
@@ -189,10 +281,89 @@ class DiscordService:
                         "error": str(e),
                         "channel_id": channel.id
                     })
+                return 0
+        
+        counts = await asyncio.gather(*(sync_channel(channel) for channel in channels))
+        stats = {
+            "messages": sum(counts),
+            "channels": sum(1 for count in counts if count)
+        }
         
         logger.info("Recent message sync completed", extra={
-            "messages_processed": message_count
+            "messages_processed": stats["messages"],
+            "channels_synced": stats["channels"],
+            "rate_limit_wait_seconds": round(rate_limiter.total_wait_seconds, 2)
         })
+        return stats
+    
+    async def _sync_channel_history(
+        self,
+        channel: discord.TextChannel,
+        cutoff_time: datetime,
+        cursor: Optional[str],
+        rate_limiter: TokenBucket
+    ) -> int:
+        """Page through a channel's history oldest-first, persisting each page."""
+        after = discord.Object(id=int(cursor)) if cursor else cutoff_time
+        if cursor and discord.utils.snowflake_time(int(cursor)) < cutoff_time:
+            after = cutoff_time
+        
+        message_count = 0
+        while True:
+            await rate_limiter.acquire()
+            page = [
+                message async for message in channel.history(
+                    limit=HISTORY_PAGE_SIZE, after=after, oldest_first=True
+                )
+            ]
+            if not page:
+                break
+            
+            await self._store_history_page(page)
+            await self._save_sync_cursor(channel, page[-1])
+            message_count += len(page)
+            
+            logger.debug(f"Synced {message_count} historical messages from #{channel.name}")
+            
+            if len(page) < HISTORY_PAGE_SIZE:
+                break
+            after = page[-1]
+        
+        return message_count
+    
+    async def _store_history_page(self, page: List[discord.Message]) -> None:
+        """Persist a page of history; messages with reactions also store reactors."""
+        await self._store_message_batch(page)
+        
+        for message in page:
+            if message.reactions:
+                await self._process_message_direct(message, is_historical=True)
+    
+    async def _load_sync_cursors(self, channels: List[discord.TextChannel]) -> Dict[str, str]:
+        """Load persisted sync cursors keyed by Discord channel ID."""
+        if not channels:
+            return {}
+        
+        async with db_service.get_session() as session:
+            result = await session.execute(
+                select(DiscordChannel.channel_id, DiscordChannel.last_synced_message_id)
+                .where(DiscordChannel.channel_id.in_([str(channel.id) for channel in channels]))
+                .where(DiscordChannel.last_synced_message_id.isnot(None))
+            )
+            return {row[0]: row[1] for row in result.all()}
+    
+    async def _save_sync_cursor(self, channel: discord.TextChannel, message: discord.Message) -> None:
+        """Advance a channel's sync cursor to ``message``."""
+        async with db_service.get_session() as session:
+            await session.execute(
+                update(DiscordChannel)
+                .where(DiscordChannel.channel_id == str(channel.id))
+                .values(
+                    last_synced_message_id=str(message.id),
+                    last_synced_at=datetime.now(timezone.utc)
+                )
+                .execution_options(synchronize_session=False)
+            )
     
     async def process_message(self, message: discord.Message, is_historical: bool = False) -> None:
         """Process a Discord message and store in database."""
@@ -204,19 +375,34 @@ class DiscordService:
         if not is_historical and self._should_rate_limit(message.id):
             return
         
+        # Buffer live messages for batched writes; messages arriving with
+        # reactions need per-reaction user lookups and take the direct path
+        if (
+            not is_historical
+            and self._ingest_queue.is_running
+            and isinstance(message.channel, discord.TextChannel)
+            and not message.reactions
+        ):
+            await self._ingest_queue.submit(message)
+            return
+        
+        await self._process_message_direct(message, is_historical)
+    
+    async def _process_message_direct(self, message: discord.Message, is_historical: bool = False) -> None:
+        """Store a single message and its engagement metrics in one session."""
         try:
             async with db_service.get_session() as session:
                 # Store/update user
-                user_record = await self._store_user(message.author, session)
+                user_id = await self._store_user(message.author, session)
                 
                 # Store/update guild and channel
                 if isinstance(message.channel, discord.TextChannel):
-                    guild_record = await self._store_guild(message.guild, session)
-                    channel_record = await self._store_channel(message.channel, message.guild, session)
+                    guild_id = await self._store_guild(message.guild, session)
+                    channel_id = await self._store_channel(message.channel, message.guild, session)
                     
                     # Store message
                     message_record = await self._store_message(
-                        message, user_record, guild_record, channel_record, session
+                        message, user_id, guild_id, channel_id, session
                     )
                     
                     # Process reactions
@@ -224,11 +410,27 @@ class DiscordService:
                         await self._store_reactions(reaction, message_record, session)
 
                     # Initialize engagement metrics
-                    await self._initialize_engagement_metrics(message_record, session)
+                    rollups = RollupChanges()
+                    is_new = await self._initialize_engagement_metrics(message_record, session, rollups)
 
-                    # Update engagement metrics with reaction/reply counts
-                    await self._update_engagement_metrics(message_record, session)
+                    if settings.engagement_incremental_counters:
+                        # Existing reactions were bulk-stored, so recount those;
+                        # a new reply only bumps its parent's counters
+                        if message.reactions:
+                            await self._update_engagement_metrics(message_record, session, rollups)
+                        if is_new and message_record.parent_message_id:
+                            await self._counters.apply_replies(
+                                session,
+                                message_record.parent_message_id,
+                                [message_record.author_id],
+                                message_record.created_at,
+                                rollups=rollups
+                            )
+                    else:
+                        # Update engagement metrics with reaction/reply counts
+                        await self._update_engagement_metrics(message_record, session, rollups)
 
+                    await rollups.apply(session)
                     await session.commit()
 
                     if not is_historical:
@@ -258,6 +460,8 @@ class DiscordService:
                 if message_record:
                     message_record.content = after.content
                     message_record.clean_content = after.clean_content
+                    for column, value in self._normalized_values(after).items():
+                        setattr(message_record, column, value)
                     message_record.is_edited = True
                     message_record.edit_timestamp = after.edited_at or datetime.now(timezone.utc)
                     
@@ -276,7 +480,7 @@ class DiscordService:
         try:
             async with db_service.get_session() as session:
                 # Store/update user
-                user_record = await self._store_user(user, session)
+                user_id = await self._store_user(user, session)
                 
                 # Find message
                 result = await session.execute(
@@ -285,19 +489,34 @@ class DiscordService:
                 message_record = result.scalar_one_or_none()
                 
                 if not message_record:
-                    # Process the message first if we don't have it
-                    await self.process_message(reaction.message)
+                    # Not stored yet, e.g. still waiting in the write-behind
+                    # queue, where process_message's dedupe would skip it:
+                    # store it now with its current reactions. Commit the
+                    # user first so the second session doesn't wait on it.
+                    await session.commit()
+                    await self._process_message_direct(reaction.message)
                     return
                 
                 if is_add:
-                    await self._store_reaction(reaction, message_record, user_record, session)
+                    changed = await self._store_reaction(reaction, message_record, user_id, session)
                 else:
-                    await self._remove_reaction(reaction, message_record, user_record, session)
+                    changed = await self._remove_reaction(reaction, message_record, user_id, session)
                 
                 # Update engagement metrics
-                await self._update_engagement_metrics(message_record, session)
+                rollups = RollupChanges()
+                if not settings.engagement_incremental_counters:
+                    await self._update_engagement_metrics(message_record, session, rollups)
+                elif changed:
+                    await session.flush()
+                    applied = await self._counters.apply_reaction(
+                        session, message_record, user_id, is_add, rollups=rollups
+                    )
+                    if not applied:
+                        await self._update_engagement_metrics(message_record, session, rollups)
+                await rollups.apply(session)
         
         except Exception as e:
+            self.invalidate_identity("user", user.id)
             logger.error("Error processing reaction", extra={
                 "error": str(e),
                 "message_id": reaction.message.id,
@@ -306,125 +525,161 @@ class DiscordService:
     
     def _should_rate_limit(self, message_id: str) -> bool:
         """Check if message processing should be rate limited."""
-        now = datetime.now(timezone.utc)
-        
-        # Clean old entries
-        cutoff = now - timedelta(minutes=5)
-        self._message_cache = {
-            k: v for k, v in self._message_cache.items() 
-            if v > cutoff
-        }
-        
-        # Check if we've seen this message recently
-        if message_id in self._message_cache:
-            return True
+        # Skip messages we've seen recently
+        return not self._seen_messages.add(message_id)
+    
+    async def process_guild_update(self, guild: discord.Guild) -> None:
+        """Refresh a guild after Discord reports a change."""
+        self.invalidate_identity("guild", guild.id)
+        try:
+            await self._store_guild(guild)
+        except Exception as e:
+            logger.error("Error processing guild update", extra={
+                "error": str(e),
+                "guild_id": guild.id
+            })
+    
+    async def process_channel_update(self, channel: discord.abc.GuildChannel) -> None:
+        """Refresh a channel after Discord reports a change."""
+        self.invalidate_identity("channel", channel.id)
+        if not isinstance(channel, discord.TextChannel):
+            return
+        try:
+            await self._store_channel(channel, channel.guild)
+        except Exception as e:
+            logger.error("Error processing channel update", extra={
+                "error": str(e),
+                "channel_id": channel.id
+            })
+    
+    def invalidate_identity(self, kind: str, snowflake) -> None:
+        """Drop a cached guild/channel/user identity so the next write refreshes it."""
+        self._identity_cache[kind].invalidate(str(snowflake))
+    
+    def get_identity_cache_stats(self) -> Dict[str, Dict]:
+        """Get hit/miss counters for the guild, channel and user identity caches."""
+        return {kind: cache.get_stats() for kind, cache in self._identity_cache.items()}
+    
+    def _cached_identity(self, kind: str, values: Dict) -> Tuple[str, tuple, Optional[uuid.UUID]]:
+        """Look up an identity; returns (snowflake, fingerprint, cached UUID if unchanged)."""
+        snowflake = values[f"{kind}_id"]
+        fingerprint = tuple(values[column] for column in IDENTITY_UPDATE_COLUMNS[kind])
+        entry = self._identity_cache[kind].get(snowflake)
+        if entry is not None and entry[1] == fingerprint:
+            return snowflake, fingerprint, entry[0]
+        return snowflake, fingerprint, None
+    
+    def _remember_identity(self, session, kind: str, snowflake: str, entry: Tuple[uuid.UUID, tuple]) -> None:
+        """Cache an identity once ``session`` commits; a rollback discards it.
         
-        self._message_cache[message_id] = now
-        return False
+        New rows only exist after the commit, so caching their IDs earlier
+        would hand out UUIDs of rolled-back rows to later writes.
+        """
+        sync_session = session.sync_session
+        if not event.contains(sync_session, "after_commit", _publish_identities):
+            event.listen(sync_session, "after_commit", _publish_identities)
+            event.listen(sync_session, "after_rollback", _discard_identities)
+        sync_session.info.setdefault(PENDING_IDENTITIES, []).append(
+            (self._identity_cache[kind], snowflake, entry)
+        )
     
-    async def _store_guild(self, guild: discord.Guild, session=None) -> DiscordGuild:
-        """Store or update guild information."""
+    async def _store_guild(self, guild: discord.Guild, session=None) -> uuid.UUID:
+        """Store or update guild information; returns the guild's database ID."""
+        values = self._guild_values(guild)
+        snowflake, fingerprint, cached_id = self._cached_identity("guild", values)
+        if cached_id:
+            return cached_id
+        
         if session is None:
             async with db_service.get_session() as session:
                 return await self._store_guild(guild, session)
         
         # Check if guild exists
         result = await session.execute(
-            select(DiscordGuild).where(DiscordGuild.guild_id == str(guild.id))
+            select(DiscordGuild).where(DiscordGuild.guild_id == snowflake)
         )
         guild_record = result.scalar_one_or_none()
         
         if not guild_record:
-            guild_record = DiscordGuild(
-                guild_id=str(guild.id),
-                name=guild.name,
-                description=guild.description,
-                member_count=guild.member_count,
-                is_active=True
-            )
+            guild_record = DiscordGuild(**values)
             session.add(guild_record)
         else:
             # Update existing record
-            guild_record.name = guild.name
-            guild_record.description = guild.description
-            guild_record.member_count = guild.member_count
+            for column in IDENTITY_UPDATE_COLUMNS["guild"]:
+                setattr(guild_record, column, values[column])
         
         await session.flush()
-        return guild_record
+        self._remember_identity(session, "guild", snowflake, (guild_record.id, fingerprint))
+        return guild_record.id
     
-    async def _store_channel(self, channel: discord.TextChannel, guild: discord.Guild, session=None) -> DiscordChannel:
-        """Store or update channel information."""
+    async def _store_channel(self, channel: discord.TextChannel, guild: discord.Guild, session=None) -> uuid.UUID:
+        """Store or update channel information; returns the channel's database ID."""
+        values = self._channel_values(channel)
+        snowflake, fingerprint, cached_id = self._cached_identity("channel", values)
+        if cached_id:
+            return cached_id
+        
         if session is None:
             async with db_service.get_session() as session:
                 return await self._store_channel(channel, guild, session)
         
-        # Get guild record
-        guild_result = await session.execute(
-            select(DiscordGuild).where(DiscordGuild.guild_id == str(guild.id))
-        )
-        guild_record = guild_result.scalar_one()
+        guild_id = await self._store_guild(guild, session)
         
         # Check if channel exists
         result = await session.execute(
-            select(DiscordChannel).where(DiscordChannel.channel_id == str(channel.id))
+            select(DiscordChannel).where(DiscordChannel.channel_id == snowflake)
         )
         channel_record = result.scalar_one_or_none()
         
         if not channel_record:
-            channel_record = DiscordChannel(
-                channel_id=str(channel.id),
-                guild_id=guild_record.id,
-                name=channel.name,
-                channel_type=str(channel.type),
-                topic=channel.topic,
-                is_monitored=self._monitor_all_channels or str(channel.id) in self._monitored_channels
-            )
+            channel_record = DiscordChannel(guild_id=guild_id, **values)
             session.add(channel_record)
         else:
             # Update existing record
-            channel_record.name = channel.name
-            channel_record.topic = channel.topic
-            channel_record.is_monitored = self._monitor_all_channels or str(channel.id) in self._monitored_channels
+            for column in IDENTITY_UPDATE_COLUMNS["channel"]:
+                setattr(channel_record, column, values[column])
         
         await session.flush()
-        return channel_record
+        await refresh_leaderboard_names(session, channel_ids=[channel_record.id])
+        self._remember_identity(session, "channel", snowflake, (channel_record.id, fingerprint))
+        return channel_record.id
     
-    async def _store_user(self, user: discord.User, session=None) -> DiscordUser:
-        """Store or update user information."""
+    async def _store_user(self, user: discord.User, session=None) -> uuid.UUID:
+        """Store or update user information; returns the user's database ID."""
+        values = self._user_values(user)
+        snowflake, fingerprint, cached_id = self._cached_identity("user", values)
+        if cached_id:
+            return cached_id
+        
         if session is None:
             async with db_service.get_session() as session:
                 return await self._store_user(user, session)
         
         # Check if user exists
         result = await session.execute(
-            select(DiscordUser).where(DiscordUser.user_id == str(user.id))
+            select(DiscordUser).where(DiscordUser.user_id == snowflake)
         )
         user_record = result.scalar_one_or_none()
         
         if not user_record:
-            user_record = DiscordUser(
-                user_id=str(user.id),
-                username=user.name,
-                display_name=user.display_name,
-                avatar_url=str(user.avatar.url) if user.avatar else None,
-                is_bot=user.bot
-            )
+            user_record = DiscordUser(**values)
             session.add(user_record)
         else:
             # Update existing record
-            user_record.username = user.name
-            user_record.display_name = user.display_name
-            user_record.avatar_url = str(user.avatar.url) if user.avatar else None
+            for column in IDENTITY_UPDATE_COLUMNS["user"]:
+                setattr(user_record, column, values[column])
         
         await session.flush()
-        return user_record
+        await refresh_leaderboard_names(session, user_ids=[user_record.id])
+        self._remember_identity(session, "user", snowflake, (user_record.id, fingerprint))
+        return user_record.id
     
     async def _store_message(
         self, 
         message: discord.Message, 
-        user_record: DiscordUser,
-        guild_record: DiscordGuild,
-        channel_record: DiscordChannel,
+        user_id: uuid.UUID,
+        guild_id: uuid.UUID,
+        channel_id: uuid.UUID,
         session
     ) -> DiscordMessage:
         """Store message information."""
@@ -437,43 +692,243 @@ class DiscordService:
         if existing_message:
             return existing_message
         
-        # Determine parent message for replies
-        parent_message_id = None
-        if message.reference and message.reference.message_id:
-            parent_message_id = str(message.reference.message_id)
-        
         # Create message record
         message_record = DiscordMessage(
-            message_id=str(message.id),
-            guild_id=guild_record.id,
-            channel_id=channel_record.id,
-            author_id=user_record.id,
-            content=message.content,
-            clean_content=message.clean_content,
-            message_type=str(message.type),
-            thread_id=str(message.thread.id) if hasattr(message, 'thread') and message.thread else None,
-            parent_message_id=parent_message_id,
-            is_edited=message.edited_at is not None,
-            edit_timestamp=message.edited_at,
-            is_pinned=message.pinned,
-            has_attachments=len(message.attachments) > 0,
-            attachment_urls=[str(att.url) for att in message.attachments] if message.attachments else None,
-            has_embeds=len(message.embeds) > 0,
-            embed_data=[embed.to_dict() for embed in message.embeds] if message.embeds else None,
-            created_at=message.created_at
+            guild_id=guild_id,
+            channel_id=channel_id,
+            author_id=user_id,
+            **self._message_values(message)
         )
         
         session.add(message_record)
         await session.flush()
         return message_record
     
+    async def _store_message_batch(self, messages: List[discord.Message]) -> None:
+        """Store a batch of live messages in one transaction.
+        
+        Guilds, channels and users are de-duplicated within the batch and
+        written with multi-row INSERT ... ON CONFLICT statements; messages and
+        their initial engagement metrics are inserted the same way.
+        """
+        async with db_service.get_session() as session:
+            new_message_ids = await self._write_message_batch(session, messages)
+        
+        logger.debug("Flushed message batch", extra={
+            "messages": len(messages),
+            "new_messages": len(new_message_ids)
+        })
+    
+    async def _write_message_batch(self, session, messages: List[discord.Message]) -> Dict[str, uuid.UUID]:
+        """Write a message batch within ``session``; returns IDs of newly inserted messages."""
+        guild_rows = {str(m.guild.id): self._guild_values(m.guild) for m in messages}
+        guild_ids = await self._upsert_identities(session, "guild", DiscordGuild, guild_rows)
+        
+        channel_rows = {
+            str(m.channel.id): {
+                "guild_id": guild_ids[str(m.guild.id)],
+                **self._channel_values(m.channel)
+            }
+            for m in messages
+        }
+        channel_ids = await self._upsert_identities(session, "channel", DiscordChannel, channel_rows)
+        
+        user_rows = {str(m.author.id): self._user_values(m.author) for m in messages}
+        user_ids = await self._upsert_identities(session, "user", DiscordUser, user_rows)
+        
+        message_rows = {
+            str(m.id): {
+                "id": uuid.uuid4(),
+                "guild_id": guild_ids[str(m.guild.id)],
+                "channel_id": channel_ids[str(m.channel.id)],
+                "author_id": user_ids[str(m.author.id)],
+                **self._message_values(m)
+            }
+            for m in messages
+        }
+        message_stmt = upsert_insert(session, DiscordMessage).values(list(message_rows.values()))
+        result = await session.execute(
+            message_stmt.on_conflict_do_nothing(index_elements=[DiscordMessage.message_id])
+            .returning(DiscordMessage.id, DiscordMessage.message_id)
+        )
+        new_message_ids = {row.message_id: row.id for row in result.all()}
+        rollups = RollupChanges()
+        
+        if new_message_ids:
+            metrics_stmt = upsert_insert(session, EngagementMetrics).values([
+                {
+                    "id": uuid.uuid4(),
+                    "message_id": record_id,
+                    "reply_count": 0,
+                    "reaction_count": 0,
+                    "unique_reactors": 0,
+                    "thread_depth": 0,
+                    "engagement_score": 0.0,
+                    "trending_score": 0.0,
+                    "discussion_participants": 1,  # At least the author
+                    "last_activity": message_rows[message_id]["created_at"]
+                }
+                for message_id, record_id in new_message_ids.items()
+            ])
+            await session.execute(
+                metrics_stmt.on_conflict_do_nothing(index_elements=[EngagementMetrics.message_id])
+            )
+            await refresh_leaderboard(session, list(new_message_ids.values()))
+            for message_id in new_message_ids:
+                rollups.add_message(message_rows[message_id]["created_at"], 0.0)
+        
+        # Replies bump their parent's counters (parents may be in this batch)
+        replies_by_parent: Dict[str, List[Dict]] = {}
+        for message_id in new_message_ids:
+            row = message_rows[message_id]
+            if row["parent_message_id"]:
+                replies_by_parent.setdefault(row["parent_message_id"], []).append(row)
+        
+        for parent_id, replies in replies_by_parent.items():
+            if settings.engagement_incremental_counters:
+                await self._counters.apply_replies(
+                    session,
+                    parent_id,
+                    [reply["author_id"] for reply in replies],
+                    max(reply["created_at"] for reply in replies),
+                    rollups=rollups
+                )
+            else:
+                parent_result = await session.execute(
+                    select(DiscordMessage).where(DiscordMessage.message_id == parent_id)
+                )
+                parent_record = parent_result.scalar_one_or_none()
+                if parent_record:
+                    await self._update_engagement_metrics(parent_record, session, rollups)
+        
+        await rollups.apply(session)
+        return new_message_ids
+    
+    async def _upsert_identities(
+        self,
+        session,
+        kind: str,
+        model,
+        rows: Dict[str, Dict]
+    ) -> Dict[str, uuid.UUID]:
+        """Upsert guild/channel/user rows, skipping those the identity cache has unchanged."""
+        ids: Dict[str, uuid.UUID] = {}
+        pending: Dict[str, Tuple[Dict, tuple]] = {}
+        for snowflake, values in rows.items():
+            _, fingerprint, cached_id = self._cached_identity(kind, values)
+            if cached_id:
+                ids[snowflake] = cached_id
+            else:
+                pending[snowflake] = (values, fingerprint)
+        
+        if pending:
+            upserted = await self._upsert_rows(
+                session,
+                model,
+                f"{kind}_id",
+                [values for values, _ in pending.values()],
+                IDENTITY_UPDATE_COLUMNS[kind]
+            )
+            for snowflake, record_id in upserted.items():
+                self._remember_identity(session, kind, snowflake, (record_id, pending[snowflake][1]))
+            ids.update(upserted)
+            # Renamed channels and users: leaderboard rows carry their names
+            if kind == "channel":
+                await refresh_leaderboard_names(session, channel_ids=list(upserted.values()))
+            elif kind == "user":
+                await refresh_leaderboard_names(session, user_ids=list(upserted.values()))
+        
+        return ids
+    
+    async def _upsert_rows(
+        self,
+        session,
+        model,
+        key: str,
+        rows,
+        update_columns: List[str]
+    ) -> Dict[str, uuid.UUID]:
+        """Multi-row upsert keyed by a Discord snowflake; returns snowflake -> UUID."""
+        stmt = upsert_insert(session, model).values([{"id": uuid.uuid4(), **row} for row in rows])
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        set_["updated_at"] = func.now()
+        result = await session.execute(
+            stmt.on_conflict_do_update(index_elements=[getattr(model, key)], set_=set_)
+            .returning(model.id, getattr(model, key))
+        )
+        return {row[1]: row[0] for row in result.all()}
+    
+    def _guild_values(self, guild: discord.Guild) -> Dict:
+        """Column values for a guild row."""
+        return {
+            "guild_id": str(guild.id),
+            "name": guild.name,
+            "description": guild.description,
+            "member_count": guild.member_count,
+            "is_active": True
+        }
+    
+    def _channel_values(self, channel: discord.TextChannel) -> Dict:
+        """Column values for a channel row (without the guild reference)."""
+        return {
+            "channel_id": str(channel.id),
+            "name": channel.name,
+            "channel_type": str(channel.type),
+            "topic": channel.topic,
+            "is_monitored": self._monitor_all_channels or str(channel.id) in self._monitored_channels
+        }
+    
+    def _user_values(self, user: discord.User) -> Dict:
+        """Column values for a user row."""
+        return {
+            "user_id": str(user.id),
+            "username": user.name,
+            "display_name": user.display_name,
+            "avatar_url": str(user.avatar.url) if user.avatar else None,
+            "is_bot": user.bot
+        }
+    
+    def _message_values(self, message: discord.Message) -> Dict:
+        """Column values for a message row (without guild/channel/author references)."""
+        # Determine parent message for replies
+        parent_message_id = None
+        if message.reference and message.reference.message_id:
+            parent_message_id = str(message.reference.message_id)
+        
+        return {
+            "message_id": str(message.id),
+            "content": message.content,
+            "clean_content": message.clean_content,
+            **self._normalized_values(message),
+            "message_type": str(message.type),
+            "thread_id": str(message.thread.id) if hasattr(message, 'thread') and message.thread else None,
+            "parent_message_id": parent_message_id,
+            "is_edited": message.edited_at is not None,
+            "edit_timestamp": message.edited_at,
+            "is_pinned": message.pinned,
+            "has_attachments": len(message.attachments) > 0,
+            "attachment_urls": [str(att.url) for att in message.attachments] if message.attachments else None,
+            "has_embeds": len(message.embeds) > 0,
+            "embed_data": [embed.to_dict() for embed in message.embeds] if message.embeds else None,
+            "created_at": message.created_at
+        }
+    
+    def _normalized_values(self, message: discord.Message) -> Dict:
+        """Normalized content columns, parsed once at ingest so agents need not."""
+        parsed = parse_discord_content(message.content, str(message.id))
+        return {
+            "normalized_content": parsed.clean_text,
+            "content_urls": list(parsed.urls) or None,
+            "code_languages": parsed.code_languages or None
+        }
+    
     async def _store_reactions(self, reaction: discord.Reaction, message_record: DiscordMessage, session) -> None:
         """Store reaction information."""
         # Get all users who reacted
         try:
             async for user in reaction.users():
-                user_record = await self._store_user(user, session)
-                await self._store_reaction(reaction, message_record, user_record, session)
+                user_id = await self._store_user(user, session)
+                await self._store_reaction(reaction, message_record, user_id, session)
         except Exception as e:
             logger.warning("Could not fetch reaction users", extra={
                 "error": str(e),
@@ -484,10 +939,14 @@ class DiscordService:
         self, 
         reaction: discord.Reaction, 
         message_record: DiscordMessage, 
-        user_record: DiscordUser, 
+        user_id: uuid.UUID, 
         session
-    ) -> None:
-        """Store individual reaction."""
+    ) -> bool:
+        """Store individual reaction.
+        
+        Returns:
+            True if a new reaction row was added.
+        """
         emoji_str = str(reaction.emoji)
         emoji_id = None
         is_custom = False
@@ -500,7 +959,7 @@ class DiscordService:
         result = await session.execute(
             select(MessageReaction).where(
                 MessageReaction.message_id == message_record.id,
-                MessageReaction.user_id == user_record.id,
+                MessageReaction.user_id == user_id,
                 MessageReaction.emoji == emoji_str
             )
         )
@@ -509,27 +968,33 @@ class DiscordService:
         if not existing_reaction:
             reaction_record = MessageReaction(
                 message_id=message_record.id,
-                user_id=user_record.id,
+                user_id=user_id,
                 emoji=emoji_str,
                 emoji_id=emoji_id,
                 is_custom=is_custom
             )
             session.add(reaction_record)
+            return True
+        return False
     
     async def _remove_reaction(
         self,
         reaction: discord.Reaction,
         message_record: DiscordMessage,
-        user_record: DiscordUser,
+        user_id: uuid.UUID,
         session
-    ) -> None:
-        """Remove reaction from database."""
+    ) -> bool:
+        """Remove reaction from database.
+        
+        Returns:
+            True if a reaction row was deleted.
+        """
         emoji_str = str(reaction.emoji)
         
         result = await session.execute(
             select(MessageReaction).where(
                 MessageReaction.message_id == message_record.id,
-                MessageReaction.user_id == user_record.id,
+                MessageReaction.user_id == user_id,
                 MessageReaction.emoji == emoji_str
             )
         )
@@ -537,9 +1002,23 @@ class DiscordService:
         
         if reaction_record:
             await session.delete(reaction_record)
+            return True
+        return False
     
-    async def _initialize_engagement_metrics(self, message_record: DiscordMessage, session) -> None:
-        """Initialize engagement metrics for a message."""
+    async def _initialize_engagement_metrics(
+        self,
+        message_record: DiscordMessage,
+        session,
+        rollups: Optional[RollupChanges] = None
+    ) -> bool:
+        """Initialize engagement metrics for a message.
+        
+        A new message is counted in ``rollups`` when given, otherwise in
+        the daily rollups straight away.
+        
+        Returns:
+            True if a new metrics row was created.
+        """
         # Check if metrics already exist
         result = await session.execute(
             select(EngagementMetrics).where(EngagementMetrics.message_id == message_record.id)
@@ -559,9 +1038,27 @@ class DiscordService:
                 last_activity=message_record.created_at
             )
             session.add(metrics)
+            await session.flush()
+            await refresh_leaderboard(session, [message_record.id])
+            
+            pending = rollups if rollups is not None else RollupChanges()
+            pending.add_message(message_record.created_at, metrics.engagement_score)
+            if rollups is None:
+                await pending.apply(session)
+            return True
+        return False
     
-    async def _update_engagement_metrics(self, message_record: DiscordMessage, session) -> None:
-        """Update engagement metrics for a message."""
+    async def _update_engagement_metrics(
+        self,
+        message_record: DiscordMessage,
+        session,
+        rollups: Optional[RollupChanges] = None
+    ) -> None:
+        """Update engagement metrics for a message.
+        
+        The rescore is recorded in ``rollups`` when given, otherwise applied
+        to the daily rollups straight away.
+        """
         # Get current metrics
         result = await session.execute(
             select(EngagementMetrics).where(EngagementMetrics.message_id == message_record.id)
@@ -569,8 +1066,9 @@ class DiscordService:
         metrics = result.scalar_one_or_none()
 
         if not metrics:
-            await self._initialize_engagement_metrics(message_record, session)
+            await self._initialize_engagement_metrics(message_record, session, rollups)
             return
+        old_score = metrics.engagement_score
 
         # Count reactions
         reaction_result = await session.execute(
@@ -589,53 +1087,60 @@ class DiscordService:
         )
         metrics.reply_count = reply_result.scalar() or 0
 
-        # Count unique participants in discussion
+        # Count unique participants in discussion, thread peers included
+        sources = participant_sources([message_record.message_id])
         participant_result = await session.execute(
-            select(func.count(func.distinct(DiscordMessage.author_id)))
-            .where(
-                (DiscordMessage.message_id == message_record.message_id) |
-                (DiscordMessage.parent_message_id == message_record.message_id)
-            )
+            select(func.count(func.distinct(sources.c.author_id)))
         )
         metrics.discussion_participants = participant_result.scalar() or 1
 
         metrics.last_activity = datetime.now(timezone.utc)
 
         # Calculate basic engagement score
-        metrics.engagement_score = self._calculate_engagement_score(
+        metrics.engagement_score = engagement_scorer.score(
             reply_count=metrics.reply_count,
             reaction_count=metrics.reaction_count,
             unique_reactors=metrics.unique_reactors,
             discussion_participants=metrics.discussion_participants,
-            message_age_hours=(datetime.now(timezone.utc) - message_record.created_at).total_seconds() / 3600
+            thread_depth=metrics.thread_depth or 0,
+            message_age_hours=(datetime.now(timezone.utc) - message_record.created_at).total_seconds() / 3600,
+            keyword_count=len(set(metrics.extracted_keywords or []))
         )
-    
-    def _calculate_engagement_score(
-        self, 
-        reply_count: int, 
-        reaction_count: int, 
-        unique_reactors: int,
-        discussion_participants: int,
-        message_age_hours: float
-    ) -> float:
-        """Calculate engagement score for a message."""
-        # Weight factors
-        reply_weight = 0.4
-        reaction_weight = 0.2
-        participant_weight = 0.3
-        recency_weight = 0.1
-        
-        # Recency multiplier (decay over time)
-        recency_multiplier = max(0.1, 1.0 - (message_age_hours / 168))  # Decay over 7 days
-        
-        score = (
-            reply_count * reply_weight +
-            reaction_count * reaction_weight +
-            unique_reactors * participant_weight +
-            recency_multiplier * recency_weight * 10  # Base recency score
+        # Activity was just recorded, so the message trends at full weight
+        metrics.trending_score = engagement_scorer.trending(metrics.engagement_score, 0.0)
+        await session.flush()
+        await refresh_leaderboard(session, [message_record.id])
+        
+        pending = rollups if rollups is not None else RollupChanges()
+        pending.rescore(
+            message_record.created_at,
+            old_score,
+            metrics.engagement_score,
+            metrics.extracted_keywords,
+            metrics.extracted_keywords
         )
+        if rollups is None:
+            await pending.apply(session)
+    
+    async def reconcile_engagement(self, days: Optional[int] = None) -> int:
+        """Recompute engagement metrics from source rows to correct counter drift."""
+        from discord_bot.services.engagement_service import engagement_service
+        
+        if days is None:
+            days = settings.engagement_reconcile_days
+        
+        updated = await engagement_service.bulk_update_engagement(days=days)
+        self._counters.reset()
         
-        return round(score, 2)
+        logger.info("Engagement counters reconciled", extra={
+            "messages_updated": updated,
+            "days": days
+        })
+        return updated
+    
+    def get_ingest_stats(self) -> Dict:
+        """Get write-behind ingestion queue statistics."""
+        return self._ingest_queue.get_stats()
     
     @property
     def is_running(self) -> bool:
@@ -0,0 +1,307 @@
+"""Incremental, event-driven engagement counters."""
+
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+import uuid
+
+from sqlalchemy import func, select, union, update
+from sqlalchemy.orm import aliased
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+from discord_bot.services.engagement_rollups import RollupChanges
+from discord_bot.services.engagement_scoring import engagement_scorer
+from discord_bot.services.leaderboard import refresh_leaderboard
+from discord_bot.models.discord_models import (
+    DiscordMessage, EngagementMetrics, MessageReaction
+)
+
+logger = get_logger(__name__)
+
+SeedLoader = Callable[[], Awaitable[Dict[uuid.UUID, int]]]
+ScoreFunction = Callable[..., float]
+TrendingFunction = Callable[[float, float], float]
+
+
+def participant_sources(discord_ids: Sequence[str]):
+    """Messages that make their authors participants of each root message.
+    
+    Rows of ``(root_id, source_id, author_id)``: the root itself, its
+    replies and every message in the root's thread, each message once per
+    root. Count distinct ``author_id`` per root for the participant count.
+    """
+    thread_peer = aliased(DiscordMessage)
+    return union(
+        select(
+            DiscordMessage.message_id.label("root_id"),
+            DiscordMessage.id.label("source_id"),
+            DiscordMessage.author_id.label("author_id")
+        ).where(DiscordMessage.message_id.in_(discord_ids)),
+        select(
+            DiscordMessage.parent_message_id.label("root_id"),
+            DiscordMessage.id.label("source_id"),
+            DiscordMessage.author_id.label("author_id")
+        ).where(DiscordMessage.parent_message_id.in_(discord_ids)),
+        select(
+            DiscordMessage.message_id.label("root_id"),
+            thread_peer.id.label("source_id"),
+            thread_peer.author_id.label("author_id")
+        )
+        .join(thread_peer, thread_peer.thread_id == DiscordMessage.thread_id)
+        .where(DiscordMessage.message_id.in_(discord_ids))
+        .where(DiscordMessage.thread_id.isnot(None))
+    ).subquery()
+
+
+class MessageUserIndex:
+    """Bounded per-message multiset of user IDs.
+
+    Each entry maps a user to the number of rows they contributed to a
+    message (reactions or discussion messages), which is enough to tell
+    whether an add/remove event changes the set of distinct users. Entries
+    are seeded lazily from the database on first touch and evicted in LRU
+    order once ``max_messages`` is exceeded.
+    """
+
+    def __init__(self, max_messages: int):
+        self._max_messages = max_messages
+        self._entries: "OrderedDict[Hashable, Dict[uuid.UUID, int]]" = OrderedDict()
+
+    async def add(self, key: Hashable, user_id: uuid.UUID, seed: SeedLoader) -> bool:
+        """Record a row for ``user_id``; return True if the user is new to ``key``.
+
+        ``seed`` must reflect the database *after* the row was written.
+        """
+        return await self.add_many(key, [user_id], seed) == 1
+
+    async def add_many(self, key: Hashable, user_ids: List[uuid.UUID], seed: SeedLoader) -> int:
+        """Record one row per entry in ``user_ids``; return how many users are new.
+
+        ``seed`` must reflect the database *after* all rows were written.
+        """
+        added = Counter(user_ids)
+        counts = self._entries.get(key)
+        if counts is None:
+            counts = await self._seed(key, seed)
+            return sum(1 for user_id, n in added.items() if counts.get(user_id, 0) == n)
+
+        self._entries.move_to_end(key)
+        new_users = 0
+        for user_id, n in added.items():
+            if counts.get(user_id, 0) == 0:
+                new_users += 1
+            counts[user_id] = counts.get(user_id, 0) + n
+        return new_users
+
+    async def remove(self, key: Hashable, user_id: uuid.UUID, seed: SeedLoader) -> bool:
+        """Drop a row for ``user_id``; return True if the user left ``key``."""
+        counts = self._entries.get(key)
+        if counts is None:
+            counts = await self._seed(key, seed)
+            return user_id not in counts
+
+        self._entries.move_to_end(key)
+        remaining = counts.get(user_id, 0) - 1
+        if remaining > 0:
+            counts[user_id] = remaining
+            return False
+        return counts.pop(user_id, None) is not None
+
+    def clear(self) -> None:
+        """Forget all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _seed(self, key: Hashable, seed: SeedLoader) -> Dict[uuid.UUID, int]:
+        counts = dict(await seed())
+        self._entries[key] = counts
+        while len(self._entries) > self._max_messages:
+            self._entries.popitem(last=False)
+        return counts
+
+
+class EngagementCounters:
+    """Apply reaction and reply events to ``EngagementMetrics`` as deltas.
+
+    Counts are adjusted with atomic ``SET x = x + n`` statements so an event
+    costs O(1) queries regardless of how many reactions or replies a message
+    already has. Drift is corrected by a periodic reconciliation job that
+    recomputes metrics from source rows.
+    """
+
+    def __init__(
+        self,
+        score_fn: ScoreFunction,
+        max_messages: Optional[int] = None,
+        trending_fn: TrendingFunction = engagement_scorer.trending
+    ):
+        if max_messages is None:
+            max_messages = settings.engagement_counter_cache_size
+        self._score_fn = score_fn
+        self._trending_fn = trending_fn
+        self._reactors = MessageUserIndex(max_messages)
+        self._participants = MessageUserIndex(max_messages)
+
+    async def apply_reaction(
+        self,
+        session,
+        message_record: DiscordMessage,
+        user_id: uuid.UUID,
+        is_add: bool,
+        rollups: Optional[RollupChanges] = None
+    ) -> bool:
+        """Apply a stored/removed reaction; return False if no metrics row exists.
+        
+        The rescore is recorded in ``rollups`` when given (the caller applies
+        it), otherwise applied to the daily rollups straight away.
+        """
+        async def seed() -> Dict[uuid.UUID, int]:
+            result = await session.execute(
+                select(MessageReaction.user_id, func.count(MessageReaction.id))
+                .where(MessageReaction.message_id == message_record.id)
+                .group_by(MessageReaction.user_id)
+            )
+            return {row[0]: row[1] for row in result.all()}
+
+        if is_add:
+            changed = await self._reactors.add(message_record.id, user_id, seed)
+            delta = 1
+        else:
+            changed = await self._reactors.remove(message_record.id, user_id, seed)
+            delta = -1
+
+        return await self._apply_delta(
+            session,
+            message_record.id,
+            message_record.created_at,
+            rollups=rollups,
+            reaction_count=delta,
+            unique_reactors=delta if changed else 0
+        )
+
+    async def apply_replies(
+        self,
+        session,
+        parent_id: str,
+        author_ids: List[uuid.UUID],
+        replied_at: datetime,
+        rollups: Optional[RollupChanges] = None
+    ) -> bool:
+        """Apply newly stored replies (one author per reply) to their parent's metrics."""
+        parent_result = await session.execute(
+            select(DiscordMessage.id, DiscordMessage.created_at)
+            .where(DiscordMessage.message_id == parent_id)
+        )
+        parent = parent_result.one_or_none()
+        if parent is None:
+            return False
+
+        async def seed() -> Dict[uuid.UUID, int]:
+            # Same participants as the bulk engine: author, repliers and thread peers
+            sources = participant_sources([parent_id])
+            result = await session.execute(
+                select(sources.c.author_id, func.count(sources.c.source_id))
+                .group_by(sources.c.author_id)
+            )
+            return {row[0]: row[1] for row in result.all()}
+
+        new_participants = await self._participants.add_many(parent_id, author_ids, seed)
+
+        return await self._apply_delta(
+            session,
+            parent.id,
+            parent.created_at,
+            reply_count=len(author_ids),
+            discussion_participants=new_participants,
+            activity_at=replied_at,
+            rollups=rollups
+        )
+
+    def reset(self) -> None:
+        """Drop cached per-message structures (e.g. after reconciliation)."""
+        self._reactors.clear()
+        self._participants.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get sizes of the in-memory per-message structures."""
+        return {
+            "tracked_reaction_messages": len(self._reactors),
+            "tracked_discussions": len(self._participants),
+        }
+
+    async def _apply_delta(
+        self,
+        session,
+        metrics_message_id: uuid.UUID,
+        message_created_at: datetime,
+        activity_at: Optional[datetime] = None,
+        rollups: Optional[RollupChanges] = None,
+        **deltas: int
+    ) -> bool:
+        now = datetime.now(timezone.utc)
+        values = {
+            name: getattr(EngagementMetrics, name) + delta
+            for name, delta in deltas.items()
+            if delta
+        }
+        values["last_activity"] = activity_at or now
+
+        result = await session.execute(
+            update(EngagementMetrics)
+            .where(EngagementMetrics.message_id == metrics_message_id)
+            .values(**values)
+            .returning(
+                EngagementMetrics.reply_count,
+                EngagementMetrics.reaction_count,
+                EngagementMetrics.unique_reactors,
+                EngagementMetrics.discussion_participants,
+                EngagementMetrics.thread_depth,
+                EngagementMetrics.extracted_keywords,
+                EngagementMetrics.engagement_score,
+                EngagementMetrics.last_activity
+            )
+            .execution_options(synchronize_session=False)
+        )
+        counts = result.one_or_none()
+        if counts is None:
+            return False
+
+        created_at = message_created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+        score = self._score_fn(
+            reply_count=counts.reply_count,
+            reaction_count=counts.reaction_count,
+            unique_reactors=counts.unique_reactors,
+            discussion_participants=counts.discussion_participants,
+            thread_depth=counts.thread_depth or 0,
+            message_age_hours=(now - created_at).total_seconds() / 3600,
+            keyword_count=len(set(counts.extracted_keywords or []))
+        )
+        last_activity = counts.last_activity
+        if last_activity.tzinfo is None:
+            last_activity = last_activity.replace(tzinfo=timezone.utc)
+        trending = self._trending_fn(score, max(0.0, (now - last_activity).total_seconds() / 3600))
+        await session.execute(
+            update(EngagementMetrics)
+            .where(EngagementMetrics.message_id == metrics_message_id)
+            .values(engagement_score=score, trending_score=trending)
+            .execution_options(synchronize_session=False)
+        )
+        await refresh_leaderboard(session, [metrics_message_id])
+        
+        pending = rollups if rollups is not None else RollupChanges()
+        pending.rescore(
+            created_at,
+            counts.engagement_score,
+            score,
+            counts.extracted_keywords,
+            counts.extracted_keywords
+        )
+        if rollups is None:
+            await pending.apply(session)
+        return True
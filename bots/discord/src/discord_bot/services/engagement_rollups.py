@@ -0,0 +1,243 @@
+"""Daily engagement rollups backing engagement summaries."""
+
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func, select
+
+from discord_bot.core.config import settings
+from discord_bot.services.database import upsert_insert
+from discord_bot.models.discord_models import (
+    DiscordMessage, EngagementDailyRollup, EngagementMetrics
+)
+
+# Lower bounds of the engagement score histogram buckets
+SCORE_BUCKETS = (0, 1, 2, 5, 10, 20)
+
+
+def score_bucket(score: float) -> str:
+    """Histogram bucket label for an engagement score."""
+    for lower, upper in zip(SCORE_BUCKETS, SCORE_BUCKETS[1:]):
+        if score < upper:
+            return f"{lower}-{upper}"
+    return f"{SCORE_BUCKETS[-1]}+"
+
+
+def utc_day(value: datetime) -> date:
+    """UTC calendar day of a timestamp (naive timestamps are taken as UTC)."""
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
+
+
+def _empty_counts() -> Dict[str, Any]:
+    """Zeroed rollup counters."""
+    return {
+        "message_count": 0,
+        "scored_count": 0,
+        "high_engagement_count": 0,
+        "score_sum": 0.0,
+        "score_histogram": Counter(),
+        "keyword_counts": Counter(),
+    }
+
+
+async def refresh_daily_rollups(session, days: Iterable[date]) -> None:
+    """Recompute rollups for ``days`` from messages and metrics.
+    
+    Reads each day's messages once and writes all rollups with a single
+    multi-row upsert in the caller's transaction.
+    """
+    days = sorted(set(days))
+    if not days:
+        return
+    
+    start = datetime.combine(days[0], time.min, tzinfo=timezone.utc)
+    end = datetime.combine(days[-1] + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    result = await session.execute(
+        select(
+            DiscordMessage.created_at,
+            EngagementMetrics.engagement_score,
+            EngagementMetrics.extracted_keywords
+        )
+        .outerjoin(EngagementMetrics, EngagementMetrics.message_id == DiscordMessage.id)
+        .where(DiscordMessage.created_at >= start)
+        .where(DiscordMessage.created_at < end)
+    )
+    
+    wanted = set(days)
+    rollups: Dict[date, Dict[str, Any]] = {day: {"day": day, **_empty_counts()} for day in days}
+    for created_at, score, keywords in result.all():
+        day = utc_day(created_at)
+        if day not in wanted:
+            continue
+        rollup = rollups[day]
+        rollup["message_count"] += 1
+        if score is None:
+            continue
+        rollup["scored_count"] += 1
+        rollup["score_sum"] += score
+        rollup["score_histogram"][score_bucket(score)] += 1
+        if score >= settings.min_engagement_score:
+            rollup["high_engagement_count"] += 1
+        if keywords:
+            rollup["keyword_counts"].update(keywords)
+    
+    await _upsert_rollups(session, [
+        {
+            **rollup,
+            "score_histogram": dict(rollup["score_histogram"]),
+            "keyword_counts": dict(rollup["keyword_counts"]),
+        }
+        for rollup in rollups.values()
+    ])
+
+
+async def _upsert_rollups(session, rows: List[Dict[str, Any]]) -> None:
+    """Write complete rollup rows with a single multi-row upsert."""
+    stmt = upsert_insert(session, EngagementDailyRollup).values(rows)
+    set_ = {column: stmt.excluded[column] for column in rows[0] if column != "day"}
+    set_["updated_at"] = func.now()
+    await session.execute(
+        stmt.on_conflict_do_update(index_elements=[EngagementDailyRollup.day], set_=set_)
+    )
+
+
+class RollupChanges:
+    """Score changes to fold into the daily rollups, grouped by UTC day.
+    
+    Live scoring paths record each message they add or rescore and apply
+    the batch once, in their own transaction, so rollups stay current
+    without rescanning a day's messages.
+    """
+    
+    def __init__(self):
+        self._days: Dict[date, Dict[str, Any]] = {}
+    
+    def __bool__(self) -> bool:
+        return bool(self._days)
+    
+    def add_message(
+        self,
+        created_at: datetime,
+        score: Optional[float] = None,
+        keywords: Optional[Sequence[str]] = None
+    ) -> None:
+        """Count a newly stored message, scored if ``score`` is given."""
+        self._delta(created_at)["message_count"] += 1
+        self._count(created_at, score, keywords, 1)
+    
+    def rescore(
+        self,
+        created_at: datetime,
+        old_score: Optional[float],
+        new_score: Optional[float],
+        old_keywords: Optional[Sequence[str]] = None,
+        new_keywords: Optional[Sequence[str]] = None
+    ) -> None:
+        """Move an existing message from its old score and keywords to new ones."""
+        if old_score == new_score and list(old_keywords or []) == list(new_keywords or []):
+            return
+        self._count(created_at, old_score, old_keywords, -1)
+        self._count(created_at, new_score, new_keywords, 1)
+    
+    async def apply(self, session) -> None:
+        """Fold the recorded changes into the rollups within ``session``."""
+        if not self._days:
+            return
+        
+        days = sorted(self._days)
+        # Create missing days as zero rows first, so concurrent writers all
+        # lock and add to the same row instead of overwriting each other
+        await session.execute(
+            upsert_insert(session, EngagementDailyRollup)
+            .values([
+                {"day": day, **_empty_counts(), "score_histogram": {}, "keyword_counts": {}}
+                for day in days
+            ])
+            .on_conflict_do_nothing(index_elements=[EngagementDailyRollup.day])
+        )
+        result = await session.execute(
+            select(
+                EngagementDailyRollup.day,
+                EngagementDailyRollup.message_count,
+                EngagementDailyRollup.scored_count,
+                EngagementDailyRollup.high_engagement_count,
+                EngagementDailyRollup.score_sum,
+                EngagementDailyRollup.score_histogram,
+                EngagementDailyRollup.keyword_counts,
+            )
+            .where(EngagementDailyRollup.day.in_(days))
+            .with_for_update()
+        )
+        rows = []
+        for current in result.all():
+            delta = self._days[current.day]
+            histogram = Counter(current.score_histogram or {})
+            histogram.update(delta["score_histogram"])
+            keywords = Counter(current.keyword_counts or {})
+            keywords.update(delta["keyword_counts"])
+            rows.append({
+                "day": current.day,
+                "message_count": current.message_count + delta["message_count"],
+                "scored_count": current.scored_count + delta["scored_count"],
+                "high_engagement_count": current.high_engagement_count + delta["high_engagement_count"],
+                "score_sum": current.score_sum + delta["score_sum"],
+                "score_histogram": {label: n for label, n in histogram.items() if n > 0},
+                "keyword_counts": {keyword: n for keyword, n in keywords.items() if n > 0},
+            })
+        await _upsert_rollups(session, rows)
+        self._days.clear()
+    
+    def _delta(self, created_at: datetime) -> Dict[str, Any]:
+        day = utc_day(created_at)
+        if day not in self._days:
+            self._days[day] = _empty_counts()
+        return self._days[day]
+    
+    def _count(
+        self,
+        created_at: datetime,
+        score: Optional[float],
+        keywords: Optional[Sequence[str]],
+        sign: int
+    ) -> None:
+        if score is None:
+            return
+        delta = self._delta(created_at)
+        delta["scored_count"] += sign
+        delta["score_sum"] += sign * score
+        delta["score_histogram"][score_bucket(score)] += sign
+        if score >= settings.min_engagement_score:
+            delta["high_engagement_count"] += sign
+        for keyword in keywords or []:
+            delta["keyword_counts"][keyword] += sign
+
+
+async def summarize_rollups(session, since: date, top_keywords: int = 10) -> Dict[str, Any]:
+    """Aggregate the rollups for every day from ``since`` onwards."""
+    result = await session.execute(
+        select(EngagementDailyRollup).where(EngagementDailyRollup.day >= since)
+    )
+    rollups: List[EngagementDailyRollup] = list(result.scalars().all())
+    
+    histogram: Counter = Counter()
+    keywords: Counter = Counter()
+    for rollup in rollups:
+        histogram.update(rollup.score_histogram or {})
+        keywords.update(rollup.keyword_counts or {})
+    
+    scored_count = sum(rollup.scored_count for rollup in rollups)
+    return {
+        "total_messages": sum(rollup.message_count for rollup in rollups),
+        "high_engagement_count": sum(rollup.high_engagement_count for rollup in rollups),
+        "average_engagement_score": (
+            sum(rollup.score_sum for rollup in rollups) / scored_count if scored_count else 0.0
+        ),
+        "score_histogram": {
+            label: histogram.get(label, 0)
+            for label in map(score_bucket, SCORE_BUCKETS)
+        },
+        "top_keywords": keywords.most_common(top_keywords),
+    }
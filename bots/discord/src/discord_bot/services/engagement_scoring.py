@@ -0,0 +1,133 @@
+"""Engagement and trending scoring shared by ingestion and analysis."""
+
+from typing import Optional, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from discord_bot.core.config import settings
+
+ArrayLike = Union[np.ndarray, list, float, int]
+
+
+class ScoringWeights(BaseModel):
+    """Weights applied to engagement signals."""
+    
+    reply: float = 0.35
+    reaction: float = 0.20
+    unique_reactors: float = 0.25
+    thread_depth: float = 0.10
+    recency: float = 0.10
+    keyword_bonus: float = 0.05
+    decay_hours: float = 168  # 7 days
+    
+    @classmethod
+    def from_settings(cls) -> "ScoringWeights":
+        """Build weights from application settings."""
+        return cls(
+            reply=settings.engagement_reply_weight,
+            reaction=settings.engagement_reaction_weight,
+            unique_reactors=settings.engagement_reactor_weight,
+            thread_depth=settings.engagement_thread_weight,
+            recency=settings.engagement_recency_weight,
+            keyword_bonus=settings.engagement_keyword_weight,
+            decay_hours=settings.engagement_decay_hours
+        )
+
+
+class EngagementScorer:
+    """Score messages one at a time or as columnar NumPy batches.
+    
+    The batch methods take one array per signal and score every message
+    with a handful of vectorized operations; the single-message methods
+    run the same code on length-one arrays so both paths always agree.
+    """
+    
+    def __init__(self, weights: Optional[ScoringWeights] = None):
+        self.weights = weights or ScoringWeights.from_settings()
+    
+    def score(
+        self,
+        reply_count: int = 0,
+        reaction_count: int = 0,
+        unique_reactors: int = 0,
+        discussion_participants: int = 1,
+        thread_depth: int = 0,
+        message_age_hours: float = 0,
+        keyword_count: int = 0
+    ) -> float:
+        """Calculate the engagement score for a single message."""
+        return float(self.score_batch(
+            reply_count=reply_count,
+            reaction_count=reaction_count,
+            unique_reactors=unique_reactors,
+            discussion_participants=discussion_participants,
+            thread_depth=thread_depth,
+            message_age_hours=message_age_hours,
+            keyword_count=keyword_count
+        )[0])
+    
+    def score_batch(
+        self,
+        reply_count: ArrayLike,
+        reaction_count: ArrayLike,
+        unique_reactors: ArrayLike,
+        discussion_participants: ArrayLike,
+        thread_depth: ArrayLike,
+        message_age_hours: ArrayLike,
+        keyword_count: ArrayLike = 0
+    ) -> np.ndarray:
+        """Calculate engagement scores for a batch of messages."""
+        w = self.weights
+        age = np.atleast_1d(np.asarray(message_age_hours, dtype=np.float64))
+        participants = np.asarray(discussion_participants, dtype=np.float64)
+        
+        # Recency decay factor (messages lose engagement value over time)
+        recency_multiplier = np.maximum(0.1, 1.0 - age / w.decay_hours)
+        
+        total = (
+            np.asarray(reply_count, dtype=np.float64) * w.reply
+            + np.asarray(reaction_count, dtype=np.float64) * w.reaction
+            + np.asarray(unique_reactors, dtype=np.float64) * w.unique_reactors
+            + np.minimum(np.asarray(thread_depth, dtype=np.float64), 10) * w.thread_depth
+            + recency_multiplier * w.recency * 10
+            + np.asarray(keyword_count, dtype=np.float64) * w.keyword_bonus
+        )
+        
+        # Apply discussion size multiplier
+        size_multiplier = np.where(
+            participants > 3,
+            np.minimum(1.5, 1.0 + (participants - 3) * 0.1),
+            1.0
+        )
+        return np.round(total * size_multiplier, 2)
+    
+    def trending(
+        self,
+        engagement_score: float,
+        recent_activity_hours: float,
+        velocity_factor: float = 1.0
+    ) -> float:
+        """Calculate the trending score for a single message."""
+        return float(self.trending_batch(
+            engagement_score, recent_activity_hours, velocity_factor
+        )[0])
+    
+    def trending_batch(
+        self,
+        engagement_score: ArrayLike,
+        recent_activity_hours: ArrayLike,
+        velocity_factor: ArrayLike = 1.0
+    ) -> np.ndarray:
+        """Calculate trending scores for a batch of messages.
+        
+        Messages with no activity in the last 24 hours score zero.
+        """
+        hours = np.atleast_1d(np.asarray(recent_activity_hours, dtype=np.float64))
+        recency_boost = np.maximum(0.1, 1.0 - hours / 24)
+        trending = np.asarray(engagement_score, dtype=np.float64) * recency_boost * velocity_factor
+        return np.round(np.where(hours > 24, 0.0, trending), 2)
+
+
+# Global scorer instance
+engagement_scorer = EngagementScorer()
@@ -1,26 +1,65 @@
 """Engagement analysis service for Discord discussions."""
 
-import asyncio
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
-from sqlalchemy import select, func, and_, or_, text
+import numpy as np
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
-from discord_bot.services.database import db_service
+from discord_bot.services.database import db_service, upsert_insert
+from discord_bot.services.engagement_rollups import (
+    RollupChanges, refresh_daily_rollups, summarize_rollups, utc_day
+)
+from discord_bot.services.engagement_counters import participant_sources
+from discord_bot.services.engagement_scoring import engagement_scorer
+from discord_bot.services.leaderboard import (
+    refresh_leaderboard, top_leaderboard_query, trending_leaderboard_query
+)
+from discord_bot.utils.offload import run_cpu
+from discord_bot.utils.text_processing import KeywordMatcher
 from discord_bot.models.discord_models import (
-    DiscordMessage, DiscordUser, DiscordChannel, EngagementMetrics, MessageReaction
+    DiscordMessage, DiscordUser, DiscordChannel, EngagementLeaderboard, EngagementMetrics,
+    MessageReaction
 )
 
 logger = get_logger(__name__)
 
+TECHNICAL_KEYWORDS: Tuple[str, ...] = (
+    # AI/ML Terms
+    "langchain", "langgraph", "llm", "gpt", "claude", "openai", "anthropic",
+    "vector", "embedding", "rag", "retrieval", "agent", "workflow", "chain",
+    "prompt", "fine-tune", "model", "inference", "training", "dataset",
+
+    # Programming Terms
+    "python", "javascript", "typescript", "react", "node", "api", "rest",
+    "graphql", "database", "sql", "nosql", "mongodb", "postgres", "redis",
+    "docker", "kubernetes", "aws", "azure", "gcp", "serverless", "microservices",
+
+    # Austin/Local Terms
+    "austin", "texas", "meetup", "conference", "sxsw", "local", "atx",
+
+    # General Tech Terms
+    "startup", "venture", "funding", "saas", "platform", "framework",
+    "library", "tool", "integration", "automation", "deployment", "ci/cd"
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive timestamps (e.g. from SQLite) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
 
 class EngagementAnalyzer:
     """Analyzes engagement metrics for Discord discussions."""
     
     def __init__(self):
-        self._keywords_cache: Dict[str, List[str]] = {}
+        self._keyword_matcher = KeywordMatcher(settings.engagement_keyword_list or TECHNICAL_KEYWORDS)
+        self._keyword_set = frozenset(self._keyword_matcher.vocabulary)
     
     async def calculate_engagement_score(
         self,
@@ -34,50 +73,15 @@ class EngagementAnalyzer:
         content_keywords: List[str] = None
     ) -> float:
         """Calculate comprehensive engagement score for a message."""
-        
-        # Base weights for different engagement factors
-        weights = {
-            'reply': 0.35,
-            'reaction': 0.20,
-            'unique_reactors': 0.25,
-            'thread_depth': 0.10,
-            'recency': 0.10,
-            'keyword_bonus': 0.05  # Bonus for technical keywords
-        }
-        
-        # Recency decay factor (messages lose engagement value over time)
-        max_age_hours = 168  # 7 days
-        recency_multiplier = max(0.1, 1.0 - (message_age_hours / max_age_hours))
-        
-        # Calculate base score components
-        reply_score = reply_count * weights['reply']
-        reaction_score = reaction_count * weights['reaction']
-        reactor_score = unique_reactors * weights['unique_reactors']
-        thread_score = min(thread_depth, 10) * weights['thread_depth']  # Cap thread depth
-        recency_score = recency_multiplier * weights['recency'] * 10
-        
-        # Keyword bonus for technical discussions
-        keyword_bonus = 0
-        if content_keywords:
-            technical_keywords = self._get_technical_keywords()
-            matching_keywords = set(content_keywords) & set(technical_keywords)
-            keyword_bonus = len(matching_keywords) * weights['keyword_bonus']
-        
-        # Calculate final score
-        total_score = (
-            reply_score + 
-            reaction_score + 
-            reactor_score + 
-            thread_score + 
-            recency_score + 
-            keyword_bonus
+        return engagement_scorer.score(
+            reply_count=reply_count,
+            reaction_count=reaction_count,
+            unique_reactors=unique_reactors,
+            discussion_participants=discussion_participants,
+            thread_depth=thread_depth,
+            message_age_hours=message_age_hours,
+            keyword_count=self._count_technical_keywords(content_keywords)
         )
-        
-        # Apply discussion size multiplier
-        if discussion_participants > 3:
-            total_score *= min(1.5, 1.0 + (discussion_participants - 3) * 0.1)
-        
-        return round(total_score, 2)
     
     async def calculate_trending_score(
         self,
@@ -86,133 +90,42 @@ class EngagementAnalyzer:
         velocity_factor: float = 1.0
     ) -> float:
         """Calculate trending score based on recent activity velocity."""
-        
-        # Trending is based on recent engagement and velocity
-        if recent_activity_hours > 24:
-            return 0.0  # Not trending if no recent activity
-        
-        # Higher score for more recent activity
-        recency_boost = max(0.1, 1.0 - (recent_activity_hours / 24))
-        
-        # Calculate trending score
-        trending_score = engagement_score * recency_boost * velocity_factor
-        
-        return round(trending_score, 2)
+        return engagement_scorer.trending(engagement_score, recent_activity_hours, velocity_factor)
     
     async def update_message_engagement(self, message_id: str) -> Optional[float]:
         """Update engagement metrics for a specific message."""
         async with db_service.get_session() as session:
             try:
-                # Get message with relationships
                 result = await session.execute(
-                    select(DiscordMessage)
-                    .options(
-                        selectinload(DiscordMessage.reactions),
-                        selectinload(DiscordMessage.engagement_metrics)
-                    )
-                    .where(DiscordMessage.message_id == message_id)
+                    self._base_rows_query().where(DiscordMessage.message_id == message_id)
                 )
-                message = result.scalar_one_or_none()
+                base_rows = result.all()
                 
-                if not message:
+                if not base_rows:
                     logger.warning(f"Message {message_id} not found for engagement update")
                     return None
                 
-                # Count direct replies
-                reply_result = await session.execute(
-                    select(func.count(DiscordMessage.id))
-                    .where(DiscordMessage.parent_message_id == message_id)
-                )
-                reply_count = reply_result.scalar() or 0
-                
-                # Count thread messages
-                thread_result = await session.execute(
-                    select(func.count(DiscordMessage.id))
-                    .where(and_(
-                        DiscordMessage.thread_id.isnot(None),
-                        or_(
-                            DiscordMessage.message_id == message_id,
-                            DiscordMessage.parent_message_id == message_id
-                        )
-                    ))
-                )
-                thread_depth = thread_result.scalar() or 0
+                previous = (await session.execute(
+                    select(EngagementMetrics.engagement_score, EngagementMetrics.extracted_keywords)
+                    .where(EngagementMetrics.message_id == base_rows[0].id)
+                )).one_or_none()
+                old_score, old_keywords = previous or (None, None)
                 
-                # Analyze reactions
-                reaction_count = len(message.reactions)
-                unique_reactors = len(set(r.user_id for r in message.reactions))
+                metric_rows = await self._compute_engagement_rows(session, base_rows)
+                await self._upsert_engagement_rows(session, metric_rows)
                 
-                # Count unique participants in discussion
-                participant_result = await session.execute(
-                    select(func.count(func.distinct(DiscordMessage.author_id)))
-                    .where(or_(
-                        DiscordMessage.message_id == message_id,
-                        DiscordMessage.parent_message_id == message_id,
-                        and_(
-                            DiscordMessage.thread_id.isnot(None),
-                            DiscordMessage.thread_id == message.thread_id
-                        )
-                    ))
+                rollups = RollupChanges()
+                rollups.rescore(
+                    base_rows[0].created_at,
+                    old_score,
+                    metric_rows[0]["engagement_score"],
+                    old_keywords,
+                    metric_rows[0]["extracted_keywords"]
                 )
-                discussion_participants = participant_result.scalar() or 1
-                
-                # Calculate message age
-                message_age = datetime.now(timezone.utc) - message.created_at
-                message_age_hours = message_age.total_seconds() / 3600
-                
-                # Extract keywords from content
-                content_keywords = self._extract_keywords(message.content)
-                
-                # Calculate engagement score
-                engagement_score = await self.calculate_engagement_score(
-                    message_id=message_id,
-                    reply_count=reply_count,
-                    reaction_count=reaction_count,
-                    unique_reactors=unique_reactors,
-                    discussion_participants=discussion_participants,
-                    thread_depth=thread_depth,
-                    message_age_hours=message_age_hours,
-                    content_keywords=content_keywords
-                )
-                
-                # Find most recent activity
-                last_activity_result = await session.execute(
-                    select(func.max(DiscordMessage.created_at))
-                    .where(or_(
-                        DiscordMessage.message_id == message_id,
-                        DiscordMessage.parent_message_id == message_id
-                    ))
-                )
-                last_activity = last_activity_result.scalar() or message.created_at
-                
-                # Calculate trending score
-                recent_activity_hours = (datetime.now(timezone.utc) - last_activity).total_seconds() / 3600
-                trending_score = await self.calculate_trending_score(
-                    engagement_score=engagement_score,
-                    recent_activity_hours=recent_activity_hours
-                )
-                
-                # Update or create engagement metrics
-                if message.engagement_metrics:
-                    metrics = message.engagement_metrics
-                else:
-                    metrics = EngagementMetrics(message_id=message.id)
-                    session.add(metrics)
-                
-                # Update metrics
-                metrics.reply_count = reply_count
-                metrics.reaction_count = reaction_count
-                metrics.unique_reactors = unique_reactors
-                metrics.thread_depth = thread_depth
-                metrics.discussion_participants = discussion_participants
-                metrics.engagement_score = engagement_score
-                metrics.trending_score = trending_score
-                metrics.last_activity = last_activity
-                metrics.extracted_keywords = content_keywords
-                metrics.topic_categories = self._categorize_content(message.content, content_keywords)
-                
+                await rollups.apply(session)
                 await session.commit()
                 
+                engagement_score = metric_rows[0]["engagement_score"]
                 logger.debug(f"Updated engagement for message {message_id}: score={engagement_score}")
                 return engagement_score
                 
@@ -235,6 +148,20 @@ class EngagementAnalyzer:
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         
         async with db_service.get_session() as session:
+            if settings.engagement_leaderboard_enabled:
+                ranked = top_leaderboard_query(days, min_score, limit, channel_ids).subquery()
+                result = await session.execute(
+                    select(DiscordMessage, EngagementMetrics)
+                    .join(EngagementMetrics)
+                    .join(ranked, ranked.c.message_id == DiscordMessage.id)
+                    .options(
+                        selectinload(DiscordMessage.author),
+                        selectinload(DiscordMessage.channel)
+                    )
+                    .order_by(ranked.c.engagement_score.desc())
+                )
+                return result.all()
+            
             query = (
                 select(DiscordMessage, EngagementMetrics)
                 .join(EngagementMetrics)
@@ -265,6 +192,20 @@ class EngagementAnalyzer:
         cutoff_date = datetime.now(timezone.utc) - timedelta(hours=hours)
         
         async with db_service.get_session() as session:
+            if settings.engagement_leaderboard_enabled:
+                ranked = trending_leaderboard_query(hours, min_trending_score, limit).subquery()
+                result = await session.execute(
+                    select(DiscordMessage, EngagementMetrics)
+                    .join(EngagementMetrics)
+                    .join(ranked, ranked.c.message_id == DiscordMessage.id)
+                    .options(
+                        selectinload(DiscordMessage.author),
+                        selectinload(DiscordMessage.channel)
+                    )
+                    .order_by(ranked.c.trending_score.desc())
+                )
+                return result.all()
+            
             result = await session.execute(
                 select(DiscordMessage, EngagementMetrics)
                 .join(EngagementMetrics)
@@ -279,137 +220,263 @@ class EngagementAnalyzer:
             )
             return result.all()
     
-    async def get_engagement_summary(self, days: int = 7) -> Dict:
-        """Get engagement summary statistics."""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    async def get_leaderboard(
+        self,
+        days: int = 7,
+        min_score: float = None,
+        limit: int = 20,
+        channel_ids: List[str] = None
+    ) -> List[EngagementLeaderboard]:
+        """Get top leaderboard rows without loading full messages."""
+        if min_score is None:
+            min_score = settings.min_engagement_score
         
         async with db_service.get_session() as session:
-            # Total messages
-            total_messages_result = await session.execute(
-                select(func.count(DiscordMessage.id))
-                .where(DiscordMessage.created_at >= cutoff_date)
-            )
-            total_messages = total_messages_result.scalar() or 0
-            
-            # Messages with high engagement
-            high_engagement_result = await session.execute(
-                select(func.count(EngagementMetrics.id))
-                .join(DiscordMessage)
-                .where(DiscordMessage.created_at >= cutoff_date)
-                .where(EngagementMetrics.engagement_score >= settings.min_engagement_score)
-            )
-            high_engagement_count = high_engagement_result.scalar() or 0
-            
-            # Average engagement score
-            avg_score_result = await session.execute(
-                select(func.avg(EngagementMetrics.engagement_score))
-                .join(DiscordMessage)
-                .where(DiscordMessage.created_at >= cutoff_date)
-            )
-            avg_engagement_score = avg_score_result.scalar() or 0.0
-            
-            # Top keywords
-            keyword_result = await session.execute(
-                text("""
-                SELECT keyword, COUNT(*) as frequency
-                FROM (
-                    SELECT jsonb_array_elements_text(extracted_keywords) as keyword
-                    FROM engagement_metrics em
-                    JOIN discord_messages dm ON em.message_id = dm.id
-                    WHERE dm.created_at >= :cutoff_date
-                    AND em.extracted_keywords IS NOT NULL
-                ) keywords
-                GROUP BY keyword
-                ORDER BY frequency DESC
-                LIMIT 10
-                """),
-                {"cutoff_date": cutoff_date}
+            result = await session.execute(
+                top_leaderboard_query(days, min_score, limit, channel_ids)
             )
-            top_keywords = [(row[0], row[1]) for row in keyword_result.fetchall()]
-            
-            return {
-                "period_days": days,
-                "total_messages": total_messages,
-                "high_engagement_count": high_engagement_count,
-                "high_engagement_rate": high_engagement_count / total_messages if total_messages > 0 else 0,
-                "average_engagement_score": round(float(avg_engagement_score), 2),
-                "top_keywords": top_keywords
-            }
+            return list(result.scalars().all())
     
-    async def bulk_update_engagement(self, message_ids: List[str] = None, batch_size: int = 100) -> int:
-        """Bulk update engagement metrics for multiple messages."""
+    async def get_engagement_summary(self, days: int = 7) -> Dict:
+        """Get engagement summary statistics.
+        
+        Aggregated from daily rollups, so the window covers whole UTC days
+        and reflects messages as of their last scoring run.
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+        
+        async with db_service.get_session() as session:
+            summary = await summarize_rollups(session, since)
+        
+        total_messages = summary["total_messages"]
+        high_engagement_count = summary["high_engagement_count"]
+        return {
+            "period_days": days,
+            "total_messages": total_messages,
+            "high_engagement_count": high_engagement_count,
+            "high_engagement_rate": high_engagement_count / total_messages if total_messages > 0 else 0,
+            "average_engagement_score": round(float(summary["average_engagement_score"]), 2),
+            "score_histogram": summary["score_histogram"],
+            "top_keywords": summary["top_keywords"]
+        }
+    
+    async def bulk_update_engagement(
+        self,
+        message_ids: List[str] = None,
+        batch_size: int = 500,
+        days: Optional[int] = 7
+    ) -> int:
+        """Bulk update engagement metrics for multiple messages.
+        
+        Each batch is computed with a handful of grouped aggregate queries and
+        written back with a single multi-row upsert, instead of running the
+        single-message path once per message.
+        
+        Args:
+            message_ids: Discord message IDs to update. When omitted, every
+                message created in the last ``days`` days is updated.
+            batch_size: Number of messages aggregated and upserted per batch.
+            days: Window to recompute when ``message_ids`` is not given; ``None``
+                recomputes every stored message.
+        """
         async with db_service.get_session() as session:
-            # Get messages to update
+            query = self._base_rows_query()
             if message_ids:
-                query = select(DiscordMessage.message_id).where(DiscordMessage.message_id.in_(message_ids))
-            else:
-                # Update messages from last 7 days
-                cutoff_date = datetime.now(timezone.utc) - timedelta(days=7)
-                query = select(DiscordMessage.message_id).where(DiscordMessage.created_at >= cutoff_date)
+                query = query.where(DiscordMessage.message_id.in_(message_ids))
+            elif days is not None:
+                cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+                query = query.where(DiscordMessage.created_at >= cutoff_date)
             
             result = await session.execute(query)
-            all_message_ids = [row[0] for row in result.fetchall()]
+            base_rows = result.all()
         
-        # Process in batches
         updated_count = 0
-        total_messages = len(all_message_ids)
+        total_messages = len(base_rows)
         
         logger.info(f"Bulk updating engagement for {total_messages} messages")
         
         for i in range(0, total_messages, batch_size):
-            batch = all_message_ids[i:i + batch_size]
+            batch = base_rows[i:i + batch_size]
             
-            # Update each message in the batch
-            for message_id in batch:
-                score = await self.update_message_engagement(message_id)
-                if score is not None:
-                    updated_count += 1
-            
-            # Rate limiting between batches
-            if i + batch_size < total_messages:
-                await asyncio.sleep(1)
+            try:
+                async with db_service.get_session() as session:
+                    metric_rows = await self._compute_engagement_rows(session, batch)
+                    await self._upsert_engagement_rows(session, metric_rows)
+                updated_count += len(metric_rows)
+            except Exception as e:
+                logger.error(f"Error bulk updating engagement batch at offset {i}: {e}")
             
             logger.info(f"Updated engagement for {min(i + batch_size, total_messages)}/{total_messages} messages")
         
+        if base_rows:
+            async with db_service.get_session() as session:
+                await refresh_daily_rollups(session, {utc_day(row.created_at) for row in base_rows})
+        
         logger.info(f"Bulk engagement update completed: {updated_count}/{total_messages} messages updated")
         return updated_count
     
-    def _extract_keywords(self, content: str) -> List[str]:
-        """Extract technical keywords from message content."""
-        if not content:
+    def _base_rows_query(self):
+        """Select the message columns the engagement engine needs."""
+        return select(
+            DiscordMessage.id,
+            DiscordMessage.message_id,
+            DiscordMessage.thread_id,
+            DiscordMessage.content,
+            DiscordMessage.created_at
+        )
+    
+    async def _compute_engagement_rows(self, session, base_rows) -> List[Dict]:
+        """Compute engagement metric rows for a batch of messages.
+        
+        Reply, reaction and participant aggregates are gathered with one
+        grouped query each, keyed by Discord message ID (replies and
+        participants) or message UUID (reactions), then scored in one pass.
+        """
+        if not base_rows:
             return []
         
-        # Simple keyword extraction (can be enhanced with NLP)
-        technical_terms = self._get_technical_keywords()
-        content_lower = content.lower()
+        discord_ids = [row.message_id for row in base_rows]
+        record_ids = [row.id for row in base_rows]
         
-        keywords = []
-        for term in technical_terms:
-            if term.lower() in content_lower:
-                keywords.append(term)
+        # Replies grouped by parent: count, thread replies and latest activity
+        reply_result = await session.execute(
+            select(
+                DiscordMessage.parent_message_id,
+                func.count(DiscordMessage.id),
+                func.count(DiscordMessage.thread_id),
+                func.max(DiscordMessage.created_at)
+            )
+            .where(DiscordMessage.parent_message_id.in_(discord_ids))
+            .group_by(DiscordMessage.parent_message_id)
+        )
+        replies = {row[0]: (row[1], row[2], row[3]) for row in reply_result.all()}
         
-        return keywords[:10]  # Limit to top 10 keywords
-    
-    def _get_technical_keywords(self) -> List[str]:
-        """Get list of technical keywords to look for."""
-        return [
-            # AI/ML Terms
-            "langchain", "langgraph", "llm", "gpt", "claude", "openai", "anthropic",
-            "vector", "embedding", "rag", "retrieval", "agent", "workflow", "chain",
-            "prompt", "fine-tune", "model", "inference", "training", "dataset",
-            
-            # Programming Terms
-            "python", "javascript", "typescript", "react", "node", "api", "rest",
-            "graphql", "database", "sql", "nosql", "mongodb", "postgres", "redis",
-            "docker", "kubernetes", "aws", "azure", "gcp", "serverless", "microservices",
+        # Reactions grouped by message
+        reaction_result = await session.execute(
+            select(
+                MessageReaction.message_id,
+                func.count(MessageReaction.id),
+                func.count(func.distinct(MessageReaction.user_id))
+            )
+            .where(MessageReaction.message_id.in_(record_ids))
+            .group_by(MessageReaction.message_id)
+        )
+        reactions = {row[0]: (row[1], row[2]) for row in reaction_result.all()}
+        
+        # Participants: the author, reply authors and anyone in the same thread
+        sources = participant_sources(discord_ids)
+        participant_result = await session.execute(
+            select(
+                sources.c.root_id,
+                func.count(func.distinct(sources.c.author_id))
+            ).group_by(sources.c.root_id)
+        )
+        participants = {row[0]: row[1] for row in participant_result.all()}
+        
+        # Keyword matching over every message is the CPU-heavy part; keep it off the loop
+        analyses = await run_cpu(
+            "engagement.keywords", analyze_message_contents, [row.content for row in base_rows]
+        )
+        
+        now = datetime.now(timezone.utc)
+        metric_rows = []
+        for row, (content_keywords, topic_categories) in zip(base_rows, analyses):
+            created_at = _as_utc(row.created_at)
+            reply_count, thread_replies, last_reply_at = replies.get(row.message_id, (0, 0, None))
+            reaction_count, unique_reactors = reactions.get(row.id, (0, 0))
             
-            # Austin/Local Terms
-            "austin", "texas", "meetup", "conference", "sxsw", "local", "atx",
+            last_activity = created_at
+            if last_reply_at is not None:
+                last_activity = max(created_at, _as_utc(last_reply_at))
             
-            # General Tech Terms
-            "startup", "venture", "funding", "saas", "platform", "framework",
-            "library", "tool", "integration", "automation", "deployment", "ci/cd"
-        ]
+            metric_rows.append({
+                "message_id": row.id,
+                "reply_count": reply_count,
+                "reaction_count": reaction_count,
+                "unique_reactors": unique_reactors,
+                "thread_depth": thread_replies + (1 if row.thread_id else 0),
+                "discussion_participants": participants.get(row.message_id) or 1,
+                "last_activity": last_activity,
+                "message_age_hours": (now - created_at).total_seconds() / 3600,
+                "recent_activity_hours": (now - last_activity).total_seconds() / 3600,
+                "extracted_keywords": content_keywords,
+                "topic_categories": topic_categories,
+            })
+        
+        self._score_rows(metric_rows)
+        return metric_rows
+    
+    def _score_rows(self, metric_rows: List[Dict]) -> None:
+        """Apply engagement and trending scores to computed metric rows in place."""
+        if not metric_rows:
+            return
+        
+        def column(name: str) -> np.ndarray:
+            return np.fromiter((row[name] for row in metric_rows), dtype=np.float64, count=len(metric_rows))
+        
+        engagement_scores = engagement_scorer.score_batch(
+            reply_count=column("reply_count"),
+            reaction_count=column("reaction_count"),
+            unique_reactors=column("unique_reactors"),
+            discussion_participants=column("discussion_participants"),
+            thread_depth=column("thread_depth"),
+            message_age_hours=column("message_age_hours"),
+            keyword_count=np.fromiter(
+                (self._count_technical_keywords(row["extracted_keywords"]) for row in metric_rows),
+                dtype=np.float64,
+                count=len(metric_rows)
+            )
+        )
+        trending_scores = engagement_scorer.trending_batch(
+            engagement_score=engagement_scores,
+            recent_activity_hours=column("recent_activity_hours")
+        )
+        
+        for row, engagement_score, trending_score in zip(metric_rows, engagement_scores.tolist(), trending_scores.tolist()):
+            del row["message_age_hours"], row["recent_activity_hours"]
+            row["engagement_score"] = engagement_score
+            row["trending_score"] = trending_score
+    
+    async def _upsert_engagement_rows(self, session, metric_rows: List[Dict]) -> None:
+        """Write computed metric rows with a single multi-row upsert."""
+        if not metric_rows:
+            return
+        
+        stmt = upsert_insert(session, EngagementMetrics).values(
+            [{"id": uuid.uuid4(), **row} for row in metric_rows]
+        )
+        update_columns = {
+            key: getattr(stmt.excluded, key)
+            for key in metric_rows[0]
+            if key != "message_id"
+        }
+        update_columns["updated_at"] = func.now()
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[EngagementMetrics.message_id],
+                set_=update_columns
+            )
+        )
+        await refresh_leaderboard(session, [row["message_id"] for row in metric_rows])
+    
+    def _analyze_content(self, content: str) -> Tuple[List[str], List[str]]:
+        """Extract keywords and topic categories from message content."""
+        keywords = self._extract_keywords(content)
+        return keywords, self._categorize_content(content, keywords)
+    
+    def _extract_keywords(self, content: str) -> List[str]:
+        """Extract technical keywords from message content, most frequent first."""
+        return [term for term, _ in self._keyword_matcher.find(content, limit=10)]
+    
+    def _get_technical_keywords(self) -> Tuple[str, ...]:
+        """Get list of technical keywords to look for."""
+        return self._keyword_matcher.vocabulary
+    
+    def _count_technical_keywords(self, content_keywords: Optional[List[str]]) -> int:
+        """Count distinct technical keywords among extracted keywords."""
+        if not content_keywords:
+            return 0
+        return len(self._keyword_set.intersection(content_keywords))
     
     def _categorize_content(self, content: str, keywords: List[str]) -> List[str]:
         """Categorize content based on keywords and content analysis."""
@@ -448,4 +515,13 @@ class EngagementAnalyzer:
 
 
 # Global engagement service instance
-engagement_service = EngagementAnalyzer()
\ No newline at end of file
+engagement_service = EngagementAnalyzer()
+
+
+def analyze_message_contents(contents: List[str]) -> List[Tuple[List[str], List[str]]]:
+    """Keywords and topic categories for each message, for ``run_cpu``.
+
+    A plain function so it can be sent to a process pool, where it uses
+    that worker's own analyzer.
+    """
+    return [engagement_service._analyze_content(content) for content in contents]
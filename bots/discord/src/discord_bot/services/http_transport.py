@@ -0,0 +1,488 @@
+"""Shared HTTP transport for external API services.
+
+Every upstream (Requesty, Perplexity, Buttondown) goes through one
+``HTTPTransport`` so connection pooling, retries, rate-limit handling,
+circuit breaking and latency metrics behave the same everywhere.
+"""
+
+import asyncio
+import random
+import re
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses that mean "try again later" rather than "this request is wrong"
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Methods that are safe to resend after the request may have reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Errors raised before the request was sent, so any method can be retried
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class CircuitOpenError(Exception):
+    """Raised when an upstream's circuit breaker is rejecting requests."""
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"Circuit open for {upstream}, retry in {retry_in:.1f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    requests are rejected for ``reset_timeout`` seconds. Then a single
+    trial request is let through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a trial request through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot without judging the upstream.
+
+        For trials that end without an outcome (cancelled, or failed for a
+        reason unrelated to the upstream), so the next request may try again.
+        """
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._failure_threshold:
+            if self._opened_at is None or self._trial_in_flight:
+                self.times_opened += 1
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self._bounds = tuple(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (0-1)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self._bounds, self._counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}": count for bound, count in zip(self._bounds, self._counts)}
+        buckets["le_inf"] = self._counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class UpstreamState:
+    """Breaker, rate-limit window and metrics of one upstream service."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.statuses: Dict[int, int] = {}
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None  # time.time() epoch
+
+    def rate_limit_wait(self) -> float:
+        """Seconds to wait before the upstream will accept another request."""
+        if self.rate_limit_remaining != 0 or self.rate_limit_reset is None:
+            return 0.0
+        return max(0.0, self.rate_limit_reset - time.time())
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "rate_limit_remaining": self.rate_limit_remaining,
+            "rate_limit_reset": (
+                datetime.fromtimestamp(self.rate_limit_reset, tz=timezone.utc).isoformat()
+                if self.rate_limit_reset else None
+            ),
+            "latency": self.latency.as_dict(),
+        }
+
+
+def parse_retry_after(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After or x-ratelimit-reset headers."""
+    now = time.time() if now is None else now
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset"):
+        reset_at = _parse_reset(headers.get(name), now)
+        if reset_at is not None:
+            return max(0.0, reset_at - now)
+    return None
+
+
+def _parse_reset(value: Optional[str], now: float) -> Optional[float]:
+    """Parse a rate-limit reset header into an epoch timestamp.
+
+    Accepts epoch seconds, seconds from now, or durations like ``1m30s``.
+    """
+    if not value:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        if not parts:
+            return None
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return now + sum(float(amount) * scale[unit] for amount, unit in parts)
+    # Large values are absolute epoch timestamps, small ones are deltas
+    return number if number > 1_000_000_000 else now + number
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPTransport:
+    """Pooled, retrying, circuit-breaking HTTP transport shared by services.
+
+    One ``httpx.AsyncClient`` is kept per host, so each upstream gets its
+    own bounded keep-alive pool (HTTP/2 through httpx's ``http2`` extra,
+    falling back to HTTP/1.1 if ``h2`` is missing). Requests that hit a retryable status or a connection error
+    are retried with jittered exponential backoff, honouring ``Retry-After``
+    and ``x-ratelimit-*`` headers; a request is never retried after it may
+    have reached the server unless it is idempotent. Each upstream has a
+    circuit breaker and a latency histogram.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._upstreams: Dict[str, UpstreamState] = {}
+        self._http2 = settings.http_transport_http2 and _http2_available()
+        if settings.http_transport_http2 and not self._http2:
+            logger.info("h2 package not installed, external APIs use HTTP/1.1")
+
+    def client(
+        self,
+        upstream: str,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30.0
+    ) -> "ServiceClient":
+        """Get a client bound to one upstream's base URL and default headers."""
+        return ServiceClient(self, upstream, base_url, headers or {}, timeout)
+
+    async def request(
+        self,
+        upstream: str,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request with retries and circuit breaking.
+
+        Returns the final response, which may still be an error status once
+        retries are exhausted. Raises ``CircuitOpenError`` if the upstream's
+        circuit is open, or the last transport error if every attempt failed
+        to get a response.
+        """
+        state = self._upstream(upstream)
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        client = self._client_for(url)
+        max_attempts = settings.http_transport_max_retries + 1
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._wait_for_rate_limit(state)
+            if not state.breaker.allow():
+                raise CircuitOpenError(upstream, state.breaker.retry_in())
+
+            state.requests += 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, url, headers=headers, timeout=timeout, **kwargs
+                )
+            except httpx.TransportError as e:
+                state.latency.observe(time.perf_counter() - started)
+                state.errors += 1
+                state.breaker.record_failure()
+                retryable = idempotent or isinstance(e, CONNECT_ERRORS)
+                if not retryable or attempt == max_attempts:
+                    logger.warning("External API request failed", extra={
+                        "upstream": upstream,
+                        "method": method,
+                        "attempts": attempt,
+                        "error_type": type(e).__name__,
+                        "error": str(e)
+                    })
+                    raise
+                delay = self._backoff(attempt)
+            except BaseException:
+                # Cancelled or failed before reaching the upstream: no verdict
+                state.breaker.release_trial()
+                raise
+            else:
+                state.latency.observe(time.perf_counter() - started)
+                state.statuses[response.status_code] = state.statuses.get(response.status_code, 0) + 1
+                self._update_rate_limit(state, response.headers)
+                if response.status_code >= 500:
+                    state.breaker.record_failure()
+                else:
+                    state.breaker.record_success()
+
+                if response.status_code not in RETRY_STATUSES or attempt == max_attempts:
+                    return response
+                # 429/503 are rejected before processing; other 5xx may not be
+                if not idempotent and response.status_code not in (429, 503):
+                    return response
+
+                delay = parse_retry_after(response.headers)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > settings.http_transport_max_retry_delay:
+                    logger.warning("External API asked for a longer wait than allowed", extra={
+                        "upstream": upstream,
+                        "status": response.status_code,
+                        "retry_after": delay
+                    })
+                    return response
+
+            state.retries += 1
+            logger.info("Retrying external API request", extra={
+                "upstream": upstream,
+                "method": method,
+                "attempt": attempt,
+                "delay": round(delay, 2)
+            })
+            await asyncio.sleep(delay)
+
+    def get_stats(self, upstream: Optional[str] = None) -> Dict[str, Any]:
+        """Get request, retry, status, circuit and latency stats per upstream."""
+        if upstream is not None:
+            state = self._upstreams.get(upstream)
+            return state.as_dict() if state else {}
+        return {name: state.as_dict() for name, state in self._upstreams.items()}
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+        if clients:
+            logger.info("HTTP transport closed", extra={"hosts": list(clients)})
+
+    def _upstream(self, name: str) -> UpstreamState:
+        state = self._upstreams.get(name)
+        if state is None:
+            state = UpstreamState(
+                name,
+                failure_threshold=settings.http_transport_breaker_threshold,
+                reset_timeout=settings.http_transport_breaker_reset_seconds
+            )
+            self._upstreams[name] = state
+        return state
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=settings.http_transport_max_connections,
+                    max_keepalive_connections=settings.http_transport_max_keepalive,
+                    keepalive_expiry=settings.http_transport_keepalive_expiry
+                ),
+                timeout=30.0,
+                transport=self._transport
+            )
+            self._clients[host] = client
+        return client
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        ceiling = min(
+            settings.http_transport_max_retry_delay,
+            settings.http_transport_backoff_base * (2 ** (attempt - 1))
+        )
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _update_rate_limit(state: UpstreamState, headers: Mapping[str, str]) -> None:
+        now = time.time()
+        for suffix in ("-requests", ""):
+            remaining = headers.get(f"x-ratelimit-remaining{suffix}")
+            if remaining is None:
+                continue
+            try:
+                state.rate_limit_remaining = int(float(remaining))
+            except ValueError:
+                continue
+            state.rate_limit_reset = _parse_reset(headers.get(f"x-ratelimit-reset{suffix}"), now)
+            return
+
+    @staticmethod
+    async def _wait_for_rate_limit(state: UpstreamState) -> None:
+        wait = state.rate_limit_wait()
+        if not wait:
+            return
+        if wait > settings.http_transport_max_retry_delay:
+            # Stale or far-off reset; let the request through and let the
+            # server's answer correct our view of the window
+            state.rate_limit_remaining = None
+            return
+        logger.info("Waiting for external API rate limit window", extra={
+            "upstream": state.name,
+            "wait": round(wait, 2)
+        })
+        await asyncio.sleep(wait)
+        state.rate_limit_remaining = None
+
+
+class ServiceClient:
+    """An upstream's view of the shared transport.
+
+    Mirrors the small part of the ``httpx.AsyncClient`` API the services
+    use (``get``/``post``/``patch`` with paths relative to ``base_url``).
+    """
+
+    def __init__(
+        self,
+        transport: HTTPTransport,
+        upstream: str,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: float
+    ):
+        self.transport = transport
+        self.upstream = upstream
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.timeout = timeout
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        kwargs.setdefault("timeout", self.timeout)
+        return await self.transport.request(
+            self.upstream, method, f"{self.base_url}/{path.lstrip('/')}", headers=headers, **kwargs
+        )
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", path, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.transport.get_stats(self.upstream)
+
+
+# Global HTTP transport instance
+http_transport = HTTPTransport()
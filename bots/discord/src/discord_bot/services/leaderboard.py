@@ -0,0 +1,155 @@
+"""Denormalized engagement leaderboard maintenance and queries."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+
+from sqlalchemy import func, select, true, update
+
+from discord_bot.services.database import upsert_insert
+from discord_bot.models.discord_models import (
+    DiscordChannel, DiscordMessage, DiscordUser, EngagementLeaderboard, EngagementMetrics
+)
+
+# Columns copied from the source tables, in insert order
+LEADERBOARD_COLUMNS = [
+    "message_id",
+    "discord_message_id",
+    "channel_id",
+    "channel_name",
+    "author_name",
+    "content_preview",
+    "message_created_at",
+    "last_activity",
+    "reply_count",
+    "reaction_count",
+    "discussion_participants",
+    "engagement_score",
+    "trending_score",
+]
+
+
+def _leaderboard_source(message_ids: Optional[Sequence[uuid.UUID]] = None):
+    """Select leaderboard rows from messages, metrics, channels and authors."""
+    query = (
+        select(
+            EngagementMetrics.message_id,
+            DiscordMessage.message_id,
+            DiscordChannel.channel_id,
+            DiscordChannel.name,
+            func.coalesce(DiscordUser.display_name, DiscordUser.username),
+            func.substr(DiscordMessage.content, 1, 200),
+            DiscordMessage.created_at,
+            EngagementMetrics.last_activity,
+            EngagementMetrics.reply_count,
+            EngagementMetrics.reaction_count,
+            EngagementMetrics.discussion_participants,
+            EngagementMetrics.engagement_score,
+            EngagementMetrics.trending_score,
+        )
+        .join(DiscordMessage, EngagementMetrics.message_id == DiscordMessage.id)
+        .join(DiscordChannel, DiscordMessage.channel_id == DiscordChannel.id)
+        .join(DiscordUser, DiscordMessage.author_id == DiscordUser.id)
+    )
+    if message_ids is None:
+        # SQLite needs a WHERE clause to parse INSERT ... SELECT ... ON CONFLICT
+        return query.where(true())
+    return query.where(EngagementMetrics.message_id.in_(message_ids))
+
+
+async def refresh_leaderboard(session, message_ids: Optional[Sequence[uuid.UUID]] = None) -> None:
+    """Copy current metrics for ``message_ids`` (or every message) into the leaderboard.
+    
+    Runs as one ``INSERT ... SELECT ... ON CONFLICT`` statement within the
+    caller's transaction, so the leaderboard commits together with the
+    metrics it mirrors.
+    """
+    if message_ids is not None and not message_ids:
+        return
+    
+    stmt = upsert_insert(session, EngagementLeaderboard).from_select(
+        LEADERBOARD_COLUMNS, _leaderboard_source(message_ids)
+    )
+    set_ = {column: stmt.excluded[column] for column in LEADERBOARD_COLUMNS[1:]}
+    set_["updated_at"] = func.now()
+    await session.execute(
+        stmt.on_conflict_do_update(index_elements=[EngagementLeaderboard.message_id], set_=set_)
+    )
+
+
+async def refresh_leaderboard_names(
+    session,
+    channel_ids: Sequence[uuid.UUID] = (),
+    user_ids: Sequence[uuid.UUID] = ()
+) -> None:
+    """Copy current channel and author names into existing leaderboard rows.
+    
+    Names are denormalized into the leaderboard, so renames written to
+    ``DiscordChannel``/``DiscordUser`` are pushed here in the caller's
+    transaction. Rows already showing the current name are left alone, so
+    re-upserting an unchanged identity writes nothing.
+    """
+    if channel_ids:
+        current_name = (
+            select(DiscordChannel.name)
+            .where(DiscordChannel.channel_id == EngagementLeaderboard.channel_id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(EngagementLeaderboard)
+            .where(EngagementLeaderboard.channel_id.in_(
+                select(DiscordChannel.channel_id).where(DiscordChannel.id.in_(channel_ids))
+            ))
+            .where(EngagementLeaderboard.channel_name != current_name)
+            .values(channel_name=current_name, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    
+    if user_ids:
+        current_name = (
+            select(func.coalesce(DiscordUser.display_name, DiscordUser.username))
+            .join(DiscordMessage, DiscordMessage.author_id == DiscordUser.id)
+            .where(DiscordMessage.id == EngagementLeaderboard.message_id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(EngagementLeaderboard)
+            .where(EngagementLeaderboard.message_id.in_(
+                select(DiscordMessage.id).where(DiscordMessage.author_id.in_(user_ids))
+            ))
+            .where(EngagementLeaderboard.author_name != current_name)
+            .values(author_name=current_name, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+
+def top_leaderboard_query(
+    days: int,
+    min_score: float,
+    limit: int,
+    channel_ids: Optional[List[str]] = None
+):
+    """Select the highest-scoring leaderboard rows posted in the last ``days``."""
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    query = (
+        select(EngagementLeaderboard)
+        .where(EngagementLeaderboard.message_created_at >= cutoff_date)
+        .where(EngagementLeaderboard.engagement_score >= min_score)
+        .order_by(EngagementLeaderboard.engagement_score.desc())
+        .limit(limit)
+    )
+    if channel_ids:
+        query = query.where(EngagementLeaderboard.channel_id.in_(channel_ids))
+    return query
+
+
+def trending_leaderboard_query(hours: int, min_trending_score: float, limit: int):
+    """Select the highest-trending leaderboard rows active in the last ``hours``."""
+    cutoff_date = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return (
+        select(EngagementLeaderboard)
+        .where(EngagementLeaderboard.last_activity >= cutoff_date)
+        .where(EngagementLeaderboard.trending_score >= min_trending_score)
+        .order_by(EngagementLeaderboard.trending_score.desc())
+        .limit(limit)
+    )
@@ -0,0 +1,272 @@
+"""Content-addressed cache for LLM responses."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+from discord_bot.utils.caching import SettingsBound
+
+logger = get_logger(__name__)
+
+
+def llm_cache_key(
+    model: str,
+    messages: Sequence[Any],
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """Hash everything that determines an LLM completion.
+
+    The system prompt is part of ``messages``, so editing a prompt naturally
+    invalidates every response produced under the old one.
+    """
+    payload = {
+        "model": model,
+        "messages": [[message.type, message.content] for message in messages],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(ABC):
+    """Base class for LLM response cache backends.
+
+    Entries are JSON-serialisable dicts holding the response ``content`` and
+    the token ``usage`` of the original call, so a hit can report what it
+    saved. Backends must never raise from ``get``/``set``: a broken cache
+    degrades to a miss rather than failing generation.
+    """
+
+    backend = "none"
+
+    def __init__(self, ttl: int):
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``key``, or None."""
+        try:
+            entry = await self._get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("LLM cache read failed", extra={
+                "backend": self.backend,
+                "error": str(e)
+            })
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store ``entry`` under ``key``."""
+        try:
+            await self._set(key, entry)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("LLM cache write failed", extra={
+                "backend": self.backend,
+                "error": str(e)
+            })
+
+    async def clear(self) -> None:
+        """Drop every cached response."""
+        await self._clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for health reporting."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read the entry stored under ``key``."""
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Write ``entry`` under ``key``."""
+        pass
+
+    @abstractmethod
+    async def _clear(self) -> None:
+        """Delete every entry."""
+        pass
+
+
+class SQLiteLLMCache(LLMResponseCache):
+    """LLM response cache in a local SQLite file.
+
+    Entries expire after ``ttl`` seconds. Once more than ``max_entries`` are
+    stored, the least recently read ones are evicted. Calls run in a worker
+    thread so the event loop never blocks on disk I/O.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, ttl: int, max_entries: int):
+        super().__init__(ttl)
+        self._path = path
+        self._max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self._path != ":memory:":
+                Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_access "
+                "ON llm_responses (last_access)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn, *args):
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args)
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self._run(self._get_sync, key)
+
+    async def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        await self._run(self._set_sync, key, json.dumps(entry))
+
+    async def _clear(self) -> None:
+        await self._run(self._clear_sync)
+
+    def _get_sync(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            conn.commit()
+            return None
+        conn.execute("UPDATE llm_responses SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        return json.loads(row[0])
+
+    def _set_sync(self, key: str, value: str) -> None:
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_responses (key, value, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?)",
+            (key, value, now + self._ttl, now)
+        )
+        conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (now,))
+        evicted = conn.execute(
+            "DELETE FROM llm_responses WHERE key IN ("
+            "SELECT key FROM llm_responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,)
+        ).rowcount
+        conn.commit()
+        self.evictions += max(evicted, 0)
+
+    def _clear_sync(self) -> None:
+        conn = self._connect()
+        conn.execute("DELETE FROM llm_responses")
+        conn.commit()
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters for health reporting."""
+        return {**super().get_stats(), "evictions": self.evictions}
+
+
+class RedisLLMCache(LLMResponseCache):
+    """LLM response cache in Redis.
+
+    Entries expire via ``SETEX``; size-based eviction is delegated to the
+    server's ``maxmemory-policy`` (``allkeys-lru`` is recommended).
+    """
+
+    backend = "redis"
+
+    def __init__(self, url: str, ttl: int, prefix: str = "llm_cache:"):
+        super().__init__(ttl)
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self._client.get(self._prefix + key)
+        return json.loads(value) if value is not None else None
+
+    async def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        await self._client.setex(self._prefix + key, self._ttl, json.dumps(entry))
+
+    async def _clear(self) -> None:
+        async for key in self._client.scan_iter(match=self._prefix + "*"):
+            await self._client.delete(key)
+
+
+def _cache_settings() -> tuple:
+    return (
+        settings.llm_cache_backend.lower(),
+        settings.llm_cache_path,
+        settings.redis_url,
+        settings.llm_cache_ttl_seconds,
+        settings.llm_cache_max_entries,
+    )
+
+
+def _build_cache(
+    backend: str, path: str, redis_url: str, ttl: int, max_entries: int
+) -> Optional[LLMResponseCache]:
+    try:
+        if backend == "sqlite":
+            return SQLiteLLMCache(path, ttl=ttl, max_entries=max_entries)
+        if backend == "redis":
+            return RedisLLMCache(redis_url, ttl=ttl)
+        if backend != "none":
+            logger.warning(f"Unknown LLM cache backend '{backend}', caching disabled")
+    except ImportError:
+        logger.warning("redis package not installed, LLM response caching disabled")
+    return None
+
+
+_cache: SettingsBound[Optional[LLMResponseCache]] = SettingsBound(_cache_settings, _build_cache)
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get the configured LLM response cache, or None if caching is disabled."""
+    return _cache.get()
@@ -1,14 +1,17 @@
 """Model router service for requesty.ai integration."""
 
 import asyncio
+import time
+from collections import deque
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timezone
 from enum import Enum
-import httpx
 import json
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
+from discord_bot.services.http_transport import CircuitOpenError, ServiceClient, http_transport
+from discord_bot.utils.instrumentation import record_llm_call
 
 logger = get_logger(__name__)
 
@@ -30,6 +33,13 @@ class ModelProvider(Enum):
     MISTRAL = "mistral"
 
 
+class RoutingPolicy(Enum):
+    """How a model is chosen among those with a capability."""
+    CHEAPEST_UNDER_SLA = "cheapest_under_sla"
+    FASTEST = "fastest"
+    HEDGED = "hedged"
+
+
 class ModelInfo:
     """Information about a model."""
     
@@ -54,6 +64,78 @@ class ModelInfo:
         self.max_tokens = max_tokens
         self.context_window = context_window
         self.is_available = is_available
+    
+    @property
+    def cost_per_token(self) -> float:
+        """Combined input and output price, used to rank models by cost."""
+        return self.input_cost_per_token + self.output_cost_per_token
+
+
+class ModelStats:
+    """Rolling latency, error and throughput statistics of one model.
+    
+    Only the last ``window`` invocations, and only those younger than
+    ``max_age`` seconds, are kept, so the numbers follow the model's current
+    behaviour rather than its lifetime average. Expiry also lets a model
+    that was demoted for failing fall back to unmeasured and be retried.
+    """
+    
+    def __init__(self, window: int, max_age: Optional[float] = None):
+        # (recorded at, latency, ok, completion tokens per second) of recent invocations
+        self._samples: deque = deque(maxlen=window)
+        self.max_age = max_age
+        self.requests = 0
+        self.errors = 0
+    
+    def record(self, latency: float, ok: bool, completion_tokens: int = 0) -> None:
+        """Record one invocation. Failed calls count towards the error rate only."""
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        throughput = completion_tokens / latency if ok and latency > 0 else None
+        self._samples.append((time.monotonic(), latency, ok, throughput))
+    
+    def _recent(self) -> deque:
+        """Drop samples older than ``max_age`` and return the rest."""
+        if self.max_age:
+            cutoff = time.monotonic() - self.max_age
+            while self._samples and self._samples[0][0] < cutoff:
+                self._samples.popleft()
+        return self._samples
+    
+    @property
+    def samples(self) -> int:
+        return len(self._recent())
+    
+    @property
+    def error_rate(self) -> float:
+        samples = self._recent()
+        if not samples:
+            return 0.0
+        return sum(1 for _, _, ok, _ in samples if not ok) / len(samples)
+    
+    @property
+    def tokens_per_second(self) -> float:
+        rates = [rate for _, _, _, rate in self._recent() if rate]
+        return sum(rates) / len(rates) if rates else 0.0
+    
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile ``q`` (0-1) of recent successful calls."""
+        ordered = sorted(latency for _, latency, ok, _ in self._recent() if ok)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "samples": self.samples,
+            "error_rate": self.error_rate,
+            "p50": self.latency_percentile(0.5),
+            "p95": self.latency_percentile(0.95),
+            "tokens_per_second": self.tokens_per_second,
+        }
 
 
 class ModelRouter:
@@ -62,11 +144,14 @@ class ModelRouter:
     def __init__(self):
         self.base_url = settings.requesty_base_url
         self.api_key = settings.requesty_api_key
-        self.client: Optional[httpx.AsyncClient] = None
+        self.client: Optional[ServiceClient] = None
         self.available_models: Dict[str, ModelInfo] = {}
         self.user_preferences: Dict[str, str] = {}
         self._model_cache_expires = None
         self._usage_tracking: Dict[str, Dict] = {}
+        self._model_stats: Dict[str, ModelStats] = {}
+        self._hedge_tracking: Dict[str, Dict[str, int]] = {}
+        self._capability_index: Dict[ModelCapability, List[ModelInfo]] = {}
     
     async def initialize(self):
         """Initialize the model router service."""
@@ -75,8 +160,9 @@ class ModelRouter:
             self._initialize_fallback_models()
             return
         
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
+        self.client = http_transport.client(
+            "requesty",
+            self.base_url,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
@@ -95,7 +181,6 @@ class ModelRouter:
     async def close(self):
         """Close the model router service."""
         if self.client:
-            await self.client.aclose()
             self.client = None
             logger.info("Model router service closed")
     
@@ -120,39 +205,122 @@ class ModelRouter:
                 if capability in model.capabilities and model.is_available:
                     return model
         
-        # Find best available model for capability
-        suitable_models = [
-            model for model in self.available_models.values()
-            if capability in model.capabilities and model.is_available
-        ]
-        
-        if not suitable_models:
+        candidates = self.get_candidates_for_capability(capability)
+        if not candidates:
             logger.warning(f"No available models for capability: {capability}")
             return None
         
-        # Sort by preference: Anthropic first, then by cost-effectiveness
-        def model_score(model: ModelInfo) -> tuple:
-            # Prefer Anthropic models
-            provider_score = 0 if model.provider == ModelProvider.ANTHROPIC else 1
-            
-            # Prefer lower cost (higher score for lower cost)
-            cost_score = 1.0 / (model.input_cost_per_token + 1e-6)
-            
-            # Prefer larger context window for complex tasks
-            context_score = model.context_window / 100000  # Normalize
-            
-            return (provider_score, -cost_score, -context_score)
-        
-        best_model = min(suitable_models, key=model_score)
+        best_model = candidates[0]
         
         logger.debug(f"Selected model {best_model.id} for {capability}", extra={
             "model_id": best_model.id,
             "provider": best_model.provider.value,
-            "capability": capability.value
+            "capability": capability.value,
+            "policy": self.get_routing_policy(capability).value
         })
         
         return best_model
     
+    def get_candidates_for_capability(self, capability: ModelCapability) -> List[ModelInfo]:
+        """Rank the models with a capability under its routing policy, best first.
+        
+        Starts from the pre-sorted index (cheapest first) and reorders it by
+        recent statistics. Models with fewer than ``model_stats_min_samples``
+        recent invocations are assumed to be healthy and within the SLA, and
+        the latency policies try them first, so a new model, or one whose
+        failures have expired, gets traffic and builds up statistics.
+        """
+        candidates = self._capability_index.get(capability, [])
+        if len(candidates) < 2:
+            return list(candidates)
+        
+        healthy = [model for model in candidates if not self._is_failing(model.id)]
+        unhealthy = [model for model in candidates if self._is_failing(model.id)]
+        
+        if self.get_routing_policy(capability) == RoutingPolicy.CHEAPEST_UNDER_SLA:
+            within_sla = [model for model in healthy if self._within_sla(model.id)]
+            over_sla = sorted(
+                (model for model in healthy if not self._within_sla(model.id)),
+                key=lambda model: self._latency(model.id, 0.95)
+            )
+            return within_sla + over_sla + unhealthy
+        
+        # fastest and hedged: unmeasured models first, to measure them, then
+        # lowest median latency; the hedge goes to the runner-up. Stable sort
+        # keeps unmeasured models in cost order.
+        unmeasured = [model for model in healthy if self._stats_for(model.id) is None]
+        measured = [model for model in healthy if self._stats_for(model.id) is not None]
+        return unmeasured + sorted(measured, key=lambda model: self._latency(model.id, 0.5)) + unhealthy
+    
+    def get_routing_policy(self, capability: ModelCapability) -> RoutingPolicy:
+        """Get the routing policy configured for a capability."""
+        name = settings.model_routing_policy_overrides.get(
+            capability.value, settings.model_routing_policy
+        )
+        try:
+            return RoutingPolicy(name)
+        except ValueError:
+            logger.warning(f"Unknown model routing policy '{name}', using cheapest_under_sla")
+            return RoutingPolicy.CHEAPEST_UNDER_SLA
+    
+    def _stats_for(self, model_id: str) -> Optional[ModelStats]:
+        """Get a model's statistics if it has enough samples to be trusted."""
+        stats = self._model_stats.get(model_id)
+        if stats is None or stats.samples < settings.model_stats_min_samples:
+            return None
+        return stats
+    
+    def _is_failing(self, model_id: str) -> bool:
+        stats = self._stats_for(model_id)
+        return stats is not None and stats.error_rate > settings.model_routing_max_error_rate
+    
+    def _within_sla(self, model_id: str) -> bool:
+        stats = self._stats_for(model_id)
+        if stats is None:
+            return True
+        p95 = stats.latency_percentile(0.95)
+        return p95 is None or p95 <= settings.model_routing_latency_sla
+    
+    def _latency(self, model_id: str, q: float) -> float:
+        """Latency quantile used for ranking; infinite for unmeasured models."""
+        stats = self._stats_for(model_id)
+        latency = stats.latency_percentile(q) if stats else None
+        return latency if latency is not None else float("inf")
+    
+    def _record_invocation(
+        self,
+        model_id: str,
+        latency: float,
+        ok: bool,
+        completion_tokens: int = 0
+    ) -> None:
+        """Feed one real invocation into the model's rolling statistics."""
+        stats = self._model_stats.get(model_id)
+        if stats is None:
+            stats = self._model_stats[model_id] = ModelStats(
+                settings.model_stats_window, settings.model_stats_max_age
+            )
+        stats.record(latency, ok, completion_tokens)
+    
+    def _build_capability_index(self):
+        """Pre-sort the available models of each capability, cheapest first.
+        
+        Ties go to Anthropic models, then to larger context windows. Only
+        rebuilt when the model list is (re)loaded.
+        """
+        def static_rank(model: ModelInfo) -> tuple:
+            provider_rank = 0 if model.provider == ModelProvider.ANTHROPIC else 1
+            return (model.cost_per_token, provider_rank, -model.context_window)
+        
+        ranked = sorted(
+            (model for model in self.available_models.values() if model.is_available),
+            key=static_rank
+        )
+        self._capability_index = {
+            capability: [model for model in ranked if capability in model.capabilities]
+            for capability in ModelCapability
+        }
+    
     async def invoke_model(
         self,
         model_id: str,
@@ -175,23 +343,45 @@ class ModelRouter:
                 **kwargs
             }
             
-            # Make API request
-            response = await self.client.post("/chat/completions", json=payload)
+            # Make API request; completions have no side effects, so the
+            # transport may retry them even after a read timeout
+            started = time.perf_counter()
+            try:
+                response = await self.client.post("/chat/completions", json=payload, idempotent=True)
+            except CircuitOpenError:
+                # Requesty as a whole is down, which says nothing about this model
+                raise
+            except Exception:
+                self._record_invocation(model_id, time.perf_counter() - started, ok=False)
+                raise
+            latency = time.perf_counter() - started
             
             if response.status_code == 200:
                 result = response.json()
                 
                 # Track usage
                 self._track_usage(model_id, payload, result)
+                self._record_invocation(
+                    model_id,
+                    latency,
+                    ok=True,
+                    completion_tokens=result.get("usage", {}).get("completion_tokens", 0)
+                )
                 
                 return result
             else:
+                self._record_invocation(model_id, latency, ok=False)
                 logger.error(f"Model invocation failed: {response.status_code} - {response.text}")
-                return self._fallback_model_response(messages, model_id)
-                
+                return self._fallback_model_response(
+                    messages, model_id, reason=f"HTTP {response.status_code}"
+                )
+        
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping model {model_id}: {e}")
+            return self._fallback_model_response(messages, model_id, reason="circuit_open")
         except Exception as e:
             logger.error(f"Error invoking model {model_id}: {e}")
-            return self._fallback_model_response(messages, model_id)
+            return self._fallback_model_response(messages, model_id, reason=type(e).__name__)
     
     async def invoke_model_by_capability(
         self,
@@ -200,14 +390,31 @@ class ModelRouter:
         temperature: float = 0.7,
         max_tokens: int = 2000,
         user_preference: Optional[str] = None,
+        hedge: Optional[bool] = None,
         **kwargs
     ) -> tuple[Optional[Dict[str, Any]], Optional[str]]:
-        """Invoke the best model for a capability."""
+        """Invoke the best model for a capability.
+        
+        With ``hedge`` (by default: when the capability uses the ``hedged``
+        routing policy) a slow call is raced against the next-best model.
+        """
         model = await self.get_model_for_capability(capability, user_preference)
         
         if not model:
             return None, None
         
+        if hedge is None:
+            hedge = self.get_routing_policy(capability) == RoutingPolicy.HEDGED
+        if hedge and self.client and self.api_key:
+            backup = next(
+                (c for c in self.get_candidates_for_capability(capability) if c.id != model.id),
+                None
+            )
+            if backup:
+                return await self._invoke_hedged(
+                    capability, model, backup, messages, temperature, max_tokens, **kwargs
+                )
+        
         response = await self.invoke_model(
             model.id,
             messages,
@@ -218,6 +425,109 @@ class ModelRouter:
         
         return response, model.id
     
+    async def _invoke_hedged(
+        self,
+        capability: ModelCapability,
+        primary: ModelInfo,
+        backup: ModelInfo,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        **kwargs
+    ) -> tuple[Dict[str, Any], str]:
+        """Race ``primary`` against a delayed duplicate request to ``backup``.
+        
+        The hedge is sent once the primary call has run longer than the
+        model's ``model_hedge_quantile`` latency, or straight away if it
+        fails first, as long as the capability's hedge budget allows. The
+        first successful response wins and the other call is cancelled.
+        """
+        tracking = self._hedge_entry(capability)
+        tracking["requests"] += 1
+        tasks: Dict[asyncio.Task, ModelInfo] = {}
+        started: Dict[asyncio.Task, float] = {}
+        
+        def launch(model: ModelInfo) -> asyncio.Task:
+            task = asyncio.create_task(
+                self.invoke_model(model.id, messages, temperature, max_tokens, **kwargs)
+            )
+            tasks[task] = model
+            started[task] = time.perf_counter()
+            return task
+        
+        primary_task = launch(primary)
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=self._hedge_delay(primary.id))
+            if done and self._succeeded(primary_task.result()):
+                tracking["primary_wins"] += 1
+                return primary_task.result(), primary.id
+            
+            if not self._take_hedge_budget(tracking):
+                tracking["budget_skipped"] += 1
+                return await primary_task, primary.id
+            
+            tracking["hedged"] += 1
+            self._usage_entry(backup.id)["hedges"] += 1
+            launch(backup)
+            logger.debug(f"Hedging {primary.id} with {backup.id}", extra={
+                "capability": capability.value,
+                "primary": primary.id,
+                "backup": backup.id
+            })
+            
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if self._succeeded(task.result())), None)
+                if winner is not None:
+                    model = tasks[winner]
+                    if model is backup:
+                        tracking["hedge_wins"] += 1
+                        self._usage_entry(backup.id)["hedge_wins"] += 1
+                    else:
+                        tracking["primary_wins"] += 1
+                    return winner.result(), model.id
+            
+            # Both calls failed; report the primary's fallback response
+            return primary_task.result(), primary.id
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+                # The elapsed time is a lower bound on the loser's latency;
+                # without it a model that keeps losing would keep looking fast
+                self._record_invocation(tasks[task].id, time.perf_counter() - started[task], ok=True)
+            await asyncio.gather(*losers, return_exceptions=True)
+    
+    def _hedge_delay(self, model_id: str) -> float:
+        """Seconds to wait on a model before sending a hedge."""
+        stats = self._stats_for(model_id)
+        latency = stats.latency_percentile(settings.model_hedge_quantile) if stats else None
+        return latency if latency is not None else settings.model_hedge_delay
+    
+    def _take_hedge_budget(self, tracking: Dict[str, int]) -> bool:
+        """Whether a capability may send another hedge.
+        
+        At most ``model_hedge_budget`` of its requests (counting the current
+        one) are hedged, so the first slow request can always hedge.
+        """
+        return tracking["hedged"] < settings.model_hedge_budget * tracking["requests"]
+    
+    def _hedge_entry(self, capability: ModelCapability) -> Dict[str, int]:
+        if capability.value not in self._hedge_tracking:
+            self._hedge_tracking[capability.value] = {
+                "requests": 0,
+                "hedged": 0,
+                "hedge_wins": 0,
+                "primary_wins": 0,
+                "budget_skipped": 0
+            }
+        return self._hedge_tracking[capability.value]
+    
+    @staticmethod
+    def _succeeded(response: Optional[Dict[str, Any]]) -> bool:
+        return bool(response) and not response.get("fallback")
+    
     async def _load_available_models(self):
         """Load available models from requesty.ai."""
         try:
@@ -276,6 +586,7 @@ class ModelRouter:
             
             self.available_models[model_id] = model_info
         
+        self._build_capability_index()
         logger.info(f"Loaded {len(self.available_models)} models from requesty.ai")
     
     def _determine_provider(self, model_id: str) -> ModelProvider:
@@ -387,6 +698,7 @@ class ModelRouter:
             )
         }
         
+        self._build_capability_index()
         logger.info("Initialized fallback models")
     
     def _load_user_preferences(self):
@@ -407,9 +719,14 @@ class ModelRouter:
     def _fallback_model_response(
         self, 
         messages: List[Dict[str, str]], 
-        model_id: str
+        model_id: str,
+        reason: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate fallback response when model API is not available."""
+        """Generate fallback response when model API is not available.
+        
+        ``reason`` records why the API call was not used (missing client,
+        HTTP status after retries, open circuit, ...).
+        """
         user_message = messages[-1].get("content", "") if messages else ""
         
         # Simple template-based response
@@ -438,7 +755,8 @@ class ModelRouter:
                 "total_tokens": len(user_message.split()) + len(fallback_response.split())
             },
             "model": model_id,
-            "fallback": True
+            "fallback": True,
+            "fallback_reason": reason or "api_unavailable"
         }
     
     def _track_usage(
@@ -452,20 +770,13 @@ class ModelRouter:
         prompt_tokens = usage.get("prompt_tokens", 0)
         completion_tokens = usage.get("completion_tokens", 0)
         
-        if model_id not in self._usage_tracking:
-            self._usage_tracking[model_id] = {
-                "requests": 0,
-                "prompt_tokens": 0,
-                "completion_tokens": 0,
-                "total_cost": 0.0
-            }
-        
-        tracking = self._usage_tracking[model_id]
+        tracking = self._usage_entry(model_id)
         tracking["requests"] += 1
         tracking["prompt_tokens"] += prompt_tokens
         tracking["completion_tokens"] += completion_tokens
         
         # Calculate cost if model info is available
+        cost = 0.0
         if model_id in self.available_models:
             model_info = self.available_models[model_id]
             cost = (
@@ -474,12 +785,27 @@ class ModelRouter:
             )
             tracking["total_cost"] += cost
         
+        # Attribute the call to the newsletter node/agent making it, if any
+        record_llm_call(prompt_tokens, completion_tokens, cost, model=model_id)
+        
         logger.debug(f"Usage tracked for {model_id}", extra={
             "model_id": model_id,
             "prompt_tokens": prompt_tokens,
             "completion_tokens": completion_tokens
         })
     
+    def _usage_entry(self, model_id: str) -> Dict[str, Any]:
+        if model_id not in self._usage_tracking:
+            self._usage_tracking[model_id] = {
+                "requests": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_cost": 0.0,
+                "hedges": 0,
+                "hedge_wins": 0
+            }
+        return self._usage_tracking[model_id]
+    
     def set_user_preference(self, capability: ModelCapability, model_id: str):
         """Set user preference for a specific capability."""
         pref_key = f"{capability.value}_model"
@@ -492,8 +818,32 @@ class ModelRouter:
         return self.available_models.copy()
     
     def get_usage_stats(self) -> Dict[str, Dict]:
-        """Get usage statistics."""
-        return self._usage_tracking.copy()
+        """Get usage statistics.
+        
+        ``hedges`` counts the hedged requests a model served as backup and
+        ``hedge_win_rate`` how often that hedge answered first.
+        """
+        return {
+            model_id: {
+                **tracking,
+                "hedge_win_rate": tracking["hedge_wins"] / tracking["hedges"] if tracking["hedges"] else 0.0
+            }
+            for model_id, tracking in self._usage_tracking.items()
+        }
+    
+    def get_hedge_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get hedged-request counters and hedge win rate per capability."""
+        return {
+            capability: {
+                **tracking,
+                "win_rate": tracking["hedge_wins"] / tracking["hedged"] if tracking["hedged"] else 0.0
+            }
+            for capability, tracking in self._hedge_tracking.items()
+        }
+    
+    def get_model_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get rolling latency, error rate and throughput per model."""
+        return {model_id: stats.as_dict() for model_id, stats in self._model_stats.items()}
     
     async def health_check(self) -> Dict[str, Any]:
         """Check health of model router service."""
@@ -503,7 +853,16 @@ class ModelRouter:
             "api_key_configured": bool(self.api_key),
             "client_initialized": bool(self.client),
             "available_models": len(self.available_models),
-            "models_loaded": list(self.available_models.keys())[:5]  # Show first 5
+            "models_loaded": list(self.available_models.keys())[:5],  # Show first 5
+            "http": self.client.get_stats() if self.client else {},
+            "routing": {
+                "policies": {
+                    capability.value: self.get_routing_policy(capability).value
+                    for capability in ModelCapability
+                },
+                "models": self.get_model_stats(),
+                "hedging": self.get_hedge_stats()
+            }
         }
         
         if not self.api_key:
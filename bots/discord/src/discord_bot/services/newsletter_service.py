@@ -1,13 +1,15 @@
 """Newsletter service for managing newsletter generation and storage."""
 
 import asyncio
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, and_
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import select, and_, delete, insert, update
 from sqlalchemy.orm import selectinload
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
+from discord_bot.services.cluster_lock import get_cluster_lock
 from discord_bot.services.database import db_service
 from discord_bot.services.engagement_service import engagement_service
 from discord_bot.agents.newsletter_workflow import newsletter_workflow
@@ -20,6 +22,20 @@ from discord_bot.models.discord_models import DiscordMessage, EngagementMetrics
 
 logger = get_logger(__name__)
 
+# Step-name prefix of the per-node entries in NewsletterGenerationLog
+NODE_STEP_PREFIX = "node:"
+
+# State keys carrying newsletter sections, from least to most finished. A
+# node's sections are persisted unless a more finished set already is.
+SECTION_STAGES = ("discussion_sections", "draft_sections", "newsletter_draft")
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def newsletter_lease_key(newsletter_type: NewsletterType, target_date: str) -> str:
+    """Cluster lease key covering one newsletter type on one date."""
+    return f"newsletter:{NewsletterType(newsletter_type).value}:{target_date}"
+
 
 class NewsletterService:
     """Service for managing newsletter generation and storage."""
@@ -31,9 +47,22 @@ class NewsletterService:
         self,
         newsletter_type: NewsletterType = NewsletterType.DAILY,
         force: bool = False,
-        target_date: Optional[str] = None
+        target_date: Optional[str] = None,
+        resume: bool = True,
+        restart_from: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> Optional[Newsletter]:
-        """Generate a newsletter of the specified type."""
+        """Generate a newsletter of the specified type.
+        
+        ``resume`` and ``restart_from`` control how the workflow reuses
+        checkpoints from an earlier run for the same newsletter; see
+        ``NewsletterWorkflow.generate_newsletter``. Sections are persisted
+        as workflow nodes complete, and ``on_progress`` is awaited with a
+        progress event after each node.
+        
+        Generation holds a cluster-wide lease on the type and date, so only
+        one replica generates a given newsletter; the others get None.
+        """
         if target_date is None:
             target_date = datetime.now().strftime("%Y-%m-%d")
         
@@ -43,13 +72,25 @@ class NewsletterService:
             self._generation_locks[lock_key] = asyncio.Lock()
         
         async with self._generation_locks[lock_key]:
-            return await self._generate_newsletter_locked(newsletter_type, force, target_date)
+            lease_key = newsletter_lease_key(newsletter_type, target_date)
+            async with get_cluster_lock().lease(lease_key) as acquired:
+                if not acquired:
+                    logger.warning("Newsletter generation already running on another replica", extra={
+                        "lease": lease_key
+                    })
+                    return None
+                return await self._generate_newsletter_locked(
+                    newsletter_type, force, target_date, resume, restart_from, on_progress
+                )
     
     async def _generate_newsletter_locked(
         self,
         newsletter_type: NewsletterType,
         force: bool,
-        target_date: str
+        target_date: str,
+        resume: bool = True,
+        restart_from: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None
     ) -> Optional[Newsletter]:
         """Generate newsletter with exclusive lock."""
         logger.info("Starting newsletter generation", extra={
@@ -72,9 +113,6 @@ class NewsletterService:
         newsletter = await self._create_newsletter_record(newsletter_type, target_date)
         
         try:
-            # Update status to generating
-            await self._update_newsletter_status(newsletter.id, NewsletterStatus.GENERATING)
-            
             # Get discussions for newsletter
             discussions = await self._get_discussions_for_newsletter(newsletter_type)
             
@@ -83,12 +121,16 @@ class NewsletterService:
                 await self._update_newsletter_status(newsletter.id, NewsletterStatus.FAILED, "No discussions found")
                 return None
             
-            # Log generation start
-            await self._log_generation_step(
+            # Mark as generating and log the start in one write
+            await self._update_newsletter_status(
                 newsletter.id,
-                "generation_start",
-                "started",
-                {"discussion_count": len(discussions)}
+                NewsletterStatus.GENERATING,
+                log_steps=[self._generation_log_values(
+                    newsletter.id,
+                    "generation_start",
+                    "started",
+                    {"discussion_count": len(discussions)}
+                )]
             )
             
             # Convert to DiscussionData objects
@@ -106,34 +148,33 @@ class NewsletterService:
                     participants=d[1].discussion_participants,
                     keywords=d[1].extracted_keywords or [],
                     category=d[1].topic_categories or ["general"],
-                    created_at=d[0].created_at
+                    created_at=d[0].created_at,
+                    clean_content=d[0].normalized_content,
+                    urls=d[0].content_urls or [],
+                    code_languages=d[0].code_languages or []
                 )
                 discussion_data.append(discussion_obj)
             
-            # Generate newsletter using workflow
-            workflow_result = await newsletter_workflow.generate_newsletter(
+            # Stream the workflow, persisting each node's output as it lands
+            workflow_result: Dict[str, Any] = {}
+            section_rank = -1
+            async for event in newsletter_workflow.stream_newsletter(
                 discussions=discussion_data,
                 newsletter_type=newsletter_type.value,
-                target_date=target_date
-            )
-            
-            # Store newsletter content
-            await self._store_newsletter_content(newsletter.id, workflow_result)
-            
-            # Update status to generated
-            await self._update_newsletter_status(newsletter.id, NewsletterStatus.GENERATED)
+                target_date=target_date,
+                resume=resume,
+                restart_from=restart_from
+            ):
+                if event["type"] == "completed":
+                    workflow_result = event["state"]
+                    continue
+                section_rank = await self._record_node_progress(
+                    newsletter.id, event["node"], event["update"], section_rank, on_progress
+                )
             
-            # Log generation completion
-            await self._log_generation_step(
-                newsletter.id,
-                "generation_complete",
-                "completed",
-                {
-                    "word_count": workflow_result.get("quality_metrics", {}).get("total_word_count", 0),
-                    "section_count": len(workflow_result.get("draft_sections", [])),
-                    "errors": workflow_result.get("errors", [])
-                }
-            )
+            # Store content, sections, featured discussions, the generated
+            # status and the completion log in one transaction
+            await self._store_newsletter_content(newsletter.id, workflow_result, discussions)
             
             logger.info("Newsletter generation completed", extra={
                 "newsletter_id": str(newsletter.id),
@@ -152,14 +193,13 @@ class NewsletterService:
             await self._update_newsletter_status(
                 newsletter.id, 
                 NewsletterStatus.FAILED, 
-                f"Generation failed: {str(e)}"
-            )
-            
-            await self._log_generation_step(
-                newsletter.id,
-                "generation_error",
-                "failed",
-                {"error": str(e), "error_type": type(e).__name__}
+                f"Generation failed: {str(e)}",
+                log_steps=[self._generation_log_values(
+                    newsletter.id,
+                    "generation_error",
+                    "failed",
+                    {"error": str(e), "error_type": type(e).__name__}
+                )]
             )
             
             return None
@@ -259,113 +299,247 @@ class NewsletterService:
 
         return discussions
     
-    async def _store_newsletter_content(self, newsletter_id: str, workflow_result: Dict[str, Any]) -> None:
-        """Store newsletter content and sections."""
+    async def _store_newsletter_content(
+        self,
+        newsletter_id: uuid.UUID,
+        workflow_result: Dict[str, Any],
+        discussions: Optional[List[tuple]] = None
+    ) -> None:
+        """Store the finished newsletter in a single transaction.
+        
+        Content, sections, featured discussions, the ``generated`` status and
+        the completion log are written together with multi-row inserts, so
+        storing a run takes a few statements however many rows it has.
+        ``discussions`` are the (message, metrics) pairs the run was given.
+        """
+        draft = workflow_result.get("newsletter_draft")
+        quality_metrics = workflow_result.get("quality_metrics", {})
+        
+        values: Dict[str, Any] = {"status": NewsletterStatus.GENERATED}
+        if draft:
+            # Reuse the formatter node's output; only render if it never ran
+            formatted_content = workflow_result.get("formatted_content") or {}
+            if not formatted_content.get("html"):
+                formatted_content = self._render_draft(draft)
+            values.update(
+                content_html=formatted_content.get("html"),
+                content_markdown=formatted_content.get("markdown"),
+                content_text=formatted_content.get("text"),
+                word_count=draft.get("total_word_count", 0),
+                estimated_read_time=draft.get("estimated_read_time", 1),
+                generated_at=datetime.now(timezone.utc),
+                quality_score=quality_metrics.get("overall_score", 0.8)
+            )
+        
+        discussion_rows = self._featured_discussion_values(
+            newsletter_id, workflow_result, discussions or []
+        )
+        completion_log = self._generation_log_values(
+            newsletter_id,
+            "generation_complete",
+            "completed",
+            {
+                "word_count": quality_metrics.get("total_word_count", 0),
+                "section_count": len(workflow_result.get("draft_sections", [])),
+                "featured_discussions": len(discussion_rows),
+                "errors": workflow_result.get("errors", []),
+                **self._summarize_node_metrics(workflow_result.get("node_metrics", []))
+            }
+        )
+        
         async with db_service.get_session() as session:
-            # Get newsletter
-            result = await session.execute(
-                select(Newsletter).where(Newsletter.id == newsletter_id)
+            await session.execute(
+                update(Newsletter).where(Newsletter.id == newsletter_id).values(**values)
             )
-            newsletter = result.scalar_one()
-
-            # Store main content
-            draft = workflow_result.get("newsletter_draft")
-            # Check if formatted_content exists in workflow result, if not generate it
-            formatted_content = workflow_result.get("formatted_content")
-            quality_metrics = workflow_result.get("quality_metrics", {})
-
-            if draft:
-                # If formatted_content is not in workflow result, we need to generate it from draft
-                if not formatted_content:
-                    from discord_bot.agents.formatter_agent import FormatterAgent
-                    formatter = FormatterAgent()
-                    # Generate formatted content from the draft
-                    from discord_bot.agents.state import NewsletterDraft, NewsletterSection
-
-                    # Reconstruct sections with all required fields
-                    sections = []
-                    for section_data in draft.get("sections", []):
-                        section = NewsletterSection(
-                            section_type=section_data.get("section_type", "general"),
-                            title=section_data.get("title", "Untitled"),
-                            content=section_data.get("content", ""),
-                            discussions=section_data.get("discussions", []),
-                            word_count=section_data.get("word_count", 0)
-                        )
-                        sections.append(section)
-
-                    draft_obj = NewsletterDraft(
-                        title=draft.get("title", ""),
-                        subtitle=draft.get("subtitle", ""),
-                        sections=sections,
-                        total_word_count=draft.get("total_word_count", 0),
-                        estimated_read_time=draft.get("estimated_read_time", 1),
-                        featured_discussions=draft.get("featured_discussions", []),
-                        generation_metadata=draft.get("generation_metadata", {})
-                    )
-
-                    html_content = formatter._format_as_html(draft_obj)
-                    markdown_content = formatter._format_as_markdown(draft_obj)
-                    text_content = formatter._format_as_text(draft_obj)
-
-                    newsletter.content_html = html_content
-                    newsletter.content_markdown = markdown_content
-                    newsletter.content_text = text_content
-                else:
-                    newsletter.content_html = formatted_content.get("html")
-                    newsletter.content_markdown = formatted_content.get("markdown")
-                    newsletter.content_text = formatted_content.get("text")
-
-                newsletter.word_count = draft.get("total_word_count", 0)
-                newsletter.estimated_read_time = draft.get("estimated_read_time", 1)
-
-                # Update generation metadata
-                newsletter.generated_at = datetime.now(timezone.utc)
-                newsletter.quality_score = quality_metrics.get("overall_score", 0.8)
             
-            # Store sections - use sections from the draft object which is correctly structured
+            # Replace the sections persisted while the workflow was running
             if draft and "sections" in draft:
-                from discord_bot.models.newsletter_models import NewsletterSection as DBNewsletterSection
-                sections = draft["sections"]
-                for i, section_data in enumerate(sections):
-                    # Sections from draft are dictionaries with section_type, title, content, discussions, word_count
-                    section = DBNewsletterSection(
-                        newsletter_id=newsletter.id,
-                        section_type=section_data.get("section_type", "general"),
-                        title=section_data.get("title", f"Section {i+1}"),
-                        order_index=i,
-                        content_html=f"<p>{section_data.get('content', '')}</p>",
-                        content_markdown=section_data.get("content", ""),
-                        summary=section_data.get("content", "")[:200] + "..." if len(section_data.get("content", "")) > 200 else section_data.get("content", ""),
-                        generated_by_agent="NewsletterWorkflow"
-                    )
-                    session.add(section)
+                await self._replace_sections(session, newsletter_id, draft["sections"])
             
-            # TODO: Store featured discussions
-            # Skipping for now - message_id is Discord snowflake (string) not UUID
-            # technical_analysis = workflow_result.get("technical_analysis", {})
-            # for message_id, analysis in technical_analysis.items():
-            #     ...
+            if discussion_rows:
+                await session.execute(
+                    delete(NewsletterDiscussion).where(NewsletterDiscussion.newsletter_id == newsletter_id)
+                )
+                await session.execute(insert(NewsletterDiscussion).values(discussion_rows))
             
+            await session.execute(insert(NewsletterGenerationLog).values([completion_log]))
             await session.commit()
     
+    @staticmethod
+    def _render_draft(draft: Dict[str, Any]) -> Dict[str, str]:
+        """Render a stored draft when the workflow produced no formatted content."""
+        from discord_bot.agents.state import NewsletterDraft
+        from discord_bot.utils.newsletter_renderer import newsletter_renderer
+        
+        sections = [
+            {
+                "section_type": section.get("section_type", "general"),
+                "title": section.get("title", "Untitled"),
+                "content": section.get("content", ""),
+                "discussions": section.get("discussions", []),
+                "word_count": section.get("word_count", 0)
+            }
+            for section in draft.get("sections", [])
+        ]
+        return newsletter_renderer.render(NewsletterDraft(
+            title=draft.get("title", ""),
+            subtitle=draft.get("subtitle", ""),
+            sections=sections,
+            total_word_count=draft.get("total_word_count", 0),
+            estimated_read_time=draft.get("estimated_read_time", 1),
+            featured_discussions=draft.get("featured_discussions", []),
+            generation_metadata=draft.get("generation_metadata", {})
+        ))
+    
+    @staticmethod
+    def _featured_discussion_values(
+        newsletter_id: uuid.UUID,
+        workflow_result: Dict[str, Any],
+        discussions: List[tuple]
+    ) -> List[Dict[str, Any]]:
+        """Build ``newsletter_discussions`` rows for the discussions the run featured.
+        
+        Featured discussions are the ones the opinion writer commented on,
+        else the draft's ``featured_discussions``. Both hold Discord message
+        IDs, which are mapped to message rows through ``discussions``.
+        """
+        technical_analysis = workflow_result.get("technical_analysis") or {}
+        draft = workflow_result.get("newsletter_draft") or {}
+        featured_ids = list(technical_analysis) or draft.get("featured_discussions", [])
+        by_message_id = {message.message_id: (message, metrics) for message, metrics in discussions}
+        
+        rows = []
+        for message_id in dict.fromkeys(featured_ids):
+            if message_id not in by_message_id:
+                continue
+            message, metrics = by_message_id[message_id]
+            analysis = technical_analysis.get(message_id) or {}
+            content = (message.content or "").strip()
+            rows.append({
+                "id": uuid.uuid4(),
+                "newsletter_id": newsletter_id,
+                "message_id": message.id,
+                "discussion_title": (content.split("\n", 1)[0] or "Discussion")[:200],
+                "discussion_summary": content[:500],
+                "key_points": analysis.get("focus_areas"),
+                "technical_analysis": analysis.get("commentary"),
+                "engagement_score_snapshot": metrics.engagement_score,
+                "participant_count_snapshot": metrics.discussion_participants,
+                "inclusion_reason": "Technical commentary" if analysis else "Featured in draft",
+                "priority_score": metrics.engagement_score
+            })
+        return rows
+    
+    async def _record_node_progress(
+        self,
+        newsletter_id: uuid.UUID,
+        node: str,
+        update: Dict[str, Any],
+        section_rank: int,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """Persist what a finished workflow node produced and report it.
+        
+        Returns the stage of the sections now stored (see ``SECTION_STAGES``),
+        so a revision pass re-running early nodes does not replace a more
+        finished draft with partial sections.
+        """
+        sections = None
+        for rank, key in enumerate(SECTION_STAGES):
+            value = update.get(key)
+            if key == "newsletter_draft":
+                value = value.get("sections") if value else None
+            if value and rank >= section_rank:
+                sections, section_rank = value, rank
+        
+        node_metrics = update.get("node_metrics", [])
+        if sections is not None or node_metrics:
+            async with db_service.get_session() as session:
+                if sections is not None:
+                    await self._replace_sections(session, newsletter_id, sections, generated_by=node)
+                if node_metrics:
+                    await session.execute(insert(NewsletterGenerationLog).values(
+                        self._node_metric_log_values(newsletter_id, node_metrics)
+                    ))
+                await session.commit()
+        
+        event = {
+            "newsletter_id": str(newsletter_id),
+            "node": node,
+            "iteration": node_metrics[0].get("iteration", 0) if node_metrics else 0,
+            "duration": node_metrics[0].get("duration") if node_metrics else None,
+            "sections_saved": len(sections) if sections is not None else 0,
+            "errors": update.get("errors", [])
+        }
+        logger.info("Newsletter workflow node completed", extra=event)
+        
+        if on_progress:
+            try:
+                await on_progress(event)
+            except Exception as e:
+                logger.warning("Newsletter progress callback failed", extra={"error": str(e)})
+        
+        return section_rank
+    
+    async def _replace_sections(
+        self,
+        session,
+        newsletter_id: uuid.UUID,
+        sections: List[Dict[str, Any]],
+        generated_by: str = "NewsletterWorkflow"
+    ) -> None:
+        """Replace a newsletter's stored sections with ``sections``."""
+        await session.execute(
+            delete(NewsletterSection).where(NewsletterSection.newsletter_id == newsletter_id)
+        )
+        if not sections:
+            return
+        
+        rows = []
+        for i, section_data in enumerate(sections):
+            content = section_data.get("content", "")
+            rows.append({
+                "id": uuid.uuid4(),
+                "newsletter_id": newsletter_id,
+                "section_type": section_data.get("section_type", "general"),
+                "title": section_data.get("title", f"Section {i+1}"),
+                "order_index": i,
+                "content_html": f"<p>{content}</p>",
+                "content_markdown": content,
+                "summary": content[:200] + "..." if len(content) > 200 else content,
+                "generated_by_agent": generated_by
+            })
+        await session.execute(insert(NewsletterSection).values(rows))
+    
     async def _update_newsletter_status(
         self, 
-        newsletter_id: str, 
+        newsletter_id: uuid.UUID, 
         status: NewsletterStatus,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        log_steps: Optional[List[Dict[str, Any]]] = None
     ) -> None:
-        """Update newsletter status."""
+        """Update newsletter status, writing ``log_steps`` in the same transaction."""
+        values: Dict[str, Any] = {"status": status}
+        if error_message:
+            values["error_message"] = error_message
+        
         async with db_service.get_session() as session:
-            result = await session.execute(
-                select(Newsletter).where(Newsletter.id == newsletter_id)
+            await session.execute(
+                update(Newsletter).where(Newsletter.id == newsletter_id).values(**values)
+            )
+            if log_steps:
+                await session.execute(insert(NewsletterGenerationLog).values(log_steps))
+            await session.commit()
+    
+    async def mark_published(self, newsletter_id: uuid.UUID, draft_id: str) -> None:
+        """Record that a newsletter was sent to Buttondown."""
+        async with db_service.get_session() as session:
+            await session.execute(
+                update(Newsletter).where(Newsletter.id == newsletter_id).values(
+                    status=NewsletterStatus.PUBLISHED,
+                    buttondown_draft_id=draft_id
+                )
             )
-            newsletter = result.scalar_one()
-            
-            newsletter.status = status
-            if error_message:
-                newsletter.error_message = error_message
-            
             await session.commit()
     
     async def _get_newsletter_by_id(self, newsletter_id: str) -> Optional[Newsletter]:
@@ -382,25 +556,152 @@ class NewsletterService:
             )
             return result.scalar_one_or_none()
     
-    async def _log_generation_step(
-        self,
-        newsletter_id: str,
+    @staticmethod
+    def _generation_log_values(
+        newsletter_id: uuid.UUID,
         step_name: str,
         status: str,
-        metadata: Dict[str, Any] = None
-    ) -> None:
-        """Log a generation step."""
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build a ``newsletter_generation_logs`` row for a generation step."""
+        now = datetime.now(timezone.utc)
+        return {
+            "id": uuid.uuid4(),
+            "newsletter_id": newsletter_id,
+            "step_name": step_name,
+            "status": status,
+            "started_at": now,
+            "completed_at": now if status in ["completed", "failed"] else None,
+            "step_metadata": metadata or {}
+        }
+    
+    @staticmethod
+    def _node_metric_log_values(
+        newsletter_id: uuid.UUID,
+        node_metrics: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Build log rows for workflow node runs.
+        
+        Wall time, LLM calls, tokens and cost go into the log's columns;
+        the token split and cache counters go into ``step_metadata``.
+        """
+        rows = []
+        for metrics in node_metrics:
+            started_at = datetime.fromisoformat(metrics["started_at"])
+            rows.append({
+                "id": uuid.uuid4(),
+                "newsletter_id": newsletter_id,
+                "step_name": f"{NODE_STEP_PREFIX}{metrics['node']}",
+                "agent_name": metrics["node"],
+                "status": "completed",
+                "started_at": started_at,
+                "completed_at": started_at + timedelta(seconds=metrics["duration"]),
+                "duration": metrics["duration"],
+                "model_used": ", ".join(metrics.get("models", []))[:100] or None,
+                "api_calls": metrics.get("calls", 0),
+                "tokens_used": metrics.get("input_tokens", 0) + metrics.get("output_tokens", 0),
+                "cost": metrics.get("cost", 0.0),
+                "step_metadata": {
+                    "iteration": metrics.get("iteration", 0),
+                    "input_tokens": metrics.get("input_tokens", 0),
+                    "output_tokens": metrics.get("output_tokens", 0),
+                    "cache_hits": metrics.get("cache_hits", 0),
+                    "cache_misses": metrics.get("cache_misses", 0),
+                    "cost_saved": metrics.get("cost_saved", 0.0)
+                }
+            })
+        return rows
+    
+    @staticmethod
+    def _summarize_node_metrics(node_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Total time per node, plus the wall-clock span of the whole run.
+        
+        Parallel branches overlap, so ``wall_time`` is less than the sum of
+        the node durations whenever the fan-out paid off.
+        """
+        if not node_metrics:
+            return {}
+        
+        per_node: Dict[str, float] = {}
+        for metrics in node_metrics:
+            per_node[metrics["node"]] = round(per_node.get(metrics["node"], 0.0) + metrics["duration"], 3)
+        
+        starts = [datetime.fromisoformat(m["started_at"]) for m in node_metrics]
+        ends = [start + timedelta(seconds=m["duration"]) for start, m in zip(starts, node_metrics)]
+        return {
+            "node_durations": per_node,
+            "node_time_total": round(sum(per_node.values()), 3),
+            "wall_time": round((max(ends) - min(starts)).total_seconds(), 3),
+            "llm_calls": sum(m.get("calls", 0) for m in node_metrics),
+            "total_cost": sum(m.get("cost", 0.0) for m in node_metrics)
+        }
+    
+    async def get_generation_profile(self, newsletter_id: str) -> Optional[Dict[str, Any]]:
+        """Aggregate the per-node logs of a newsletter run into a latency/spend profile.
+        
+        Returns None if the newsletter has no node logs. Nodes are ordered by
+        first start; each carries its share of total node time and cost.
+        """
         async with db_service.get_session() as session:
-            log_entry = NewsletterGenerationLog(
-                newsletter_id=newsletter_id,
-                step_name=step_name,
-                status=status,
-                started_at=datetime.now(timezone.utc),
-                completed_at=datetime.now(timezone.utc) if status in ["completed", "failed"] else None,
-                metadata=metadata or {}
+            result = await session.execute(
+                select(NewsletterGenerationLog)
+                .where(
+                    NewsletterGenerationLog.newsletter_id == uuid.UUID(str(newsletter_id)),
+                    NewsletterGenerationLog.step_name.startswith(NODE_STEP_PREFIX)
+                )
+                .order_by(NewsletterGenerationLog.started_at)
             )
-            session.add(log_entry)
-            await session.commit()
+            logs = result.scalars().all()
+        
+        if not logs:
+            return None
+        
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for log in logs:
+            meta = log.step_metadata or {}
+            node = nodes.setdefault(log.agent_name, {
+                "node": log.agent_name,
+                "runs": 0,
+                "duration": 0.0,
+                "llm_calls": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cache_hits": 0,
+                "cost": 0.0,
+                "cost_saved": 0.0,
+                "models": set()
+            })
+            node["runs"] += 1
+            node["duration"] += log.duration or 0.0
+            node["llm_calls"] += log.api_calls or 0
+            node["input_tokens"] += meta.get("input_tokens", 0)
+            node["output_tokens"] += meta.get("output_tokens", 0)
+            node["cache_hits"] += meta.get("cache_hits", 0)
+            node["cost"] += log.cost or 0.0
+            node["cost_saved"] += meta.get("cost_saved", 0.0)
+            if log.model_used:
+                node["models"].update(log.model_used.split(", "))
+        
+        total_duration = sum(node["duration"] for node in nodes.values())
+        total_cost = sum(node["cost"] for node in nodes.values())
+        for node in nodes.values():
+            node["models"] = sorted(node["models"])
+            node["duration_share"] = node["duration"] / total_duration if total_duration else 0.0
+            node["cost_share"] = node["cost"] / total_cost if total_cost else 0.0
+        
+        wall_start = min(log.started_at for log in logs)
+        wall_end = max(log.completed_at or log.started_at for log in logs)
+        return {
+            "newsletter_id": str(newsletter_id),
+            "wall_time": (wall_end - wall_start).total_seconds(),
+            "node_time_total": total_duration,
+            "llm_calls": sum(node["llm_calls"] for node in nodes.values()),
+            "tokens": sum(node["input_tokens"] + node["output_tokens"] for node in nodes.values()),
+            "cache_hits": sum(node["cache_hits"] for node in nodes.values()),
+            "total_cost": total_cost,
+            "cost_saved": sum(node["cost_saved"] for node in nodes.values()),
+            "nodes": list(nodes.values())
+        }
     
     async def get_recent_newsletters(
         self,
@@ -1,13 +1,15 @@
 """Perplexity API service for research and fact-checking."""
 
-import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 from datetime import datetime, timezone
 import httpx
 import json
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
+from discord_bot.services.http_transport import CircuitOpenError, ServiceClient, http_transport
+from discord_bot.services.research_cache import get_research_cache, research_cache_key, research_max_age
+from discord_bot.utils.concurrency import SingleFlight
 from discord_bot.agents.state import ResearchResult
 
 logger = get_logger(__name__)
@@ -19,9 +21,8 @@ class PerplexityService:
     def __init__(self):
         self.base_url = settings.perplexity_base_url
         self.api_key = settings.perplexity_api_key
-        self.client: Optional[httpx.AsyncClient] = None
-        self._rate_limit_remaining = 100  # Default rate limit
-        self._rate_limit_reset = datetime.now(timezone.utc)
+        self.client: Optional[ServiceClient] = None
+        self._in_flight: SingleFlight[Optional[Dict[str, Any]]] = SingleFlight()
     
     async def initialize(self):
         """Initialize the Perplexity service."""
@@ -29,8 +30,9 @@ class PerplexityService:
             logger.warning("Perplexity API key not configured")
             return
         
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
+        self.client = http_transport.client(
+            "perplexity",
+            self.base_url,
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
@@ -43,7 +45,6 @@ class PerplexityService:
     async def close(self):
         """Close the Perplexity service."""
         if self.client:
-            await self.client.aclose()
             self.client = None
             logger.info("Perplexity service closed")
     
@@ -51,9 +52,15 @@ class PerplexityService:
         self,
         query: str,
         topic_context: str = "",
-        max_tokens: int = 500
+        max_tokens: int = 500,
+        max_age: Optional[float] = None
     ) -> Optional[ResearchResult]:
-        """Research a topic using Perplexity API."""
+        """Research a topic using Perplexity API.
+        
+        Results fetched within ``max_age`` seconds (see ``research_max_age``)
+        are served from the research cache, and concurrent identical
+        requests share one API call.
+        """
         if not self.client:
             await self.initialize()
         
@@ -61,11 +68,26 @@ class PerplexityService:
             logger.warning("Perplexity API not available, using fallback research")
             return self._fallback_research(query, topic_context)
         
-        # Check rate limits
-        if not await self._check_rate_limit():
-            logger.warning("Perplexity API rate limit exceeded")
-            return self._fallback_research(query, topic_context)
+        result = await self._cached_request(
+            research_cache_key("research", query, topic_context, max_tokens=max_tokens),
+            "research",
+            query,
+            max_age,
+            lambda: self._fetch_research(query, topic_context, max_tokens)
+        )
+        if result is not None:
+            return ResearchResult(**{**result, "topic": query, "query": query})
         
+        # Fallback to local research
+        return self._fallback_research(query, topic_context)
+    
+    async def _fetch_research(
+        self,
+        query: str,
+        topic_context: str,
+        max_tokens: int
+    ) -> Optional[Dict[str, Any]]:
+        """Research a topic via the API; None if the request failed."""
         try:
             # Prepare the research prompt
             research_prompt = self._create_research_prompt(query, topic_context)
@@ -93,30 +115,43 @@ class PerplexityService:
             )
             
             if response:
-                return self._parse_research_response(query, response)
+                return self._parse_research_response(query, response).model_dump(mode="json")
             
         except Exception as e:
             logger.error(f"Perplexity API research failed: {e}")
         
-        # Fallback to local research
-        return self._fallback_research(query, topic_context)
+        return None
     
     async def fact_check(
         self,
         claim: str,
-        context: str = ""
+        context: str = "",
+        max_age: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Fact-check a claim using Perplexity API."""
+        """Fact-check a claim using Perplexity API.
+        
+        Cached and coalesced like ``research_topic``.
+        """
         if not self.client:
             await self.initialize()
         
         if not self.client or not self.api_key:
             return self._fallback_fact_check(claim)
         
-        # Check rate limits
-        if not await self._check_rate_limit():
-            return self._fallback_fact_check(claim)
+        result = await self._cached_request(
+            research_cache_key("fact_check", claim, context),
+            "fact_check",
+            claim,
+            max_age,
+            lambda: self._fetch_fact_check(claim, context)
+        )
+        if result is not None:
+            return {**result, "claim": claim}
         
+        return self._fallback_fact_check(claim)
+    
+    async def _fetch_fact_check(self, claim: str, context: str) -> Optional[Dict[str, Any]]:
+        """Fact-check a claim via the API; None if the request failed."""
         try:
             fact_check_prompt = f"""
             Fact-check this claim: "{claim}"
@@ -158,7 +193,38 @@ class PerplexityService:
         except Exception as e:
             logger.error(f"Perplexity fact-check failed: {e}")
         
-        return self._fallback_fact_check(claim)
+        return None
+    
+    async def _cached_request(
+        self,
+        key: str,
+        kind: str,
+        query: str,
+        max_age: Optional[float],
+        fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Serve a request from the research cache, or fetch it exactly once.
+        
+        Concurrent callers with the same key join the in-flight fetch. Only
+        successful API results are cached, never fallbacks.
+        """
+        cache = get_research_cache()
+        if max_age is None:
+            max_age = research_max_age()
+        
+        if cache is not None:
+            cached = await cache.get(key, max_age)
+            if cached is not None:
+                logger.debug("Research cache hit", extra={"kind": kind, "query": query[:80]})
+                return cached
+        
+        async def fetch_and_store() -> Optional[Dict[str, Any]]:
+            result = await fetch()
+            if result is not None and cache is not None:
+                await cache.set(key, kind, query, result)
+            return result
+        
+        return await self._in_flight.do(key, fetch_and_store)
     
     async def get_latest_updates(
         self,
@@ -180,10 +246,6 @@ class PerplexityService:
                     updates.append(self._fallback_update(topic))
                     continue
                 
-                if not await self._check_rate_limit():
-                    updates.append(self._fallback_update(topic))
-                    continue
-                
                 response = await self._make_api_request(
                     "/chat/completions",
                     {
@@ -206,9 +268,6 @@ class PerplexityService:
                 else:
                     updates.append(self._fallback_update(topic))
                 
-                # Rate limiting between requests
-                await asyncio.sleep(1)
-                
             except Exception as e:
                 logger.error(f"Failed to get updates for {topic}: {e}")
                 updates.append(self._fallback_update(topic))
@@ -216,12 +275,13 @@ class PerplexityService:
         return updates
     
     async def _make_api_request(self, endpoint: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Make API request to Perplexity."""
+        """Make API request to Perplexity.
+        
+        Rate limiting, retries and backoff are handled by the shared HTTP
+        transport; a None result means the request still failed.
+        """
         try:
-            response = await self.client.post(endpoint, json=payload)
-            
-            # Update rate limit info
-            self._update_rate_limits(response.headers)
+            response = await self.client.post(endpoint, json=payload, idempotent=True)
             
             if response.status_code == 200:
                 return response.json()
@@ -231,7 +291,10 @@ class PerplexityService:
             else:
                 logger.error(f"Perplexity API error: {response.status_code} - {response.text}")
                 return None
-                
+        
+        except CircuitOpenError as e:
+            logger.warning(f"Perplexity API unavailable: {e}")
+            return None
         except httpx.TimeoutException:
             logger.error("Perplexity API request timeout")
             return None
@@ -357,25 +420,6 @@ class PerplexityService:
         
         return min(1.0, base_score + length_bonus + tech_bonus)
     
-    async def _check_rate_limit(self) -> bool:
-        """Check if we can make an API request based on rate limits."""
-        now = datetime.now(timezone.utc)
-        
-        # Reset rate limit if time has passed
-        if now >= self._rate_limit_reset:
-            self._rate_limit_remaining = 100  # Reset to default
-        
-        return self._rate_limit_remaining > 0
-    
-    def _update_rate_limits(self, headers: Dict[str, str]):
-        """Update rate limit tracking from API response headers."""
-        if "x-ratelimit-remaining" in headers:
-            self._rate_limit_remaining = int(headers["x-ratelimit-remaining"])
-        
-        if "x-ratelimit-reset" in headers:
-            reset_timestamp = int(headers["x-ratelimit-reset"])
-            self._rate_limit_reset = datetime.fromtimestamp(reset_timestamp, tz=timezone.utc)
-    
     def _fallback_research(self, query: str, context: str = "") -> ResearchResult:
         """Fallback research when Perplexity API is not available."""
         # Simulate research based on common Austin LangChain topics
@@ -428,13 +472,15 @@ class PerplexityService:
     
     async def health_check(self) -> Dict[str, Any]:
         """Check health of Perplexity service."""
+        cache = get_research_cache()
         health = {
             "service": "perplexity",
             "status": "unknown",
             "api_key_configured": bool(self.api_key),
             "client_initialized": bool(self.client),
-            "rate_limit_remaining": self._rate_limit_remaining,
-            "last_reset": self._rate_limit_reset.isoformat() if self._rate_limit_reset else None
+            "http": self.client.get_stats() if self.client else {},
+            "research_cache": cache.get_stats() if cache else {"backend": "none"},
+            "coalescing": self._in_flight.get_stats()
         }
         
         if not self.api_key:
@@ -0,0 +1,221 @@
+"""Shared cache of Perplexity research and fact-check results."""
+
+import hashlib
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+from discord_bot.models.newsletter_models import ResearchCacheEntry
+from discord_bot.services.database import db_service, upsert_insert
+from discord_bot.utils.caching import SettingsBound
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries match."""
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+def research_cache_key(kind: str, query: str, context: str = "", **params: Any) -> str:
+    """Hash a research request: kind, normalized query and context, and any
+    parameters that change the answer (e.g. ``max_tokens``)."""
+    payload = [kind, normalize_query(query), normalize_query(context), sorted(params.items())]
+    encoded = json.dumps(payload, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def research_max_age(newsletter_type: Optional[str] = None) -> int:
+    """Seconds a cached result stays fresh for a newsletter type.
+
+    Unknown or missing types use the daily window, the strictest one.
+    """
+    windows = {
+        "daily": settings.research_cache_max_age_daily,
+        "weekly": settings.research_cache_max_age_weekly,
+        "monthly": settings.research_cache_max_age_monthly,
+    }
+    return windows.get((newsletter_type or "daily").lower(), settings.research_cache_max_age_daily)
+
+
+def research_retention() -> int:
+    """Seconds an entry is kept: the longest freshness window of any type."""
+    return max(
+        settings.research_cache_max_age_daily,
+        settings.research_cache_max_age_weekly,
+        settings.research_cache_max_age_monthly,
+    )
+
+
+class ResearchCache(ABC):
+    """Base class for research cache backends.
+
+    Entries record when they were fetched, so each reader decides whether
+    a result is fresh enough for it (``max_age``) and one entry serves every
+    newsletter type. Like the LLM response cache, backends never raise from
+    ``get``/``set``: a broken cache degrades to a miss.
+    """
+
+    backend = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """Return the cached result for ``key`` if fetched within ``max_age`` seconds."""
+        try:
+            entry = await self._get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Research cache read failed", extra={
+                "backend": self.backend,
+                "error": str(e)
+            })
+            entry = None
+
+        if entry is None or time.time() - entry["fetched_at"] > max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["result"]
+
+    async def set(self, key: str, kind: str, query: str, result: Dict[str, Any]) -> None:
+        """Store a freshly fetched result."""
+        try:
+            await self._set(key, kind, normalize_query(query), result, time.time())
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Research cache write failed", extra={
+                "backend": self.backend,
+                "error": str(e)
+            })
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for health reporting."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read the entry (``result`` and ``fetched_at``) stored under ``key``."""
+        pass
+
+    @abstractmethod
+    async def _set(
+        self, key: str, kind: str, query: str, result: Dict[str, Any], fetched_at: float
+    ) -> None:
+        """Write a result fetched at ``fetched_at`` under ``key``."""
+        pass
+
+
+class DatabaseResearchCache(ResearchCache):
+    """Research cache in the ``research_cache`` table of the application database."""
+
+    backend = "database"
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        async with db_service.get_session() as session:
+            entry = (await session.execute(
+                select(ResearchCacheEntry).where(
+                    ResearchCacheEntry.cache_key == key,
+                    ResearchCacheEntry.expires_at > datetime.now(timezone.utc)
+                )
+            )).scalar_one_or_none()
+            if entry is None:
+                return None
+            fetched_at = entry.fetched_at
+            if fetched_at.tzinfo is None:
+                fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+            return {"fetched_at": fetched_at.timestamp(), "result": entry.result}
+
+    async def _set(
+        self, key: str, kind: str, query: str, result: Dict[str, Any], fetched_at: float
+    ) -> None:
+        fetched = datetime.fromtimestamp(fetched_at, tz=timezone.utc)
+        expires = fetched + timedelta(seconds=research_retention())
+        async with db_service.get_session() as session:
+            stmt = upsert_insert(session, ResearchCacheEntry).values(
+                cache_key=key,
+                kind=kind,
+                query=query,
+                result=result,
+                fetched_at=fetched,
+                expires_at=expires
+            )
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=["cache_key"],
+                set_={
+                    "result": stmt.excluded.result,
+                    "fetched_at": stmt.excluded.fetched_at,
+                    "expires_at": stmt.excluded.expires_at,
+                }
+            ))
+            await session.execute(
+                delete(ResearchCacheEntry).where(ResearchCacheEntry.expires_at <= fetched)
+            )
+            await session.commit()
+
+
+class RedisResearchCache(ResearchCache):
+    """Research cache in Redis; entries expire after the longest freshness window."""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "research_cache:"):
+        super().__init__()
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self._client.get(self._prefix + key)
+        return json.loads(value) if value is not None else None
+
+    async def _set(
+        self, key: str, kind: str, query: str, result: Dict[str, Any], fetched_at: float
+    ) -> None:
+        entry = {"kind": kind, "query": query, "fetched_at": fetched_at, "result": result}
+        await self._client.setex(self._prefix + key, research_retention(), json.dumps(entry))
+
+
+def _cache_settings() -> tuple:
+    return (settings.research_cache_backend.lower(), settings.redis_url)
+
+
+def _build_cache(backend: str, redis_url: str) -> Optional[ResearchCache]:
+    try:
+        if backend == "database":
+            return DatabaseResearchCache()
+        if backend == "redis":
+            return RedisResearchCache(redis_url)
+        if backend != "none":
+            logger.warning(f"Unknown research cache backend '{backend}', caching disabled")
+    except ImportError:
+        logger.warning("redis package not installed, research caching disabled")
+    return None
+
+
+_cache: SettingsBound[Optional[ResearchCache]] = SettingsBound(_cache_settings, _build_cache)
+
+
+def get_research_cache() -> Optional[ResearchCache]:
+    """Get the configured research cache, or None if caching is disabled."""
+    return _cache.get()
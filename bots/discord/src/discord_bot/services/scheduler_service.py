@@ -6,6 +6,7 @@ from datetime import datetime, time, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.job import Job
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
@@ -13,27 +14,54 @@ import pytz
 
 from discord_bot.core.config import settings
 from discord_bot.core.logging import get_logger
-from discord_bot.services.newsletter_service import newsletter_service
+from discord_bot.services.cluster_lock import get_cluster_lock
+from discord_bot.services.newsletter_service import newsletter_service, newsletter_lease_key
 from discord_bot.services.buttondown_service import buttondown_service
-from discord_bot.models.newsletter_models import NewsletterType
+from discord_bot.services.discord_service import discord_service
+from discord_bot.models.newsletter_models import NewsletterType, NewsletterStatus
 
 logger = get_logger(__name__)
 
 
+def jobstore_url(database_url: str) -> str:
+    """Derive the synchronous job store URL from the application database URL.
+
+    Postgres URLs are pointed at the psycopg (v3) driver; async SQLite URLs
+    drop ``+aiosqlite`` for the standard library driver.
+    """
+    scheme, sep, rest = database_url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+psycopg{sep}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite{sep}{rest}"
+    return database_url
+
+
 class SchedulerService:
-    """Service for scheduling automated newsletter generation and publishing."""
+    """Service for scheduling automated newsletter generation and publishing.
+    
+    Jobs live in a database-backed job store, so schedules, reschedules and
+    pauses survive restarts. Every replica runs its own scheduler over the
+    same store, which APScheduler 3 does not support: nothing stops two
+    schedulers from firing the same due job, and each keeps its own idea of
+    the next run time. The cluster lease each job takes before doing any
+    work is what keeps a job due on several replicas running on exactly one
+    of them, so jobs added here must take one.
+    """
     
     def __init__(self):
         self.scheduler: Optional[AsyncIOScheduler] = None
         self.timezone = pytz.timezone(settings.timezone)
         self.is_running = False
         self._job_callbacks: Dict[str, Callable] = {}
+        self.jobstore_backend = "memory"
     
     async def initialize(self):
         """Initialize the scheduler service."""
         # Configure scheduler
         jobstores = {
-            'default': MemoryJobStore()
+            'default': self._create_jobstore()
         }
         executors = {
             'default': AsyncIOExecutor()
@@ -58,9 +86,34 @@ class SchedulerService:
         self.scheduler.add_listener(self._job_missed, EVENT_JOB_MISSED)
         
         logger.info("Scheduler service initialized", extra={
-            "timezone": settings.timezone
+            "timezone": settings.timezone,
+            "jobstore": self.jobstore_backend
         })
     
+    def _create_jobstore(self):
+        """Create the configured job store, falling back to memory.
+
+        APScheduler's SQLAlchemy job store is synchronous, so unless
+        ``scheduler_jobstore_url`` is set it uses ``database_url`` on the
+        psycopg driver.
+        """
+        self.jobstore_backend = "memory"
+        if settings.scheduler_jobstore.lower() != "database":
+            return MemoryJobStore()
+
+        url = settings.scheduler_jobstore_url or jobstore_url(settings.database_url)
+        try:
+            from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+            jobstore = SQLAlchemyJobStore(url=url, tablename="apscheduler_jobs")
+        except Exception as e:
+            logger.warning("Database job store unavailable, jobs will not survive restarts", extra={
+                "error": str(e)
+            })
+            return MemoryJobStore()
+
+        self.jobstore_backend = "database"
+        return jobstore
+    
     async def start(self):
         """Start the scheduler service."""
         if not self.scheduler:
@@ -84,13 +137,18 @@ class SchedulerService:
             logger.info("Scheduler service stopped")
     
     async def _schedule_default_jobs(self):
-        """Schedule default newsletter generation jobs."""
+        """Schedule default newsletter generation jobs.
+
+        Jobs already in a persistent store are kept as they are, so
+        reschedules and pauses made at runtime survive a restart.
+        """
         # Daily newsletter - 6 AM CST
         await self.schedule_newsletter_generation(
             newsletter_type=NewsletterType.DAILY,
             cron_expression=settings.newsletter_schedule_daily,
             job_id="daily_newsletter",
-            auto_publish=False  # Don't auto-publish daily
+            auto_publish=False,  # Don't auto-publish daily
+            replace_existing=False
         )
 
         # Weekly newsletter - Saturday 8 PM CST
@@ -98,7 +156,8 @@ class SchedulerService:
             newsletter_type=NewsletterType.WEEKLY,
             cron_expression=settings.newsletter_schedule_weekly,
             job_id="weekly_newsletter",
-            auto_publish=True  # Auto-publish weekly to Buttondown
+            auto_publish=True,  # Auto-publish weekly to Buttondown
+            replace_existing=False
         )
 
         # Monthly newsletter - 1st day of month 8 PM CST
@@ -106,20 +165,36 @@ class SchedulerService:
             newsletter_type=NewsletterType.MONTHLY,
             cron_expression=settings.newsletter_schedule_monthly,
             job_id="monthly_newsletter",
-            auto_publish=True  # Auto-publish monthly to Buttondown
+            auto_publish=True,  # Auto-publish monthly to Buttondown
+            replace_existing=False
         )
 
         # Maintenance job - daily cleanup at 2 AM
-        await self.schedule_maintenance_job()
+        await self.schedule_maintenance_job(replace_existing=False)
+
+        # Reconcile incremental engagement counters
+        if settings.engagement_incremental_counters:
+            await self.schedule_engagement_reconciliation(replace_existing=False)
+    
+    def _keep_existing_job(self, job_id: str, replace_existing: bool) -> bool:
+        """Check whether an already stored job should be left untouched."""
+        if replace_existing or not self.scheduler.get_job(job_id):
+            return False
+        logger.info(f"Keeping stored job {job_id}")
+        return True
     
     async def schedule_newsletter_generation(
         self,
         newsletter_type: NewsletterType,
         cron_expression: str,
         job_id: str,
-        auto_publish: bool = False
+        auto_publish: bool = False,
+        replace_existing: bool = True
     ):
         """Schedule newsletter generation job."""
+        if self._keep_existing_job(job_id, replace_existing):
+            return
+        
         try:
             # Parse cron expression (format: minute hour day month day_of_week)
             cron_parts = cron_expression.split()
@@ -140,7 +215,7 @@ class SchedulerService:
             
             # Add job
             job = self.scheduler.add_job(
-                func=self._generate_newsletter_job,
+                func=run_newsletter_job,
                 trigger=trigger,
                 args=[newsletter_type, auto_publish],
                 id=job_id,
@@ -171,7 +246,7 @@ class SchedulerService:
             trigger = DateTrigger(run_date=scheduled_time, timezone=self.timezone)
             
             job = self.scheduler.add_job(
-                func=self._generate_newsletter_job,
+                func=run_newsletter_job,
                 trigger=trigger,
                 args=[newsletter_type, auto_publish],
                 id=job_id,
@@ -191,8 +266,11 @@ class SchedulerService:
             logger.error(f"Failed to schedule one-time newsletter: {e}")
             raise
     
-    async def schedule_maintenance_job(self):
+    async def schedule_maintenance_job(self, replace_existing: bool = True):
         """Schedule daily maintenance job."""
+        if self._keep_existing_job("daily_maintenance", replace_existing):
+            return
+        
         try:
             trigger = CronTrigger(
                 hour=2,
@@ -201,7 +279,7 @@ class SchedulerService:
             )
             
             self.scheduler.add_job(
-                func=self._maintenance_job,
+                func=run_maintenance_job,
                 trigger=trigger,
                 id="daily_maintenance",
                 name="Daily maintenance",
@@ -213,19 +291,69 @@ class SchedulerService:
         except Exception as e:
             logger.error(f"Failed to schedule maintenance job: {e}")
     
+    async def schedule_engagement_reconciliation(self, replace_existing: bool = True):
+        """Schedule periodic reconciliation of incremental engagement counters."""
+        if self._keep_existing_job("engagement_reconcile", replace_existing):
+            return
+        
+        try:
+            trigger = IntervalTrigger(
+                minutes=settings.engagement_reconcile_interval_minutes,
+                timezone=self.timezone
+            )
+            
+            self.scheduler.add_job(
+                func=run_engagement_reconcile_job,
+                trigger=trigger,
+                id="engagement_reconcile",
+                name="Engagement counter reconciliation",
+                replace_existing=True
+            )
+            
+            logger.info("Scheduled engagement reconciliation job", extra={
+                "interval_minutes": settings.engagement_reconcile_interval_minutes
+            })
+            
+        except Exception as e:
+            logger.error(f"Failed to schedule engagement reconciliation: {e}")
+    
     async def _generate_newsletter_job(
         self,
         newsletter_type: NewsletterType,
         auto_publish: bool = False
     ):
-        """Execute newsletter generation job."""
+        """Execute newsletter generation job.
+        
+        The cluster lease on the newsletter type and date is held through
+        generation and publishing, so a replica running the same job late
+        finds the newsletter already published instead of sending it again.
+        """
+        target_date = datetime.now().strftime("%Y-%m-%d")
+        lease_key = newsletter_lease_key(newsletter_type, target_date)
+        
+        async with get_cluster_lock().lease(lease_key) as acquired:
+            if not acquired:
+                logger.info(f"Skipping scheduled {newsletter_type.value} newsletter, another replica holds it", extra={
+                    "lease": lease_key
+                })
+                return
+            await self._run_newsletter_job(newsletter_type, target_date, auto_publish)
+    
+    async def _run_newsletter_job(
+        self,
+        newsletter_type: NewsletterType,
+        target_date: str,
+        auto_publish: bool
+    ):
+        """Generate and optionally publish a newsletter while holding its lease."""
         logger.info(f"Starting scheduled {newsletter_type.value} newsletter generation")
         
         try:
             # Generate newsletter
             newsletter = await newsletter_service.generate_newsletter(
                 newsletter_type=newsletter_type,
-                force=False  # Don't force if one already exists for today
+                force=False,  # Don't force if one already exists for today
+                target_date=target_date
             )
             
             if not newsletter:
@@ -238,7 +366,11 @@ class SchedulerService:
             })
             
             # Auto-publish if requested
-            if auto_publish:
+            if auto_publish and newsletter.status == NewsletterStatus.PUBLISHED:
+                logger.info("Newsletter already published", extra={
+                    "newsletter_id": str(newsletter.id)
+                })
+            elif auto_publish:
                 try:
                     draft_id = await buttondown_service.create_newsletter_from_model(
                         newsletter=newsletter,
@@ -246,6 +378,7 @@ class SchedulerService:
                     )
                     
                     if draft_id:
+                        await newsletter_service.mark_published(newsletter.id, draft_id)
                         logger.info(f"Auto-published newsletter", extra={
                             "newsletter_id": str(newsletter.id),
                             "buttondown_draft_id": draft_id
@@ -262,15 +395,33 @@ class SchedulerService:
     
     async def _maintenance_job(self):
         """Execute daily maintenance tasks."""
-        logger.info("Starting daily maintenance")
-        
-        try:
-            # Clean up old newsletter generation logs
-            # This would involve database cleanup operations
-            logger.info("Maintenance completed successfully")
+        lease_key = f"maintenance:{datetime.now().strftime('%Y-%m-%d')}"
+        async with get_cluster_lock().lease(lease_key) as acquired:
+            if not acquired:
+                logger.info("Skipping daily maintenance, another replica holds it")
+                return
             
-        except Exception as e:
-            logger.error(f"Error in maintenance job: {e}")
+            logger.info("Starting daily maintenance")
+            
+            try:
+                # Clean up old newsletter generation logs
+                # This would involve database cleanup operations
+                logger.info("Maintenance completed successfully")
+                
+            except Exception as e:
+                logger.error(f"Error in maintenance job: {e}")
+    
+    async def _engagement_reconcile_job(self):
+        """Recompute recent engagement metrics to correct counter drift."""
+        async with get_cluster_lock().lease("engagement_reconcile") as acquired:
+            if not acquired:
+                logger.info("Skipping engagement reconciliation, another replica holds it")
+                return
+            
+            try:
+                await discord_service.reconcile_engagement()
+            except Exception as e:
+                logger.error(f"Error in engagement reconciliation job: {e}")
     
     def _job_executed(self, event):
         """Handle job executed event."""
@@ -446,9 +597,28 @@ class SchedulerService:
             "scheduler_initialized": bool(self.scheduler),
             "timezone": settings.timezone,
             "jobs_count": len(self.scheduler.get_jobs()) if self.scheduler else 0,
-            "scheduler_state": self.scheduler.state if self.scheduler else None
+            "scheduler_state": self.scheduler.state if self.scheduler else None,
+            "jobstore": self.jobstore_backend,
+            "cluster_lock": get_cluster_lock().get_stats()
         }
 
 
 # Global scheduler service instance
-scheduler_service = SchedulerService()
\ No newline at end of file
+scheduler_service = SchedulerService()
+
+
+# Job callables. A persistent job store records jobs by module-level
+# reference, which bound methods of the service instance do not have.
+async def run_newsletter_job(newsletter_type: NewsletterType, auto_publish: bool = False):
+    """Scheduled entry point for newsletter generation."""
+    await scheduler_service._generate_newsletter_job(newsletter_type, auto_publish)
+
+
+async def run_maintenance_job():
+    """Scheduled entry point for daily maintenance."""
+    await scheduler_service._maintenance_job()
+
+
+async def run_engagement_reconcile_job():
+    """Scheduled entry point for engagement counter reconciliation."""
+    await scheduler_service._engagement_reconcile_job()
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""Durable LangGraph checkpointer backed by the application database."""
+
+from contextlib import AbstractAsyncContextManager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from discord_bot.core.logging import get_logger
+from discord_bot.models.workflow_models import WorkflowCheckpoint, WorkflowCheckpointWrite
+from discord_bot.services.database import db_service, upsert_insert
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+class SQLAlchemyCheckpointSaver(BaseCheckpointSaver):
+    """Store LangGraph checkpoints in the ``workflow_checkpoints`` tables.
+
+    Uses the same async engine as the rest of the bot, so Postgres in
+    production and SQLite in tests, instead of a separate psycopg-based
+    saver. Each checkpoint is stored whole (channel values included); the
+    newsletter state is small enough that per-channel blob deduplication is
+    not worth the extra round trips. Only the async API is implemented; the
+    sync methods keep the base class's NotImplementedError.
+    """
+
+    def __init__(self, session_factory: Optional[SessionFactory] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._session_factory = session_factory or db_service.get_session
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get the requested checkpoint, or the thread's latest one."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+
+        query = select(WorkflowCheckpoint).where(
+            WorkflowCheckpoint.thread_id == thread_id,
+            WorkflowCheckpoint.checkpoint_ns == checkpoint_ns
+        )
+        if checkpoint_id:
+            query = query.where(WorkflowCheckpoint.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(WorkflowCheckpoint.checkpoint_id.desc()).limit(1)
+
+        async with self._session_factory() as session:
+            row = (await session.execute(query)).scalar_one_or_none()
+            if row is None:
+                return None
+            writes = await self._load_writes(session, row)
+            return self._to_tuple(row, writes)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """List checkpoints newest first, optionally filtered by metadata."""
+        query = select(WorkflowCheckpoint).order_by(WorkflowCheckpoint.checkpoint_id.desc())
+        if config:
+            configurable = config["configurable"]
+            query = query.where(WorkflowCheckpoint.thread_id == configurable["thread_id"])
+            if "checkpoint_ns" in configurable:
+                query = query.where(WorkflowCheckpoint.checkpoint_ns == configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(WorkflowCheckpoint.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(WorkflowCheckpoint.checkpoint_id < before_id)
+        if limit and not filter:
+            query = query.limit(limit)
+
+        async with self._session_factory() as session:
+            rows = (await session.execute(query)).scalars().all()
+            results = []
+            for row in rows:
+                if filter:
+                    metadata = self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata))
+                    if any(metadata.get(key) != value for key, value in filter.items()):
+                        continue
+                results.append(self._to_tuple(row, await self._load_writes(session, row)))
+                if limit and len(results) >= limit:
+                    break
+
+        for result in results:
+            yield result
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and return the config that addresses it."""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        values = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+            "parent_checkpoint_id": configurable.get("checkpoint_id"),
+            "checkpoint_type": checkpoint_type,
+            "checkpoint": checkpoint_data,
+            "metadata_type": metadata_type,
+            "checkpoint_metadata": metadata_data,
+        }
+        async with self._session_factory() as session:
+            stmt = upsert_insert(session, WorkflowCheckpoint).values(**values)
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=["thread_id", "checkpoint_ns", "checkpoint_id"],
+                set_={
+                    "parent_checkpoint_id": stmt.excluded.parent_checkpoint_id,
+                    "checkpoint_type": stmt.excluded.checkpoint_type,
+                    "checkpoint": stmt.excluded.checkpoint,
+                    "metadata_type": stmt.excluded.metadata_type,
+                    "metadata": stmt.excluded["metadata"],
+                }
+            ))
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store the pending writes a task produced for a checkpoint."""
+        if not writes:
+            return
+
+        configurable = config["configurable"]
+        rows = []
+        for position, (channel, value) in enumerate(writes):
+            value_type, value_data = self.serde.dumps_typed(value)
+            rows.append({
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": configurable["checkpoint_id"],
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, position),
+                "channel": channel,
+                "value_type": value_type,
+                "value": value_data,
+                "task_path": task_path,
+            })
+
+        # Special writes (errors, interrupts) overwrite; regular writes are
+        # idempotent so a replayed task keeps its first result.
+        overwrite = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        async with self._session_factory() as session:
+            stmt = upsert_insert(session, WorkflowCheckpointWrite).values(rows)
+            index_elements = ["thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx"]
+            if overwrite:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={
+                        "channel": stmt.excluded.channel,
+                        "value_type": stmt.excluded.value_type,
+                        "value": stmt.excluded.value,
+                        "task_path": stmt.excluded.task_path,
+                    }
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            await session.execute(stmt)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint and pending write of a thread."""
+        async with self._session_factory() as session:
+            await session.execute(
+                delete(WorkflowCheckpointWrite).where(WorkflowCheckpointWrite.thread_id == thread_id)
+            )
+            await session.execute(
+                delete(WorkflowCheckpoint).where(WorkflowCheckpoint.thread_id == thread_id)
+            )
+        logger.info("Deleted workflow checkpoints", extra={"thread_id": thread_id})
+
+    async def _load_writes(self, session: AsyncSession, row: WorkflowCheckpoint) -> list:
+        result = await session.execute(
+            select(WorkflowCheckpointWrite)
+            .where(
+                WorkflowCheckpointWrite.thread_id == row.thread_id,
+                WorkflowCheckpointWrite.checkpoint_ns == row.checkpoint_ns,
+                WorkflowCheckpointWrite.checkpoint_id == row.checkpoint_id
+            )
+            .order_by(WorkflowCheckpointWrite.task_id, WorkflowCheckpointWrite.idx)
+        )
+        return [
+            (write.task_id, write.channel, self.serde.loads_typed((write.value_type, write.value)))
+            for write in result.scalars().all()
+        ]
+
+    def _to_tuple(self, row: WorkflowCheckpoint, writes: list) -> CheckpointTuple:
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((row.checkpoint_type, row.checkpoint)),
+            metadata=self.serde.loads_typed((row.metadata_type, row.checkpoint_metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": row.thread_id,
+                        "checkpoint_ns": row.checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=writes,
+        )
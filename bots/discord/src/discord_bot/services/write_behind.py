@@ -0,0 +1,165 @@
+"""Asyncio write-behind queue for batching database writes."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+from discord_bot.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class WriteBehindQueue(Generic[T]):
+    """Buffer items and flush them in batches from a background task.
+
+    Items are flushed when ``batch_size`` items are buffered or
+    ``flush_interval`` seconds after the first item of a batch arrived,
+    whichever comes first. The queue is bounded by ``max_size``; producers
+    block on ``submit`` once it is full, which is reported in the stats as
+    backpressure.
+
+    If ``flush_fn`` raises, the batch is handed to ``fallback_fn`` (when
+    given) one item at a time so a single bad item cannot drop the batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[List[T]], Awaitable[None]],
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        max_size: int = 5000,
+        fallback_fn: Optional[Callable[[T], Awaitable[None]]] = None
+    ):
+        self.name = name
+        self._flush_fn = flush_fn
+        self._fallback_fn = fallback_fn
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_size = max_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self._stats: Dict[str, Any] = {
+            "submitted": 0,
+            "flushed": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_depth": 0,
+            "blocked_submits": 0,
+            "blocked_seconds": 0.0,
+            "last_batch_size": 0,
+            "last_flush_seconds": 0.0,
+        }
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._worker = asyncio.create_task(self._run(), name=f"write-behind-{self.name}")
+        logger.info(f"Write-behind queue '{self.name}' started", extra={
+            "batch_size": self._batch_size,
+            "flush_interval": self._flush_interval,
+            "max_size": self._max_size
+        })
+
+    async def stop(self) -> None:
+        """Flush everything buffered and stop the background task."""
+        if not self.is_running:
+            return
+        await self._queue.put(_STOP)
+        await self._worker
+        self._worker = None
+        logger.info(f"Write-behind queue '{self.name}' stopped", extra=self.get_stats())
+
+    async def submit(self, item: T) -> None:
+        """Buffer an item, waiting for space if the queue is full."""
+        if self._queue.full():
+            self._stats["blocked_submits"] += 1
+            started = time.perf_counter()
+            await self._queue.put(item)
+            self._stats["blocked_seconds"] += time.perf_counter() - started
+        else:
+            self._queue.put_nowait(item)
+
+        self._stats["submitted"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the background flush task is running."""
+        return self._worker is not None and not self._worker.done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue throughput and backpressure statistics."""
+        return {
+            **self._stats,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_size": self._max_size,
+            "blocked_seconds": round(self._stats["blocked_seconds"], 3),
+            "last_flush_seconds": round(self._stats["last_flush_seconds"], 3),
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[T]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._flush_fn(batch)
+            self._stats["flushed"] += len(batch)
+        except Exception as e:
+            logger.error(f"Write-behind flush failed for '{self.name}'", extra={
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "batch_size": len(batch)
+            })
+            await self._fallback(batch)
+        finally:
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_flush_seconds"] = time.perf_counter() - started
+
+    async def _fallback(self, batch: List[T]) -> None:
+        if not self._fallback_fn:
+            self._stats["failed"] += len(batch)
+            return
+
+        for item in batch:
+            try:
+                await self._fallback_fn(item)
+                self._stats["flushed"] += 1
+            except Exception as e:
+                self._stats["failed"] += 1
+                logger.error(f"Write-behind fallback failed for '{self.name}'", extra={
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                })
@@ -0,0 +1,184 @@
+"""In-process caching utilities."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    Lookups refresh recency but not expiry, so an entry is re-validated
+    against its source at least once per ``ttl``. Hit, miss and eviction
+    counters are kept for health reporting.
+
+    Examples:
+        >>> cache = TTLCache(max_size=1000, ttl=3600)
+        >>> cache.set("123", "value")
+        >>> cache.get("123")
+        'value'
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        if max_size <= 0 or ttl <= 0:
+            raise ValueError("Cache size and TTL must be positive")
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class ExpiringSet:
+    """Bounded set whose members expire ``ttl`` seconds after insertion.
+
+    Members are kept in insertion order, which is also expiry order, so
+    expired members are always at the front and are evicted incrementally
+    on each insert. Insert, membership check and eviction are amortized
+    O(1); once ``max_size`` is reached the oldest members are dropped early.
+
+    Examples:
+        >>> seen = ExpiringSet(ttl=300, max_size=10000)
+        >>> seen.add("123")
+        True
+        >>> seen.add("123")
+        False
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        if max_size <= 0 or ttl <= 0:
+            raise ValueError("Set size and TTL must be positive")
+
+        self._ttl = ttl
+        self._max_size = max_size
+        self._expiry: "OrderedDict[Hashable, float]" = OrderedDict()
+        self.evictions = 0
+
+    def add(self, key: Hashable) -> bool:
+        """Add a member; return False if it was already present and unexpired."""
+        now = time.monotonic()
+        self._evict_expired(now)
+
+        if key in self._expiry:
+            return False
+
+        self._expiry[key] = now + self._ttl
+        if len(self._expiry) > self._max_size:
+            self._expiry.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self._expiry.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a member if present."""
+        self._expiry.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all members."""
+        self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get current size and early evictions."""
+        return {
+            "size": len(self._expiry),
+            "max_size": self._max_size,
+            "evictions": self.evictions,
+        }
+
+    def _evict_expired(self, now: float) -> None:
+        while self._expiry:
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            del self._expiry[key]
+
+
+class SettingsBound(Generic[V]):
+    """Module-level instance rebuilt whenever the settings it is built from change.
+
+    ``config`` reads the relevant settings into a tuple; ``build`` is called
+    with that tuple's items on first use and after any change, so backends
+    chosen by configuration follow settings changed at runtime or by tests.
+
+    Examples:
+        >>> bound = SettingsBound(lambda: (3,), lambda size: [None] * size)
+        >>> bound.get() is bound.get()
+        True
+    """
+
+    def __init__(self, config: Callable[[], tuple], build: Callable[..., V]):
+        self._config_fn = config
+        self._build = build
+        self._config: Optional[tuple] = None
+        self._instance: Optional[V] = None
+
+    def get(self) -> V:
+        """Get the instance for the current settings, building it on change."""
+        config = self._config_fn()
+        if config != self._config:
+            self._instance = self._build(*config)
+            self._config = config
+        return self._instance
+
+    def reset(self) -> None:
+        """Drop the instance; the next ``get`` builds a new one."""
+        self._config = None
+        self._instance = None
@@ -0,0 +1,127 @@
+"""Concurrency helpers for fanning out and coalescing external calls."""
+
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Semaphores are bound to the event loop that first waits on them
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def concurrency_limit(key: str) -> int:
+    """Get the concurrency limit for a model name or ``provider/model`` key.
+    
+    Exact model overrides (``provider/model`` or the bare model name) win
+    over provider overrides, which win over the default
+    ``LLM_MAX_CONCURRENCY``.
+    """
+    overrides = settings.llm_concurrency_limits
+    if key in overrides:
+        return overrides[key]
+    provider, _, model = key.rpartition("/")
+    if model in overrides:
+        return overrides[model]
+    return overrides.get(provider.split("/", 1)[0], settings.llm_max_concurrency)
+
+
+def get_semaphore(key: str) -> asyncio.Semaphore:
+    """Get the semaphore shared by all callers of ``key`` on the running loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    if key not in semaphores:
+        semaphores[key] = asyncio.Semaphore(concurrency_limit(key))
+    return semaphores[key]
+
+
+async def bounded_gather(
+    items: Iterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    key: str,
+    timeout: Optional[float] = None,
+    fallback: Optional[Callable[[T], R]] = None
+) -> List[R]:
+    """Run ``fn`` over ``items`` concurrently, at most ``limit(key)`` at a time.
+    
+    Results are returned in input order. Each call is bounded by ``timeout``
+    seconds (``LLM_TASK_TIMEOUT`` by default). When ``fallback`` is given, a
+    failed or timed-out item is replaced by ``fallback(item)``; otherwise the
+    first failure is raised after all items have finished.
+    """
+    if timeout is None:
+        timeout = settings.llm_task_timeout
+    semaphore = get_semaphore(key)
+    
+    async def run(item: T) -> R:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(fn(item), timeout)
+            except Exception as e:
+                if fallback is None:
+                    raise
+                logger.warning("Fan-out task failed, using fallback", extra={
+                    "key": key,
+                    "error": str(e) or type(e).__name__,
+                    "error_type": type(e).__name__
+                })
+                return fallback(item)
+    
+    results = await asyncio.gather(*(run(item) for item in items), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+class SingleFlight(Generic[R]):
+    """Coalesce concurrent calls that share a key into one execution.
+    
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight await the same result (or exception) instead of repeating the
+    work. Nothing is remembered once the call finishes, so pair this with a
+    cache for reuse over time.
+    
+    Examples:
+        >>> flight = SingleFlight()
+        >>> await flight.do("langgraph", lambda: fetch("langgraph"))
+    """
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, "asyncio.Future[R]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        """Run ``fn`` for ``key``, or join the run already in flight."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        
+        self.calls += 1
+        future = asyncio.ensure_future(fn())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(future)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get executed/coalesced call counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+    
+    def _forget(self, key: Hashable, future: "asyncio.Future[R]") -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
@@ -0,0 +1,89 @@
+"""Scoped accounting of LLM calls, tokens and cost."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+
+@dataclass
+class LLMUsage:
+    """LLM calls, tokens and cost accumulated within a usage scope."""
+
+    calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    cost_saved: float = 0.0
+    models: Set[str] = field(default_factory=set)
+
+    def record(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cost: float,
+        cached: bool = False,
+        model: Optional[str] = None
+    ) -> None:
+        """Count one LLM call. Cached calls count their tokens and cost as saved."""
+        self.calls += 1
+        if model:
+            self.models.add(model)
+        if cached:
+            self.cache_hits += 1
+            self.cost_saved += cost
+            return
+        self.cache_misses += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cost += cost
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, suitable for state, metadata and JSON columns."""
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost": self.cost,
+            "cost_saved": self.cost_saved,
+            "models": sorted(self.models),
+        }
+
+
+_active_scopes: ContextVar[Tuple[LLMUsage, ...]] = ContextVar("llm_usage_scopes", default=())
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[LLMUsage]:
+    """Collect every LLM call made in this context into a fresh ``LLMUsage``.
+
+    Scopes nest: a call is counted by every enclosing scope, so an agent
+    invocation and the workflow node running it both see it. Tasks spawned
+    inside the scope (e.g. by ``bounded_gather``) inherit it.
+    """
+    usage = LLMUsage()
+    token = _active_scopes.set(_active_scopes.get() + (usage,))
+    try:
+        yield usage
+    finally:
+        _active_scopes.reset(token)
+
+
+def record_llm_call(
+    input_tokens: int,
+    output_tokens: int,
+    cost: float,
+    cached: bool = False,
+    model: Optional[str] = None
+) -> None:
+    """Count an LLM call against all active usage scopes."""
+    for usage in _active_scopes.get():
+        usage.record(input_tokens, output_tokens, cost, cached=cached, model=model)
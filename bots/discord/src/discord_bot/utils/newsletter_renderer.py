@@ -0,0 +1,420 @@
+"""Template-based rendering of newsletter drafts to HTML, Markdown and text."""
+
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import markdown
+from jinja2 import DictLoader, Environment, StrictUndefined, select_autoescape
+from markupsafe import Markup
+
+if TYPE_CHECKING:
+    from discord_bot.agents.state import NewsletterDraft, NewsletterSection
+
+# AIMUG branding constants
+AIMUG_LOGO_URL = "https://aimug.org/img/alc-docs-social-card.jpg"
+AIMUG_PRIMARY_COLOR = "#2C5F9E"  # Blue from AIMUG branding
+AIMUG_SECONDARY_COLOR = "#1B3A5C"  # Darker blue
+AIMUG_ACCENT_COLOR = "#4A90E2"  # Light blue for accents
+
+# Community links
+COMMUNITY_LINKS = {
+    "website": "https://aimug.org",
+    "discord": "https://discord.gg/JzWgadPFQd",
+    "twitter": "https://twitter.com/AustinLangChain",
+    "youtube": "https://www.youtube.com/@AI-MUG",
+    "meetup": "https://www.meetup.com/austin-langchain-ai-group/",
+    "subscribe": "https://newsletter.aimug.org/"
+}
+
+# Motivational quotes pool
+MOTIVATIONAL_QUOTES = [
+    ("The only way to do great work is to love what you do.", "Steve Jobs"),
+    ("Innovation distinguishes between a leader and a follower.", "Steve Jobs"),
+    ("The future belongs to those who believe in the beauty of their dreams.", "Eleanor Roosevelt"),
+    ("Don't watch the clock; do what it does. Keep going.", "Sam Levenson"),
+    ("The best way to predict the future is to invent it.", "Alan Kay"),
+    ("Artificial intelligence is the new electricity.", "Andrew Ng"),
+    ("Technology is best when it brings people together.", "Matt Mullenweg"),
+    ("The science of today is the technology of tomorrow.", "Edward Teller"),
+    ("Learning never exhausts the mind.", "Leonardo da Vinci"),
+    ("Stay curious, stay humble, stay hungry for knowledge.", "Anonymous"),
+    ("The only impossible journey is the one you never begin.", "Tony Robbins"),
+    ("Code is like humor. When you have to explain it, it's bad.", "Cory House"),
+    ("First, solve the problem. Then, write the code.", "John Johnson"),
+    ("The advance of technology is based on making it fit in so that you don't really even notice it.", "Bill Gates"),
+    ("AI is the new UI.", "Mustafa Suleyman")
+]
+
+_SECTION_HTML = """
+            <section class="newsletter-section">
+                <h2>{{ section.title }}</h2>
+                {{ content_html }}
+            </section>
+"""
+
+_SECTION_MARKDOWN = """## {{ section.title }}
+
+{{ section.content }}
+
+---"""
+
+_SECTION_TEXT = """{{ section.title | upper }}
+{{ "=" * section.title | length }}
+
+{{ section.content }}
+
+{{ "-" * 50 }}"""
+
+_NEWSLETTER_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ draft.title }}</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 700px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        }
+        .logo {
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .logo img {
+            max-width: 100%;
+            height: auto;
+            border-radius: 8px;
+        }
+        .header {
+            text-align: center;
+            border-bottom: 3px solid {{ primary }};
+            padding-bottom: 20px;
+            margin-bottom: 30px;
+        }
+        .header h1 {
+            color: {{ primary }};
+            margin-bottom: 10px;
+            font-size: 2em;
+        }
+        .subtitle {
+            color: #666;
+            font-style: italic;
+            font-size: 1.1em;
+        }
+        .community-links {
+            text-align: center;
+            margin: 20px 0;
+            padding: 15px;
+            background-color: #f8f9fa;
+            border-radius: 6px;
+        }
+        .community-links a {
+            display: inline-block;
+            margin: 5px 10px;
+            padding: 8px 16px;
+            background-color: {{ primary }};
+            color: white;
+            text-decoration: none;
+            border-radius: 4px;
+            font-size: 0.9em;
+            transition: background-color 0.3s;
+        }
+        .community-links a:hover {
+            background-color: {{ secondary }};
+        }
+        .subscribe-btn {
+            background-color: {{ accent }} !important;
+            font-weight: bold;
+        }
+        .newsletter-section {
+            margin-bottom: 30px;
+            padding: 20px;
+            border-left: 4px solid {{ primary }};
+            background-color: #f9f9f9;
+            border-radius: 4px;
+        }
+        .newsletter-section h2 {
+            color: {{ primary }};
+            margin-top: 0;
+        }
+        .quote-section {
+            margin: 40px 0;
+            padding: 25px;
+            background: linear-gradient(135deg, {{ primary }}15, {{ accent }}15);
+            border-left: 4px solid {{ primary }};
+            border-radius: 6px;
+            font-style: italic;
+            text-align: center;
+        }
+        .quote-text {
+            font-size: 1.2em;
+            color: {{ secondary }};
+            margin-bottom: 10px;
+        }
+        .quote-author {
+            font-size: 0.9em;
+            color: #666;
+            font-weight: bold;
+        }
+        .footer {
+            text-align: center;
+            margin-top: 40px;
+            padding-top: 20px;
+            border-top: 2px solid {{ primary }};
+            font-size: 0.9em;
+            color: #666;
+        }
+        .footer-logo {
+            color: {{ primary }};
+            font-weight: bold;
+            font-size: 1.1em;
+        }
+        .read-time {
+            text-align: center;
+            color: #888;
+            font-size: 0.9em;
+            margin-bottom: 30px;
+        }
+        p {
+            margin-bottom: 15px;
+        }
+        a {
+            color: {{ primary }};
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="logo">
+            <img src="{{ logo_url }}" alt="Austin LangChain User Group">
+        </div>
+
+        <div class="header">
+            <h1>{{ draft.title }}</h1>
+            <p class="subtitle">{{ draft.subtitle }}</p>
+        </div>
+
+        <div class="community-links">
+            <a href="{{ links.subscribe }}" class="subscribe-btn">📧 Subscribe</a>
+            <a href="{{ links.discord }}">💬 Discord</a>
+            <a href="{{ links.meetup }}">📅 Meetup</a>
+            <a href="{{ links.twitter }}">🐦 Twitter</a>
+            <a href="{{ links.youtube }}">▶️ YouTube</a>
+            <a href="{{ links.website }}">🌐 Website</a>
+        </div>
+
+        <div class="read-time">
+            📖 Estimated reading time: {{ read_time }}
+        </div>
+
+        {{ sections | join }}
+
+        <div class="quote-section">
+            <div class="quote-text">"{{ quote }}"</div>
+            <div class="quote-author">— {{ author }}</div>
+        </div>
+
+        <div class="footer">
+            <p class="footer-logo">🤖 Austin LangChain User Group (AIMUG)</p>
+            <p>Generated with ❤️ by our AI-powered newsletter system</p>
+            <p><small>Word count: {{ draft.total_word_count }} | Sections: {{ draft.sections | length }}</small></p>
+            <p><small><a href="{{ links.website }}">Visit AIMUG.org</a></small></p>
+        </div>
+    </div>
+</body>
+</html>"""
+
+_NEWSLETTER_MARKDOWN = """# {{ draft.title }}
+
+*{{ draft.subtitle }}*
+
+📖 **Reading time:** {{ read_time }}
+
+---
+
+## 🔗 Connect with AIMUG
+
+**[📧 Subscribe to Newsletter]({{ links.subscribe }})** | **[💬 Join Discord]({{ links.discord }})** | **[📅 Meetup]({{ links.meetup }})** | **[🐦 Twitter]({{ links.twitter }})** | **[▶️ YouTube]({{ links.youtube }})** | **[🌐 Website]({{ links.website }})**
+
+---
+
+{{ sections | join("\\n") }}
+
+---
+
+## 💭 Thought of the Day
+
+> *"{{ quote }}"*
+> — {{ author }}
+
+---
+
+**🤖 Austin LangChain User Group (AIMUG)**
+Generated with ❤️ by our AI-powered newsletter system
+
+*Word count: {{ draft.total_word_count }} | Sections: {{ draft.sections | length }}*
+
+[Visit AIMUG.org]({{ links.website }})"""
+
+_NEWSLETTER_TEXT = """{{ draft.title | upper }}
+{{ "=" * draft.title | length }}
+
+{{ draft.subtitle }}
+
+Reading time: {{ read_time }}
+
+{{ "=" * 60 }}
+
+{{ sections | join("\\n") }}
+
+{{ "=" * 60 }}
+
+AUSTIN LANGCHAIN COMMUNITY NEWSLETTER
+Generated with love by our AI-powered newsletter system
+
+Word count: {{ draft.total_word_count }} | Sections: {{ draft.sections | length }}"""
+
+_TEMPLATES = {
+    "section.html": _SECTION_HTML,
+    "section.md": _SECTION_MARKDOWN,
+    "section.txt": _SECTION_TEXT,
+    "newsletter.html": _NEWSLETTER_HTML,
+    "newsletter.md": _NEWSLETTER_MARKDOWN,
+    "newsletter.txt": _NEWSLETTER_TEXT,
+}
+
+FORMATS = ("html", "markdown", "text")
+
+
+class NewsletterRenderer:
+    """Render newsletter drafts to every output format in one pass.
+
+    Templates are compiled once per renderer and the Markdown converter is
+    reused (reset between sections) instead of rebuilding its extensions for
+    each call. Rendered sections are cached by a hash of their title and
+    content, so re-rendering a draft after editing one section only converts
+    that section again. The converter and cache are shared, so section
+    rendering is serialized when the renderer runs on a thread pool.
+    """
+
+    def __init__(self, max_cached_sections: int = 512):
+        env = Environment(
+            loader=DictLoader(_TEMPLATES),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+            undefined=StrictUndefined,
+        )
+        env.globals.update(
+            primary=AIMUG_PRIMARY_COLOR,
+            secondary=AIMUG_SECONDARY_COLOR,
+            accent=AIMUG_ACCENT_COLOR,
+            logo_url=AIMUG_LOGO_URL,
+            links=COMMUNITY_LINKS,
+        )
+        self._section_templates = {
+            "html": env.get_template("section.html"),
+            "markdown": env.get_template("section.md"),
+            "text": env.get_template("section.txt"),
+        }
+        self._newsletter_templates = {
+            "html": env.get_template("newsletter.html"),
+            "markdown": env.get_template("newsletter.md"),
+            "text": env.get_template("newsletter.txt"),
+        }
+        self._markdown = markdown.Markdown(extensions=["extra", "nl2br"])
+        self._sections: OrderedDict[str, Dict[str, str]] = OrderedDict()
+        self._max_cached_sections = max_cached_sections
+        self._lock = threading.Lock()
+        self.section_hits = 0
+        self.section_misses = 0
+
+    def render(
+        self,
+        draft: "NewsletterDraft",
+        quote: Optional[Tuple[str, str]] = None
+    ) -> Dict[str, str]:
+        """Render a draft as HTML, Markdown and plain text.
+
+        One motivational ``quote`` (random unless given) is shared by the
+        formats that show it.
+        """
+        quote_text, author = quote or random.choice(MOTIVATIONAL_QUOTES)
+        sections = [self.render_section(section) for section in draft.sections]
+        minutes = draft.estimated_read_time
+        context = {
+            "draft": draft,
+            "quote": quote_text,
+            "author": author,
+            "read_time": f"{minutes} minute{'s' if minutes != 1 else ''}",
+        }
+        return {
+            fmt: self._newsletter_templates[fmt].render(
+                sections=[Markup(s[fmt]) if fmt == "html" else s[fmt] for s in sections],
+                **context
+            )
+            for fmt in FORMATS
+        }
+
+    def render_section(self, section: "NewsletterSection") -> Dict[str, str]:
+        """Render one section to every format, reusing a cached rendering."""
+        key = hashlib.sha256(
+            f"{section.title}\0{section.content}".encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            return self._render_section_locked(key, section)
+
+    def _render_section_locked(self, key: str, section: "NewsletterSection") -> Dict[str, str]:
+        rendered = self._sections.get(key)
+        if rendered is not None:
+            self.section_hits += 1
+            self._sections.move_to_end(key)
+            return rendered
+
+        self.section_misses += 1
+        content_html = Markup(self._markdown.reset().convert(section.content))
+        rendered = {
+            "html": self._section_templates["html"].render(section=section, content_html=content_html),
+            "markdown": self._section_templates["markdown"].render(section=section),
+            "text": self._section_templates["text"].render(section=section),
+        }
+        self._sections[key] = rendered
+        if len(self._sections) > self._max_cached_sections:
+            self._sections.popitem(last=False)
+        return rendered
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get section cache counters."""
+        return {
+            "cached_sections": len(self._sections),
+            "section_hits": self.section_hits,
+            "section_misses": self.section_misses,
+        }
+
+
+# Global renderer instance
+newsletter_renderer = NewsletterRenderer()
+
+
+def render_newsletter(
+    draft: "NewsletterDraft",
+    quote: Optional[Tuple[str, str]] = None
+) -> Dict[str, str]:
+    """Render a draft with the global renderer.
+
+    A plain function, so it can be sent to a process pool; each worker
+    process then keeps its own renderer and section cache.
+    """
+    return newsletter_renderer.render(draft, quote)
@@ -0,0 +1,212 @@
+"""Run CPU-bound helpers off the event loop and watch for loop stalls."""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from discord_bot.core.config import settings
+from discord_bot.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+R = TypeVar("R")
+
+
+class CpuOffloader:
+    """Dispatch CPU-bound helpers to a configurable executor.
+
+    ``CPU_EXECUTOR`` selects a thread pool (the default; the loop still
+    shares the GIL but gets scheduled between bytecode slices), a process
+    pool (true parallelism; callables and arguments must pickle, so pass
+    module-level functions or staticmethods) or ``inline`` to run on the
+    loop. Every call is counted per call site, with the time it held the
+    loop when run inline and the time it took when offloaded.
+    """
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._config: Optional[tuple] = None
+        self._sites: Dict[str, Dict[str, Any]] = {}
+        self._recent: Dict[str, float] = {}
+
+    @property
+    def mode(self) -> str:
+        mode = settings.cpu_executor.lower()
+        return mode if mode in ("thread", "process") else "inline"
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Get the executor for the current settings, rebuilding it on change."""
+        config = (settings.cpu_executor.lower(), settings.cpu_executor_workers)
+        if config == self._config:
+            return self._executor
+
+        previous, self._executor = self._executor, None
+        self._config = config
+        mode, workers = config
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu-offload")
+        elif mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        elif mode != "inline":
+            logger.warning(f"Unknown CPU executor '{mode}', running CPU work on the event loop")
+        if previous is not None:
+            previous.shutdown(wait=False)
+        return self._executor
+
+    async def run(self, site: str, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Run ``fn(*args, **kwargs)`` on the CPU executor, recorded under ``site``."""
+        executor = self._get_executor()
+        if executor is None:
+            with self.blocking(site):
+                return fn(*args, **kwargs)
+
+        call = functools.partial(fn, *args, **kwargs)
+        if isinstance(executor, ThreadPoolExecutor):
+            # Like asyncio.to_thread, keep context variables visible to the helper
+            call = functools.partial(contextvars.copy_context().run, call)
+
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, call)
+        finally:
+            self._record(site, offloaded=time.perf_counter() - start)
+
+    @contextmanager
+    def blocking(self, site: str) -> Iterator[None]:
+        """Record the time a block of synchronous work holds the event loop."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(site, blocked=time.perf_counter() - start)
+
+    def _record(self, site: str, blocked: float = 0.0, offloaded: Optional[float] = None) -> None:
+        stats = self._sites.get(site)
+        if stats is None:
+            stats = self._sites[site] = {
+                "calls": 0,
+                "offloaded": 0,
+                "blocked_seconds": 0.0,
+                "max_blocked": 0.0,
+                "offloaded_seconds": 0.0,
+            }
+        stats["calls"] += 1
+        if offloaded is not None:
+            stats["offloaded"] += 1
+            stats["offloaded_seconds"] += offloaded
+        if blocked:
+            stats["blocked_seconds"] += blocked
+            stats["max_blocked"] = max(stats["max_blocked"], blocked)
+            self._recent[site] = self._recent.get(site, 0.0) + blocked
+
+    def take_recent_blocking(self) -> Dict[str, float]:
+        """Return loop-blocking time per site since the last call, and reset it."""
+        recent, self._recent = self._recent, {}
+        return recent
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor configuration and per-site counters."""
+        return {
+            "executor": self.mode,
+            "workers": settings.cpu_executor_workers if self.mode != "inline" else 0,
+            "sites": {site: dict(stats) for site, stats in self._sites.items()},
+        }
+
+    def shutdown(self) -> None:
+        """Shut the executor down; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._config = None
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes a periodic timer.
+
+    Lag above ``LOOP_LAG_WARN_THRESHOLD`` is logged together with the call
+    sites that held the loop since the previous tick (work run through
+    ``CpuOffloader.blocking`` or inline ``run``), largest first.
+    """
+
+    def __init__(self, offloader: CpuOffloader):
+        self._offloader = offloader
+        self._task: Optional[asyncio.Task] = None
+        self.ticks = 0
+        self.stalls = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            interval = settings.loop_lag_interval
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.observe(max(0.0, loop.time() - expected))
+
+    def observe(self, lag: float) -> None:
+        """Account one timer wake-up that ran ``lag`` seconds late."""
+        self.ticks += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        recent = self._offloader.take_recent_blocking()
+        if lag < settings.loop_lag_warn_threshold:
+            return
+
+        self.stalls += 1
+        logger.warning("Event loop blocked", extra={
+            "lag": round(lag, 3),
+            "sites": {
+                site: round(seconds, 3)
+                for site, seconds in sorted(recent.items(), key=lambda item: item[1], reverse=True)
+            }
+        })
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get loop lag counters."""
+        return {
+            "running": self.is_running,
+            "ticks": self.ticks,
+            "stalls": self.stalls,
+            "max_lag": self.max_lag,
+            "mean_lag": self.total_lag / self.ticks if self.ticks else 0.0,
+        }
+
+
+# Global offloader and loop monitor instances
+cpu_offloader = CpuOffloader()
+loop_lag_monitor = LoopLagMonitor(cpu_offloader)
+
+
+async def run_cpu(site: str, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """Run a CPU-bound helper off the event loop; see ``CpuOffloader.run``."""
+    return await cpu_offloader.run(site, fn, *args, **kwargs)
+
+
+def get_offload_stats() -> Dict[str, Any]:
+    """Get CPU executor and event loop lag stats for health reporting."""
+    return {**cpu_offloader.get_stats(), "loop_lag": loop_lag_monitor.get_stats()}
@@ -0,0 +1,56 @@
+"""Rate limiting utilities."""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Async token bucket shared by concurrent callers.
+
+    Tokens refill continuously at ``requests / period`` per second up to
+    ``capacity`` (defaults to ``requests``). ``acquire`` waits until enough
+    tokens are available, so callers are smoothed to the configured rate
+    while short bursts up to ``capacity`` pass through immediately.
+
+    Examples:
+        >>> bucket = TokenBucket(requests=50, period=60)
+        >>> await bucket.acquire()
+    """
+
+    def __init__(self, requests: int, period: float, capacity: Optional[int] = None):
+        if requests <= 0 or period <= 0:
+            raise ValueError("Requests and period must be positive")
+
+        self._rate = requests / period
+        self._capacity = float(capacity if capacity is not None else requests)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.total_wait_seconds = 0.0
+
+    async def acquire(self, tokens: int = 1) -> None:
+        """Take ``tokens`` from the bucket, waiting for a refill if needed."""
+        if tokens > self._capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self._rate
+                self.total_wait_seconds += wait
+                await asyncio.sleep(wait)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
@@ -2,59 +2,229 @@
 
 import re
 import html
-from typing import List, Dict, Optional
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
 
+_WORD_PATTERN = re.compile(r"\w+(?:[/-]\w+)*")
+_WORD_SEPARATOR = re.compile(r"[/-]")
+
+# Every Discord markdown construct we care about, as one alternation so a
+# message is scanned once. Code comes first so nothing inside it is parsed.
+_DISCORD_TOKEN = re.compile(
+    r"```(?P<lang>\w+)?\n(?P<block>.*?)\n```"
+    r"|`(?P<inline>[^`]+)`"
+    r"|<@!?(?P<user>\d+)>"
+    r"|<@&(?P<role>\d+)>"
+    r"|<#(?P<channel>\d+)>"
+    r"|<a?:(?P<emoji>\w+):\d+>"
+    r"|(?P<url>https?://[^\s<>\"{}|^`[\]\\]+)"
+    r"|(?P<blank>\n\s*\n)"
+    r"|(?P<spaces>  +)",
+    re.DOTALL
+)
+
+# Terms shorter than this only match exactly; their "plurals" are mostly
+# other words ("rages", "apes")
+_MIN_PLURAL_LENGTH = 4
+
+# Parsed messages kept by message ID
+_CONTENT_CACHE_SIZE = 4096
+_content_cache: "OrderedDict[str, Tuple[str, DiscordContent]]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class DiscordContent:
+    """Everything extracted from one Discord message in a single pass.
+    
+    ``clean_text`` replaces mentions with ``@user``/``@role``, channel links
+    with ``#channel`` and custom emojis with ``:name:``, turns code blocks
+    into inline code and collapses runs of blank lines and spaces.
+    """
+    
+    clean_text: str
+    mentions: Tuple[str, ...] = ()
+    roles: Tuple[str, ...] = ()
+    channels: Tuple[str, ...] = ()
+    emojis: Tuple[str, ...] = ()
+    code_blocks: Tuple[Tuple[str, str], ...] = ()  # (language, code)
+    inline_code: Tuple[str, ...] = ()
+    urls: Tuple[str, ...] = ()
+    
+    @property
+    def code_languages(self) -> List[str]:
+        """Languages declared on code blocks, in order of first use."""
+        return list(dict.fromkeys(lang for lang, _ in self.code_blocks if lang != "text"))
+    
+    def code_snippets(self) -> List[Dict[str, str]]:
+        """Code blocks and inline code, as ``extract_code_snippets`` returns them."""
+        snippets = [
+            {'type': 'block', 'language': lang, 'code': code.strip()}
+            for lang, code in self.code_blocks
+        ]
+        snippets.extend(
+            {'type': 'inline', 'language': 'text', 'code': code.strip()}
+            for code in self.inline_code if code.strip()
+        )
+        return snippets
+
+
+def parse_discord_content(content: str, message_id: Optional[str] = None) -> DiscordContent:
+    """Tokenize Discord message content once.
+    
+    With ``message_id`` the result is cached, so every agent looking at the
+    same message shares one parse; an edited message (different content) is
+    parsed again.
+    """
+    if message_id is not None:
+        cached = _content_cache.get(message_id)
+        if cached is not None and cached[0] == content:
+            _content_cache.move_to_end(message_id)
+            return cached[1]
+    
+    parsed = _tokenize_discord_content(content or "")
+    
+    if message_id is not None:
+        _content_cache[message_id] = (content, parsed)
+        _content_cache.move_to_end(message_id)
+        if len(_content_cache) > _CONTENT_CACHE_SIZE:
+            _content_cache.popitem(last=False)
+    return parsed
+
+
+def _tokenize_discord_content(content: str) -> DiscordContent:
+    parts: List[str] = []
+    found: Dict[str, List] = {
+        "mentions": [], "roles": [], "channels": [], "emojis": [],
+        "code_blocks": [], "inline_code": [], "urls": []
+    }
+    position = 0
+    for match in _DISCORD_TOKEN.finditer(content):
+        parts.append(content[position:match.start()])
+        position = match.end()
+        kind = match.lastgroup
+        
+        if kind == "block":
+            code = match.group("block")
+            found["code_blocks"].append((match.group("lang") or "text", code))
+            parts.append(f"`{code}`")
+        elif kind == "inline":
+            found["inline_code"].append(match.group("inline"))
+            parts.append(match.group(0))
+        elif kind == "user":
+            found["mentions"].append(match.group("user"))
+            parts.append("@user")
+        elif kind == "role":
+            found["roles"].append(match.group("role"))
+            parts.append("@role")
+        elif kind == "channel":
+            found["channels"].append(match.group("channel"))
+            parts.append("#channel")
+        elif kind == "emoji":
+            found["emojis"].append(match.group("emoji"))
+            parts.append(f":{match.group('emoji')}:")
+        elif kind == "url":
+            found["urls"].append(match.group("url"))
+            parts.append(match.group(0))
+        elif kind == "blank":
+            parts.append("\n\n")
+        else:  # spaces
+            parts.append(" ")
+    parts.append(content[position:])
+    
+    return DiscordContent(
+        clean_text="".join(parts).strip(),
+        **{key: tuple(values) for key, values in found.items()}
+    )
+
+
+class KeywordMatcher:
+    """Find whole-word keyword occurrences in a single pass over the text.
+    
+    Single-word terms (including ``ci/cd`` or ``fine-tune``) are matched by
+    tokenizing the text once with a precompiled regex and looking each token
+    up in a hash table, so cost grows with text length rather than
+    vocabulary size. Terms containing spaces are compiled into one
+    case-insensitive alternation. Terms only match as whole words, so "rag"
+    does not match inside "storage"; simple plurals ("models", "agents")
+    count towards their singular term, except for terms shorter than four
+    characters.
+    
+    Examples:
+        >>> matcher = KeywordMatcher(["rag", "agent"])
+        >>> matcher.find("Agents that do RAG over storage, one agent each")
+        [('agent', 2), ('rag', 1)]
+    """
+    
+    def __init__(self, vocabulary: Iterable[str]):
+        self._terms: Dict[str, str] = {}
+        for term in vocabulary:
+            term = term.strip()
+            if term:
+                self._terms.setdefault(term.lower(), term)
+        
+        if not self._terms:
+            raise ValueError("Keyword vocabulary must not be empty")
+        
+        # Lowercased token -> term. Real terms are added first so a generated
+        # plural never shadows one ("transformers" stays its own term), and
+        # very short terms get no plurals ("rages" is not about "rag").
+        self._forms: Dict[str, str] = dict(self._terms)
+        for key, term in self._terms.items():
+            if len(key) >= _MIN_PLURAL_LENGTH:
+                for form in (key + "s", key + "es"):
+                    self._forms.setdefault(form, term)
+        
+        phrases = [term for term in self._terms if not _WORD_PATTERN.fullmatch(term)]
+        self._phrase_pattern = None
+        if phrases:
+            alternation = "|".join(re.escape(term) for term in sorted(phrases, key=len, reverse=True))
+            self._phrase_pattern = re.compile(rf"(?<!\w)({alternation})(?:e?s)?(?!\w)", re.IGNORECASE)
+    
+    @property
+    def vocabulary(self) -> Tuple[str, ...]:
+        """Terms recognized by this matcher."""
+        return tuple(self._terms.values())
+    
+    def find(self, text: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return ``(term, count)`` hits ranked by count, then first occurrence."""
+        if not text:
+            return []
+        
+        lowered = text.lower()
+        tokens = _WORD_PATTERN.findall(lowered)
+        counts = Counter(filter(None, map(self._forms.get, tokens)))
+        
+        # Compound tokens such as "langchain/langgraph" match their parts
+        if "/" in lowered or "-" in lowered:
+            for token in tokens:
+                if token not in self._forms and ("/" in token or "-" in token):
+                    counts.update(filter(None, map(self._forms.get, _WORD_SEPARATOR.split(token))))
+        
+        if self._phrase_pattern is not None:
+            for match in self._phrase_pattern.finditer(text):
+                counts[self._terms[match.group(1).lower()]] += 1
+        
+        # Counter preserves first-seen order, which breaks ties
+        return counts.most_common(limit)
+
+
 class TextProcessor:
     """Utility class for text processing operations."""
     
     @staticmethod
-    def clean_discord_content(content: str) -> str:
+    def clean_discord_content(content: str, message_id: Optional[str] = None) -> str:
         """Clean Discord message content for newsletter use."""
         if not content:
             return ""
-        
-        # Remove Discord-specific formatting
-        content = re.sub(r'<@!?(\d+)>', r'@user', content)  # Mentions
-        content = re.sub(r'<#(\d+)>', r'#channel', content)  # Channel links
-        content = re.sub(r'<:(\w+):(\d+)>', r':\1:', content)  # Custom emojis
-        content = re.sub(r'<a?:(\w+):(\d+)>', r':\1:', content)  # Animated emojis
-        
-        # Clean up code blocks for readability
-        content = re.sub(r'```(\w+)?\n(.*?)\n```', r'`\2`', content, flags=re.DOTALL)
-        
-        # Remove excessive whitespace
-        content = re.sub(r'\n\s*\n', '\n\n', content)
-        content = re.sub(r'  +', ' ', content)
-        
-        return content.strip()
+        return parse_discord_content(content, message_id).clean_text
     
     @staticmethod
-    def extract_code_snippets(content: str) -> List[Dict[str, str]]:
+    def extract_code_snippets(content: str, message_id: Optional[str] = None) -> List[Dict[str, str]]:
         """Extract code snippets from Discord messages."""
-        snippets = []
-        
-        # Multi-line code blocks
-        code_blocks = re.findall(r'```(\w+)?\n(.*?)\n```', content, re.DOTALL)
-        for lang, code in code_blocks:
-            snippets.append({
-                'type': 'block',
-                'language': lang or 'text',
-                'code': code.strip()
-            })
-        
-        # Inline code
-        inline_code = re.findall(r'`([^`]+)`', content)
-        for code in inline_code:
-            if len(code.strip()) > 0:
-                snippets.append({
-                    'type': 'inline',
-                    'language': 'text',
-                    'code': code.strip()
-                })
-        
-        return snippets
+        return parse_discord_content(content, message_id).code_snippets()
     
     @staticmethod
     def truncate_text(text: str, max_length: int = 200, suffix: str = "...") -> str:
@@ -127,10 +297,9 @@ class TextProcessor:
         return text
     
     @staticmethod
-    def extract_urls(text: str) -> List[str]:
-        """Extract URLs from text."""
-        url_pattern = r'https?://[^\s<>"{}|^`[\]\\]+'
-        return re.findall(url_pattern, text)
+    def extract_urls(text: str, message_id: Optional[str] = None) -> List[str]:
+        """Extract URLs from text, skipping any inside code."""
+        return list(parse_discord_content(text, message_id).urls)
     
     @staticmethod
     def highlight_keywords(text: str, keywords: List[str]) -> str:
@@ -165,6 +334,17 @@ class TextProcessor:
         return summary
 
 
+def discussion_text(discussion: Dict[str, Any]) -> str:
+    """Normalized text of a discussion, as stored at ingest.
+    
+    Rows stored before ingest-time normalization have no ``clean_content``;
+    their raw content is parsed instead (cached by message ID).
+    """
+    return discussion.get("clean_content") or TextProcessor.clean_discord_content(
+        discussion.get("content", ""), discussion.get("message_id")
+    )
+
+
 class NewsletterFormatter:
     """Specialized formatter for newsletter content."""
     
@@ -176,10 +356,17 @@ class NewsletterFormatter:
         content: str, 
         author: str, 
         engagement_score: float,
-        max_length: int = 300
+        max_length: int = 300,
+        message_id: Optional[str] = None,
+        clean_content: Optional[str] = None
     ) -> Dict[str, str]:
-        """Format a discussion summary for newsletter inclusion."""
-        clean_content = self.text_processor.clean_discord_content(content)
+        """Format a discussion summary for newsletter inclusion.
+        
+        Pass the ingest-time ``clean_content`` when stored; otherwise the
+        raw content is parsed (cached under ``message_id``).
+        """
+        if clean_content is None:
+            clean_content = self.text_processor.clean_discord_content(content, message_id)
         summary = self.text_processor.generate_summary(clean_content, max_sentences=2)
         
         if len(summary) > max_length:
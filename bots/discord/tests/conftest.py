@@ -1,11 +1,13 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+from contextlib import asynccontextmanager
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from discord_bot.models.base import Base
 from discord_bot.core.config import settings
+from discord_bot.services.database import db_service
 
 
 @pytest.fixture(scope="session")
@@ -16,6 +18,30 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def disable_llm_cache(monkeypatch):
+    """Keep mocked LLM responses from leaking between tests via the response cache."""
+    monkeypatch.setattr(settings, "llm_cache_backend", "none")
+
+
+@pytest.fixture(autouse=True)
+def disable_workflow_checkpoints(monkeypatch):
+    """Run the newsletter workflow without the database-backed checkpointer by default."""
+    monkeypatch.setattr(settings, "newsletter_checkpointing", False)
+
+
+@pytest.fixture(autouse=True)
+def disable_research_cache(monkeypatch):
+    """Keep Perplexity results out of the shared research cache by default."""
+    monkeypatch.setattr(settings, "research_cache_backend", "none")
+
+
+@pytest.fixture(autouse=True)
+def local_cluster_lock(monkeypatch):
+    """Take generation leases in-process instead of on the production database."""
+    monkeypatch.setattr(settings, "cluster_lock_backend", "local")
+
+
 @pytest_asyncio.fixture
 async def test_db_engine():
     """Create test database engine."""
@@ -51,6 +77,31 @@ async def test_db_session(test_db_engine):
         await session.rollback()
 
 
+@pytest.fixture
+def db_session(monkeypatch, test_db_session):
+    """Route db_service.get_session to the test session, committing like the real one."""
+    lock = asyncio.Lock()  # the test session must not be used concurrently
+    holder = {}
+    
+    @asynccontextmanager
+    async def get_session():
+        task = asyncio.current_task()
+        if holder.get("task") is task:
+            # Nested sessions in the same task share the open one
+            yield test_db_session
+            return
+        async with lock:
+            holder["task"] = task
+            try:
+                yield test_db_session
+                await test_db_session.commit()
+            finally:
+                holder.pop("task", None)
+    
+    monkeypatch.setattr(db_service, "get_session", get_session)
+    return test_db_session
+
+
 @pytest.fixture
 def mock_discord_message():
     """Mock Discord message for testing."""
@@ -0,0 +1,105 @@
+"""Tests for in-process caches and the Discord identity cache."""
+
+import pytest
+from sqlalchemy import select
+from discord_bot.utils import caching
+from discord_bot.utils.caching import ExpiringSet, SettingsBound, TTLCache
+from discord_bot.services.discord_service import DiscordService
+from discord_bot.models.discord_models import DiscordGuild
+from tests.test_write_behind import _mock_message
+
+
+def test_ttl_cache_lru_and_expiry(monkeypatch):
+    """Test LRU eviction, expiry and hit/miss counters."""
+    now = [0.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    
+    now[0] = 11
+    assert cache.get("a") is None
+    
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_expiring_set_expiry_and_cap(monkeypatch):
+    """Test members expire after the TTL and the size cap drops the oldest."""
+    now = [0.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    
+    seen = ExpiringSet(ttl=10, max_size=3)
+    assert seen.add("a")
+    assert not seen.add("a")
+    
+    now[0] = 5
+    seen.add("b")
+    seen.add("c")
+    seen.add("d")  # over the cap, drops "a"
+    assert "a" not in seen
+    assert seen.evictions == 1
+    
+    now[0] = 16
+    assert seen.add("e")  # "b", "c" and "d" expired
+    assert len(seen) == 1
+
+
+def test_settings_bound_rebuilds_on_change():
+    """Test the instance is reused until its settings change or it is reset."""
+    config = ["sqlite"]
+    bound = SettingsBound(lambda: (config[0],), lambda backend: {"backend": backend})
+    
+    first = bound.get()
+    assert bound.get() is first
+    config[0] = "redis"
+    assert bound.get() == {"backend": "redis"}
+    bound.reset()
+    assert bound.get() is not first and bound.get() == {"backend": "redis"}
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_skips_unchanged_upserts(db_session):
+    """Test unchanged identities are served from cache and changes are written."""
+    service = DiscordService()
+    service._monitor_all_channels = True
+    
+    await service._store_message_batch([_mock_message(100, 10)])
+    await service._store_message_batch([_mock_message(101, 10)])
+    stats = service.get_identity_cache_stats()
+    assert stats["guild"]["hits"] == 1
+    assert stats["user"]["hits"] == 1
+    
+    renamed = _mock_message(102, 10)
+    renamed.guild.name = "Renamed"
+    await service._store_message_batch([renamed])
+    
+    result = await db_session.execute(
+        select(DiscordGuild.name).execution_options(populate_existing=True)
+    )
+    assert result.scalar_one() == "Renamed"
+    assert service._identity_cache["guild"].get("1")[1][0] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_waits_for_commit(test_db_session):
+    """Test identities are cached on commit and never from a rolled-back transaction."""
+    service = DiscordService()
+    author = _mock_message(100, 10).author
+    
+    await service._store_user(author, test_db_session)
+    assert service._identity_cache["user"].get("10") is None
+    await test_db_session.rollback()
+    assert service._identity_cache["user"].get("10") is None
+    
+    user_id = await service._store_user(author, test_db_session)
+    await test_db_session.commit()
+    assert service._identity_cache["user"].get("10")[0] == user_id
@@ -0,0 +1,209 @@
+"""Tests for cluster lease locks and the persistent scheduler job store."""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from apscheduler.triggers.cron import CronTrigger
+
+from discord_bot.core.config import settings
+from discord_bot.models.newsletter_models import NewsletterStatus, NewsletterType
+from discord_bot.services import cluster_lock as cluster_lock_module
+from discord_bot.services import scheduler_service as scheduler_module
+from discord_bot.services.cluster_lock import (
+    DatabaseClusterLock, LocalClusterLock, advisory_lock_id, get_cluster_lock
+)
+from discord_bot.services.scheduler_service import SchedulerService, jobstore_url
+
+
+async def hold_lease(lock, key, acquired: asyncio.Event, release: asyncio.Event):
+    """Hold ``key`` from another task, as a second replica would."""
+    async with lock.lease(key) as ok:
+        assert ok
+        acquired.set()
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_lease_is_exclusive_and_reentrant():
+    """Test a held key is refused elsewhere but re-entered by its holder."""
+    lock = LocalClusterLock()
+    acquired, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(hold_lease(lock, "newsletter:daily:2025-01-01", acquired, release))
+    await acquired.wait()
+
+    async with lock.lease("newsletter:daily:2025-01-01") as ok:
+        assert not ok
+    async with lock.lease("newsletter:weekly:2025-01-01") as ok:
+        assert ok
+        async with lock.lease("newsletter:weekly:2025-01-01") as nested:
+            assert nested
+
+    release.set()
+    await holder
+    async with lock.lease("newsletter:daily:2025-01-01") as ok:
+        assert ok
+    assert lock.get_stats() == {"backend": "local", "acquired": 3, "contended": 1, "errors": 0}
+
+
+def test_advisory_lock_id_is_stable_signed_bigint():
+    """Test lease keys map to deterministic ids in Postgres' bigint range."""
+    lock_id = advisory_lock_id("newsletter:daily:2025-01-01")
+    assert lock_id == advisory_lock_id("newsletter:daily:2025-01-01")
+    assert lock_id != advisory_lock_id("newsletter:daily:2025-01-02")
+    assert -2 ** 63 <= lock_id < 2 ** 63
+
+
+@pytest.mark.asyncio
+async def test_database_lock_falls_back_to_local_without_postgres(monkeypatch, test_db_engine):
+    """Test the database backend still excludes within a process on SQLite."""
+    monkeypatch.setattr(cluster_lock_module.db_service, "_engine", test_db_engine)
+    lock = DatabaseClusterLock()
+    acquired, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(hold_lease(lock, "maintenance:2025-01-01", acquired, release))
+    await acquired.wait()
+
+    async with lock.lease("maintenance:2025-01-01") as ok:
+        assert not ok
+
+    release.set()
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_scheduled_newsletter_skips_when_another_replica_holds_it(monkeypatch):
+    """Test the job does nothing while another replica holds the date's lease."""
+    calls = []
+
+    async def generate_newsletter(**kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr(scheduler_module.newsletter_service, "generate_newsletter", generate_newsletter)
+    monkeypatch.setattr(scheduler_module, "datetime", SimpleNamespace(
+        now=lambda: SimpleNamespace(strftime=lambda fmt: "2025-01-04")
+    ))
+
+    acquired, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(
+        hold_lease(get_cluster_lock(), "newsletter:weekly:2025-01-04", acquired, release)
+    )
+    await acquired.wait()
+    await SchedulerService()._generate_newsletter_job(NewsletterType.WEEKLY, auto_publish=True)
+    release.set()
+    await holder
+    assert calls == []
+
+    await SchedulerService()._generate_newsletter_job(NewsletterType.WEEKLY, auto_publish=True)
+    assert calls == [{"newsletter_type": NewsletterType.WEEKLY, "force": False, "target_date": "2025-01-04"}]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status,published", [
+    (NewsletterStatus.GENERATED, True),
+    (NewsletterStatus.PUBLISHED, False),
+])
+async def test_scheduled_newsletter_publishes_once(monkeypatch, status, published):
+    """Test auto-publish skips a newsletter another run already published."""
+    newsletter = SimpleNamespace(id="n1", title="Weekly", status=status)
+    sent, marked = [], []
+
+    async def generate_newsletter(**kwargs):
+        return newsletter
+
+    async def create_newsletter_from_model(newsletter, publish_immediately):
+        sent.append(newsletter.id)
+        return "draft-1"
+
+    async def mark_published(newsletter_id, draft_id):
+        marked.append((newsletter_id, draft_id))
+
+    monkeypatch.setattr(scheduler_module.newsletter_service, "generate_newsletter", generate_newsletter)
+    monkeypatch.setattr(scheduler_module.newsletter_service, "mark_published", mark_published)
+    monkeypatch.setattr(
+        scheduler_module.buttondown_service, "create_newsletter_from_model", create_newsletter_from_model
+    )
+
+    await SchedulerService()._generate_newsletter_job(NewsletterType.WEEKLY, auto_publish=True)
+
+    assert sent == (["n1"] if published else [])
+    assert marked == ([("n1", "draft-1")] if published else [])
+
+
+@pytest.mark.parametrize("database_url,expected", [
+    ("postgresql+asyncpg://u:p@db:5432/app", "postgresql+psycopg://u:p@db:5432/app"),
+    ("postgresql://u:p@db/app", "postgresql+psycopg://u:p@db/app"),
+    ("sqlite+aiosqlite:///data/app.db", "sqlite:///data/app.db"),
+])
+def test_jobstore_url_uses_sync_driver(database_url, expected):
+    """Test the job store gets a synchronous driver for the application database."""
+    assert jobstore_url(database_url) == expected
+
+
+@pytest.mark.asyncio
+async def test_job_round_trips_through_sqlite_store(monkeypatch, tmp_path):
+    """Test a stored job is read back by a new scheduler with its callable and arguments."""
+    monkeypatch.setattr(settings, "scheduler_jobstore", "database")
+    monkeypatch.setattr(settings, "scheduler_jobstore_url", None)
+    monkeypatch.setattr(settings, "database_url", f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+
+    first = SchedulerService()
+    await first.initialize()
+    first.scheduler.start(paused=True)
+    first.scheduler.add_job(
+        scheduler_module.run_newsletter_job,
+        CronTrigger(hour=8, minute=15, timezone=first.timezone),
+        args=[NewsletterType.MONTHLY, True],
+        id="monthly_newsletter",
+    )
+    first.scheduler.shutdown(wait=False)
+
+    second = SchedulerService()
+    await second.initialize()
+    second.scheduler.start(paused=True)
+    try:
+        job = second.scheduler.get_job("monthly_newsletter")
+        assert second.jobstore_backend == "database"
+        assert job.func is scheduler_module.run_newsletter_job
+        assert job.args == (NewsletterType.MONTHLY, True)
+        assert "hour='8'" in str(job.trigger) and "minute='15'" in str(job.trigger)
+    finally:
+        second.scheduler.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_jobs_and_pauses_survive_restart(monkeypatch, tmp_path):
+    """Test a database job store keeps paused and rescheduled jobs across restarts."""
+    monkeypatch.setattr(settings, "scheduler_jobstore", "database")
+    monkeypatch.setattr(settings, "scheduler_jobstore_url", f"sqlite:///{tmp_path / 'jobs.db'}")
+    monkeypatch.setattr(settings, "engagement_incremental_counters", False)
+
+    first = SchedulerService()
+    await first.start()
+    assert first.jobstore_backend == "database"
+    assert await first.pause_job("daily_newsletter")
+    assert await first.reschedule_job("weekly_newsletter", "30 9 * * 0")
+    await first.stop()
+
+    second = SchedulerService()
+    await second.start()
+    try:
+        daily = second.scheduler.get_job("daily_newsletter")
+        weekly = second.scheduler.get_job("weekly_newsletter")
+        assert daily.next_run_time is None
+        assert daily.func is scheduler_module.run_newsletter_job
+        assert daily.args == (NewsletterType.DAILY, False)
+        assert "hour='9'" in str(weekly.trigger) and "minute='30'" in str(weekly.trigger)
+    finally:
+        await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_unavailable_jobstore_falls_back_to_memory(monkeypatch):
+    """Test a job store URL without an installed driver degrades to memory."""
+    monkeypatch.setattr(settings, "scheduler_jobstore", "database")
+    monkeypatch.setattr(settings, "scheduler_jobstore_url", "nosuchdialect://localhost/jobs")
+
+    service = SchedulerService()
+    await service.initialize()
+
+    assert service.jobstore_backend == "memory"
+    assert service.get_scheduler_status()["jobstore"] == "memory"
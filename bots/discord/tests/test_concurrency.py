@@ -0,0 +1,74 @@
+"""Tests for bounded LLM fan-out."""
+
+import asyncio
+import pytest
+from langchain_openai import ChatOpenAI
+from discord_bot.agents.editor_agent import EditorAgent
+from discord_bot.core.config import settings
+from discord_bot.utils.concurrency import bounded_gather, concurrency_limit
+
+
+@pytest.mark.asyncio
+async def test_bounded_gather_limits_concurrency_and_keeps_order(monkeypatch):
+    """Test results keep input order while in-flight calls stay under the limit."""
+    monkeypatch.setattr(settings, "llm_concurrency_overrides", "test-model=2")
+    active = 0
+    peak = 0
+    
+    async def work(i):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01 * (5 - i))  # later items finish first
+        active -= 1
+        return i * 10
+    
+    results = await bounded_gather(range(5), work, key="test-model")
+    
+    assert results == [0, 10, 20, 30, 40]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_bounded_gather_timeout_and_failure_fallback():
+    """Test timed-out or failing items are replaced by their fallback."""
+    async def work(i):
+        if i == 1:
+            await asyncio.sleep(1)
+        if i == 2:
+            raise RuntimeError("boom")
+        return f"ok-{i}"
+    
+    results = await bounded_gather(
+        range(3), work, key="fallback-model", timeout=0.05, fallback=lambda i: f"fallback-{i}"
+    )
+    
+    assert results == ["ok-0", "fallback-1", "fallback-2"]
+    
+    # Without a fallback the first failure in input order is raised
+    with pytest.raises(asyncio.TimeoutError):
+        await bounded_gather(range(3), work, key="fallback-model", timeout=0.05)
+
+
+def test_concurrency_limit_overrides(monkeypatch):
+    """Test model overrides win over provider overrides and the default."""
+    monkeypatch.setattr(settings, "llm_max_concurrency", 3)
+    monkeypatch.setattr(settings, "llm_concurrency_overrides", "openai=8, openai/gpt-4o=2")
+    
+    assert concurrency_limit("openai/gpt-4o") == 2
+    assert concurrency_limit("openai/gpt-4o-mini") == 8
+    assert concurrency_limit("anthropic/claude-3-haiku") == 3
+
+
+def test_provider_override_applies_to_agent_model(monkeypatch):
+    """Test an agent's model key carries its provider so provider overrides match."""
+    monkeypatch.setattr(settings, "llm_max_concurrency", 3)
+    monkeypatch.setattr(settings, "llm_concurrency_overrides", "openai=8, gpt-4o=2")
+    
+    mini = EditorAgent(model=ChatOpenAI(model="gpt-4o-mini", api_key="test"))
+    full = EditorAgent(model=ChatOpenAI(model="gpt-4o", api_key="test"))
+    
+    assert mini.model_key == "openai/gpt-4o-mini"
+    assert concurrency_limit(mini.model_key) == 8
+    assert concurrency_limit(full.model_key) == 2
+    assert EditorAgent(model=None).model_key == "none"
@@ -2,9 +2,15 @@
 
 import pytest
 from datetime import datetime, timezone, timedelta
+from sqlalchemy import select
+from discord_bot.core.config import settings
 from discord_bot.services.engagement_service import EngagementAnalyzer
+from discord_bot.services.engagement_rollups import refresh_daily_rollups
+from discord_bot.services.engagement_scoring import EngagementScorer, ScoringWeights
+from discord_bot.utils.text_processing import KeywordMatcher
 from discord_bot.models.discord_models import (
-    DiscordGuild, DiscordChannel, DiscordUser, DiscordMessage, EngagementMetrics
+    DiscordGuild, DiscordChannel, DiscordUser, DiscordMessage, EngagementLeaderboard,
+    EngagementMetrics, MessageReaction
 )
 
 
@@ -74,6 +80,23 @@ async def test_calculate_trending_score():
     assert very_old_score == 0.0
 
 
+def test_score_batch_matches_single():
+    """Test batch scoring agrees with single-message scoring and honors weights."""
+    scorer = EngagementScorer(ScoringWeights())
+    rows = [
+        dict(reply_count=0, reaction_count=0, unique_reactors=0, discussion_participants=1,
+             thread_depth=0, message_age_hours=400, keyword_count=0),
+        dict(reply_count=5, reaction_count=10, unique_reactors=8, discussion_participants=12,
+             thread_depth=15, message_age_hours=2, keyword_count=2),
+    ]
+    
+    batch = scorer.score_batch(**{key: [row[key] for row in rows] for key in rows[0]})
+    assert batch.tolist() == [scorer.score(**row) for row in rows]
+    
+    reply_heavy = EngagementScorer(ScoringWeights(reply=1.0))
+    assert reply_heavy.score(**rows[1]) > scorer.score(**rows[1])
+
+
 @pytest.mark.asyncio
 async def test_update_message_engagement(test_db_session):
     """Test updating message engagement metrics."""
@@ -139,6 +162,29 @@ def test_extract_keywords():
     expected_keywords = ["langchain", "python", "agent", "openai", "gpt", "model"]
     for keyword in expected_keywords:
         assert keyword in keywords
+    
+    # Terms only match whole words
+    assert analyzer._extract_keywords("Moved the storage layer to a new paragraph") == []
+
+
+def test_keyword_matcher_ranks_hits():
+    """Test keyword hits are counted and ranked by frequency."""
+    matcher = KeywordMatcher(["RAG", "agent", "ci/cd", "vector store"])
+    
+    hits = matcher.find("Agents doing rag; an agent for ci/cd and rag/agent tools over a vector store")
+    
+    assert hits == [("agent", 3), ("RAG", 2), ("ci/cd", 1), ("vector store", 1)]
+    assert matcher.find("agent agent rag", limit=1) == [("agent", 2)]
+
+
+def test_keyword_matcher_plurals_never_shadow_terms():
+    """Test real terms win over generated plurals and short terms match exactly."""
+    matcher = KeywordMatcher(["transformers", "transformer", "rag", "api"])
+    
+    assert matcher.find("the transformers library") == [("transformers", 1)]
+    assert matcher.find("a transformer") == [("transformer", 1)]
+    assert matcher.find("road rages and rags") == []
+    assert matcher.find("rag over two apis") == [("rag", 1)]
 
 
 def test_categorize_content():
@@ -166,14 +212,14 @@ def test_categorize_content():
 
 
 @pytest.mark.asyncio
-async def test_get_engagement_summary(test_db_session):
-    """Test engagement summary generation."""
+async def test_get_engagement_summary(db_session):
+    """Test live rescoring keeps the daily rollups behind the summary current."""
     analyzer = EngagementAnalyzer()
     
     # Create some test data
     guild = DiscordGuild(guild_id="123", name="Test Guild", is_active=True)
-    test_db_session.add(guild)
-    await test_db_session.flush()
+    db_session.add(guild)
+    await db_session.flush()
     
     channel = DiscordChannel(
         channel_id="456",
@@ -182,8 +228,8 @@ async def test_get_engagement_summary(test_db_session):
         channel_type="text",
         is_monitored=True
     )
-    test_db_session.add(channel)
-    await test_db_session.flush()
+    db_session.add(channel)
+    await db_session.flush()
     
     user = DiscordUser(
         user_id="789",
@@ -191,8 +237,8 @@ async def test_get_engagement_summary(test_db_session):
         display_name="Test User",
         is_bot=False
     )
-    test_db_session.add(user)
-    await test_db_session.flush()
+    db_session.add(user)
+    await db_session.flush()
     
     # Create test message
     message = DiscordMessage(
@@ -200,31 +246,130 @@ async def test_get_engagement_summary(test_db_session):
         guild_id=guild.id,
         channel_id=channel.id,
         author_id=user.id,
-        content="Test message",
-        clean_content="Test message",
+        content="Trying langchain with python",
+        clean_content="Trying langchain with python",
         message_type="default",
         has_attachments=False,
         has_embeds=False,
         created_at=datetime.now(timezone.utc)
     )
-    test_db_session.add(message)
-    await test_db_session.flush()
+    db_session.add(message)
+    await refresh_daily_rollups(db_session, [message.created_at.date()])
+    await db_session.commit()
+    
+    # Live scoring adjusts the day's rollup in place
+    first_score = await analyzer.update_message_engagement("999")
+    for i in range(3):
+        reactor = DiscordUser(user_id=f"r{i}", username=f"reactor{i}", is_bot=False)
+        db_session.add(reactor)
+        await db_session.flush()
+        db_session.add(MessageReaction(message_id=message.id, user_id=reactor.id, emoji="👍"))
+    await db_session.commit()
+    score = await analyzer.update_message_engagement("999")
+    assert score > first_score
+    
+    summary = await analyzer.get_engagement_summary(days=7)
+    assert summary["period_days"] == 7
+    assert summary["total_messages"] == 1
+    assert summary["high_engagement_count"] == int(score >= settings.min_engagement_score)
+    assert summary["average_engagement_score"] == round(score, 2)
+    assert sum(summary["score_histogram"].values()) == 1
+    assert summary["top_keywords"] == [("langchain", 1), ("python", 1)]
+    
+    # A full recompute agrees with the incrementally maintained rollup
+    await refresh_daily_rollups(db_session, [message.created_at.date()])
+    assert await analyzer.get_engagement_summary(days=7) == summary
+
+@pytest.mark.asyncio
+async def test_bulk_engagement_rows(db_session):
+    """Test grouped aggregate computation, bulk upsert and the leaderboard fast path."""
+    analyzer = EngagementAnalyzer()
+    
+    guild = DiscordGuild(guild_id="123", name="Test Guild", is_active=True)
+    db_session.add(guild)
+    await db_session.flush()
     
-    # Create engagement metrics
-    metrics = EngagementMetrics(
-        message_id=message.id,
-        engagement_score=15.5,
-        extracted_keywords=["langchain", "python"]
+    channel = DiscordChannel(
+        channel_id="456",
+        guild_id=guild.id,
+        name="test-channel",
+        channel_type="text",
+        is_monitored=True
     )
-    test_db_session.add(metrics)
-    await test_db_session.commit()
+    db_session.add(channel)
+    await db_session.flush()
+    
+    users = [
+        DiscordUser(user_id=str(700 + i), username=f"user{i}", is_bot=False)
+        for i in range(3)
+    ]
+    db_session.add_all(users)
+    await db_session.flush()
+    
+    now = datetime.now(timezone.utc)
+    root = DiscordMessage(
+        message_id="1000",
+        guild_id=guild.id,
+        channel_id=channel.id,
+        author_id=users[0].id,
+        content="Anyone using langgraph with postgres checkpoints?",
+        created_at=now - timedelta(hours=3)
+    )
+    quiet = DiscordMessage(
+        message_id="1001",
+        guild_id=guild.id,
+        channel_id=channel.id,
+        author_id=users[0].id,
+        content="hello",
+        created_at=now - timedelta(hours=2)
+    )
+    replies = [
+        DiscordMessage(
+            message_id=str(1100 + i),
+            guild_id=guild.id,
+            channel_id=channel.id,
+            author_id=users[i + 1].id,
+            content="yes",
+            parent_message_id="1000",
+            created_at=now - timedelta(hours=1 - i * 0.5)
+        )
+        for i in range(2)
+    ]
+    db_session.add_all([root, quiet, *replies])
+    await db_session.flush()
+    
+    db_session.add_all([
+        MessageReaction(message_id=root.id, user_id=users[1].id, emoji="👍"),
+        MessageReaction(message_id=root.id, user_id=users[1].id, emoji="🔥"),
+        MessageReaction(message_id=root.id, user_id=users[2].id, emoji="👍"),
+    ])
+    await db_session.flush()
+    
+    base_rows = (await db_session.execute(
+        analyzer._base_rows_query().where(DiscordMessage.message_id.in_(["1000", "1001"]))
+    )).all()
+    rows = await analyzer._compute_engagement_rows(db_session, base_rows)
+    by_id = {row["message_id"]: row for row in rows}
+    
+    assert by_id[root.id]["reply_count"] == 2
+    assert by_id[root.id]["reaction_count"] == 3
+    assert by_id[root.id]["unique_reactors"] == 2
+    assert by_id[root.id]["discussion_participants"] == 3
+    assert "langgraph" in by_id[root.id]["extracted_keywords"]
+    assert by_id[quiet.id]["reply_count"] == 0
+    assert by_id[quiet.id]["discussion_participants"] == 1
+    assert by_id[root.id]["engagement_score"] > by_id[quiet.id]["engagement_score"]
+    
+    # Upserting twice must update in place rather than duplicate rows
+    await analyzer._upsert_engagement_rows(db_session, rows)
+    await analyzer._upsert_engagement_rows(db_session, rows)
+    stored = (await db_session.execute(select(EngagementMetrics))).scalars().all()
+    assert len(stored) == 2
+    
+    leaderboard = (await db_session.execute(select(EngagementLeaderboard))).scalars().all()
+    assert len(leaderboard) == 2
+    assert {entry.author_name for entry in leaderboard} == {"user0"}
     
-    # Get summary (would work with PostgreSQL, might not with SQLite in tests)
-    try:
-        summary = await analyzer.get_engagement_summary(days=7)
-        assert "total_messages" in summary
-        assert "average_engagement_score" in summary
-        assert isinstance(summary["period_days"], int)
-    except Exception:
-        # Skip this test if database doesn't support the query
-        pass
\ No newline at end of file
+    top = await analyzer.get_top_discussions(days=1, min_score=0, limit=1, channel_ids=["456"])
+    assert [message.message_id for message, _ in top] == ["1000"]
+    assert await analyzer.get_top_discussions(days=1, min_score=0, channel_ids=["999"]) == []
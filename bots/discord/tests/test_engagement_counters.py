@@ -0,0 +1,126 @@
+"""Tests for incremental engagement counters."""
+
+import uuid
+import pytest
+from datetime import datetime, timezone
+from discord_bot.services.engagement_counters import EngagementCounters, MessageUserIndex
+from discord_bot.services.engagement_rollups import refresh_daily_rollups
+from discord_bot.models.discord_models import (
+    DiscordGuild, DiscordChannel, DiscordUser, DiscordMessage, EngagementMetrics,
+    EngagementDailyRollup, MessageReaction
+)
+from sqlalchemy import select
+
+
+@pytest.mark.asyncio
+async def test_message_user_index_tracks_distinct_users():
+    """Test add/remove bookkeeping and LRU eviction."""
+    index = MessageUserIndex(max_messages=2)
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    
+    async def seed_alice():
+        return {alice: 1}
+    
+    # Seed already includes the row being added
+    assert await index.add("m1", alice, seed_alice) is True
+    assert await index.add("m1", alice, seed_alice) is False
+    assert await index.add("m1", bob, seed_alice) is True
+    
+    assert await index.remove("m1", alice, seed_alice) is False
+    assert await index.remove("m1", alice, seed_alice) is True
+    
+    async def seed_empty():
+        return {}
+    
+    await index.add("m2", alice, seed_empty)
+    await index.add("m3", alice, seed_empty)
+    assert len(index) == 2
+
+
+@pytest.mark.asyncio
+async def test_apply_reaction_updates_counts(test_db_session):
+    """Test reaction deltas are applied to stored metrics."""
+    guild = DiscordGuild(guild_id="1", name="Guild", is_active=True)
+    test_db_session.add(guild)
+    await test_db_session.flush()
+    channel = DiscordChannel(
+        channel_id="2", guild_id=guild.id, name="general", channel_type="text"
+    )
+    author = DiscordUser(user_id="3", username="author")
+    reactor = DiscordUser(user_id="4", username="reactor")
+    test_db_session.add_all([channel, author, reactor])
+    await test_db_session.flush()
+    
+    message = DiscordMessage(
+        message_id="5",
+        guild_id=guild.id,
+        channel_id=channel.id,
+        author_id=author.id,
+        content="hi",
+        created_at=datetime.now(timezone.utc)
+    )
+    test_db_session.add(message)
+    await test_db_session.flush()
+    metrics = EngagementMetrics(message_id=message.id)
+    test_db_session.add(metrics)
+    await test_db_session.flush()
+    await refresh_daily_rollups(test_db_session, [message.created_at.date()])
+    
+    counters = EngagementCounters(score_fn=lambda **kwargs: float(kwargs["reaction_count"]))
+    
+    for emoji in ("👍", "🔥"):
+        test_db_session.add(MessageReaction(message_id=message.id, user_id=reactor.id, emoji=emoji))
+        await test_db_session.flush()
+        assert await counters.apply_reaction(test_db_session, message, reactor.id, is_add=True)
+    
+    await test_db_session.refresh(metrics)
+    assert metrics.reaction_count == 2
+    assert metrics.unique_reactors == 1
+    assert metrics.engagement_score == 2.0
+    assert metrics.trending_score == 2.0
+    
+    rollup = (await test_db_session.execute(select(EngagementDailyRollup))).scalar_one()
+    assert rollup.message_count == 1
+    assert rollup.score_sum == 2.0
+
+
+@pytest.mark.asyncio
+async def test_apply_replies_counts_thread_peers_as_participants(test_db_session):
+    """Test a reply from someone already talking in the thread is not a new participant."""
+    guild = DiscordGuild(guild_id="1", name="Guild", is_active=True)
+    test_db_session.add(guild)
+    await test_db_session.flush()
+    channel = DiscordChannel(
+        channel_id="2", guild_id=guild.id, name="general", channel_type="text"
+    )
+    author = DiscordUser(user_id="3", username="author")
+    peer = DiscordUser(user_id="4", username="peer")
+    test_db_session.add_all([channel, author, peer])
+    await test_db_session.flush()
+    
+    def message(message_id, author_id, **values):
+        return DiscordMessage(
+            message_id=message_id,
+            guild_id=guild.id,
+            channel_id=channel.id,
+            author_id=author_id,
+            content="hi",
+            created_at=datetime.now(timezone.utc),
+            **values
+        )
+    
+    root = message("5", author.id, thread_id="t1")
+    test_db_session.add_all([root, message("6", peer.id, thread_id="t1")])
+    await test_db_session.flush()
+    # Author and thread peer, as the bulk engine counts them
+    metrics = EngagementMetrics(message_id=root.id, discussion_participants=2)
+    test_db_session.add(metrics)
+    test_db_session.add(message("7", peer.id, parent_message_id="5"))
+    await test_db_session.flush()
+    
+    counters = EngagementCounters(score_fn=lambda **kwargs: 0.0)
+    assert await counters.apply_replies(test_db_session, "5", [peer.id], datetime.now(timezone.utc))
+    
+    await test_db_session.refresh(metrics)
+    assert metrics.reply_count == 1
+    assert metrics.discussion_participants == 2
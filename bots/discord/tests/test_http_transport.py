@@ -0,0 +1,156 @@
+"""Tests for the shared HTTP transport."""
+
+import asyncio
+import time
+import httpx
+import pytest
+
+from discord_bot.core.config import settings
+from discord_bot.services.http_transport import (
+    CircuitOpenError, HTTPTransport, LatencyHistogram, parse_retry_after
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "http_transport_backoff_base", 0.0)
+    monkeypatch.setattr(settings, "http_transport_max_retries", 2)
+
+
+def scripted(*responses):
+    """Mock transport answering with ``responses`` in order, recording requests."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        status, headers = responses[min(len(requests), len(responses)) - 1]
+        return httpx.Response(status, headers=headers, json={"ok": status == 200})
+
+    return httpx.MockTransport(handler), requests
+
+
+@pytest.mark.asyncio
+async def test_retries_honour_retry_after_then_succeed():
+    """Test a 429 with Retry-After is retried and the success is returned."""
+    mock, requests = scripted((429, {"retry-after": "0"}), (200, {}))
+    transport = HTTPTransport(transport=mock)
+    client = transport.client("api", "https://api.example.com/v1", headers={"Authorization": "Bearer k"})
+
+    response = await client.post("/chat/completions", json={})
+
+    assert response.status_code == 200
+    assert len(requests) == 2
+    assert requests[0].url == "https://api.example.com/v1/chat/completions"
+    assert requests[0].headers["authorization"] == "Bearer k"
+    stats = client.get_stats()
+    assert stats["retries"] == 1
+    assert stats["statuses"] == {429: 1, 200: 1}
+    assert stats["latency"]["count"] == 2
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_requests_are_not_resent_after_a_bad_gateway():
+    """Test a POST answered with 502 is only retried when marked idempotent."""
+    mock, requests = scripted((502, {}), (200, {}))
+    transport = HTTPTransport(transport=mock)
+    client = transport.client("api", "https://api.example.com")
+
+    assert (await client.post("/emails", json={})).status_code == 502
+    assert len(requests) == 1
+
+    assert (await client.post("/emails", json={}, idempotent=True)).status_code == 200
+    assert len(requests) == 2
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures(monkeypatch):
+    """Test repeated 5xx responses open the breaker and later requests are rejected."""
+    monkeypatch.setattr(settings, "http_transport_max_retries", 0)
+    monkeypatch.setattr(settings, "http_transport_breaker_threshold", 2)
+    monkeypatch.setattr(settings, "http_transport_breaker_reset_seconds", 60.0)
+    mock, requests = scripted((500, {}))
+    transport = HTTPTransport(transport=mock)
+    client = transport.client("flaky", "https://flaky.example.com")
+
+    await client.get("/")
+    await client.get("/")
+    with pytest.raises(CircuitOpenError):
+        await client.get("/")
+
+    assert len(requests) == 2
+    assert client.get_stats()["circuit"] == "open"
+    assert transport.get_stats("other") == {}
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_frees_the_circuit(monkeypatch):
+    """Test a cancelled half-open trial does not leave the circuit stuck open."""
+    monkeypatch.setattr(settings, "http_transport_max_retries", 0)
+    monkeypatch.setattr(settings, "http_transport_breaker_threshold", 1)
+    monkeypatch.setattr(settings, "http_transport_breaker_reset_seconds", 0.0)
+    trial_started = asyncio.Event()
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(500)
+        if len(calls) == 2:
+            trial_started.set()
+            await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    transport = HTTPTransport(transport=httpx.MockTransport(handler))
+    client = transport.client("flaky", "https://flaky.example.com")
+
+    assert (await client.get("/")).status_code == 500
+    trial = asyncio.create_task(client.get("/"))
+    await trial_started.wait()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    assert (await client.get("/")).status_code == 200
+    assert client.get_stats()["circuit"] == "closed"
+    await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_rate_limit_window_delays_next_request():
+    """Test x-ratelimit headers reporting no remaining requests pause the next call."""
+    mock, requests = scripted((200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "0.2s"}))
+    transport = HTTPTransport(transport=mock)
+    client = transport.client("api", "https://api.example.com")
+
+    await client.get("/")
+    started = time.monotonic()
+    await client.get("/")
+
+    assert time.monotonic() - started >= 0.1
+    assert client.get_stats()["rate_limit_remaining"] == 0
+    await transport.aclose()
+
+
+def test_parse_retry_after_formats():
+    """Test delays are read from seconds, HTTP dates, epochs and durations."""
+    now = 1_700_000_000.0
+    assert parse_retry_after({"retry-after": "7"}, now) == 7.0
+    assert parse_retry_after({"retry-after": "Tue, 14 Nov 2023 22:13:30 GMT"}, now) == pytest.approx(10.0)
+    assert parse_retry_after({"x-ratelimit-reset": str(int(now) + 5)}, now) == 5.0
+    assert parse_retry_after({"x-ratelimit-reset-requests": "1m30s"}, now) == 90.0
+    assert parse_retry_after({}, now) is None
+
+
+def test_latency_histogram_percentiles():
+    """Test percentiles report the upper bound of the bucket they fall in."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.05, 0.5, 3.0):
+        histogram.observe(seconds)
+
+    assert histogram.percentile(0.5) == 0.1
+    assert histogram.percentile(0.75) == 1.0
+    assert histogram.percentile(0.99) == 3.0
+    assert histogram.as_dict()["buckets"] == {"le_0.1": 2, "le_1.0": 1, "le_inf": 1}
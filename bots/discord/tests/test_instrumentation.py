@@ -0,0 +1,69 @@
+"""Tests for per-node LLM usage instrumentation."""
+
+import asyncio
+import uuid
+import pytest
+from datetime import datetime, timezone
+
+from discord_bot.services.newsletter_service import newsletter_service
+from discord_bot.utils.instrumentation import record_llm_call, track_llm_usage
+
+
+@pytest.mark.asyncio
+async def test_usage_scopes_nest_and_follow_tasks():
+    """Test calls count in every enclosing scope, including from spawned tasks."""
+    async def call():
+        await asyncio.sleep(0)
+        record_llm_call(10, 5, 0.01, model="m")
+
+    with track_llm_usage() as node:
+        with track_llm_usage() as agent:
+            await asyncio.gather(*(asyncio.create_task(call()) for _ in range(3)))
+        record_llm_call(100, 50, 0.1, cached=True)
+
+    record_llm_call(1, 1, 1.0)  # outside any scope: ignored
+
+    assert agent.calls == 3 and agent.input_tokens == 30
+    assert node.calls == 4
+    assert node.cache_hits == 1
+    assert node.total_tokens == 45
+    assert node.cost == pytest.approx(0.03)
+    assert node.cost_saved == pytest.approx(0.1)
+    assert node.as_dict()["models"] == ["m"]
+
+
+@pytest.mark.asyncio
+async def test_node_metrics_persist_and_profile(db_session):
+    """Test node metrics are stored as generation logs and aggregated per node."""
+    newsletter_id = uuid.uuid4()
+    started = datetime(2025, 1, 1, 6, 0, tzinfo=timezone.utc).isoformat()
+
+    def metrics(node, duration, calls, cost, iteration=0):
+        return {
+            "node": node, "iteration": iteration, "started_at": started, "duration": duration,
+            "calls": calls, "cache_hits": 1, "cache_misses": calls - 1,
+            "input_tokens": 100 * calls, "output_tokens": 10 * calls,
+            "cost": cost, "cost_saved": 0.01, "models": ["gpt-4o-mini"]
+        }
+
+    for run in [
+        metrics("research", 3.0, 1, 0.0),
+        metrics("discussion_writing", 6.0, 4, 0.03),
+        metrics("discussion_writing", 3.0, 2, 0.01, iteration=1),
+    ]:
+        await newsletter_service._record_node_progress(newsletter_id, run["node"], {"node_metrics": [run]}, -1)
+
+    profile = await newsletter_service.get_generation_profile(str(newsletter_id))
+
+    assert profile["wall_time"] == pytest.approx(6.0)
+    assert profile["llm_calls"] == 7
+    assert profile["total_cost"] == pytest.approx(0.04)
+    writing = next(n for n in profile["nodes"] if n["node"] == "discussion_writing")
+    assert writing["runs"] == 2
+    assert writing["output_tokens"] == 60
+    assert writing["cache_hits"] == 2
+    assert writing["duration_share"] == pytest.approx(0.75)
+    assert writing["cost_share"] == pytest.approx(1.0)
+    assert writing["models"] == ["gpt-4o-mini"]
+
+    assert await newsletter_service.get_generation_profile(str(uuid.uuid4())) is None
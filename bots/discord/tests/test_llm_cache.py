@@ -0,0 +1,105 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
+
+from discord_bot.agents.base_agent import BaseNewsletterAgent
+from discord_bot.agents.state import AgentResponse
+from discord_bot.core.config import settings
+from discord_bot.services import llm_cache
+from discord_bot.services.llm_cache import SQLiteLLMCache, get_llm_cache, llm_cache_key
+
+
+class EchoAgent(BaseNewsletterAgent):
+    """Minimal agent that makes one LLM call per invocation."""
+
+    def _create_system_prompt(self) -> str:
+        return "You are a test agent."
+
+    async def process(self, state) -> AgentResponse:
+        content = await self._call_llm(self._create_messages(state["prompt"]))
+        return AgentResponse(agent_name=self.name, action="echo", output=content)
+
+
+def make_model():
+    model = Mock()
+    model.model_name = "test-model"
+    model.ainvoke = AsyncMock(return_value=AIMessage(
+        content="generated",
+        usage_metadata={"input_tokens": 100, "output_tokens": 50, "total_tokens": 150}
+    ))
+    return model
+
+
+@pytest.fixture
+def sqlite_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "llm_cache_backend", "sqlite")
+    monkeypatch.setattr(settings, "llm_cache_path", str(tmp_path / "llm.sqlite3"))
+    llm_cache._cache.reset()
+    return get_llm_cache()
+
+
+def test_cache_key_covers_prompt_and_parameters():
+    """Test the key changes with the system prompt, model and sampling parameters."""
+    messages = [SystemMessage(content="sys"), HumanMessage(content="hi")]
+    key = llm_cache_key("m", messages, 0.7, 2000)
+
+    assert key == llm_cache_key("m", list(messages), 0.7, 2000)
+    assert key != llm_cache_key("m", [SystemMessage(content="sys2"), messages[1]], 0.7, 2000)
+    assert key != llm_cache_key("other", messages, 0.7, 2000)
+    assert key != llm_cache_key("m", messages, 0.3, 2000)
+    assert key != llm_cache_key("m", messages, 0.7, 1000)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_ttl_and_eviction(tmp_path):
+    """Test expired entries miss and the least recently read entries are evicted."""
+    cache = SQLiteLLMCache(str(tmp_path / "c.sqlite3"), ttl=3600, max_entries=2)
+    await cache.set("a", {"content": "A"})
+    await cache.set("b", {"content": "B"})
+    assert await cache.get("a") == {"content": "A"}  # "b" is now least recent
+
+    await cache.set("c", {"content": "C"})
+
+    assert len(cache) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("c") == {"content": "C"}
+    assert cache.get_stats()["evictions"] == 1
+
+    expired = SQLiteLLMCache(str(tmp_path / "e.sqlite3"), ttl=-1, max_entries=10)
+    await expired.set("a", {"content": "A"})
+    assert await expired.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_agent_serves_repeat_calls_from_cache(sqlite_cache):
+    """Test a repeated prompt skips the model and records hit/miss usage."""
+    model = make_model()
+    agent = EchoAgent("echo", "test", model=model)
+
+    first = await agent.invoke({"prompt": "summarize"})
+    second = await agent.invoke({"prompt": "summarize"})
+
+    assert first.output == second.output == "generated"
+    assert model.ainvoke.await_count == 1
+    assert first.metadata["llm_usage"]["cache_misses"] == 1
+    assert first.metadata["llm_usage"]["input_tokens"] == 100
+    assert second.metadata["llm_usage"]["cache_hits"] == 1
+    assert second.metadata["llm_usage"]["input_tokens"] == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_cache_opt_out(sqlite_cache, monkeypatch):
+    """Test agents opted out by flag or setting always call the model."""
+    model = make_model()
+    flagged = EchoAgent("flagged", "test", model=model, cache_responses=False)
+    await flagged.invoke({"prompt": "summarize"})
+    await flagged.invoke({"prompt": "summarize"})
+    assert model.ainvoke.await_count == 2
+
+    monkeypatch.setattr(settings, "llm_cache_exclude_agents", "configured")
+    configured = EchoAgent("configured", "test", model=model)
+    await configured.invoke({"prompt": "summarize"})
+    await configured.invoke({"prompt": "summarize"})
+    assert model.ainvoke.await_count == 4
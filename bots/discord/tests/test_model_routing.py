@@ -0,0 +1,234 @@
+"""Tests for latency- and cost-aware model routing."""
+
+import asyncio
+
+import pytest
+
+from discord_bot.core.config import settings
+from discord_bot.services.model_router import (
+    ModelCapability, ModelInfo, ModelProvider, ModelRouter, ModelStats, RoutingPolicy
+)
+
+
+def make_router() -> ModelRouter:
+    router = ModelRouter()
+    router.user_preferences = {}
+    router.available_models = {
+        model.id: model for model in [
+            ModelInfo("cheap", "Cheap", ModelProvider.OPENAI, [ModelCapability.EDITING],
+                      input_cost_per_token=0.000001, output_cost_per_token=0.000002),
+            ModelInfo("mid", "Mid", ModelProvider.ANTHROPIC, [ModelCapability.EDITING],
+                      input_cost_per_token=0.000003, output_cost_per_token=0.000015),
+            ModelInfo("pricey", "Pricey", ModelProvider.OPENAI, [ModelCapability.EDITING],
+                      input_cost_per_token=0.00001, output_cost_per_token=0.00003),
+            ModelInfo("offline", "Offline", ModelProvider.OPENAI, [ModelCapability.EDITING],
+                      is_available=False),
+        ]
+    }
+    router._build_capability_index()
+    return router
+
+
+def record(router: ModelRouter, model_id: str, latency: float, ok: bool = True, times: int = 5):
+    for _ in range(times):
+        router._record_invocation(model_id, latency, ok, completion_tokens=100)
+
+
+def test_model_stats_rolling_window():
+    """Test statistics only reflect the most recent invocations."""
+    stats = ModelStats(window=4)
+    for latency in (10.0, 10.0, 1.0, 2.0):
+        stats.record(latency, ok=True, completion_tokens=20)
+    stats.record(0.5, ok=False)
+    stats.record(4.0, ok=True, completion_tokens=40)
+
+    assert stats.samples == 4
+    assert stats.error_rate == 0.25
+    assert stats.latency_percentile(0.5) == 2.0
+    assert stats.latency_percentile(0.95) == 4.0
+    assert stats.tokens_per_second == pytest.approx((20 / 1 + 20 / 2 + 40 / 4) / 3)
+    assert stats.as_dict()["requests"] == 6
+
+
+@pytest.mark.asyncio
+async def test_cheapest_under_sla_skips_slow_and_failing_models(monkeypatch):
+    """Test the cheapest model wins until it breaks the SLA or starts failing."""
+    monkeypatch.setattr(settings, "model_routing_policy", "cheapest_under_sla")
+    monkeypatch.setattr(settings, "model_routing_policies", "")
+    monkeypatch.setattr(settings, "model_routing_latency_sla", 5.0)
+    router = make_router()
+
+    assert [m.id for m in router.get_candidates_for_capability(ModelCapability.EDITING)] == [
+        "cheap", "mid", "pricey"
+    ]
+
+    record(router, "cheap", latency=9.0)
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "mid"
+
+    record(router, "mid", latency=1.0, ok=False)
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "pricey"
+
+    record(router, "pricey", latency=20.0)
+    ranked = router.get_candidates_for_capability(ModelCapability.EDITING)
+    assert [m.id for m in ranked] == ["cheap", "pricey", "mid"]
+
+
+@pytest.mark.asyncio
+async def test_fastest_policy_per_capability(monkeypatch):
+    """Test a capability override picks the lowest-latency model."""
+    monkeypatch.setattr(settings, "model_routing_policy", "cheapest_under_sla")
+    monkeypatch.setattr(settings, "model_routing_policies", "editing=fastest,research=bogus")
+    router = make_router()
+
+    assert router.get_routing_policy(ModelCapability.EDITING) == RoutingPolicy.FASTEST
+    assert router.get_routing_policy(ModelCapability.RESEARCH) == RoutingPolicy.CHEAPEST_UNDER_SLA
+
+    record(router, "cheap", latency=3.0)
+    record(router, "pricey", latency=0.5)
+    record(router, "mid", latency=1.0)
+    ranked = router.get_candidates_for_capability(ModelCapability.EDITING)
+    assert [m.id for m in ranked] == ["pricey", "mid", "cheap"]
+
+    router.set_user_preference(ModelCapability.EDITING, "cheap")
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "cheap"
+
+
+@pytest.mark.asyncio
+async def test_fastest_policy_explores_unmeasured_models(monkeypatch):
+    """Test models without statistics are routed to first until measured."""
+    monkeypatch.setattr(settings, "model_routing_policies", "editing=fastest")
+    router = make_router()
+
+    record(router, "cheap", latency=0.5)
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "mid"
+    record(router, "mid", latency=3.0)
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "pricey"
+    record(router, "pricey", latency=2.0)
+    ranked = router.get_candidates_for_capability(ModelCapability.EDITING)
+    assert [m.id for m in ranked] == ["cheap", "pricey", "mid"]
+
+
+@pytest.mark.asyncio
+async def test_failing_model_is_retried_after_its_samples_expire(monkeypatch):
+    """Test a demoted model's failures age out so it gets traffic again."""
+    from discord_bot.services import model_router as model_router_module
+
+    now = [1000.0]
+    monkeypatch.setattr(model_router_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(settings, "model_routing_policy", "cheapest_under_sla")
+    monkeypatch.setattr(settings, "model_routing_policies", "")
+    monkeypatch.setattr(settings, "model_stats_max_age", 60.0)
+    router = make_router()
+
+    record(router, "cheap", latency=1.0, ok=False)
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "mid"
+
+    now[0] += 61
+    assert router._model_stats["cheap"].samples == 0
+    assert (await router.get_model_for_capability(ModelCapability.EDITING)).id == "cheap"
+
+
+@pytest.mark.asyncio
+async def test_invocations_feed_model_stats():
+    """Test real invocations are timed and failures counted per model."""
+    class Response:
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.text = "error"
+
+        def json(self):
+            return {"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": 40}}
+
+    class Client:
+        statuses = [200, 503]
+
+        async def post(self, path, json=None, idempotent=False):
+            return Response(self.statuses.pop(0))
+
+    router = make_router()
+    router.api_key = "key"
+    router.client = Client()
+
+    await router.invoke_model("cheap", [{"role": "user", "content": "hi"}])
+    response = await router.invoke_model("cheap", [{"role": "user", "content": "hi"}])
+
+    assert response["fallback"] is True
+    stats = router.get_model_stats()["cheap"]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert stats["tokens_per_second"] > 0
+
+
+def hedging_router(monkeypatch, delays, failing=()):
+    """Router whose models answer after ``delays[model_id]`` seconds."""
+    monkeypatch.setattr(settings, "model_routing_policy", "cheapest_under_sla")
+    monkeypatch.setattr(settings, "model_routing_policies", "editing=hedged")
+    monkeypatch.setattr(settings, "model_hedge_delay", 0.05)
+    router = make_router()
+    router.api_key = "key"
+    router.client = object()
+    calls = []
+
+    async def invoke_model(model_id, messages, temperature=0.7, max_tokens=2000, **kwargs):
+        calls.append(model_id)
+        await asyncio.sleep(delays[model_id])
+        if model_id in failing:
+            return {"choices": [], "fallback": True}
+        return {"choices": [{"message": {"content": model_id}}]}
+
+    router.invoke_model = invoke_model
+    return router, calls
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_uses_first_successful_model(monkeypatch):
+    """Test a slow primary is hedged and the faster backup wins."""
+    monkeypatch.setattr(settings, "model_hedge_budget", 1.0)
+    router, calls = hedging_router(monkeypatch, {"cheap": 5.0, "mid": 0.01, "pricey": 0.01})
+
+    response, model_id = await router.invoke_model_by_capability(
+        ModelCapability.EDITING, [{"role": "user", "content": "hi"}]
+    )
+
+    assert model_id == "mid"
+    assert calls == ["cheap", "mid"]
+    assert router.get_hedge_stats()["editing"]["win_rate"] == 1.0
+    assert router.get_usage_stats()["mid"]["hedge_win_rate"] == 1.0
+    # The cancelled primary still reports how long it was kept waiting
+    assert router.get_model_stats()["cheap"]["p50"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged(monkeypatch):
+    """Test no duplicate request is sent when the primary answers in time."""
+    router, calls = hedging_router(monkeypatch, {"cheap": 0.0, "mid": 0.0, "pricey": 0.0})
+
+    _, model_id = await router.invoke_model_by_capability(
+        ModelCapability.EDITING, [{"role": "user", "content": "hi"}]
+    )
+
+    assert model_id == "cheap"
+    assert calls == ["cheap"]
+    assert router.get_hedge_stats()["editing"]["hedged"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_stay_within_budget(monkeypatch):
+    """Test hedging stops once the budget is spent and the failing primary's answer is kept."""
+    monkeypatch.setattr(settings, "model_hedge_budget", 0.1)
+    router, calls = hedging_router(
+        monkeypatch, {"cheap": 0.1, "mid": 0.0, "pricey": 0.0}, failing=("mid",)
+    )
+
+    for _ in range(3):
+        _, model_id = await router.invoke_model_by_capability(
+            ModelCapability.EDITING, [{"role": "user", "content": "hi"}]
+        )
+        assert model_id == "cheap"
+
+    stats = router.get_hedge_stats()["editing"]
+    assert stats["requests"] == 3
+    assert stats["hedged"] == 1
+    assert stats["budget_skipped"] == 2
+    assert stats["hedge_wins"] == 0
+    assert calls.count("mid") == 1
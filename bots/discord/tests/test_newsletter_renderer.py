@@ -0,0 +1,72 @@
+"""Tests for the template-based newsletter renderer."""
+
+from discord_bot.agents.state import NewsletterDraft, NewsletterSection
+from discord_bot.utils.newsletter_renderer import NewsletterRenderer
+
+
+def make_section(title, content):
+    return NewsletterSection(
+        section_type="featured", title=title, content=content, discussions=[], word_count=3
+    )
+
+
+def make_draft(*sections):
+    return NewsletterDraft(
+        title="Austin LangChain Weekly - Week of October 12, 2025",
+        subtitle="This week's top discussions",
+        sections=[make_section(title, content) for title, content in sections],
+        total_word_count=3 * len(sections),
+        estimated_read_time=1,
+        featured_discussions=[],
+        generation_metadata={}
+    )
+
+
+def test_render_emits_all_formats_in_one_pass():
+    """Test one render produces HTML, Markdown and text sharing a single quote."""
+    renderer = NewsletterRenderer()
+    draft = make_draft(("Q&A Night", "**Bold** idea\nwith a [link](https://aimug.org)"))
+
+    rendered = renderer.render(draft, quote=("Ship it.", "Someone"))
+
+    html = rendered["html"]
+    assert html.startswith("<!DOCTYPE html>")
+    assert "<h2>Q&amp;A Night</h2>" in html
+    assert "<strong>Bold</strong> idea<br />" in html
+    assert '"Ship it."' in html and "#2C5F9E" in html
+    assert "1 minute\n" in html
+
+    markdown_content = rendered["markdown"]
+    assert markdown_content.startswith("# Austin LangChain Weekly")
+    assert "## Q&A Night\n\n**Bold** idea" in markdown_content
+    assert '> *"Ship it."*' in markdown_content
+
+    text = rendered["text"]
+    assert "Q&A NIGHT\n=========\n" in text
+    assert "-" * 50 in text
+    assert "Sections: 1" in text
+
+
+def test_section_cache_rerenders_only_changed_sections():
+    """Test editing one section converts only that section again."""
+    renderer = NewsletterRenderer()
+    renderer.render(make_draft(("AI", "First"), ("News", "Second")))
+    assert renderer.get_stats()["section_misses"] == 2
+
+    rendered = renderer.render(make_draft(("AI", "First"), ("News", "Second, edited")))
+
+    stats = renderer.get_stats()
+    assert stats["section_hits"] == 1
+    assert stats["section_misses"] == 3
+    assert "Second, edited" in rendered["html"]
+
+
+def test_markdown_converter_state_does_not_leak_between_sections():
+    """Test the reused converter is reset, so footnotes stay with their section."""
+    renderer = NewsletterRenderer(max_cached_sections=1)
+    first = renderer.render_section(make_section("A", "Claim[^1]\n\n[^1]: Source"))
+    second = renderer.render_section(make_section("B", "Plain text"))
+
+    assert "footnote" in first["html"]
+    assert "footnote" not in second["html"]
+    assert renderer.get_stats()["cached_sections"] == 1
@@ -0,0 +1,96 @@
+"""Tests for bulk persistence of finished newsletters."""
+
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import event, select
+
+from discord_bot.models.discord_models import (
+    DiscordChannel, DiscordGuild, DiscordMessage, DiscordUser, EngagementMetrics
+)
+from discord_bot.models.newsletter_models import (
+    Newsletter, NewsletterType, NewsletterStatus, NewsletterSection,
+    NewsletterDiscussion, NewsletterGenerationLog
+)
+from discord_bot.services.newsletter_service import newsletter_service
+
+
+@pytest.mark.asyncio
+async def test_store_newsletter_content_writes_everything_in_one_transaction(db_session):
+    """Test content, sections, featured discussions, status and log are written in a few statements."""
+    guild = DiscordGuild(guild_id="1", name="Guild", is_active=True)
+    db_session.add(guild)
+    await db_session.flush()
+    channel = DiscordChannel(channel_id="2", guild_id=guild.id, name="general", channel_type="text")
+    author = DiscordUser(user_id="3", username="author")
+    db_session.add_all([channel, author])
+    await db_session.flush()
+
+    discussions = []
+    for snowflake, score in (("100", 4.0), ("101", 2.0)):
+        message = DiscordMessage(
+            message_id=snowflake, guild_id=guild.id, channel_id=channel.id, author_id=author.id,
+            content=f"Thread {snowflake}\nMore detail", created_at=datetime.now(timezone.utc)
+        )
+        db_session.add(message)
+        await db_session.flush()
+        metrics = EngagementMetrics(message_id=message.id, engagement_score=score, discussion_participants=3)
+        db_session.add(metrics)
+        discussions.append((message, metrics))
+
+    newsletter = Newsletter(title="Daily", newsletter_type=NewsletterType.DAILY)
+    db_session.add(newsletter)
+    await db_session.commit()
+
+    sections = [{"section_type": "featured", "title": f"S{i}", "content": f"Body {i}"} for i in range(5)]
+    workflow_result = {
+        "newsletter_draft": {"sections": sections, "total_word_count": 10, "featured_discussions": ["101"]},
+        "formatted_content": {"html": "<p>html</p>", "markdown": "md", "text": "text"},
+        "technical_analysis": {"100": {"commentary": "Great thread", "focus_areas": ["rag"]}},
+        "quality_metrics": {"overall_score": 0.9},
+        "draft_sections": sections,
+    }
+
+    statements = []
+    sync_engine = db_session.bind.sync_engine
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", count)
+    try:
+        await newsletter_service._store_newsletter_content(newsletter.id, workflow_result, discussions)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", count)
+
+    assert len(statements) <= 6
+
+    newsletter_id, first_message_id = newsletter.id, discussions[0][0].id
+    db_session.expire_all()
+    stored = (await db_session.execute(
+        select(Newsletter).where(Newsletter.id == newsletter_id)
+    )).scalar_one()
+    assert stored.status == NewsletterStatus.GENERATED
+    assert stored.content_markdown == "md"
+    assert stored.quality_score == 0.9
+
+    titles = (await db_session.execute(
+        select(NewsletterSection.title)
+        .where(NewsletterSection.newsletter_id == newsletter_id)
+        .order_by(NewsletterSection.order_index)
+    )).scalars().all()
+    assert titles == [f"S{i}" for i in range(5)]
+
+    featured = (await db_session.execute(
+        select(NewsletterDiscussion).where(NewsletterDiscussion.newsletter_id == newsletter_id)
+    )).scalars().all()
+    assert len(featured) == 1
+    assert featured[0].message_id == first_message_id
+    assert featured[0].discussion_title == "Thread 100"
+    assert featured[0].technical_analysis == "Great thread"
+    assert featured[0].engagement_score_snapshot == 4.0
+
+    logs = (await db_session.execute(
+        select(NewsletterGenerationLog).where(NewsletterGenerationLog.newsletter_id == newsletter_id)
+    )).scalars().all()
+    assert [log.step_name for log in logs] == ["generation_complete"]
+    assert logs[0].step_metadata["featured_discussions"] == 1
@@ -0,0 +1,76 @@
+"""Tests for streaming newsletter generation and progressive section persistence."""
+
+import pytest
+from sqlalchemy import select
+
+from discord_bot.agents.newsletter_workflow import NewsletterWorkflow
+from discord_bot.agents.state import AgentResponse
+from discord_bot.models.newsletter_models import (
+    Newsletter, NewsletterType, NewsletterSection, NewsletterGenerationLog
+)
+from discord_bot.services.newsletter_service import newsletter_service
+
+
+@pytest.mark.asyncio
+async def test_stream_newsletter_yields_each_node_then_final_state():
+    """Test every node is reported as it completes, followed by the merged state."""
+    workflow = NewsletterWorkflow()
+    for name, agent in workflow.agents.items():
+        async def invoke(state, name=name):
+            return AgentResponse(agent_name=name, action="stub", output=None)
+        agent.invoke = invoke
+
+    events = [event async for event in workflow.stream_newsletter([], "daily", "2025-01-01")]
+
+    nodes = [event["node"] for event in events if event["type"] == "node"]
+    assert set(nodes) == set(workflow.node_names)
+    assert nodes.index("assemble_sections") < nodes.index("formatting")
+    assert events[-1]["type"] == "completed"
+    assert events[-1]["state"]["current_step"] == "quality_check"
+    assembled = next(e["update"] for e in events if e.get("node") == "assemble_sections")
+    assert assembled["draft_sections"] == events[-1]["state"]["draft_sections"]
+
+
+@pytest.mark.asyncio
+async def test_node_progress_persists_most_finished_sections(db_session):
+    """Test sections are saved as nodes finish and never regress to an earlier stage."""
+    newsletter = Newsletter(title="Daily", newsletter_type=NewsletterType.DAILY)
+    db_session.add(newsletter)
+    await db_session.commit()
+
+    def sections(*titles):
+        return [{"section_type": "featured", "title": t, "content": f"{t} body"} for t in titles]
+
+    def metrics(node):
+        return [{"node": node, "iteration": 0, "started_at": "2025-01-01T06:00:00+00:00",
+                 "duration": 1.5, "calls": 1, "cost": 0.0}]
+
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    rank = -1
+    for node, update in [
+        ("discussion_writing", {"discussion_sections": sections("AI"), "node_metrics": metrics("discussion_writing")}),
+        ("assemble_sections", {"draft_sections": sections("AI", "News"), "node_metrics": metrics("assemble_sections")}),
+        ("discussion_writing", {"discussion_sections": sections("Revised AI"), "node_metrics": metrics("discussion_writing")}),
+    ]:
+        rank = await newsletter_service._record_node_progress(newsletter.id, node, update, rank, on_progress)
+
+    stored = (await db_session.execute(
+        select(NewsletterSection)
+        .where(NewsletterSection.newsletter_id == newsletter.id)
+        .order_by(NewsletterSection.order_index)
+    )).scalars().all()
+    assert [s.title for s in stored] == ["AI", "News"]
+    assert {s.generated_by_agent for s in stored} == {"assemble_sections"}
+
+    logs = (await db_session.execute(
+        select(NewsletterGenerationLog).where(NewsletterGenerationLog.newsletter_id == newsletter.id)
+    )).scalars().all()
+    assert len(logs) == 3
+
+    assert [e["node"] for e in events] == ["discussion_writing", "assemble_sections", "discussion_writing"]
+    assert [e["sections_saved"] for e in events] == [1, 2, 0]
+    assert events[0]["duration"] == 1.5
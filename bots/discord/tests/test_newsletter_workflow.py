@@ -327,6 +327,47 @@ async def test_newsletter_workflow_execution(sample_discussions):
         assert "workflow" in str(e).lower() or "model" in str(e).lower()
 
 
+@pytest.mark.asyncio
+async def test_newsletter_workflow_fans_out_independent_nodes():
+    """Test research, discussion writing and enrichment overlap and join before opinion writing."""
+    import asyncio
+    from discord_bot.agents.state import AgentResponse
+    
+    workflow = NewsletterWorkflow()
+    active = set()
+    overlaps = []
+    outputs = {
+        "content_enrichment": {"news_article": {"title": "News", "summary": "Summary"}},
+        "discussion_writer": {"discussion_summaries": {"AI": [{
+            "message_id": "1", "summary": "Summary", "channel": "general",
+            "engagement": {"score": 1.0, "replies": 1, "reactions": 1}
+        }]}},
+    }
+    
+    for name, agent in workflow.agents.items():
+        async def invoke(state, name=name):
+            active.add(name)
+            overlaps.append(set(active))
+            await asyncio.sleep(0.02)
+            active.discard(name)
+            return AgentResponse(agent_name=name, action="stub", output=outputs.get(name))
+        agent.invoke = invoke
+    
+    result = await workflow.compiled_graph.ainvoke({
+        "newsletter_type": "daily",
+        "discussions": [],
+        "errors": [],
+        "warnings": [],
+        "iteration_count": 0
+    })
+    
+    assert {"research", "discussion_writer", "content_enrichment"} in overlaps
+    assert [s["section_type"] for s in result["draft_sections"]] == ["featured", "news"]
+    timed_nodes = [metrics["node"] for metrics in result["node_metrics"]]
+    assert timed_nodes.index("assemble_sections") > timed_nodes.index("content_analysis")
+    assert timed_nodes[-1] == "quality_check"
+
+
 def test_discussion_data_validation():
     """Test DiscussionData validation."""
     # Valid discussion data
@@ -0,0 +1,103 @@
+"""Tests for the CPU offload executor and event loop lag monitoring."""
+
+import asyncio
+import threading
+import time
+import pytest
+from contextvars import ContextVar
+
+from discord_bot.agents.editor_agent import EditorAgent
+from discord_bot.core.config import settings
+from discord_bot.utils.offload import CpuOffloader, LoopLagMonitor
+
+request_id: ContextVar[str] = ContextVar("request_id", default="")
+
+
+def current_thread_and_request():
+    return threading.get_ident(), request_id.get()
+
+
+@pytest.mark.asyncio
+async def test_inline_executor_counts_blocked_loop_time(monkeypatch):
+    """Test inline calls run on the loop and are charged to their call site."""
+    monkeypatch.setattr(settings, "cpu_executor", "inline")
+    offloader = CpuOffloader()
+
+    thread_id, _ = await offloader.run("test.inline", current_thread_and_request)
+    await offloader.run("test.inline", time.sleep, 0.01)
+
+    assert thread_id == threading.get_ident()
+    site = offloader.get_stats()["sites"]["test.inline"]
+    assert site["calls"] == 2 and site["offloaded"] == 0
+    assert site["blocked_seconds"] >= 0.01
+    assert offloader.take_recent_blocking()["test.inline"] == site["blocked_seconds"]
+    assert offloader.take_recent_blocking() == {}
+
+
+@pytest.mark.asyncio
+async def test_thread_executor_runs_off_loop_with_context(monkeypatch):
+    """Test thread-pool calls leave the loop thread but keep context variables."""
+    monkeypatch.setattr(settings, "cpu_executor", "thread")
+    offloader = CpuOffloader()
+    request_id.set("req-1")
+    try:
+        thread_id, seen = await offloader.run("test.thread", current_thread_and_request)
+    finally:
+        offloader.shutdown()
+
+    assert thread_id != threading.get_ident()
+    assert seen == "req-1"
+    site = offloader.get_stats()["sites"]["test.thread"]
+    assert site["offloaded"] == 1 and site["blocked_seconds"] == 0.0
+    assert offloader.take_recent_blocking() == {}
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_agent_helpers(monkeypatch):
+    """Test offloaded agent helpers pickle into a process pool."""
+    monkeypatch.setattr(settings, "cpu_executor", "process")
+    monkeypatch.setattr(settings, "cpu_executor_workers", 1)
+    offloader = CpuOffloader()
+    try:
+        edited = await offloader.run("editor.basic_edit", EditorAgent._basic_edit, "hello   world. it works")
+    finally:
+        offloader.shutdown()
+
+    assert edited == "hello world. It works."
+    assert offloader.get_stats()["executor"] == "process"
+
+
+def test_monitor_attributes_stalls_to_recent_sites(monkeypatch):
+    """Test a late tick counts as a stall and reports the sites that blocked."""
+    monkeypatch.setattr(settings, "loop_lag_warn_threshold", 0.1)
+    offloader = CpuOffloader()
+    monitor = LoopLagMonitor(offloader)
+
+    with offloader.blocking("editor.basic_edit"):
+        pass
+    monitor.observe(0.01)
+    with offloader.blocking("formatter.render"):
+        pass
+    monitor.observe(0.3)
+
+    stats = monitor.get_stats()
+    assert stats["ticks"] == 2 and stats["stalls"] == 1
+    assert stats["max_lag"] == 0.3
+    assert offloader.take_recent_blocking() == {}
+
+
+@pytest.mark.asyncio
+async def test_monitor_measures_blocked_loop(monkeypatch):
+    """Test the running monitor sees the loop being held by synchronous work."""
+    monkeypatch.setattr(settings, "loop_lag_interval", 0.02)
+    monitor = LoopLagMonitor(CpuOffloader())
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert not monitor.is_running
+    assert monitor.get_stats()["max_lag"] >= 0.1
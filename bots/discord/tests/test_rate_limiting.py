@@ -0,0 +1,26 @@
+"""Tests for rate limiting utilities."""
+
+import time
+import pytest
+from discord_bot.utils.rate_limiting import TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_throttles():
+    """Test burst capacity passes immediately and later calls wait for refill."""
+    bucket = TokenBucket(requests=5, period=0.25)
+    
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - started < 0.05
+    
+    await bucket.acquire()
+    assert time.monotonic() - started >= 0.04
+    assert bucket.total_wait_seconds > 0
+
+
+def test_token_bucket_rejects_invalid_configuration():
+    """Test invalid rates and oversized acquisitions are rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(requests=0, period=60)
@@ -0,0 +1,91 @@
+"""Tests for Perplexity research coalescing and caching."""
+
+import asyncio
+import pytest
+
+from discord_bot.core.config import settings
+from discord_bot.models import discord_models  # noqa: F401 - newsletter tables reference it
+from discord_bot.services import research_cache as research_cache_module
+from discord_bot.services.perplexity_service import PerplexityService
+from discord_bot.services.research_cache import (
+    DatabaseResearchCache, research_cache_key, research_max_age
+)
+from discord_bot.utils.concurrency import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test concurrent calls with one key run once and share the result."""
+    flight = SingleFlight()
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("langgraph", fetch) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert len(runs) == 1
+    assert flight.get_stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    await flight.do("langgraph", fetch)
+    assert len(runs) == 2
+
+
+def test_cache_key_normalizes_query_and_context():
+    """Test case and whitespace differences map to the same key."""
+    assert research_cache_key("research", "LangGraph  best practices", "AI") == \
+        research_cache_key("research", "  langgraph best practices", "ai ")
+    assert research_cache_key("research", "rag", max_tokens=500) != \
+        research_cache_key("research", "rag", max_tokens=300)
+    assert research_cache_key("research", "rag") != research_cache_key("fact_check", "rag")
+
+
+def test_freshness_window_per_newsletter_type(monkeypatch):
+    """Test each newsletter type gets its own freshness window, daily by default."""
+    monkeypatch.setattr(settings, "research_cache_max_age_daily", 100)
+    monkeypatch.setattr(settings, "research_cache_max_age_weekly", 300)
+
+    assert research_max_age("weekly") == 300
+    assert research_max_age("daily") == 100
+    assert research_max_age(None) == 100
+
+
+@pytest.mark.asyncio
+async def test_research_is_fetched_once_and_reused_across_types(monkeypatch, db_session):
+    """Test concurrent identical research shares one API call and later reads hit the cache."""
+    monkeypatch.setattr(settings, "research_cache_backend", "database")
+    research_cache_module._cache.reset()
+
+    service = PerplexityService()
+    service.api_key = "test_key"
+    await service.initialize()
+    calls = []
+
+    async def make_api_request(endpoint, payload):
+        calls.append(payload)
+        await asyncio.sleep(0.01)
+        return {"choices": [{"message": {"content": "LangGraph 1.0 is out"}, "citations": []}]}
+
+    monkeypatch.setattr(service, "_make_api_request", make_api_request)
+
+    first, second = await asyncio.gather(
+        service.research_topic("LangGraph updates", "AI"),
+        service.research_topic("langgraph  updates", "AI")
+    )
+    weekly = await service.research_topic("LangGraph updates", "AI", max_age=research_max_age("weekly"))
+
+    assert len(calls) == 1
+    assert first.findings == second.findings == weekly.findings == "LangGraph 1.0 is out"
+    assert second.query == "langgraph  updates"
+
+    # Too old for a zero-second window: refetched
+    await service.research_topic("LangGraph updates", "AI", max_age=0)
+    assert len(calls) == 2
+
+    cache = research_cache_module.get_research_cache()
+    assert isinstance(cache, DatabaseResearchCache)
+    assert cache.hits == 1
+    await service.close()
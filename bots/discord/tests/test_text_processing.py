@@ -0,0 +1,74 @@
+"""Tests for single-pass Discord content normalization."""
+
+from discord_bot.services.discord_service import discord_service
+from discord_bot.utils.text_processing import TextProcessor, discussion_text, parse_discord_content
+
+MESSAGE = (
+    "Hey <@!123> and <@&7>, see <#45>  <a:party:99>\n\n\n"
+    "```python\nprint('https://in.code')\n```\n"
+    "Try `pip install langgraph` from https://github.com/langchain-ai/langgraph."
+)
+
+
+def test_parse_extracts_every_token_in_one_pass():
+    """Test mentions, channels, emojis, code and URLs are all extracted and cleaned."""
+    parsed = parse_discord_content(MESSAGE)
+
+    assert parsed.clean_text == (
+        "Hey @user and @role, see #channel :party:\n\n"
+        "`print('https://in.code')`\n"
+        "Try `pip install langgraph` from https://github.com/langchain-ai/langgraph."
+    )
+    assert parsed.mentions == ("123",)
+    assert parsed.roles == ("7",)
+    assert parsed.channels == ("45",)
+    assert parsed.emojis == ("party",)
+    assert parsed.code_languages == ["python"]
+    assert parsed.inline_code == ("pip install langgraph",)
+    # URLs inside code are not links
+    assert parsed.urls == ("https://github.com/langchain-ai/langgraph.",)
+
+
+def test_text_processor_helpers_share_the_tokenizer():
+    """Test the TextProcessor helpers keep their output shapes."""
+    assert TextProcessor.clean_discord_content("") == ""
+    assert TextProcessor.clean_discord_content("a   b <:smile:1>") == "a b :smile:"
+    assert TextProcessor.extract_code_snippets("```\nx = 1\n``` and `y`") == [
+        {"type": "block", "language": "text", "code": "x = 1"},
+        {"type": "inline", "language": "text", "code": "y"},
+    ]
+    assert TextProcessor.extract_urls("see http://a.io/x and <https://b.io>") == [
+        "http://a.io/x", "https://b.io"
+    ]
+
+
+def test_parse_is_cached_per_message_until_edited():
+    """Test a message is parsed once per content version."""
+    first = parse_discord_content("hello <@1>", message_id="cache-test")
+    assert parse_discord_content("hello <@1>", message_id="cache-test") is first
+
+    edited = parse_discord_content("hello <@2>", message_id="cache-test")
+    assert edited is not first
+    assert edited.mentions == ("2",)
+
+
+def test_ingest_stores_normalized_fields(mock_discord_message):
+    """Test message rows carry the normalized content, URLs and code languages."""
+    mock_discord_message.content = "```sql\nselect 1\n``` via https://aimug.org"
+
+    values = discord_service._normalized_values(mock_discord_message)
+
+    assert values == {
+        "normalized_content": "`select 1` via https://aimug.org",
+        "content_urls": ["https://aimug.org"],
+        "code_languages": ["sql"],
+    }
+
+
+def test_discussion_text_prefers_stored_clean_content():
+    """Test agents read the ingest-time text and only parse rows stored without it."""
+    stored = {"content": "raw <@1>", "clean_content": "stored text", "message_id": "m1"}
+    legacy = {"content": "hi <@42>  there", "message_id": "m2"}
+
+    assert discussion_text(stored) == "stored text"
+    assert discussion_text(legacy) == "hi @user there"
@@ -0,0 +1,82 @@
+"""Tests for durable, resumable newsletter workflow runs."""
+
+import pytest
+
+from discord_bot.agents.newsletter_workflow import NewsletterWorkflow
+from discord_bot.agents.state import AgentResponse
+from discord_bot.core.config import settings
+
+
+@pytest.fixture
+def workflow(monkeypatch, db_session):
+    """Workflow with stub agents, checkpointing into the test database."""
+    monkeypatch.setattr(settings, "newsletter_checkpointing", True)
+    crash = {"formatting": True}
+    original_formatting = NewsletterWorkflow._formatting_node
+
+    async def formatting_node(self, state):
+        if crash["formatting"]:
+            raise RuntimeError("renderer crashed")
+        return await original_formatting(self, state)
+
+    monkeypatch.setattr(NewsletterWorkflow, "_formatting_node", formatting_node)
+    workflow = NewsletterWorkflow()
+    workflow.calls = []
+    workflow.crash = crash
+
+    for name, agent in workflow.agents.items():
+        async def invoke(state, name=name):
+            workflow.calls.append(name)
+            return AgentResponse(agent_name=name, action="stub", output=None)
+        agent.invoke = invoke
+
+    return workflow
+
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_from_failed_node(workflow):
+    """Test a crashed run resumes at the failed node instead of redoing earlier steps."""
+    with pytest.raises(RuntimeError):
+        await workflow.generate_newsletter([], "daily", "2025-01-01")
+    assert "editor" in workflow.calls
+    assert "formatter" not in workflow.calls
+
+    workflow.calls.clear()
+    workflow.crash["formatting"] = False
+    result = await workflow.generate_newsletter([], "daily", "2025-01-01")
+
+    assert workflow.calls == ["formatter"]
+    assert result["current_step"] == "quality_check"
+
+    # A completed run is not resumed; the next run starts over
+    workflow.calls.clear()
+    await workflow.generate_newsletter([], "daily", "2025-01-01")
+    assert "research" in workflow.calls
+
+
+@pytest.mark.asyncio
+async def test_restart_from_named_node(workflow):
+    """Test restarting replays only the named node and those after it."""
+    workflow.crash["formatting"] = False
+    await workflow.generate_newsletter([], "daily", "2025-01-01")
+
+    workflow.calls.clear()
+    await workflow.generate_newsletter([], "daily", "2025-01-01", restart_from="editing")
+    assert workflow.calls == ["editor", "formatter"]
+
+    with pytest.raises(ValueError):
+        await workflow.generate_newsletter([], "daily", "2025-01-01", restart_from="publishing")
+
+
+@pytest.mark.asyncio
+async def test_no_resume_starts_over(workflow):
+    """Test resume=False discards an interrupted run."""
+    with pytest.raises(RuntimeError):
+        await workflow.generate_newsletter([], "daily", "2025-01-01")
+
+    workflow.calls.clear()
+    workflow.crash["formatting"] = False
+    await workflow.generate_newsletter([], "daily", "2025-01-01", resume=False)
+
+    assert "research" in workflow.calls
+    assert "formatter" in workflow.calls
@@ -0,0 +1,174 @@
+"""Tests for the write-behind ingestion queue."""
+
+import asyncio
+import discord
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from sqlalchemy import select, func
+from discord_bot.services.write_behind import WriteBehindQueue
+from discord_bot.services.discord_service import DiscordService
+from discord_bot.models.discord_models import (
+    DiscordGuild, DiscordUser, DiscordMessage, MessageReaction, EngagementMetrics,
+    EngagementDailyRollup, EngagementLeaderboard
+)
+
+
+@pytest.mark.asyncio
+async def test_queue_batches_and_flushes_on_stop():
+    """Test size-triggered batches and the final flush on stop."""
+    batches = []
+    
+    async def flush(batch):
+        batches.append(list(batch))
+    
+    queue = WriteBehindQueue("test", flush, batch_size=3, flush_interval=10)
+    queue.start()
+    for i in range(5):
+        await queue.submit(i)
+    await asyncio.sleep(0)
+    await queue.stop()
+    
+    assert batches == [[0, 1, 2], [3, 4]]
+    stats = queue.get_stats()
+    assert stats["submitted"] == 5
+    assert stats["flushed"] == 5
+    assert stats["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_queue_falls_back_per_item_on_flush_error():
+    """Test failed batches are retried item by item."""
+    handled = []
+    
+    async def flush(batch):
+        raise RuntimeError("boom")
+    
+    async def fallback(item):
+        if item == 1:
+            raise RuntimeError("bad item")
+        handled.append(item)
+    
+    queue = WriteBehindQueue("test", flush, batch_size=10, flush_interval=0.01, fallback_fn=fallback)
+    queue.start()
+    for i in range(3):
+        await queue.submit(i)
+    await queue.stop()
+    
+    assert handled == [0, 2]
+    assert queue.get_stats()["failed"] == 1
+
+
+def _mock_message(message_id, author_id, parent_id=None):
+    message = Mock()
+    message.id = message_id
+    message.content = "hello"
+    message.clean_content = "hello"
+    message.type = "default"
+    message.thread = None
+    message.reference = Mock(message_id=parent_id) if parent_id else None
+    message.edited_at = None
+    message.pinned = False
+    message.attachments = []
+    message.embeds = []
+    message.created_at = datetime.now(timezone.utc)
+    message.guild = Mock(id=1, description=None, member_count=10)
+    message.guild.name = "Guild"
+    message.channel = Mock(id=2, type="text", topic=None)
+    message.channel.name = "general"
+    message.author = Mock(id=author_id, display_name=f"user{author_id}", avatar=None, bot=False)
+    message.author.name = f"user{author_id}"
+    return message
+
+
+@pytest.mark.asyncio
+async def test_store_message_batch(db_session):
+    """Test a batch de-duplicates identities and applies reply deltas."""
+    service = DiscordService()
+    service._monitor_all_channels = True
+    messages = [
+        _mock_message(100, 10),
+        _mock_message(101, 11, parent_id=100),
+        _mock_message(102, 12, parent_id=100),
+        _mock_message(101, 11, parent_id=100),  # duplicate delivery
+    ]
+    await service._store_message_batch(messages)
+    
+    assert (await db_session.execute(select(func.count(DiscordGuild.id)))).scalar() == 1
+    assert (await db_session.execute(select(func.count(DiscordUser.id)))).scalar() == 3
+    assert (await db_session.execute(select(func.count(DiscordMessage.id)))).scalar() == 3
+    
+    result = await db_session.execute(
+        select(EngagementMetrics)
+        .join(DiscordMessage)
+        .where(DiscordMessage.message_id == "100")
+        .execution_options(populate_existing=True)
+    )
+    metrics = result.scalar_one()
+    assert metrics.reply_count == 2
+    assert metrics.discussion_participants == 3
+    
+    rollup = (await db_session.execute(select(EngagementDailyRollup))).scalar_one()
+    assert rollup.message_count == 3
+    assert rollup.scored_count == 3
+
+
+@pytest.mark.asyncio
+async def test_renames_reach_the_leaderboard(db_session):
+    """Test channel and author renames update existing leaderboard rows."""
+    service = DiscordService()
+    service._monitor_all_channels = True
+    await service._store_message_batch([_mock_message(100, 10)])
+    
+    renamed = _mock_message(101, 10)
+    renamed.channel.name = "announcements"
+    renamed.author.display_name = "Renamed"
+    await service._store_message_batch([renamed])
+    
+    result = await db_session.execute(
+        select(EngagementLeaderboard.channel_name, EngagementLeaderboard.author_name)
+        .execution_options(populate_existing=True)
+    )
+    assert set(result.all()) == {("announcements", "Renamed")}
+    
+    renamed.channel.name = "general"
+    await service._store_channel(renamed.channel, renamed.guild, db_session)
+    result = await db_session.execute(select(EngagementLeaderboard.channel_name))
+    assert set(result.scalars().all()) == {"general"}
+
+
+@pytest.mark.asyncio
+async def test_reaction_on_queued_message(db_session, monkeypatch):
+    """Test a reaction arriving before the queued message is flushed."""
+    from discord_bot.services import discord_service as discord_service_module
+    
+    monkeypatch.setattr(discord_service_module.settings, "ingest_flush_interval", 60)
+    
+    service = DiscordService()
+    service._monitor_all_channels = True
+    service._ingest_queue.start()
+    
+    message = _mock_message(100, 10)
+    message.channel = Mock(spec=discord.TextChannel, id=2, type="text", topic=None)
+    message.channel.name = "general"
+    message.reactions = []
+    await service.process_message(message)
+    assert service._ingest_queue.get_stats()["submitted"] == 1
+    
+    reactor = Mock(id=11, display_name="user11", avatar=None, bot=False)
+    reactor.name = "user11"
+    
+    async def users():
+        yield reactor
+    
+    reaction = Mock(message=message, emoji="👍", count=1)
+    reaction.users = users
+    message.reactions = [reaction]
+    await service.process_reaction(reaction, reactor, is_add=True)
+    await service._ingest_queue.stop()
+    
+    assert (await db_session.execute(select(func.count(MessageReaction.id)))).scalar() == 1
+    result = await db_session.execute(
+        select(EngagementMetrics).execution_options(populate_existing=True)
+    )
+    assert result.scalar_one().reaction_count == 1